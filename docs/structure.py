@@ -19,6 +19,9 @@ from paz.optimization import losses
 from paz.optimization import callbacks
 from paz import datasets
 from paz import pipelines
+from paz import inference
+from paz import frame_bus
+from paz import serving
 from paz.utils import logger
 from paz.utils import documentation
 
@@ -66,7 +69,13 @@ PAGES = [
             boxes.to_corner_form,
             boxes.extract_bounding_box_corners,
             boxes.scale_box,
-            boxes.change_box_coordinates
+            boxes.change_box_coordinates,
+            boxes.pad_boxes,
+            boxes.unpad_boxes,
+            boxes.make_boxes_square,
+            boxes.offset_boxes,
+            boxes.clip_boxes,
+            boxes.denormalize_boxes
         ],
     },
 
@@ -75,10 +84,13 @@ PAGES = [
         'page': 'backend/anchors.md',
         'functions': [
             anchors.build_anchors,
+            anchors.build_prior_boxes,
+            anchors.build_pyramid_anchors,
             anchors.build_octaves,
             anchors.build_aspect,
             anchors.build_scales,
             anchors.build_strides,
+            anchors.compute_strides,
             anchors.make_branch_boxes,
             anchors.compute_box_coordinates,
             anchors.build_base_anchor,
@@ -189,6 +201,17 @@ PAGES = [
             draw.draw_RGB_masks,
             draw.draw_human_pose6D
         ],
+        'classes': [
+            (draw.Overlay, [draw.Overlay.reset,
+                            draw.Overlay.draw_points,
+                            draw.Overlay.draw_dots,
+                            draw.Overlay.draw_keypoints,
+                            draw.Overlay.draw_lines,
+                            draw.Overlay.draw_skeletons,
+                            draw.Overlay.draw_boxes,
+                            draw.Overlay.draw_text,
+                            draw.Overlay.render])
+        ]
     },
 
 
@@ -209,6 +232,10 @@ PAGES = [
             image.random_brightness,
             image.random_contrast,
             image.random_hue,
+            image.adjust_saturation,
+            image.adjust_brightness,
+            image.adjust_contrast,
+            image.adjust_hue,
             image.flip_left_right,
             image.random_flip_left_right,
             image.crop_image,
@@ -236,11 +263,16 @@ PAGES = [
 
     {
         'page': 'backend/render.md',
+        'classes': [
+            (render.ShardRenderer, [render.ShardRenderer.render]),
+        ],
         'functions': [
             render.compute_modelview_matrices,
             render.get_look_at_transform,
+            render.load_shard,
             render.random_perturbation,
             render.random_translation,
+            render.render_shards,
             render.roll_camera,
             render.sample_point_in_full_sphere,
             render.sample_point_in_sphere,
@@ -248,7 +280,9 @@ PAGES = [
             render.sample_uniformly,
             render.scale_translation,
             render.split_alpha_channel,
+            render.stack_samples,
             render.translate_camera,
+            render.write_shard,
         ],
     },
 
@@ -291,7 +325,8 @@ PAGES = [
         'functions': [
             models.classification.MiniXception,
             models.ProtoEmbedding,
-            models.ProtoNet
+            models.ProtoNet,
+            models.ProtoClassifier
         ],
     },
 
@@ -422,6 +457,10 @@ PAGES = [
             processors.RandomBrightness,
             processors.RandomContrast,
             processors.RandomHue,
+            processors.RandomSaturationBatch,
+            processors.RandomBrightnessBatch,
+            processors.RandomContrastBatch,
+            processors.RandomHueBatch,
             processors.ResizeImages,
             processors.ResizeImages,
             processors.RandomImageBlur,
@@ -476,6 +515,9 @@ PAGES = [
             processors.ToImageBoxCoordinates,
             processors.ToNormalizedBoxCoordinates,
             processors.RandomSampleCrop,
+            processors.RandomFlipBoxesLeftRightBatch,
+            processors.ExpandBatch,
+            processors.RandomSampleCropBatch,
             processors.RandomTranslation,
             processors.RandomRotation,
             processors.RandomKeypointTranslation,
@@ -499,6 +541,8 @@ PAGES = [
             processors.FilterClassBoxes2D,
             processors.CropBoxes2D,
             processors.ToBoxes2D,
+            processors.PadBoxes,
+            processors.UnpadBoxes,
             processors.MatchBoxes,
             processors.EncodeBoxes,
             processors.DecodeBoxes,
@@ -512,7 +556,14 @@ PAGES = [
             processors.BoxesWithClassArgToBoxes2D,
             processors.RoundBoxes,
             processors.RemoveClass,
-            processors.ScaleBox
+            processors.ScaleBox,
+            processors.SquareBoxes,
+            processors.DenormalizeBoxes,
+            processors.TruncateBoxes,
+            processors.ClipBoxes,
+            processors.OffsetBoxes,
+            processors.FilterClassBoxes,
+            processors.ToBoxes2DView
         ]
     },
 
@@ -648,6 +699,9 @@ PAGES = [
         'classes': [
             pipelines.AugmentBoxes,
             pipelines.AugmentDetection,
+            pipelines.AugmentBoxesBatch,
+            pipelines.LoadDetection,
+            pipelines.AugmentDetectionBatch,
             pipelines.PreprocessBoxes,
             pipelines.PostprocessBoxes2D,
             pipelines.DetectSingleShot,
@@ -684,6 +738,7 @@ PAGES = [
         'page': 'pipelines/image.md',
         'classes': [
             pipelines.AugmentImage,
+            pipelines.AugmentImageBatch,
             pipelines.PreprocessImage,
             pipelines.DecoderPredictor,
             pipelines.EncoderPredictor,
@@ -743,6 +798,20 @@ PAGES = [
     },
 
 
+    {
+        'page': 'pipelines/tf_data.md',
+        'classes': [
+            pipelines.AugmentImageTF,
+            pipelines.AugmentClassificationTF,
+            pipelines.AugmentKeypointsTF,
+            pipelines.AugmentDetectionTF
+        ],
+        'functions': [
+            pipelines.build_dataset
+        ]
+    },
+
+
     {
         'page': 'pipelines/applications.md',
         'classes': [
@@ -773,6 +842,7 @@ PAGES = [
         'page': 'abstract/messages.md',
         'classes': [
             (messages.Box2D, [messages.Box2D.contains]),
+            (messages.Boxes2DView, [messages.Boxes2DView.to_list]),
             messages.Pose6D
         ]
     },
@@ -797,7 +867,13 @@ PAGES = [
                 processor.SequentialProcessor.remove,
                 processor.SequentialProcessor.pop,
                 processor.SequentialProcessor.insert,
-                processor.SequentialProcessor.get_processor])
+                processor.SequentialProcessor.get_processor,
+                processor.SequentialProcessor.compile])
+        ],
+        'functions': [
+            processor.build_generator,
+            processor.get_generator,
+            processor.use_generator
         ]
     },
 
@@ -820,6 +896,52 @@ PAGES = [
 
     },
 
+    {
+        'page': 'inference.md',
+        'functions': [
+            inference.read_frames,
+            inference.serialize,
+            inference.build_pipeline,
+            inference.build_output_names,
+            inference.process_source,
+            inference.process_sources,
+            inference.summarize
+        ],
+        'classes': [
+            inference.FrameReader
+        ]
+    },
+
+    {
+        'page': 'frame_bus.md',
+        'classes': [
+            (frame_bus.FrameBus, [frame_bus.FrameBus.acquire,
+                                  frame_bus.FrameBus.release,
+                                  frame_bus.FrameBus.write,
+                                  frame_bus.FrameBus.read]),
+            (frame_bus.BusStage, [frame_bus.BusStage.start]),
+            (frame_bus.BusPipeline, [frame_bus.BusPipeline.submit,
+                                     frame_bus.BusPipeline.receive,
+                                     frame_bus.BusPipeline.stop])
+        ]
+    },
+
+    {
+        'page': 'serving.md',
+        'functions': [
+            serving.build_adapter
+        ],
+        'classes': [
+            (serving.MicroBatchingService, [
+                serving.MicroBatchingService.start,
+                serving.MicroBatchingService.stop,
+                serving.MicroBatchingService.predict]),
+            serving.SequentialAdapter,
+            serving.SingleShotAdapter,
+            serving.EfficientDetAdapter
+        ]
+    },
+
     {
         'page': 'utils/documentation.md',
         'functions': [
@@ -3,3 +3,4 @@ from .per_pixel_action_score import PerPixelActionScore
 from .scalar_action_score import ScalarActionScore
 from .scalar_action_score import DataScalarActionScore
 from .feature_extractor import FeatureExtractor
+from .feature_extractor import extract_features
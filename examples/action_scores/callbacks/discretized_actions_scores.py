@@ -1,14 +1,15 @@
-import os
 import h5py
 import numpy as np
 from tensorflow.keras.callbacks import Callback
 from tensorflow.keras.utils import Progbar
 
+from .utils import build_directory, build_evaluation
+
 
 class DiscretizedActionScores(Callback):
     def __init__(self, sequencer, label_topic, discretized_topic, num_bins,
                  evaluators, epochs, filepath):
-
+        super(DiscretizedActionScores, self).__init__()
         self.sequencer = sequencer
         self.label_topic = label_topic
         self.evaluators = evaluators
@@ -16,15 +17,15 @@ class DiscretizedActionScores(Callback):
         self.filepath = filepath
         self.discretized_topic = discretized_topic
         self.num_bins = num_bins
-
-        directory_name = os.path.dirname(self.filepath)
-        if not os.path.exists(directory_name):
-            os.makedirs(directory_name)
+        build_directory(self.filepath)
 
         self.write_file = h5py.File(self.filepath, 'w')
+        # every epoch is written at once as a single chunk
         self.evaluations = self.write_file.create_dataset(
             'evaluations',
-            (3, self.num_bins, self.epochs, self.num_evaluators))
+            (3, self.num_bins, self.epochs, self.num_evaluators),
+            chunks=(3, self.num_bins, 1, self.num_evaluators))
+        self._evaluate = None
 
     @property
     def num_evaluators(self):
@@ -38,25 +39,25 @@ class DiscretizedActionScores(Callback):
     def batch_size(self):
         return self.sequencer.batch_size
 
+    def set_model(self, model):
+        super(DiscretizedActionScores, self).set_model(model)
+        # evaluators receive the model outputs first and then the labels
+        self._evaluate = build_evaluation(
+            model, self.evaluators, (1, 2), model_output_first=True)
+
     def on_epoch_end(self, epoch, logs=None):
         print('\n Computing per-sample evaluations for epoch', epoch)
         progress_bar = Progbar(len(self.sequencer))
+        evaluations = np.zeros((3, self.num_bins, self.num_evaluators))
         for batch_index in range(len(self.sequencer)):
             inputs, labels = self.sequencer.__getitem__(batch_index)
-            for eval_arg, evaluator in enumerate(self.evaluators):
-                y_true = self.model(inputs['image'])
-                y_pred = labels[self.label_topic]
-                args = inputs[self.discretized_topic].astype('int')
-                evaluation = evaluator(y_true, y_pred)
-                evaluation = np.mean(evaluation, axis=(1, 2))
-                # fancy indexing not supported in h5py
-                for enu, arg in enumerate(args[:, 0]):
-                    self.evaluations[0, arg, epoch, eval_arg] = evaluation[enu]
-                for enum, arg in enumerate(args[:, 1]):
-                    self.evaluations[1, arg, epoch, eval_arg] = evaluation[enu]
-                for enum, arg in enumerate(args[:, 2]):
-                    self.evaluations[2, arg, epoch, eval_arg] = evaluation[enu]
+            evaluation = self._evaluate(
+                inputs['image'], labels[self.label_topic]).numpy()
+            args = inputs[self.discretized_topic].astype('int')
+            for axis in range(3):
+                evaluations[axis, args[:, axis]] = evaluation
             progress_bar.update(batch_index + 1)
+        self.evaluations[:, :, epoch, :] = evaluations
         self.evaluations.flush()
 
     def on_train_end(self, logs=None):
@@ -1,17 +1,236 @@
-import os
+import threading
+from queue import Queue, Full
+
 import h5py
 import numpy as np
-
+import tensorflow as tf
 from tensorflow.keras.callbacks import Callback
-from tensorflow.keras.backend import function
+from tensorflow.keras.models import Model
 from tensorflow.keras.utils import Progbar
 
+from .utils import build_directory
+
+
+def count_samples(sequencer):
+    """Returns the number of samples of ``sequencer`` without the padding
+    of its last batch.
+    """
+    if hasattr(sequencer, 'data'):
+        return len(sequencer.data)
+    return len(sequencer) * sequencer.batch_size
+
+
+def build_feature_extractor(model, layer_name):
+    """Builds a compiled function returning the outputs of a layer.
+
+    # Arguments
+        model: Keras model.
+        layer_name: String. Name of the layer whose outputs are extracted.
+
+    # Returns
+        Function taking a batch of inputs and returning its features.
+    """
+    output_tensor = model.get_layer(layer_name).output
+    extractor = Model(model.inputs, output_tensor)
+
+    @tf.function(reduce_retracing=True)
+    def extract(inputs):
+        return extractor(inputs, training=False)
+    return extract
+
+
+class BatchLoader(object):
+    """Loads the inputs of a sequence in a background thread, overlapping
+    data processing with inference.
+
+    # Arguments
+        sequencer: Keras ``Sequence``.
+        queue_size: Int. Maximum number of loaded batches held in memory.
+
+    # Methods
+        close()
+    """
+    def __init__(self, sequencer, queue_size=4):
+        self.sequencer = sequencer
+        self._queue = Queue(queue_size)
+        self._error = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._load, daemon=True)
+        self._thread.start()
+
+    def _put(self, inputs):
+        while not self._stop.is_set():
+            try:
+                self._queue.put(inputs, timeout=0.1)
+                return True
+            except Full:
+                pass
+        return False
+
+    def _load(self):
+        try:
+            for batch_index in range(len(self.sequencer)):
+                if not self._put(self.sequencer.__getitem__(batch_index)[0]):
+                    return
+        except Exception as error:
+            self._error = error
+        self._put(None)
+
+    def close(self):
+        """Stops loading. Required if the batches are not consumed until
+        the end.
+        """
+        self._stop.set()
+        self._thread.join()
+
+    def __iter__(self):
+        while True:
+            inputs = self._queue.get()
+            if inputs is None:
+                break
+            yield inputs
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+
+class FeatureWriter(object):
+    """Buffers features and writes them in contiguous chunks.
+
+    # Arguments
+        features: HDF5 dataset or numpy memmap of shape
+            ``(num_samples, num_features)``.
+        chunk_size: Int. Number of samples written at once.
+    """
+    def __init__(self, features, chunk_size):
+        self.features = features
+        self.chunk_size = chunk_size
+        self.sample_arg = 0
+        self._buffer, self._num_buffered = [], 0
+
+    @property
+    def num_samples(self):
+        return len(self.features)
+
+    def write(self, features):
+        """Appends a batch of features. Samples beyond ``num_samples``
+        e.g. the padding of the last batch are discarded.
+        """
+        num_remaining = self.num_samples - self.sample_arg - self._num_buffered
+        features = features[:num_remaining]
+        self._buffer.append(features)
+        self._num_buffered = self._num_buffered + len(features)
+        if self._num_buffered >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """Writes all buffered features."""
+        if self._num_buffered == 0:
+            return
+        features = np.concatenate(self._buffer, axis=0)
+        sample_arg_B = self.sample_arg + len(features)
+        self.features[self.sample_arg:sample_arg_B] = features
+        self.sample_arg = sample_arg_B
+        self._buffer, self._num_buffered = [], 0
+
+
+def open_features(filepath, shape, dtype='float32', chunk_size=1024,
+                  compression=None):
+    """Creates the array holding the extracted features.
+
+    # Arguments
+        filepath: String. Files ending in ``.npy`` are written as numpy
+            memmaps and any other file as HDF5 with a ``features`` dataset.
+        shape: List of ints ``(num_samples, num_features)``.
+        dtype: String. Data type of the features e.g. ``float16``.
+        chunk_size: Int. Number of samples per HDF5 chunk.
+        compression: String. HDF5 compression filter e.g. ``gzip`` or
+            ``lzf``. If ``None`` features are not compressed.
+
+    # Returns
+        Tuple with the opened file and the features array.
+    """
+    if filepath.endswith('.npy'):
+        if compression is not None:
+            raise ValueError('Compression is not supported for ``.npy``')
+        features = np.lib.format.open_memmap(filepath, 'w+', dtype, shape)
+        return features, features
+    write_file = h5py.File(filepath, 'w')
+    chunks = (max(1, min(chunk_size, shape[0])), shape[1])
+    features = write_file.create_dataset(
+        'features', shape, dtype, chunks=chunks, compression=compression)
+    return write_file, features
+
+
+def extract_features(model, layer_name, sequencer, filepath, dtype='float32',
+                     chunk_size=1024, compression=None, queue_size=4):
+    """Streams the features of a model layer for all samples of a sequence
+    into a file. Outputs of non-flat layers are flattened per sample.
+
+    # Arguments
+        model: Keras model.
+        layer_name: String. Name of the layer whose outputs are extracted.
+        sequencer: Keras ``Sequence`` e.g. ``ProcessingSequence``.
+        filepath: String. Output file, see ``open_features``.
+        dtype: String. Data type of the features e.g. ``float16``.
+        chunk_size: Int. Number of samples written at once.
+        compression: String. HDF5 compression filter or ``None``.
+        queue_size: Int. Number of batches loaded ahead of inference.
+
+    # Returns
+        Int. Number of written samples.
+    """
+    extract = build_feature_extractor(model, layer_name)
+    output_shape = tuple(model.get_layer(layer_name).output.shape)[1:]
+    if None in output_shape:
+        raise ValueError('Layer output must have a fixed shape', output_shape)
+    num_features = int(np.prod(output_shape))
+    build_directory(filepath)
+    shape = (count_samples(sequencer), num_features)
+    write_file, features = open_features(
+        filepath, shape, dtype, chunk_size, compression)
+    writer = FeatureWriter(features, chunk_size)
+    progress_bar = Progbar(len(sequencer))
+    loader = BatchLoader(sequencer, queue_size)
+    try:
+        for batch_index, inputs in enumerate(loader):
+            batch_features = extract(inputs).numpy()
+            batch_features = batch_features.reshape(
+                len(batch_features), num_features)
+            writer.write(batch_features.astype(dtype))
+            progress_bar.update(batch_index + 1)
+        writer.flush()
+    finally:
+        loader.close()
+        if isinstance(write_file, np.memmap):
+            write_file.flush()
+        else:
+            write_file.close()
+    return writer.sample_arg
+
 
 class FeatureExtractor(Callback):
-    def __init__(self, layer_name, sequencer, filepath):
+    """Extracts the features of a model layer at the end of training.
+
+    # Arguments
+        layer_name: String. Name of the layer whose outputs are extracted.
+        sequencer: Keras ``Sequence`` e.g. ``ProcessingSequence``.
+        filepath: String. Output file, see ``open_features``.
+        dtype: String. Data type of the features e.g. ``float16``.
+        chunk_size: Int. Number of samples written at once.
+        compression: String. HDF5 compression filter or ``None``.
+        queue_size: Int. Number of batches loaded ahead of inference.
+    """
+    def __init__(self, layer_name, sequencer, filepath, dtype='float32',
+                 chunk_size=1024, compression=None, queue_size=4):
+        super(FeatureExtractor, self).__init__()
         self.layer_name = layer_name
         self.sequencer = sequencer
         self.filepath = filepath
+        self.dtype = dtype
+        self.chunk_size = chunk_size
+        self.compression = compression
+        self.queue_size = queue_size
 
     @property
     def batch_size(self):
@@ -19,29 +238,10 @@ class FeatureExtractor(Callback):
 
     @property
     def num_samples(self):
-        return len(self.sequencer) * self.sequencer.batch_size
+        return count_samples(self.sequencer)
 
-    def on_train_end(self, logs):
+    def on_train_end(self, logs=None):
         print('Extracting features from layer:', self.layer_name)
-        output_tensor = self.model.get_layer(self.layer_name).output
-        feature_extractor = function(self.model.input, output_tensor)
-        num_features = output_tensor.shape.as_list()[-1]
-
-        directory_name = os.path.dirname(self.filepath)
-        if not os.path.exists(directory_name):
-            os.makedirs(directory_name)
-
-        self.write_file = h5py.File(self.filepath, 'w')
-        self.features = self.write_file.create_dataset(
-            'features', (self.num_samples, num_features))
-
-        progress_bar = Progbar(len(self.sequencer))
-        for batch_index in range(len(self.sequencer)):
-            inputs = self.sequencer.__getitem__(batch_index)[0]
-            batch_arg_A = self.batch_size * (batch_index)
-            batch_arg_B = self.batch_size * (batch_index + 1)
-            features = feature_extractor(inputs)
-            features = np.squeeze(features)
-            self.features[batch_arg_A:batch_arg_B, :] = features
-            progress_bar.update(batch_index + 1)
-        self.write_file.close()
+        extract_features(self.model, self.layer_name, self.sequencer,
+                         self.filepath, self.dtype, self.chunk_size,
+                         self.compression, self.queue_size)
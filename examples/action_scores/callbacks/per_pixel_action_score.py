@@ -1,28 +1,29 @@
-import os
 import h5py
 from tensorflow.keras.callbacks import Callback
 from tensorflow.keras.utils import Progbar
 
+from .utils import build_directory, build_evaluation, build_chunks
+from .utils import EpochWriter
+
 
 class PerPixelActionScore(Callback):
-    def __init__(self, sequencer, topic, evaluator, shape, epochs, filepath):
-        super(Callback, self).__init__()
+    def __init__(self, sequencer, topic, evaluator, shape, epochs, filepath,
+                 chunk_size=256):
+        super(PerPixelActionScore, self).__init__()
         self.sequencer = sequencer
         self.topic = topic
         self.evaluator = evaluator
         self.epochs = epochs
         H, W = self.shape = shape
         self.filepath = filepath
-        self._build_directory(filepath)
+        build_directory(filepath)
 
         self.write_file = h5py.File(filepath, 'w')
+        shape = (self.epochs, self.num_samples, H, W)
         self.action_scores = self.write_file.create_dataset(
-            'action_scores', (self.epochs, self.num_samples, H, W))
-
-    def _build_directory(self, filepath):
-        directory_name = os.path.dirname(filepath)
-        if not os.path.exists(directory_name):
-            os.makedirs(directory_name)
+            'action_scores', shape, chunks=build_chunks(shape, chunk_size))
+        self.writer = EpochWriter(self.action_scores, chunk_size)
+        self._evaluate = None
 
     @property
     def num_samples(self):
@@ -32,18 +33,20 @@ class PerPixelActionScore(Callback):
     def batch_size(self):
         return self.sequencer.batch_size
 
+    def set_model(self, model):
+        super(PerPixelActionScore, self).set_model(model)
+        self._evaluate = build_evaluation(model, [self.evaluator])
+
     def on_epoch_end(self, epoch, logs=None):
         print('\n Computing per-pixel evaluations for epoch', epoch)
         progress_bar = Progbar(len(self.sequencer))
+        self.writer.reset(epoch)
         for batch_index in range(len(self.sequencer)):
             inputs, labels = self.sequencer.__getitem__(batch_index)
-            batch_arg_A = self.batch_size * (batch_index)
-            batch_arg_B = self.batch_size * (batch_index + 1)
-            y_true = labels[self.topic]
-            y_pred = self.model(inputs)
-            score = self.evaluator(y_true, y_pred)
-            self.action_scores[epoch, batch_arg_A:batch_arg_B, :, :] = score
+            scores = self._evaluate(inputs, labels[self.topic])
+            self.writer.write(scores.numpy()[..., 0])
             progress_bar.update(batch_index + 1)
+        self.writer.flush()
         self.action_scores.flush()
 
     def on_train_end(self, logs=None):
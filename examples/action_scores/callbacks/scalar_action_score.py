@@ -1,9 +1,11 @@
-import os
 import h5py
 import numpy as np
 from tensorflow.keras.callbacks import Callback
 from tensorflow.keras.utils import Progbar
 
+from .utils import build_directory, build_evaluation, build_chunks
+from .utils import EpochWriter
+
 
 class ScalarActionScore(Callback):
     """Estimates sample difficulty using action scores as described in [1].
@@ -14,25 +16,27 @@ class ScalarActionScore(Callback):
         evaluators: List of callables for computing action scores.
         epochs: Int. Max number of epochs.
         filepath: String. Name of file to write action scores on.
+        chunk_size: Int. Number of samples written to file at once.
 
     # References
         [1] [Action Scores](https://arxiv.org/pdf/2011.11461.pdf)
     """
-    def __init__(self, sequencer, topic, evaluators, epochs, filepath):
+    def __init__(self, sequencer, topic, evaluators, epochs, filepath,
+                 chunk_size=4096):
+        super(ScalarActionScore, self).__init__()
         self.sequencer = sequencer
         self.topic = topic
         self.evaluators = evaluators
         self.epochs = epochs
         self.filepath = filepath
-
-        directory_name = os.path.dirname(self.filepath)
-        if not os.path.exists(directory_name):
-            os.makedirs(directory_name)
+        build_directory(self.filepath)
 
         self.write_file = h5py.File(self.filepath, 'w')
+        shape = (self.epochs, self.num_samples, self.num_evaluators)
         self.evaluations = self.write_file.create_dataset(
-            'evaluations',
-            (self.epochs, self.num_samples, self.num_evaluators))
+            'evaluations', shape, chunks=build_chunks(shape, chunk_size))
+        self.writer = EpochWriter(self.evaluations, chunk_size)
+        self._evaluate = None
 
     @property
     def num_evaluators(self):
@@ -46,20 +50,20 @@ class ScalarActionScore(Callback):
     def batch_size(self):
         return self.sequencer.batch_size
 
+    def set_model(self, model):
+        super(ScalarActionScore, self).set_model(model)
+        self._evaluate = build_evaluation(model, self.evaluators)
+
     def on_epoch_end(self, epoch, logs=None):
         print('\n Computing per-sample evaluations for epoch', epoch)
         progress_bar = Progbar(len(self.sequencer))
+        self.writer.reset(epoch)
         for batch_index in range(len(self.sequencer)):
             inputs, labels = self.sequencer.__getitem__(batch_index)
-            for eval_arg, evaluator in enumerate(self.evaluators):
-                batch_arg_A = self.batch_size * (batch_index)
-                batch_arg_B = self.batch_size * (batch_index + 1)
-                y_true = labels[self.topic]
-                y_pred = self.model(inputs)
-                evaluation = evaluator(y_true, y_pred)
-                self.evaluations[
-                    epoch, batch_arg_A:batch_arg_B, eval_arg] = evaluation
+            evaluations = self._evaluate(inputs, labels[self.topic])
+            self.writer.write(evaluations.numpy())
             progress_bar.update(batch_index + 1)
+        self.writer.flush()
         self.evaluations.flush()
 
     def on_train_end(self, logs=None):
@@ -68,34 +72,54 @@ class ScalarActionScore(Callback):
 
 
 class DataScalarActionScore(Callback):
-    def __init__(self, data, evaluator, epochs, filepath):
+    """Estimates sample difficulty of in-memory data using action scores.
+
+    # Arguments
+        data: List with the input and label arrays.
+        evaluator: Callable for computing action scores.
+        epochs: Int. Max number of epochs.
+        filepath: String. Name of file to write action scores on.
+        batch_size: Int. Number of samples predicted at once.
+        chunk_size: Int. Number of samples written to file at once.
+    """
+    def __init__(self, data, evaluator, epochs, filepath, batch_size=32,
+                 chunk_size=4096):
+        super(DataScalarActionScore, self).__init__()
         self.data = data
         self.evaluator = evaluator
         self.epochs = epochs
         self.filepath = filepath
-
-        directory_name = os.path.dirname(self.filepath)
-        if not os.path.exists(directory_name):
-            os.makedirs(directory_name)
+        self.batch_size = batch_size
+        build_directory(self.filepath)
 
         self.write_file = h5py.File(self.filepath, 'w')
+        shape = (self.epochs, self.num_samples, 1)
         self.evaluations = self.write_file.create_dataset(
-            'evaluations', (self.epochs, self.num_samples, 1))
+            'evaluations', shape, chunks=build_chunks(shape, chunk_size))
+        self.writer = EpochWriter(self.evaluations, chunk_size)
+        self._evaluate = None
 
     @property
     def num_samples(self):
         return len(self.data[0])
 
+    def set_model(self, model):
+        super(DataScalarActionScore, self).set_model(model)
+        self._evaluate = build_evaluation(model, [self.evaluator])
+
     def on_epoch_end(self, epoch, logs=None):
         print('\n Computing per-sample evaluations for epoch', epoch)
         progress_bar = Progbar(self.num_samples)
+        self.writer.reset(epoch)
         x_data, y_data = self.data
-        for sample_arg, (x, y_true) in enumerate(zip(x_data, y_data)):
-            y_pred = self.model(np.expand_dims(x, 0))
-            y_true = np.expand_dims(y_true, [0, 1])
-            evaluation = self.evaluator(y_true, y_pred)
-            self.evaluations[epoch, sample_arg] = evaluation
-            progress_bar.update(sample_arg + 1)
+        for sample_arg in range(0, self.num_samples, self.batch_size):
+            batch_arg_B = min(sample_arg + self.batch_size, self.num_samples)
+            x = np.asarray(x_data[sample_arg:batch_arg_B])
+            y_true = np.expand_dims(y_data[sample_arg:batch_arg_B], 1)
+            evaluations = self._evaluate(x, y_true)
+            self.writer.write(evaluations.numpy())
+            progress_bar.update(batch_arg_B)
+        self.writer.flush()
         self.evaluations.flush()
 
     def on_train_end(self, logs=None):
@@ -0,0 +1,91 @@
+import os
+import numpy as np
+import tensorflow as tf
+
+
+def build_directory(filepath):
+    directory_name = os.path.dirname(filepath)
+    if not os.path.exists(directory_name):
+        os.makedirs(directory_name)
+
+
+def build_evaluation(model, evaluators, axis=None, model_output_first=False):
+    """Builds a compiled function that predicts a batch once and applies
+    all evaluators to the same prediction.
+
+    # Arguments
+        model: Keras model.
+        evaluators: List of callables with signature ``(y_true, y_pred)``.
+        axis: List of ints. Axes averaged in every evaluation e.g. the
+            spatial axes of per-pixel evaluators. If ``None`` evaluations
+            are returned unreduced.
+        model_output_first: Boolean. If ``True`` evaluators are called as
+            ``evaluator(y_pred, y_true)``.
+
+    # Returns
+        Function taking ``inputs`` and ``y_true`` and returning a tensor
+            with the evaluations stacked along the last axis.
+    """
+    @tf.function(reduce_retracing=True)
+    def evaluate(inputs, y_true):
+        y_pred = model(inputs, training=False)
+        evaluations = []
+        for evaluator in evaluators:
+            if model_output_first:
+                evaluation = evaluator(y_pred, y_true)
+            else:
+                evaluation = evaluator(y_true, y_pred)
+            if axis is not None:
+                evaluation = tf.reduce_mean(evaluation, axis=axis)
+            evaluations.append(tf.cast(evaluation, tf.float32))
+        return tf.stack(evaluations, axis=-1)
+    return evaluate
+
+
+def build_chunks(shape, chunk_size):
+    """Returns HDF5 chunks holding ``chunk_size`` consecutive samples of a
+    single epoch of a dataset with shape ``(epochs, num_samples, ...)``.
+    """
+    return (1, max(1, min(chunk_size, shape[1]))) + tuple(shape[2:])
+
+
+class EpochWriter(object):
+    """Buffers consecutive sample evaluations of an epoch and writes them
+    to an HDF5 dataset of shape ``(epochs, num_samples, ...)`` in
+    contiguous chunks.
+
+    # Arguments
+        dataset: HDF5 dataset.
+        chunk_size: Int. Number of samples written at once.
+    """
+    def __init__(self, dataset, chunk_size):
+        self.dataset = dataset
+        self.chunk_size = chunk_size
+        self.reset(0)
+
+    def reset(self, epoch):
+        """Starts writing from the first sample of ``epoch``."""
+        self.epoch = epoch
+        self.sample_arg = 0
+        self._buffer, self._num_buffered = [], 0
+
+    def write(self, values):
+        """Appends the evaluations of a batch.
+
+        # Arguments
+            values: Numpy array of shape ``(batch_size, ...)``.
+        """
+        self._buffer.append(values)
+        self._num_buffered = self._num_buffered + len(values)
+        if self._num_buffered >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """Writes all buffered evaluations."""
+        if self._num_buffered == 0:
+            return
+        values = np.concatenate(self._buffer, axis=0)
+        sample_arg_B = self.sample_arg + len(values)
+        self.dataset[self.epoch, self.sample_arg:sample_arg_B] = values
+        self.sample_arg = sample_arg_B
+        self._buffer, self._num_buffered = [], 0
@@ -0,0 +1,147 @@
+import os
+
+import h5py
+import pytest
+import numpy as np
+import tensorflow as tf
+from tensorflow.keras.layers import Input, Dense, Conv2D
+from tensorflow.keras.models import Model
+
+from callbacks import ScalarActionScore, DataScalarActionScore
+from callbacks import PerPixelActionScore, DiscretizedActionScores
+
+
+class DictionarySequence(object):
+    """Minimal sequence returning batches of ``inputs`` and ``labels``."""
+    def __init__(self, inputs, labels, batch_size):
+        self.inputs, self.labels = inputs, labels
+        self.batch_size = batch_size
+
+    def __len__(self):
+        return len(list(self.labels.values())[0]) // self.batch_size
+
+    def _batch(self, values, batch_index):
+        batch_arg_A = self.batch_size * batch_index
+        batch_arg_B = self.batch_size * (batch_index + 1)
+        return values[batch_arg_A:batch_arg_B]
+
+    def __getitem__(self, batch_index):
+        if isinstance(self.inputs, dict):
+            inputs = {topic: self._batch(values, batch_index)
+                      for topic, values in self.inputs.items()}
+        else:
+            inputs = self._batch(self.inputs, batch_index)
+        labels = {topic: self._batch(values, batch_index)
+                  for topic, values in self.labels.items()}
+        return inputs, labels
+
+
+def asymmetric_evaluator(tensor_A, tensor_B):
+    return tf.reduce_mean(tensor_A - 2.0 * tensor_B, axis=-1)
+
+
+def run_callback(callback, model, filepath, topic):
+    callback.set_model(model)
+    callback.on_epoch_end(1)
+    callback.on_train_end()
+    with h5py.File(filepath, 'r') as read_file:
+        return read_file[topic][:]
+
+
+@pytest.fixture
+def random_state():
+    return np.random.RandomState(777)
+
+
+@pytest.fixture
+def dense_model():
+    inputs = Input((4,))
+    outputs = Dense(3, activation='softmax')(inputs)
+    return Model(inputs, outputs)
+
+
+@pytest.fixture
+def conv_model():
+    inputs = Input((5, 5, 2))
+    outputs = Conv2D(3, 3, padding='same', activation='softmax')(inputs)
+    return Model(inputs, outputs)
+
+
+def test_scalar_action_score_equals_baseline(tmp_path, random_state,
+                                             dense_model):
+    x = random_state.normal(0, 1, (12, 4)).astype('float32')
+    y = np.eye(3)[random_state.randint(0, 3, 12)].astype('float32')
+    sequencer = DictionarySequence(x, {'label': y}, 4)
+    evaluators = [tf.keras.losses.categorical_crossentropy,
+                  asymmetric_evaluator]
+    filepath = os.path.join(str(tmp_path), 'scores.hdf5')
+    callback = ScalarActionScore(sequencer, 'label', evaluators, 2, filepath)
+    evaluations = run_callback(callback, dense_model, filepath, 'evaluations')
+
+    for batch_index in range(len(sequencer)):
+        inputs, labels = sequencer[batch_index]
+        y_pred = dense_model(inputs)
+        for eval_arg, evaluator in enumerate(evaluators):
+            evaluation = evaluator(labels['label'], y_pred).numpy()
+            assert np.allclose(evaluations[1, 4 * batch_index:
+                                           4 * (batch_index + 1), eval_arg],
+                               evaluation, atol=1e-5)
+    assert np.all(evaluations[0] == 0)
+
+
+def test_data_scalar_action_score_equals_per_sample_baseline(
+        tmp_path, random_state, dense_model):
+    x = random_state.normal(0, 1, (10, 4)).astype('float32')
+    y = random_state.randint(0, 3, 10)
+    evaluator = tf.keras.losses.sparse_categorical_crossentropy
+    filepath = os.path.join(str(tmp_path), 'scores.hdf5')
+    callback = DataScalarActionScore([x, y], evaluator, 2, filepath,
+                                     batch_size=4)
+    evaluations = run_callback(callback, dense_model, filepath, 'evaluations')
+
+    for sample_arg, (sample_x, sample_y) in enumerate(zip(x, y)):
+        y_pred = dense_model(np.expand_dims(sample_x, 0))
+        y_true = np.expand_dims(sample_y, [0, 1])
+        evaluation = evaluator(y_true, y_pred).numpy()
+        assert np.allclose(evaluations[1, sample_arg], evaluation, atol=1e-5)
+
+
+def test_per_pixel_action_score_equals_baseline(tmp_path, random_state,
+                                                conv_model):
+    x = random_state.normal(0, 1, (6, 5, 5, 2)).astype('float32')
+    y = np.eye(3)[random_state.randint(0, 3, (6, 5, 5))].astype('float32')
+    sequencer = DictionarySequence(x, {'masks': y}, 3)
+    evaluator = tf.keras.losses.categorical_crossentropy
+    filepath = os.path.join(str(tmp_path), 'scores.hdf5')
+    callback = PerPixelActionScore(sequencer, 'masks', evaluator, (5, 5), 2,
+                                   filepath, chunk_size=4)
+    scores = run_callback(callback, conv_model, filepath, 'action_scores')
+
+    for batch_index in range(len(sequencer)):
+        inputs, labels = sequencer[batch_index]
+        score = evaluator(labels['masks'], conv_model(inputs)).numpy()
+        assert np.allclose(scores[1, 3 * batch_index:3 * (batch_index + 1)],
+                           score, atol=1e-5)
+
+
+def test_discretized_action_scores_pass_model_outputs_first(
+        tmp_path, random_state, conv_model):
+    x = random_state.normal(0, 1, (6, 5, 5, 2)).astype('float32')
+    y = random_state.uniform(0, 1, (6, 5, 5, 3)).astype('float32')
+    # every sample falls into its own bin along every axis
+    bins = np.stack([np.arange(6), np.arange(6)[::-1], np.arange(6)], 1)
+    sequencer = DictionarySequence({'image': x, 'bins': bins},
+                                   {'masks': y}, 2)
+    evaluators = [asymmetric_evaluator,
+                  tf.keras.losses.categorical_crossentropy]
+    filepath = os.path.join(str(tmp_path), 'scores.hdf5')
+    callback = DiscretizedActionScores(sequencer, 'masks', 'bins', 6,
+                                       evaluators, 2, filepath)
+    evaluations = run_callback(callback, conv_model, filepath, 'evaluations')
+
+    for eval_arg, evaluator in enumerate(evaluators):
+        model_output = conv_model(x)
+        evaluation = evaluator(model_output, y).numpy().mean(axis=(1, 2))
+        for axis in range(3):
+            assert np.allclose(evaluations[axis, bins[:, axis], 1, eval_arg],
+                               evaluation, atol=1e-5)
@@ -0,0 +1,109 @@
+import os
+
+import h5py
+import pytest
+import numpy as np
+from tensorflow.keras.layers import Input, Dense, Conv2D
+from tensorflow.keras.models import Model
+
+from callbacks.feature_extractor import extract_features
+from callbacks.feature_extractor import BatchLoader
+from callbacks.feature_extractor import FeatureWriter
+from callbacks.feature_extractor import open_features
+
+
+class ArraySequence(object):
+    """Minimal sequence returning zero padded batches of ``data``."""
+    def __init__(self, data, batch_size):
+        self.data = data
+        self.batch_size = batch_size
+
+    def __len__(self):
+        return int(np.ceil(len(self.data) / self.batch_size))
+
+    def __getitem__(self, batch_index):
+        inputs = np.zeros((self.batch_size, *self.data.shape[1:]),
+                          dtype=np.float32)
+        batch = self.data[batch_index * self.batch_size:
+                          (batch_index + 1) * self.batch_size]
+        inputs[:len(batch)] = batch
+        return inputs, None
+
+
+@pytest.fixture
+def dense_model():
+    inputs = Input((5,))
+    outputs = Dense(3, name='features')(inputs)
+    return Model(inputs, outputs)
+
+
+@pytest.fixture
+def conv_model():
+    inputs = Input((6, 6, 1))
+    outputs = Conv2D(4, 3, padding='same', name='features')(inputs)
+    return Model(inputs, outputs)
+
+
+@pytest.fixture
+def data():
+    return np.random.RandomState(777).normal(0, 1, (10, 5)).astype('float32')
+
+
+def test_npy_features_truncate_last_batch(tmp_path, dense_model, data):
+    filepath = os.path.join(str(tmp_path), 'features.npy')
+    num_samples = extract_features(dense_model, 'features',
+                                   ArraySequence(data, 4), filepath,
+                                   chunk_size=3)
+    features = np.load(filepath)
+    assert num_samples == 10
+    assert features.shape == (10, 3)
+    assert np.allclose(features, dense_model.predict(data), atol=1e-5)
+
+
+def test_h5_features_are_stored_as_float16(tmp_path, dense_model, data):
+    filepath = os.path.join(str(tmp_path), 'features.h5')
+    extract_features(dense_model, 'features', ArraySequence(data, 4),
+                     filepath, dtype='float16', compression='gzip')
+    with h5py.File(filepath, 'r') as features_file:
+        features = features_file['features']
+        assert features.dtype == np.float16
+        assert features.shape == (10, 3)
+        assert np.allclose(features[:], dense_model.predict(data), atol=1e-2)
+
+
+def test_non_flat_features_are_flattened_per_sample(tmp_path, conv_model):
+    data = np.random.RandomState(777).normal(0, 1, (7, 6, 6, 1))
+    filepath = os.path.join(str(tmp_path), 'features.npy')
+    extract_features(conv_model, 'features', ArraySequence(data, 3), filepath)
+    features = np.load(filepath)
+    assert features.shape == (7, 6 * 6 * 4)
+    predictions = conv_model.predict(data.astype('float32'))
+    assert np.allclose(features, predictions.reshape(7, -1), atol=1e-5)
+
+
+def test_feature_writer_flushes_chunks(tmp_path):
+    filepath = os.path.join(str(tmp_path), 'features.npy')
+    _, features = open_features(filepath, (5, 2))
+    writer = FeatureWriter(features, chunk_size=4)
+    batches = np.arange(12, dtype='float32').reshape(3, 2, 2)
+    writer.write(batches[0])
+    assert writer.sample_arg == 0
+    writer.write(batches[1])
+    assert writer.sample_arg == 4
+    writer.write(batches[2])
+    writer.flush()
+    assert writer.sample_arg == 5
+    assert np.array_equal(features, batches.reshape(6, 2)[:5])
+
+
+def test_npy_features_with_compression(tmp_path):
+    filepath = os.path.join(str(tmp_path), 'features.npy')
+    with pytest.raises(ValueError):
+        open_features(filepath, (5, 2), compression='gzip')
+
+
+def test_batch_loader_close_stops_loading(data):
+    loader = BatchLoader(ArraySequence(data, 1), queue_size=1)
+    assert len(next(iter(loader))) == 1
+    loader.close()
+    assert not loader._thread.is_alive()
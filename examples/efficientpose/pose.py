@@ -300,7 +300,7 @@ class EfficientPoseLinemodPostprocess(Processor):
                  num_pose_dims=3):
         super(EfficientPoseLinemodPostprocess, self).__init__()
         self.num_pose_dims = num_pose_dims
-        model.prior_boxes = model.prior_boxes * model.input_shape[1]
+        self.input_size = model.input_shape[1]
         self.postprocess_1 = pr.SequentialProcessor([
             pr.Squeeze(axis=None),
             pr.DecodeBoxes(model.prior_boxes, variances),
@@ -322,7 +322,7 @@ class EfficientPoseLinemodPostprocess(Processor):
     def call(self, model_output, image_scale, camera_parameter):
         detections, transformations = model_output
         box_data = self.postprocess_1(detections)
-        box_data = self.scale(box_data, 1 / image_scale)
+        box_data = self.scale(box_data, self.input_size / image_scale)
         box_data_all = box_data
         box_data = self.postprocess_2(box_data)
         boxes2D = self.to_boxes2D(box_data)
@@ -46,11 +46,17 @@ def compute_ADD(true_pose, pred_pose, mesh_points):
 
 
 def check_ADD(ADD_error, diameter, diameter_threshold=0.1):
-    if ADD_error <= (diameter * diameter_threshold):
-        is_correct = True
-    else:
-        is_correct = False
-    return is_correct
+    """Check if ADD errors are within the diameter's tolerance.
+
+    # Arguments
+        ADD_error: Float or array of floats with ADD error values.
+        diameter: Float, diameter of the object.
+        diameter_threshold: Float, threshold for diameter tolerance.
+
+    # Returns
+        Bool or boolean array flagging the correct poses.
+    """
+    return ADD_error <= (diameter * diameter_threshold)
 
 
 def compute_ADI(true_pose, pred_pose, mesh_points):
@@ -83,6 +89,121 @@ def compute_ADI(true_pose, pred_pose, mesh_points):
     return error
 
 
+def poses6D_to_arrays(poses6D):
+    """Stacks ``Pose6D`` messages into rotation and translation arrays.
+
+      # Arguments
+          poses6D: List of ``Pose6D`` messages.
+
+      # Returns
+          rotations: Array of shape (num_poses, 3, 3).
+          translations: Array of shape (num_poses, 3).
+      """
+    rotations = [quaternion_to_rotation_matrix(pose6D.quaternion)
+                 for pose6D in poses6D]
+    translations = [np.reshape(pose6D.translation, 3) for pose6D in poses6D]
+    return np.array(rotations), np.array(translations)
+
+
+def transform_matrices_to_arrays(poses):
+    """Splits (3, 4) transformation matrices into rotations and translations.
+
+      # Arguments
+          poses: List or array of (3, 4) transformation matrices.
+
+      # Returns
+          rotations: Array of shape (num_poses, 3, 3).
+          translations: Array of shape (num_poses, 3).
+      """
+    poses = np.asarray(poses)
+    return poses[:, :3, :3], poses[:, :3, 3]
+
+
+class MeshPoseEvaluator(object):
+    """Batched ADD and ADI evaluation for a single object mesh.
+
+    The KD-tree is built once over the mesh in its canonical frame.
+    ADI distances are computed by mapping the ground-truth points into the
+    frame of each predicted pose and querying this cached tree, which is
+    equivalent since rigid transformations preserve distances.
+
+    # Arguments
+        mesh_points: nx3 ndarray with 3D model points.
+        num_points: Int or ``None``. If given, the mesh is randomly
+            subsampled to at most this number of points.
+        seed: Int. Seed used for subsampling the mesh.
+    """
+    def __init__(self, mesh_points, num_points=None, seed=777):
+        mesh_points = np.asarray(mesh_points, dtype=np.float64)
+        if (num_points is not None) and (num_points < len(mesh_points)):
+            random_state = np.random.RandomState(seed)
+            args = random_state.choice(len(mesh_points), num_points, False)
+            mesh_points = mesh_points[args]
+        self.mesh_points = mesh_points
+        self.tree = spatial.cKDTree(mesh_points)
+
+    def compute_ADD(self, true_rotations, true_translations,
+                    pred_rotations, pred_translations):
+        """Calculates the ADD errors of a batch of poses.
+
+          # Arguments
+              true_rotations: Array of shape (num_poses, 3, 3).
+              true_translations: Array of shape (num_poses, 3).
+              pred_rotations: Array of shape (num_poses, 3, 3).
+              pred_translations: Array of shape (num_poses, 3).
+
+          # Returns
+              Array of shape (num_poses) with the ADD errors.
+          """
+        rotation_difference = pred_rotations - true_rotations
+        translation_difference = pred_translations - true_translations
+        distances = np.einsum('bij,nj->bni', rotation_difference,
+                              self.mesh_points)
+        distances = distances + translation_difference[:, np.newaxis, :]
+        return np.linalg.norm(distances, axis=2).mean(axis=1)
+
+    def compute_ADI(self, true_rotations, true_translations,
+                    pred_rotations, pred_translations):
+        """Calculates the ADI errors of a batch of poses.
+
+          # Arguments
+              true_rotations: Array of shape (num_poses, 3, 3).
+              true_translations: Array of shape (num_poses, 3).
+              pred_rotations: Array of shape (num_poses, 3, 3).
+              pred_translations: Array of shape (num_poses, 3).
+
+          # Returns
+              Array of shape (num_poses) with the ADI errors.
+          """
+        # R_p^T (R_t x + t_t - t_p) maps true points into the predicted frame
+        rotations = np.einsum('bki,bkj->bij', pred_rotations, true_rotations)
+        translations = np.einsum('bki,bk->bi', pred_rotations,
+                                 true_translations - pred_translations)
+        query_points = np.einsum('bij,nj->bni', rotations, self.mesh_points)
+        query_points = query_points + translations[:, np.newaxis, :]
+        nn_dists, _ = self.tree.query(query_points.reshape(-1, 3), k=1)
+        return nn_dists.reshape(len(rotations), -1).mean(axis=1)
+
+    def __call__(self, true_poses, pred_poses6D):
+        """Calculates ADD and ADI errors.
+
+          # Arguments
+              true_poses: List of (3, 4) ground-truth transformation matrices.
+              pred_poses6D: List of predicted ``Pose6D`` messages.
+
+          # Returns
+              Arrays of shape (num_poses) with ADD and ADI errors.
+          """
+        true_rotations, true_translations = transform_matrices_to_arrays(
+            true_poses)
+        pred_rotations, pred_translations = poses6D_to_arrays(pred_poses6D)
+        ADD_errors = self.compute_ADD(true_rotations, true_translations,
+                                      pred_rotations, pred_translations)
+        ADI_errors = self.compute_ADI(true_rotations, true_translations,
+                                      pred_rotations, pred_translations)
+        return ADD_errors, ADI_errors
+
+
 class EvaluatePoseError(Callback):
     """Callback for evaluating the pose error on ADD and ADI metric.
 
@@ -95,9 +216,12 @@ class EvaluatePoseError(Callback):
         topic: Key to the ''inferences'' dictionary containing as value the
             drawn inferences.
         verbose: Integer. If is bigger than 1 messages would be displayed.
+        num_mesh_points: Int or ``None``. If given, the mesh is subsampled
+            to this number of points before evaluating the errors.
     """
     def __init__(self, experiment_path, evaluation_data_manager, pipeline,
-                 mesh_points, object_diameter, topic='poses6D', verbose=1):
+                 mesh_points, object_diameter, topic='poses6D', verbose=1,
+                 num_mesh_points=None):
         self.experiment_path = experiment_path
         self.evaluation_data_manager = evaluation_data_manager
         self.images = self._load_test_images()
@@ -107,6 +231,7 @@ class EvaluatePoseError(Callback):
         self.object_diameter = object_diameter
         self.topic = topic
         self.verbose = verbose
+        self.evaluate = MeshPoseEvaluator(mesh_points, num_mesh_points)
 
     def _load_test_images(self):
         evaluation_data = self.evaluation_data_manager.load_data()
@@ -128,27 +253,23 @@ class EvaluatePoseError(Callback):
         return gt_poses
 
     def on_epoch_end(self, epoch, logs=None):
-        sum_ADD = 0.0
-        sum_ADI = 0.0
-        sum_ADD_accuracy = 0.0
-        valid_predictions = 0
+        gt_poses, poses6D = [], []
         for image, gt_pose in zip(self.images, self.gt_poses):
             inferences = self.pipeline(image.copy())
             pose6D = inferences[self.topic]
             if pose6D:
-                add_error = compute_ADD(gt_pose, pose6D[0], self.mesh_points)
-                is_correct = check_ADD(add_error, self.object_diameter)
-                sum_ADD_accuracy = sum_ADD_accuracy + float(is_correct)
-                adi_error = compute_ADI(gt_pose, pose6D[0], self.mesh_points)
-                sum_ADD = sum_ADD + add_error
-                sum_ADI = sum_ADI + adi_error
-                valid_predictions = valid_predictions + 1
+                gt_poses.append(gt_pose)
+                poses6D.append(pose6D[0])
+        valid_predictions = len(poses6D)
 
         error_path = os.path.join(self.experiment_path, 'error.txt')
         if valid_predictions > 0:
-            average_ADD = sum_ADD / valid_predictions
+            ADD_errors, ADI_errors = self.evaluate(gt_poses, poses6D)
+            is_correct = check_ADD(ADD_errors, self.object_diameter)
+            sum_ADD_accuracy = np.count_nonzero(is_correct)
+            average_ADD = np.mean(ADD_errors)
             average_ADD_accuracy = sum_ADD_accuracy / len(self.gt_poses)
-            average_ADI = sum_ADI / valid_predictions
+            average_ADI = np.mean(ADI_errors)
             with open(error_path, 'a') as filer:
                 filer.write('epoch: %d\n' % epoch)
                 filer.write('Estimated ADD error: %f\n' % average_ADD)
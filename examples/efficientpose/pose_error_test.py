@@ -0,0 +1,73 @@
+import pytest
+import numpy as np
+from paz.abstract import Pose6D
+from paz.backend.groups import rotation_vector_to_rotation_matrix
+from paz.backend.groups import rotation_matrix_to_quaternion
+from pose_error import compute_ADD, compute_ADI, MeshPoseEvaluator
+from pose_error import check_ADD
+
+
+@pytest.fixture
+def mesh_points():
+    return np.random.RandomState(777).uniform(-0.05, 0.05, (500, 3))
+
+
+@pytest.fixture
+def poses():
+    random_state = np.random.RandomState(777)
+    true_poses, pred_poses6D = [], []
+    for pose_arg in range(8):
+        rotation_vector = random_state.normal(0, 1.0, 3)
+        rotation = rotation_vector_to_rotation_matrix(rotation_vector)
+        translation = random_state.uniform(-0.1, 0.1, 3) + [0, 0, 1]
+        true_poses.append(np.concatenate(
+            [rotation, translation[:, np.newaxis]], axis=1))
+        noisy_vector = rotation_vector + random_state.normal(0, 0.1, 3)
+        noisy_rotation = rotation_vector_to_rotation_matrix(noisy_vector)
+        quaternion = rotation_matrix_to_quaternion(noisy_rotation)
+        noisy_translation = translation + random_state.normal(0, 0.01, 3)
+        pred_poses6D.append(Pose6D(quaternion, noisy_translation))
+    return true_poses, pred_poses6D
+
+
+def test_batched_ADD(mesh_points, poses):
+    true_poses, pred_poses6D = poses
+    evaluate = MeshPoseEvaluator(mesh_points)
+    ADD_errors, _ = evaluate(true_poses, pred_poses6D)
+    for true_pose, pred_pose6D, ADD_error in zip(
+            true_poses, pred_poses6D, ADD_errors):
+        assert np.isclose(ADD_error,
+                          compute_ADD(true_pose, pred_pose6D, mesh_points))
+
+
+def test_batched_ADI(mesh_points, poses):
+    true_poses, pred_poses6D = poses
+    evaluate = MeshPoseEvaluator(mesh_points)
+    _, ADI_errors = evaluate(true_poses, pred_poses6D)
+    for true_pose, pred_pose6D, ADI_error in zip(
+            true_poses, pred_poses6D, ADI_errors):
+        assert np.isclose(ADI_error,
+                          compute_ADI(true_pose, pred_pose6D, mesh_points))
+
+
+def test_ADI_smaller_than_ADD(mesh_points, poses):
+    evaluate = MeshPoseEvaluator(mesh_points)
+    ADD_errors, ADI_errors = evaluate(*poses)
+    assert np.all(ADI_errors <= ADD_errors)
+
+
+def test_mesh_subsampling(mesh_points):
+    evaluate = MeshPoseEvaluator(mesh_points, num_points=100)
+    assert evaluate.mesh_points.shape == (100, 3)
+    assert evaluate.tree.n == 100
+    evaluate = MeshPoseEvaluator(mesh_points, num_points=1000)
+    assert evaluate.mesh_points.shape == (500, 3)
+
+
+def test_batched_check_ADD(mesh_points, poses):
+    ADD_errors, _ = MeshPoseEvaluator(mesh_points)(*poses)
+    diameter = 10 * np.median(ADD_errors)
+    is_correct = check_ADD(ADD_errors, diameter)
+    assert 0 < np.count_nonzero(is_correct) < len(ADD_errors)
+    for ADD_error, is_correct_pose in zip(ADD_errors, is_correct):
+        assert check_ADD(float(ADD_error), diameter) == is_correct_pose
@@ -2,9 +2,9 @@ import os
 import argparse
 import numpy as np
 import processors as pe
-from paz import processors as pr
 from paz.backend.image import load_image
 from pipelines import CalculateFaceWeights
+from face_index import FaceIndex
 
 
 class Database():
@@ -16,7 +16,6 @@ class Database():
 
     # Methods
         load_data()
-        update_dictionary()
         add_to_database()
     """
 
@@ -24,7 +23,6 @@ class Database():
         self.path = path
         self.label = label
         self.crop = pe.CropFrontalFace()
-        self.expand_dimension = pr.ExpandDims(-1)
         self.project = CalculateFaceWeights(eigenfaces, mean_face,
                                             with_crop=False)
         super(Database, self).__init__()
@@ -39,24 +37,26 @@ class Database():
             data.append(sample)
         return data
 
-    def update_dictionary(self, dictionary, key, values):
-        if key not in dictionary:
-            dictionary[key] = values
-        else:
-            dictionary[key] = np.hstack((dictionary[key], values))
-        return dictionary
+    def add_to_database(self, database=None, metric='cosine'):
+        """Appends the weights of all images to a ``FaceIndex``.
 
-    def add_to_database(self, database=None, is_new_database=False):
+        # Arguments
+            database: ``FaceIndex`` or ``None``. If ``None`` a new index is
+                created.
+            metric: String. Metric of a newly created index.
+
+        # Returns
+            ``FaceIndex`` containing the weights of all loaded images or
+                ``database`` if no image was found.
+        """
         data = self.load_data(self.path, self.label)
-        for sample in data:
-            image, label = sample['image'], sample['label']
-            weight = self.project(image)
-            weight = self.expand_dimension(weight)
-            if is_new_database:
-                database = {label: weight}
-                is_new_database = False
-            else:
-                database = self.update_dictionary(database, label, weight)
+        if len(data) == 0:
+            return database
+        weights = [self.project(sample['image']) for sample in data]
+        weights = np.array(weights, dtype=np.float32)
+        if database is None:
+            database = FaceIndex(weights.shape[1], metric)
+        database.add(weights, self.label)
         return database
 
 
@@ -69,10 +69,15 @@ if __name__ == "__main__":
     parser.add_argument('-d', '--database_path', type=str,
                         default='database',
                         help='Directory for the database')
+    parser.add_argument('-m', '--metric', type=str, default='cosine',
+                        choices=['euclidean', 'cosine'],
+                        help='Metric used for querying the database')
+    parser.add_argument('-l', '--num_lists', type=int, default=0,
+                        help='Number of coarse lists for approximate search')
     args = parser.parse_args()
 
     image_path = os.path.join(args.database_path, 'images')
-    database_path = os.path.join(args.database_path, 'database.npy')
+    database_path = os.path.join(args.database_path, 'index')
 
     if not os.path.exists(image_path):
         os.makedirs(image_path)
@@ -90,17 +95,15 @@ if __name__ == "__main__":
         raise FileNotFoundError('''No image available to create database.
         To add images follow the directory structure provided in README.md''')
 
-    database_files = 'database.npy'
-
-    write_to_file = True
+    weights_database = None
     for label in labels:
         data_path = os.path.join(args.database_path, 'images', label)
         update_database = Database(data_path, label, eigenfaces, mean_face)
-        if database_files not in os.listdir(args.database_path):
-            weights_database = update_database.add_to_database(
-                is_new_database=True)
-        else:
-            database = np.load(database_path, allow_pickle=True).item()
-            weights_database = update_database.add_to_database(database)
-        if write_to_file:
-            np.save(database_path, weights_database)
+        weights_database = update_database.add_to_database(
+            weights_database, args.metric)
+    if weights_database is None:
+        raise FileNotFoundError('''No image available to create database.
+        To add images follow the directory structure provided in README.md''')
+    if args.num_lists > 0:
+        weights_database.train_coarse_quantizer(args.num_lists)
+    weights_database.save(database_path)
@@ -5,6 +5,7 @@ import processors as pe
 from paz.backend.camera import VideoPlayer
 from paz.backend.camera import Camera
 from pipelines import DetectEigenFaces
+from face_index import FaceIndex
 
 
 if __name__ == "__main__":
@@ -19,6 +20,10 @@ if __name__ == "__main__":
     parser.add_argument('-d', '--database_path', type=str,
                         default='database',
                         help='Directory for the database')
+    parser.add_argument('-t', '--thresh', type=float, default=1e4,
+                        help='Maximum distance for accepting a face')
+    parser.add_argument('-p', '--num_probes', type=int, default=None,
+                        help='Number of coarse lists visited per query')
     args = parser.parse_args()
 
     if not os.path.exists(args.experiments_path):
@@ -33,9 +38,10 @@ if __name__ == "__main__":
                                 run eigenface.py first and then try running the
                                 demo.''')
 
-    #  check if database is available
-    needed_files = ['images', 'database.npy']
-    if set(os.listdir(args.database_path)) != set(needed_files):
+    #  check if database is available, ``database.npy`` is the legacy format
+    index_path = os.path.join(args.database_path, 'index')
+    legacy_path = os.path.join(args.database_path, 'database.npy')
+    if not (os.path.exists(index_path) or os.path.exists(legacy_path)):
         raise FileNotFoundError('''Need database to run the demo. Please
                                 update the database with database.py first
                                 and then try running the demo.''')
@@ -43,17 +49,17 @@ if __name__ == "__main__":
     eigenfaces = np.load(os.path.join(args.experiments_path, 'eigenfaces.npy'))
     mean_face = np.load(os.path.join(args.experiments_path, 'mean_face.npy'))
 
-    database_path = os.path.join(args.database_path, 'database.npy')
-    weights = np.load(database_path, allow_pickle=True).item()
+    if os.path.exists(index_path):
+        weights = FaceIndex.load(index_path)
+        measure = weights.metric
+    else:
+        weights = np.load(legacy_path, allow_pickle=True).item()
+        # measure = pe.CalculateNorm(2)
+        measure = pe.CalculateCosineSimilarity()
 
-    # user defined parameters
-    thresh = 1e4
-    norm_order = 2
-    # measure = pe.CalculateNorm(norm_order)
-    measure = pe.CalculateCosineSimilarity()
-
-    pipeline = DetectEigenFaces(weights, measure, thresh, eigenfaces,
-                                mean_face, [args.offset, args.offset])
+    pipeline = DetectEigenFaces(weights, measure, args.thresh, eigenfaces,
+                                mean_face, [args.offset, args.offset],
+                                args.num_probes)
     camera = Camera(args.camera_id)
     player = VideoPlayer((640, 480), pipeline, camera)
     player.run()
@@ -0,0 +1,279 @@
+import os
+import json
+import numpy as np
+
+
+class FaceIndex(object):
+    """Nearest neighbour index of face weights.
+
+    All weights are stored in a single contiguous float32 matrix together
+    with an integer array of label ids. The matrix capacity is doubled
+    whenever it is full, so appending faces is amortized O(1).
+    Optionally, an IVF-style coarse quantizer restricts queries to the
+    faces assigned to the closest centroids.
+
+    # Arguments
+        dimension: Int. Length of the face weight vectors.
+        metric: String. Either ``euclidean`` or ``cosine``.
+        capacity: Int. Initial number of rows allocated.
+
+    # Properties
+        weights: Array of shape (num_faces, dimension).
+        label_ids: Array of shape (num_faces).
+        labels: List of label names indexed by label id.
+
+    # Methods
+        add()
+        search()
+        query()
+        train_coarse_quantizer()
+        save()
+        load()
+        from_dictionary()
+    """
+    def __init__(self, dimension, metric='cosine', capacity=1024):
+        if metric not in ['euclidean', 'cosine']:
+            raise ValueError('Invalid metric', metric)
+        self.dimension = dimension
+        self.metric = metric
+        self.labels = []
+        self._weights = np.zeros((capacity, dimension), dtype=np.float32)
+        self._label_ids = np.zeros(capacity, dtype=np.int32)
+        self._num_faces = 0
+        self._squared_norms = None
+        self.centroids = None
+        self._list_ids = None
+        self._lists = None
+
+    def __len__(self):
+        return self._num_faces
+
+    @property
+    def weights(self):
+        return self._weights[:self._num_faces]
+
+    @property
+    def label_ids(self):
+        return self._label_ids[:self._num_faces]
+
+    def _to_label_id(self, label):
+        if label not in self.labels:
+            self.labels.append(label)
+        return self.labels.index(label)
+
+    def _reserve(self, num_faces):
+        capacity = len(self._weights)
+        if num_faces <= capacity and self._weights.flags.writeable:
+            return
+        capacity = max(2 * capacity, num_faces, 1)
+        weights = np.zeros((capacity, self.dimension), dtype=np.float32)
+        label_ids = np.zeros(capacity, dtype=np.int32)
+        weights[:self._num_faces] = self.weights
+        label_ids[:self._num_faces] = self.label_ids
+        self._weights, self._label_ids = weights, label_ids
+        if self._list_ids is not None:
+            list_ids = np.zeros(capacity, dtype=np.int32)
+            list_ids[:self._num_faces] = self._list_ids[:self._num_faces]
+            self._list_ids = list_ids
+
+    def _prepare(self, weights):
+        weights = np.asarray(weights, dtype=np.float32)
+        weights = weights.reshape(-1, self.dimension)
+        if self.metric == 'cosine':
+            norms = np.linalg.norm(weights, axis=1, keepdims=True)
+            weights = weights / np.maximum(norms, 1e-12)
+        return weights
+
+    def add(self, weights, label):
+        """Appends face weights of a single label.
+
+        # Arguments
+            weights: Array of shape (dimension) or (num_faces, dimension).
+            label: String. Label name of all given faces.
+        """
+        weights = self._prepare(weights)
+        start, stop = self._num_faces, self._num_faces + len(weights)
+        self._reserve(stop)
+        self._weights[start:stop] = weights
+        self._label_ids[start:stop] = self._to_label_id(label)
+        if self.centroids is not None:
+            self._list_ids[start:stop] = self._assign(weights)
+        self._num_faces = stop
+        self._squared_norms = None
+        self._lists = None
+
+    def _pairwise_distances(self, queries, weights, squared_norms):
+        products = np.matmul(queries, weights.T)
+        if self.metric == 'cosine':
+            return 1.0 - products
+        query_norms = np.sum(queries ** 2, axis=1, keepdims=True)
+        distances = query_norms + squared_norms[np.newaxis] - 2 * products
+        return np.sqrt(np.maximum(distances, 0.0))
+
+    def _assign(self, weights):
+        squared_norms = np.sum(self.centroids ** 2, axis=1)
+        distances = self._pairwise_distances(
+            weights, self.centroids, squared_norms)
+        return np.argmin(distances, axis=1).astype(np.int32)
+
+    def train_coarse_quantizer(self, num_lists, num_iterations=10, seed=777):
+        """Clusters the stored faces with k-means to build inverted lists.
+
+        # Arguments
+            num_lists: Int. Number of coarse centroids.
+            num_iterations: Int. Number of Lloyd iterations.
+            seed: Int. Seed used for initializing the centroids.
+        """
+        if len(self) == 0:
+            raise ValueError('Coarse quantizer requires at least one face')
+        num_lists = min(num_lists, len(self))
+        random_state = np.random.RandomState(seed)
+        args = random_state.choice(len(self), num_lists, replace=False)
+        self.centroids = self.weights[args].copy()
+        for iteration_arg in range(num_iterations):
+            assignments = self._assign(self.weights)
+            for list_arg in range(num_lists):
+                members = self.weights[assignments == list_arg]
+                if len(members) > 0:
+                    self.centroids[list_arg] = np.mean(members, axis=0)
+            if self.metric == 'cosine':
+                self.centroids = self._prepare(self.centroids)
+        self._list_ids = np.zeros(len(self._weights), dtype=np.int32)
+        self._list_ids[:len(self)] = self._assign(self.weights)
+        self._lists = None
+
+    def _build_lists(self):
+        """Returns the row indices of the faces of every inverted list."""
+        list_ids = self._list_ids[:len(self)]
+        args = np.argsort(list_ids, kind='stable')
+        list_sizes = np.bincount(list_ids, minlength=len(self.centroids))
+        return np.split(args, np.cumsum(list_sizes)[:-1])
+
+    def search(self, queries, k=1, num_probes=None):
+        """Finds the k nearest faces of every query.
+
+        # Arguments
+            queries: Array of shape (dimension) or (num_queries, dimension).
+            k: Int. Number of neighbours returned per query.
+            num_probes: Int or ``None``. Number of inverted lists visited per
+                query. If ``None`` or no quantizer was trained the search is
+                exhaustive.
+
+        # Returns
+            distances: Array of shape (num_queries, k).
+            indices: Array of shape (num_queries, k) with row indices of the
+                neighbours or -1 if less than k faces were visited.
+        """
+        queries = self._prepare(queries)
+        if self._squared_norms is None:
+            self._squared_norms = np.sum(self.weights ** 2, axis=1)
+        if (num_probes is None) or (self.centroids is None):
+            distances = self._pairwise_distances(
+                queries, self.weights, self._squared_norms)
+            return self._top_k(distances, np.arange(len(self)), k)
+
+        squared_norms = np.sum(self.centroids ** 2, axis=1)
+        centroid_distances = self._pairwise_distances(
+            queries, self.centroids, squared_norms)
+        num_probes = min(num_probes, len(self.centroids))
+        probes = np.argsort(centroid_distances, axis=1)[:, :num_probes]
+        if self._lists is None:
+            self._lists = self._build_lists()
+        all_distances = np.full((len(queries), k), np.inf, dtype=np.float32)
+        all_indices = np.full((len(queries), k), -1, dtype=np.int64)
+        for query_arg, query_probes in enumerate(probes):
+            candidates = np.concatenate(
+                [self._lists[probe] for probe in query_probes])
+            if len(candidates) == 0:
+                continue
+            distances = self._pairwise_distances(
+                queries[query_arg:query_arg + 1], self.weights[candidates],
+                self._squared_norms[candidates])
+            distances, indices = self._top_k(distances, candidates, k)
+            all_distances[query_arg] = distances[0]
+            all_indices[query_arg] = indices[0]
+        return all_distances, all_indices
+
+    def _top_k(self, distances, candidates, k):
+        num_queries, num_candidates = distances.shape
+        top_k = min(k, num_candidates)
+        args = np.argpartition(distances, top_k - 1, axis=1)[:, :top_k]
+        top_distances = np.take_along_axis(distances, args, axis=1)
+        order = np.argsort(top_distances, axis=1)
+        args = np.take_along_axis(args, order, axis=1)
+        top_distances = np.take_along_axis(top_distances, order, axis=1)
+        padded_distances = np.full((num_queries, k), np.inf, np.float32)
+        padded_indices = np.full((num_queries, k), -1, np.int64)
+        padded_distances[:, :top_k] = top_distances
+        padded_indices[:, :top_k] = candidates[args]
+        return padded_distances, padded_indices
+
+    def query(self, queries, thresh, num_probes=None):
+        """Returns the label of the nearest face or ``None`` if its distance
+        is larger than ``thresh``.
+
+        # Arguments
+            queries: Array of shape (dimension) or (num_queries, dimension).
+            thresh: Float. Maximum accepted distance.
+            num_probes: Int or ``None``. See ``search``.
+
+        # Returns
+            List of label names or ``None`` values.
+        """
+        distances, indices = self.search(queries, 1, num_probes)
+        labels = []
+        for distance, index in zip(distances[:, 0], indices[:, 0]):
+            if (index < 0) or (distance > thresh):
+                labels.append(None)
+            else:
+                labels.append(self.labels[self._label_ids[index]])
+        return labels
+
+    def save(self, path):
+        """Writes the index as memory-mappable ``.npy`` files into ``path``.
+        """
+        if not os.path.exists(path):
+            os.makedirs(path)
+        weights_path = os.path.join(path, 'weights.npy')
+        weights = np.lib.format.open_memmap(
+            weights_path, 'w+', np.float32, self.weights.shape)
+        weights[:] = self.weights
+        weights.flush()
+        np.save(os.path.join(path, 'label_ids.npy'), self.label_ids)
+        if self.centroids is not None:
+            np.save(os.path.join(path, 'centroids.npy'), self.centroids)
+            np.save(os.path.join(path, 'list_ids.npy'),
+                    self._list_ids[:len(self)])
+        metadata = {'metric': self.metric, 'labels': self.labels}
+        with open(os.path.join(path, 'labels.json'), 'w') as filer:
+            json.dump(metadata, filer)
+
+    @classmethod
+    def load(cls, path, mmap_mode='r'):
+        """Loads an index written by ``save`` memory-mapping its weights.
+        """
+        with open(os.path.join(path, 'labels.json'), 'r') as filer:
+            metadata = json.load(filer)
+        weights = np.load(os.path.join(path, 'weights.npy'), mmap_mode)
+        index = cls(weights.shape[1], metadata['metric'], capacity=0)
+        index.labels = metadata['labels']
+        index._weights = weights
+        index._label_ids = np.load(os.path.join(path, 'label_ids.npy'))
+        index._num_faces = len(weights)
+        centroids_path = os.path.join(path, 'centroids.npy')
+        if os.path.exists(centroids_path):
+            index.centroids = np.load(centroids_path)
+            index._list_ids = np.load(os.path.join(path, 'list_ids.npy'))
+        return index
+
+    @classmethod
+    def from_dictionary(cls, dictionary, metric='cosine'):
+        """Builds an index from a dictionary mapping labels to weights of
+        shape (dimension, num_faces) as written by previous databases.
+        """
+        labels = list(dictionary.keys())
+        dimension = np.asarray(dictionary[labels[0]]).shape[0]
+        index = cls(dimension, metric)
+        for label in labels:
+            index.add(np.asarray(dictionary[label]).T, label)
+        return index
@@ -0,0 +1,156 @@
+import os
+
+import pytest
+import numpy as np
+
+import processors as pe
+from face_index import FaceIndex
+from pipelines import to_metric, to_face_index
+
+
+def brute_force_search(index, queries, metric):
+    weights = index.weights.astype(np.float64)
+    queries = np.asarray(queries, dtype=np.float64)
+    if metric == 'cosine':
+        weights = weights / np.linalg.norm(weights, axis=1, keepdims=True)
+        queries = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+        return 1.0 - np.matmul(queries, weights.T)
+    differences = queries[:, np.newaxis] - weights[np.newaxis]
+    return np.linalg.norm(differences, axis=-1)
+
+
+@pytest.fixture
+def clusters():
+    random_state = np.random.RandomState(777)
+    centers = random_state.normal(0, 10.0, (8, 16))
+    labels = random_state.randint(0, 8, 400)
+    weights = centers[labels] + random_state.normal(0, 1.0, (400, 16))
+    return weights.astype(np.float32), labels
+
+
+@pytest.fixture
+def index(clusters):
+    weights, labels = clusters
+    index = FaceIndex(16, 'euclidean', capacity=4)
+    for label in range(8):
+        index.add(weights[labels == label], 'person_%d' % label)
+    return index
+
+
+def test_add_grows_capacity():
+    index = FaceIndex(3, 'euclidean', capacity=2)
+    weights = np.arange(15, dtype=np.float32).reshape(5, 3)
+    index.add(weights[0], 'A')
+    index.add(weights[1:3], 'B')
+    assert len(index._weights) == 4
+    index.add(weights[3:], 'A')
+    assert len(index) == 5
+    assert len(index._weights) >= 5
+    assert np.array_equal(index.weights, weights)
+    assert np.array_equal(index.label_ids, [0, 1, 1, 0, 0])
+    assert index.labels == ['A', 'B']
+
+
+@pytest.mark.parametrize('metric', ['euclidean', 'cosine'])
+def test_exact_search_matches_brute_force(clusters, metric):
+    weights, labels = clusters
+    index = FaceIndex(16, metric)
+    index.add(weights, 'face')
+    queries = weights[:20] + 0.1
+    distances, indices = index.search(queries, k=5)
+    true_distances = brute_force_search(index, queries, metric)
+    true_indices = np.argsort(true_distances, axis=1)[:, :5]
+    assert np.array_equal(indices, true_indices)
+    assert np.allclose(distances, np.sort(true_distances, axis=1)[:, :5],
+                       atol=1e-3)
+
+
+def test_approximate_search_agrees_with_exact(index, clusters):
+    weights, labels = clusters
+    queries = weights[::10] + 0.1
+    exact_distances, exact_indices = index.search(queries, k=3)
+    index.train_coarse_quantizer(8)
+    distances, indices = index.search(queries, k=3, num_probes=8)
+    assert np.array_equal(indices, exact_indices)
+    distances, indices = index.search(queries, k=1, num_probes=2)
+    recall = np.mean(indices[:, 0] == exact_indices[:, 0])
+    assert recall >= 0.9
+
+
+def test_coarse_quantizer_of_empty_index_raises():
+    index = FaceIndex(3, 'euclidean')
+    with pytest.raises(ValueError):
+        index.train_coarse_quantizer(4)
+
+
+def test_search_pads_missing_neighbours():
+    index = FaceIndex(2, 'euclidean')
+    index.add(np.array([[0.0, 0.0], [1.0, 1.0]]), 'A')
+    distances, indices = index.search(np.array([0.1, 0.1]), k=3)
+    assert np.array_equal(indices, [[0, 1, -1]])
+    assert np.isinf(distances[0, 2])
+
+
+def test_query_returns_labels(index, clusters):
+    weights, labels = clusters
+    predicted = index.query(weights[:30], thresh=1e4)
+    assert predicted == ['person_%d' % label for label in labels[:30]]
+    far_away = np.full((1, 16), 1e3, dtype=np.float32)
+    assert index.query(far_away, thresh=10.0) == [None]
+
+
+def test_save_and_load_round_trip(tmp_path, index, clusters):
+    weights, labels = clusters
+    index.train_coarse_quantizer(4)
+    path = os.path.join(str(tmp_path), 'index')
+    index.save(path)
+    loaded_index = FaceIndex.load(path)
+    assert isinstance(loaded_index.weights, np.memmap)
+    assert loaded_index.metric == 'euclidean'
+    assert loaded_index.labels == index.labels
+    assert np.array_equal(loaded_index.weights, index.weights)
+    assert np.array_equal(loaded_index.label_ids, index.label_ids)
+    queries = weights[:10]
+    for num_probes in [None, 2]:
+        assert np.array_equal(loaded_index.search(queries, 3, num_probes)[1],
+                              index.search(queries, 3, num_probes)[1])
+    new_weights = weights[:2] + 100.0
+    loaded_index.add(new_weights, 'new_person')
+    assert len(loaded_index) == len(index) + 2
+    assert loaded_index.query(new_weights[:1], 1e-3) == ['new_person']
+
+
+def test_from_dictionary_of_legacy_database():
+    random_state = np.random.RandomState(777)
+    dictionary = {'A': random_state.normal(0, 1, (6, 3)),
+                  'B': random_state.normal(0, 1, (6, 2))}
+    index = FaceIndex.from_dictionary(dictionary)
+    assert index.metric == 'cosine'
+    assert index.labels == ['A', 'B']
+    assert index.query(dictionary['B'].T, 1e-3) == ['B', 'B']
+
+
+def test_measures_map_to_index_metrics():
+    assert to_metric(pe.CalculateCosineSimilarity()) == 'cosine'
+    assert to_metric(pe.CalculateNorm(2)) == 'euclidean'
+    assert to_metric('euclidean') == 'euclidean'
+    with pytest.raises(ValueError):
+        to_metric(pe.CalculateNorm(1))
+    index = FaceIndex(3, 'euclidean')
+    with pytest.raises(ValueError):
+        to_face_index(index, pe.CalculateCosineSimilarity())
+
+
+def test_inverted_lists_are_updated_by_add(index, clusters):
+    weights, labels = clusters
+    index.train_coarse_quantizer(8)
+    index.search(weights[:1], k=1, num_probes=1)
+    lists = index._lists
+    assert np.array_equal(np.sort(np.concatenate(lists)), np.arange(400))
+    for list_arg, members in enumerate(lists):
+        assert np.all(index._list_ids[members] == list_arg)
+    new_weights = weights[:3] + 0.01
+    index.add(new_weights, 'new_person')
+    distances, indices = index.search(new_weights, k=1, num_probes=1)
+    assert np.array_equal(indices[:, 0], [400, 401, 402])
+    assert sum(len(members) for members in index._lists) == 403
@@ -1,18 +1,50 @@
-import numpy as np
 import processors as pe
 from paz import processors as pr
 from paz.backend.image import lincolor
 from paz.pipelines import HaarCascadeFrontalFace
 from paz.abstract import SequentialProcessor, Processor
-from processors import MeasureSimilarity
+from face_index import FaceIndex
+
+
+def to_metric(measure):
+    """Returns the ``FaceIndex`` metric of a similarity measure.
+
+    # Arguments
+        measure: String ``euclidean`` or ``cosine``, ``CalculateNorm`` of
+            order two or ``CalculateCosineSimilarity``.
+
+    # Returns
+        String. ``FaceIndex`` metric.
+    """
+    if isinstance(measure, pe.CalculateCosineSimilarity):
+        return 'cosine'
+    if isinstance(measure, pe.CalculateNorm) and measure.order in [2, None]:
+        return 'euclidean'
+    if isinstance(measure, str) and measure in ['euclidean', 'cosine']:
+        return measure
+    raise ValueError('Invalid measure', measure)
+
+
+def to_face_index(weights, measure):
+    """Builds a ``FaceIndex`` from a dictionary of weights as written by
+    previous databases or checks the metric of an existing index.
+    """
+    metric = to_metric(measure)
+    if isinstance(weights, dict):
+        return FaceIndex.from_dictionary(weights, metric)
+    if weights.metric != metric:
+        raise ValueError('Database metric differs from measure',
+                         weights.metric, metric)
+    return weights
 
 
 class DetectEigenFaces(Processor):
     def __init__(self, weights, measure, thresh, eigenfaces,
-                 mean_face, offsets=[0, 0]):
+                 mean_face, offsets=[0, 0], num_probes=None):
         super(DetectEigenFaces, self).__init__()
         self.offsets = offsets
-        self.class_names = list(weights.keys()) + ['Face not found']
+        weights = to_face_index(weights, measure)
+        self.class_names = list(weights.labels) + ['Face not found']
         self.colors = lincolor(len(self.class_names))
         self.croped_images = None
         # detection
@@ -23,7 +55,8 @@ class DetectEigenFaces(Processor):
         self.clip = pr.ClipBoxes2D()
         self.crop = pr.CropBoxes2D()
         self.face_detector = EigenFaceDetector(weights, measure, thresh,
-                                               eigenfaces, mean_face)
+                                               eigenfaces, mean_face,
+                                               num_probes)
         # drawing and wrapping
         self.draw = pr.DrawBoxes2D(self.class_names, self.colors,
                                    weighted=True, with_score=False)
@@ -34,53 +67,63 @@ class DetectEigenFaces(Processor):
         boxes2D = self.square(boxes2D)
         boxes2D = self.clip(image, boxes2D)
         self.cropped_images = self.crop(image, boxes2D)
-        for cropped_image, box2D in zip(self.cropped_images, boxes2D):
-            box2D.class_name = self.face_detector(cropped_image)
+        class_names = self.face_detector(self.cropped_images)
+        for class_name, box2D in zip(class_names, boxes2D):
+            box2D.class_name = class_name
         image = self.draw(image, boxes2D)
         return self.wrap(image, boxes2D)
 
 
 class EigenFaceDetector(Processor):
+    """Identifies faces by querying their weights in a ``FaceIndex``.
+
+    # Arguments
+        weights_data_base: ``FaceIndex`` or dictionary mapping labels to
+            weights of shape (num_weights, num_faces).
+        measure: Similarity measure, see ``to_metric``.
+        thresh: Float. Maximum distance for accepting a face.
+        eigenfaces: Array of shape (num_weights, num_pixels).
+        mean_face: Array containing the mean face.
+        num_probes: Int or ``None``. Number of inverted lists visited by an
+            approximate search. If ``None`` the search is exhaustive.
+    """
     def __init__(self, weights_data_base, measure, thresh,
-                 eigenfaces, mean_face):
-        self.weights_data_base = weights_data_base
+                 eigenfaces, mean_face, num_probes=None):
+        self.weights_data_base = to_face_index(weights_data_base, measure)
         self.calculate_weights = CalculateFaceWeights(eigenfaces, mean_face,
                                                       with_crop=False)
-        self.query = QueryFace(measure, thresh)
+        self.query = QueryFace(measure, thresh, num_probes)
         super(EigenFaceDetector, self).__init__()
 
-    def call(self, image):
-        test_weight = self.calculate_weights(image)
-        similar_face = self.query(test_weight, self.weights_data_base)
-        return similar_face
+    def call(self, images):
+        if len(images) == 0:
+            return []
+        test_weights = [self.calculate_weights(image) for image in images]
+        return self.query(test_weights, self.weights_data_base)
 
 
 class QueryFace(Processor):
-    """Identify the most similar face in the database
+    """Identify the most similar faces in the database
 
     # Properties
-        measure: Similarity measurement metric
-        thresh: Float. Threshold for the similarity between two images
+        measure: Similarity measure, see ``to_metric``.
+        thresh: Float. Maximum distance between two faces
+        num_probes: Int or ``None``. Number of inverted lists visited by an
+            approximate search.
     """
 
-    def __init__(self, measure, thresh):
+    def __init__(self, measure, thresh, num_probes=None):
+        self.metric = to_metric(measure)
         self.thresh = thresh
-        self.measure_distance = MeasureSimilarity(measure)
-        super(QueryFace).__init__()
-
-    def call(self, test_face_weight, database):
-        self.database = database
-        weights_difference = []
-        for sample in database:
-            weight = database[sample].T
-            weight_norm = self.measure_distance(weight, test_face_weight)
-            weights_difference.append(np.min(weight_norm))
-
-        if np.min(weights_difference) > self.thresh:
-            return 'Face not found'
-        else:
-            most_similar_face_arg = np.argmin(weights_difference)
-        return list(database.keys())[most_similar_face_arg]
+        self.num_probes = num_probes
+        super(QueryFace, self).__init__()
+
+    def call(self, test_face_weights, database):
+        database = to_face_index(database, self.metric)
+        labels = database.query(test_face_weights, self.thresh,
+                                self.num_probes)
+        return ['Face not found' if label is None else label
+                for label in labels]
 
 
 class CalculateEigenFaces(pr.SequentialProcessor):
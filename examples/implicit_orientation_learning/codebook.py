@@ -0,0 +1,157 @@
+import os
+import numpy as np
+from paz.backend.image import resize_image, convert_color_space, RGB2BGR
+
+
+def normalize_vectors(vectors):
+    """Scales vectors to unit L2 norm.
+
+    # Arguments
+        vectors: Array of shape (num_vectors, dimension).
+
+    # Returns
+        Float32 array of shape (num_vectors, dimension).
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def preprocess_images(images, shape):
+    """Converts RGB images into a normalized BGR batch for the encoder.
+
+    # Arguments
+        images: List of uint8 RGB images.
+        shape: List of two integers [H, W] of the encoder input.
+
+    # Returns
+        Float32 array of shape (num_images, H, W, 3).
+    """
+    batch = np.zeros((len(images), *shape, 3), dtype=np.float32)
+    for image_arg, image in enumerate(images):
+        image = convert_color_space(image, RGB2BGR)
+        batch[image_arg] = resize_image(image, tuple(shape[::-1]))
+    return batch / 255.0
+
+
+def encode_images(encoder, images, batch_size=64):
+    """Encodes images into latent vectors in batches.
+
+    # Arguments
+        encoder: Keras model mapping images to latent vectors.
+        images: List of uint8 RGB images.
+        batch_size: Int. Number of images encoded per forward pass.
+
+    # Returns
+        Float32 array of shape (num_images, latent_dimension).
+    """
+    shape = encoder.input_shape[1:3]
+    latent_dimension = encoder.output_shape[-1]
+    latent_vectors = np.zeros((len(images), latent_dimension), np.float32)
+    for start in range(0, len(images), batch_size):
+        batch = preprocess_images(images[start:start + batch_size], shape)
+        latent_vectors[start:start + len(batch)] = encoder.predict_on_batch(
+            batch)
+    return latent_vectors
+
+
+class Codebook(object):
+    """Codebook of L2-normalized latent vectors of rendered views.
+
+    # Arguments
+        latent_vectors: Array of shape (num_views, latent_dimension).
+        rotations: Array of shape (num_views, 3, 3) with the world to camera
+            rotation of every view.
+        images: Array of shape (num_views, H, W, 3) with the rendered views
+            or ``None``.
+
+    # Methods
+        search()
+        save()
+        load()
+        build()
+    """
+    def __init__(self, latent_vectors, rotations, images=None):
+        self.latent_vectors = normalize_vectors(latent_vectors)
+        self.rotations = np.asarray(rotations, dtype=np.float32)
+        self.images = images
+
+    def __len__(self):
+        return len(self.latent_vectors)
+
+    def search(self, latent_vectors, k=1):
+        """Finds the k most similar views of every latent vector.
+
+        # Arguments
+            latent_vectors: Array of shape (latent_dimension) or
+                (num_queries, latent_dimension).
+            k: Int. Number of views returned per query.
+
+        # Returns
+            similarities: Array of shape (num_queries, k) with the cosine
+                similarities in descending order.
+            indices: Array of shape (num_queries, k) with the view indices.
+        """
+        queries = normalize_vectors(latent_vectors).reshape(
+            -1, self.latent_vectors.shape[1])
+        similarities = np.matmul(queries, self.latent_vectors.T)
+        k = min(k, len(self))
+        indices = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+        top_similarities = np.take_along_axis(similarities, indices, axis=1)
+        order = np.argsort(-top_similarities, axis=1)
+        indices = np.take_along_axis(indices, order, axis=1)
+        similarities = np.take_along_axis(top_similarities, order, axis=1)
+        return similarities, indices
+
+    def save(self, path):
+        """Writes the codebook as memory-mappable ``.npy`` files into ``path``.
+        """
+        if not os.path.exists(path):
+            os.makedirs(path)
+        arrays = {'latent_vectors': self.latent_vectors,
+                  'rotations': self.rotations}
+        if self.images is not None:
+            arrays['images'] = np.asarray(self.images)
+        for name, array in arrays.items():
+            filepath = os.path.join(path, name + '.npy')
+            memmap = np.lib.format.open_memmap(
+                filepath, 'w+', array.dtype, array.shape)
+            memmap[:] = array
+            memmap.flush()
+
+    @classmethod
+    def load(cls, path, mmap_mode='r'):
+        """Loads a codebook written by ``save`` memory-mapping its arrays.
+        """
+        latent_vectors = np.load(
+            os.path.join(path, 'latent_vectors.npy'), mmap_mode)
+        rotations = np.load(os.path.join(path, 'rotations.npy'), mmap_mode)
+        images_path = os.path.join(path, 'images.npy')
+        images = None
+        if os.path.exists(images_path):
+            images = np.load(images_path, mmap_mode)
+        codebook = cls.__new__(cls)
+        codebook.latent_vectors = latent_vectors
+        codebook.rotations = rotations
+        codebook.images = images
+        return codebook
+
+    @classmethod
+    def build(cls, encoder, renderer, batch_size=64):
+        """Renders all views of ``renderer`` and encodes them in batches.
+
+        # Arguments
+            encoder: Keras model mapping images to latent vectors.
+            renderer: Class with a ``render`` method returning a list of
+                dictionaries with keys ``image`` and ``matrices``.
+            batch_size: Int. Number of views encoded per forward pass.
+
+        # Returns
+            ``Codebook`` instance.
+        """
+        data = renderer.render()
+        images = np.array([sample['image'] for sample in data])
+        matrices = np.array([sample['matrices'] for sample in data])
+        world_to_camera = matrices[:, 0].reshape(-1, 4, 4)
+        latent_vectors = encode_images(encoder, images, batch_size)
+        return cls(latent_vectors, world_to_camera[:, :3, :3], images)
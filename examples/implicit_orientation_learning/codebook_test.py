@@ -0,0 +1,107 @@
+import os
+
+import pytest
+import numpy as np
+from tensorflow.keras.layers import Input, Flatten, Dense
+from tensorflow.keras.models import Model
+
+from codebook import Codebook, encode_images, preprocess_images
+
+
+def cosine_similarity(vector_A, vector_B):
+    return np.dot(vector_A, vector_B) / (
+        np.linalg.norm(vector_A) * np.linalg.norm(vector_B))
+
+
+def search_per_entry(latent_vectors, query):
+    similarities = [cosine_similarity(latent_vector, query)
+                    for latent_vector in latent_vectors]
+    return np.argmax(similarities), similarities
+
+
+class ViewRenderer(object):
+    def __init__(self, images, matrices):
+        self.images, self.matrices = images, matrices
+
+    def render(self):
+        return [{'image': image, 'matrices': matrices}
+                for image, matrices in zip(self.images, self.matrices)]
+
+
+@pytest.fixture
+def random_state():
+    return np.random.RandomState(777)
+
+
+@pytest.fixture
+def codebook(random_state):
+    latent_vectors = random_state.normal(0, 1, (500, 32))
+    rotations = random_state.normal(0, 1, (500, 3, 3))
+    return Codebook(latent_vectors, rotations)
+
+
+@pytest.fixture
+def encoder():
+    inputs = Input((8, 8, 3))
+    outputs = Dense(5)(Flatten()(inputs))
+    return Model(inputs, outputs)
+
+
+def test_search_matches_per_entry_search(codebook, random_state):
+    queries = random_state.normal(0, 1, (40, 32))
+    similarities, indices = codebook.search(queries)
+    for query, similarity, index in zip(queries, similarities, indices):
+        true_index, true_similarities = search_per_entry(
+            codebook.latent_vectors, query)
+        assert index[0] == true_index
+        assert np.isclose(similarity[0], true_similarities[true_index],
+                          atol=1e-5)
+
+
+def test_search_returns_sorted_top_k(codebook, random_state):
+    query = random_state.normal(0, 1, 32)
+    similarities, indices = codebook.search(query, k=5)
+    _, true_similarities = search_per_entry(codebook.latent_vectors, query)
+    true_indices = np.argsort(true_similarities)[::-1][:5]
+    assert similarities.shape == indices.shape == (1, 5)
+    assert np.array_equal(indices[0], true_indices)
+    assert np.all(np.diff(similarities[0]) <= 0)
+
+
+def test_save_and_load_round_trip(tmp_path, random_state):
+    images = random_state.randint(0, 256, (6, 8, 8, 3)).astype('uint8')
+    codebook = Codebook(random_state.normal(0, 1, (6, 4)),
+                        random_state.normal(0, 1, (6, 3, 3)), images)
+    path = os.path.join(str(tmp_path), 'codebook')
+    codebook.save(path)
+    loaded_codebook = Codebook.load(path)
+    assert isinstance(loaded_codebook.latent_vectors, np.memmap)
+    assert np.array_equal(loaded_codebook.latent_vectors,
+                          codebook.latent_vectors)
+    assert np.array_equal(loaded_codebook.rotations, codebook.rotations)
+    assert np.array_equal(loaded_codebook.images, images)
+    queries = random_state.normal(0, 1, (3, 4))
+    assert np.array_equal(loaded_codebook.search(queries, 2)[1],
+                          codebook.search(queries, 2)[1])
+
+
+def test_encode_images_in_batches(encoder, random_state):
+    images = random_state.randint(0, 256, (7, 8, 8, 3)).astype('uint8')
+    latent_vectors = encode_images(encoder, list(images), batch_size=3)
+    for image, latent_vector in zip(images, latent_vectors):
+        batch = preprocess_images([image], (8, 8))
+        assert np.allclose(latent_vector, encoder.predict(batch)[0],
+                           atol=1e-5)
+
+
+def test_build_codebook(encoder, random_state):
+    images = random_state.randint(0, 256, (4, 8, 8, 3)).astype('uint8')
+    matrices = np.tile(np.eye(4), (4, 2, 1, 1))
+    matrices[:, 0, :3, :3] = random_state.normal(0, 1, (4, 3, 3))
+    renderer = ViewRenderer(images, matrices.reshape(4, 2, 16))
+    codebook = Codebook.build(encoder, renderer, batch_size=3)
+    assert len(codebook) == 4
+    assert np.allclose(np.linalg.norm(codebook.latent_vectors, axis=1), 1.0)
+    assert np.allclose(codebook.rotations, matrices[:, 0, :3, :3])
+    _, indices = codebook.search(encode_images(encoder, list(images)))
+    assert np.array_equal(indices[:, 0], np.arange(4))
@@ -3,13 +3,13 @@ import json
 import argparse
 
 from tensorflow.keras.utils import get_file
-from sklearn.metrics.pairwise import cosine_similarity as measure
 from paz.backend.camera import VideoPlayer, Camera
 
 from scenes import DictionaryView
 
 from model import AutoEncoder
 from pipelines import ImplicitRotationPredictor
+from codebook import Codebook
 
 
 parser = argparse.ArgumentParser(description='Implicit orientation demo')
@@ -44,6 +44,10 @@ parser.add_argument('--model_path', type=str,
                     default=os.path.join(
                         os.path.expanduser('~'), '.keras/paz/models/'),
                     help='Root directory PAZ trained models')
+parser.add_argument('--batch_size', type=int, default=64,
+                    help='Number of views encoded per forward pass')
+parser.add_argument('--codebook_path', type=str, default=None,
+                    help='Directory for writing and loading the codebook')
 args = parser.parse_args()
 
 
@@ -57,15 +61,23 @@ weights_path = os.path.join(path, args.model_name + '_weights.hdf5')
 obj_path = get_file('textured.obj', None,
                     cache_subdir='paz/datasets/ycb/models/035_power_drill/')
 
-renderer = DictionaryView(
-    obj_path, (args.viewport_size, args.viewport_size), args.y_fov,
-    args.distance, bool(args.top_only), args.light, args.theta_steps,
-    args.phi_steps)
-
 encoder = AutoEncoder((size, size, 3), latent_dimension, mode='encoder')
 encoder.load_weights(weights_path, by_name=True)
 decoder = AutoEncoder((size, size, 3), latent_dimension, mode='decoder')
 decoder.load_weights(weights_path, by_name=True)
-inference = ImplicitRotationPredictor(encoder, decoder, measure, renderer)
+
+has_codebook = args.codebook_path and os.path.exists(args.codebook_path)
+if has_codebook:
+    codebook = Codebook.load(args.codebook_path)
+else:
+    renderer = DictionaryView(
+        obj_path, (args.viewport_size, args.viewport_size), args.y_fov,
+        args.distance, bool(args.top_only), args.light, args.theta_steps,
+        args.phi_steps)
+    codebook = Codebook.build(encoder, renderer, args.batch_size)
+    if args.codebook_path:
+        codebook.save(args.codebook_path)
+
+inference = ImplicitRotationPredictor(encoder, decoder, codebook=codebook)
 player = VideoPlayer((1280, 960), inference, camera=Camera(args.camera_id))
 player.run()
@@ -3,25 +3,48 @@ from paz.pipelines import EncoderPredictor, DecoderPredictor
 from paz.pipelines import RandomizeRenderedImage
 from paz import processors as pr
 
-from processors import MeasureSimilarity
-from processors import MakeDictionary
+from processors import MakeCodebook
+from processors import EncodeImages
+from processors import QueryCodebook
 
 
 class ImplicitRotationPredictor(Processor):
-    def __init__(self, encoder, decoder, measure, renderer):
+    """Predicts the closest rendered view of an image.
+
+    # Arguments
+        encoder: Keras model mapping images to latent vectors.
+        decoder: Keras model mapping latent vectors to images.
+        renderer: Class with a ``render`` method e.g. ``DictionaryView``.
+            Ignored if ``codebook`` is given.
+        codebook: ``Codebook`` instance or ``None``.
+        batch_size: Int. Number of views encoded per forward pass.
+    """
+    def __init__(self, encoder, decoder, renderer=None, codebook=None,
+                 batch_size=64):
         super(ImplicitRotationPredictor, self).__init__()
         self.show_decoded_image = pr.ShowImage('decoded_image', wait=False)
         self.show_closest_image = pr.ShowImage('closest_image', wait=False)
+        if codebook is None:
+            codebook = MakeCodebook(encoder, renderer, batch_size)()
+        self.codebook = codebook
         self.encoder = EncoderPredictor(encoder)
-        self.dictionary = MakeDictionary(self.encoder, renderer)()
-        self.encoder.add(pr.ExpandDims(0))
-        self.encoder.add(MeasureSimilarity(self.dictionary, measure))
+        self.encode_images = EncodeImages(encoder, batch_size)
+        self.query = QueryCodebook(self.codebook)
         self.decoder = DecoderPredictor(decoder)
         outputs = ['image', 'latent_vector', 'latent_image', 'decoded_image']
         self.wrap = pr.WrapOutput(outputs)
 
+    def predict_rotations(self, images):
+        """Returns the rotations of the closest views of many crops.
+        """
+        latent_vectors = self.encode_images(images)
+        similarities, indices, rotations = self.query(latent_vectors)
+        return rotations[:, 0], similarities[:, 0]
+
     def call(self, image):
-        latent_vector, closest_image = self.encoder(image)
+        latent_vector = self.encoder(image)
+        similarities, indices, rotations = self.query(latent_vector)
+        closest_image = self.codebook.images[indices[0, 0]]
         self.show_closest_image(closest_image)
         decoded_image = self.decoder(latent_vector)
         self.show_decoded_image(decoded_image)
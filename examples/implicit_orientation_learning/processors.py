@@ -1,34 +1,55 @@
 from paz.abstract import Processor
-import numpy as np
 
+from codebook import Codebook, encode_images
 
-class MakeDictionary(Processor):
-    def __init__(self, encoder, renderer):
-        super(MakeDictionary, self).__init__()
-        self.latent_dimension = encoder.encoder.output_shape[1]
+
+class MakeCodebook(Processor):
+    """Renders all views of an object and encodes them into a ``Codebook``.
+
+    # Arguments
+        encoder: Keras model mapping images to latent vectors.
+        renderer: Class with a ``render`` method e.g. ``DictionaryView``.
+        batch_size: Int. Number of views encoded per forward pass.
+    """
+    def __init__(self, encoder, renderer, batch_size=64):
+        super(MakeCodebook, self).__init__()
         self.encoder = encoder
         self.renderer = renderer
+        self.batch_size = batch_size
 
     def call(self):
-        data = self.renderer.render()
-        dictionary = {}
-        latent_vectors = np.zeros((len(data), self.latent_dimension))
-        for sample_arg, sample in enumerate(data):
-            image = sample['image']
-            latent_vectors[sample_arg] = self.encoder(image)
-            dictionary[sample_arg] = image
-        dictionary['latent_vectors'] = latent_vectors
-        return dictionary
-
-
-class MeasureSimilarity(Processor):
-    def __init__(self, dictionary, measure):
-        super(MeasureSimilarity, self).__init__()
-        self.dictionary = dictionary
-        self.measure = measure
-
-    def call(self, latent_vector):
-        latent_vectors = self.dictionary['latent_vectors']
-        measurements = self.measure(latent_vectors, latent_vector)
-        closest_image = self.dictionary[np.argmax(measurements)]
-        return latent_vector, closest_image
+        return Codebook.build(self.encoder, self.renderer, self.batch_size)
+
+
+class EncodeImages(Processor):
+    """Encodes a list of images into latent vectors in batches.
+
+    # Arguments
+        encoder: Keras model mapping images to latent vectors.
+        batch_size: Int. Number of images encoded per forward pass.
+    """
+    def __init__(self, encoder, batch_size=64):
+        super(EncodeImages, self).__init__()
+        self.encoder = encoder
+        self.batch_size = batch_size
+
+    def call(self, images):
+        return encode_images(self.encoder, images, self.batch_size)
+
+
+class QueryCodebook(Processor):
+    """Finds the closest rendered views of one or many latent vectors.
+
+    # Arguments
+        codebook: ``Codebook`` instance.
+        k: Int. Number of views returned per latent vector.
+    """
+    def __init__(self, codebook, k=1):
+        super(QueryCodebook, self).__init__()
+        self.codebook = codebook
+        self.k = k
+
+    def call(self, latent_vectors):
+        similarities, indices = self.codebook.search(latent_vectors, self.k)
+        rotations = self.codebook.rotations[indices]
+        return similarities, indices, rotations
@@ -1,5 +1,8 @@
+import math
+from functools import lru_cache
 import numpy as np
 
+from paz.backend.anchors import build_pyramid_anchors
 from paz.backend.boxes import to_center_form, compute_ious
 
 
@@ -45,14 +48,46 @@ def generate_pyramid_anchors(scales, ratios, feature_shapes, feature_strides,
 
     # Returns:
         anchors: [N, (x1, y1, x2, y2)]. All generated anchors in one array.
-                 Sorted with the same order of the given scales.
+                 Sorted with the same order of the given scales. The array
+                 is shared and read-only.
     """
-    anchors = []
-    for scale, feature_shape, feature_stride in zip(scales, feature_shapes,
-                                                    feature_strides):
-        anchors.append(generate_anchors(scale, ratios, feature_shape,
-                                        feature_stride, anchor_stride))
-    return np.concatenate(anchors, axis=0)
+    return build_pyramid_anchors(scales, ratios, feature_shapes,
+                                 feature_strides, anchor_stride)
+
+
+def generate_normalized_anchors(scales, ratios, image_shape,
+                                feature_strides=(4, 8, 16, 32, 64),
+                                anchor_stride=1):
+    """Generates pyramid anchors of a ResNet backbone normalized to the
+       image shape. Anchors are memoized by configuration and image shape.
+
+    # Arguments:
+        scales: 1D array of anchor sizes in pixels of every level.
+        ratios: 1D array of anchor ratios of width/height.
+        image_shape: [height, width] of the input image.
+        feature_strides: strides of every level relative to the image.
+        anchor_stride: anchor stride on feature map.
+
+    # Returns:
+        anchors: Read-only array [N, (y1, x1, y2, x2)] in normalized
+                 coordinates.
+    """
+    return _generate_normalized_anchors(
+        tuple(scales), tuple(ratios), tuple(image_shape[:2]),
+        tuple(feature_strides), anchor_stride)
+
+
+@lru_cache(maxsize=None)
+def _generate_normalized_anchors(scales, ratios, image_shape,
+                                 feature_strides, anchor_stride):
+    feature_shapes = [[int(math.ceil(image_shape[0] / stride)),
+                       int(math.ceil(image_shape[1] / stride))]
+                      for stride in feature_strides]
+    anchors = generate_pyramid_anchors(scales, ratios, feature_shapes,
+                                       feature_strides, anchor_stride)
+    anchors = normalized_boxes(anchors, image_shape)
+    anchors.flags.writeable = False
+    return anchors
 
 
 def generate_anchors(scales, ratios, shape, feature_stride, anchor_stride):
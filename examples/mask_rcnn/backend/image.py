@@ -33,8 +33,22 @@ def add_mean_image(normalized_image, mean_pixel_values):
     return normalized_image + mean_pixel_values
 
 
+def _sample_coordinates(start, stop, size, max_value):
+    """Computes bilinear sampling positions between ``start`` and ``stop - 1``
+    with the same alignment as ``tf.image.crop_and_resize``.
+    """
+    steps = np.linspace(0.0, 1.0, size) if size > 1 else np.array([0.5])
+    coordinates = start[:, None] + ((stop - 1 - start)[:, None] * steps)
+    coordinates = np.clip(coordinates, 0, max_value)
+    lower = np.floor(coordinates).astype(int)
+    upper = np.minimum(lower + 1, max_value)
+    return lower, upper, coordinates - lower
+
+
 def crop_resize_masks(boxes, mask, small_mask_shape):
-    """Resize masks to a smaller version to reduce memory load.
+    """Resize masks to a smaller version to reduce memory load. All instances
+    are cropped and bilinearly resized at once following the sampling of
+    ``tf.image.crop_and_resize``.
 
     # Arguments:
         boxes: [instances, ymin, xmin, ymax, xmax] Bounding box.
@@ -46,15 +60,36 @@ def crop_resize_masks(boxes, mask, small_mask_shape):
         smaller_masks: [height, width, channel]
 
     """
-    smaller_masks = np.zeros(small_mask_shape + (mask.shape[-1],), dtype=bool)
-    for instance in range(mask.shape[-1]):
-        small_mask = mask[:, :, instance]
-        y1, x1, y2, x2 = boxes[instance, :4]
-        small_mask = small_mask[y1:y2, x1:x2]
+    H, W, num_instances = mask.shape
+    small_H, small_W = small_mask_shape
+    boxes = np.asarray(boxes[:, :4], dtype=np.float64)
+    y0, y1, dy = _sample_coordinates(boxes[:, 0], boxes[:, 2], small_H, H - 1)
+    x0, x1, dx = _sample_coordinates(boxes[:, 1], boxes[:, 3], small_W, W - 1)
+    instances = np.arange(num_instances)[:, None, None]
+    y0, y1, dy = y0[:, :, None], y1[:, :, None], dy[:, :, None]
+    x0, x1, dx = x0[:, None, :], x1[:, None, :], dx[:, None, :]
+    mask = mask.astype(np.float32)
+    top = ((1 - dx) * mask[y0, x0, instances]) + (dx * mask[y0, x1, instances])
+    bottom = ((1 - dx) * mask[y1, x0, instances] +
+              (dx * mask[y1, x1, instances]))
+    small_masks = ((1 - dy) * top) + (dy * bottom)
+    return np.around(np.transpose(small_masks, [1, 2, 0])).astype(bool)
+
+
+def resize_to_box(mask, box, threshold=0.5):
+    """Resizes a small mask to the size of its box.
 
-        small_mask = resize_image(np.array(small_mask), small_mask_shape)
-        smaller_masks[:, :, instance] = np.around(small_mask).astype(bool)
-    return smaller_masks
+    # Arguments:
+        mask: [height, width] of type float. Typically 28x28 mask.
+        box: [y_min, x_min, y_max, x_max]. The box to fit the mask in.
+        threshold: Float. Minimum value of a foreground pixel.
+
+    # Returns:
+        A binary mask of shape [y_max - y_min, x_max - x_min].
+    """
+    y_min, x_min, y_max, x_max = [int(x) for x in box]
+    mask = resize_image(mask, (int(x_max - x_min), int(y_max - y_min)))
+    return mask >= threshold
 
 
 def resize_to_original_size(mask, box, image_shape, threshold=0.5):
@@ -68,11 +103,34 @@ def resize_to_original_size(mask, box, image_shape, threshold=0.5):
     # Returns:
         A binary mask with the same size as the original image.
     """
-    box = [int(x) for x in box]
-    y_min, x_min, y_max, x_max = box
-    mask = resize_image(mask, (int(x_max - x_min), int(y_max - y_min)))
+    return paste_masks(mask[np.newaxis], np.array([box]), image_shape,
+                       threshold)[..., 0]
+
 
-    mask = np.where(mask >= threshold, 1, 0).astype(np.bool)
-    full_mask = np.zeros(image_shape[:2], dtype=np.bool)
-    full_mask[int(y_min):int(y_max), int(x_min):int(x_max)] = mask
-    return full_mask
+def paste_masks(masks, boxes, image_shape, threshold=0.5):
+    """Pastes small masks into a single array of the original image size.
+    Each mask is only resized to and written into its box region.
+
+    # Arguments:
+        masks: [num_masks, height, width] of type float.
+        boxes: [num_masks, (y_min, x_min, y_max, x_max)] in pixels.
+        image_shape: [height, width, channel].
+        threshold: Float. Minimum value of a foreground pixel.
+
+    # Returns:
+        Binary masks of shape [height, width, num_masks].
+    """
+    H, W = image_shape[:2]
+    full_masks = np.zeros((H, W, len(masks)), dtype=bool)
+    for mask_arg, (mask, box) in enumerate(zip(masks, boxes)):
+        y_min, x_min, y_max, x_max = [int(x) for x in box]
+        if (y_max <= y_min) or (x_max <= x_min):
+            continue
+        box_mask = resize_to_box(mask, box, threshold)
+        clipped_y_min, clipped_x_min = max(y_min, 0), max(x_min, 0)
+        clipped_y_max, clipped_x_max = min(y_max, H), min(x_max, W)
+        box_mask = box_mask[clipped_y_min - y_min:clipped_y_max - y_min,
+                            clipped_x_min - x_min:clipped_x_max - x_min]
+        full_masks[clipped_y_min:clipped_y_max,
+                   clipped_x_min:clipped_x_max, mask_arg] = box_mask
+    return full_masks
@@ -3,7 +3,7 @@ import tensorflow as tf
 from tensorflow.keras.layers import Layer
 from tensorflow.python.eager import context
 
-from mask_rcnn.model.layer_utils import apply_box_delta, slice_batch
+from mask_rcnn.model.layer_utils import apply_box_delta, map_batch
 from mask_rcnn.model.layer_utils import clip_boxes
 
 
@@ -288,16 +288,19 @@ class DetectionLayer(Layer):
 
     def call(self, inputs):
         ROIs, mrcnn_class, mrcnn_bounding_box = inputs
-        detections_batch = slice_batch([ROIs, mrcnn_class, mrcnn_bounding_box],
-                                       [tf.cast(self.bounding_box_std_dev,
-                                                dtype=tf.float32),
-                                       self.window,
-                                       self.detection_min_confidence,
-                                       self.detection_max_instances,
-                                       tf.cast(self.detection_nms_threshold,
-                                               dtype=tf.float32)],
-                                       refine_detections,
-                                       self.images_per_gpu)
-
+        bounding_box_std_dev = tf.cast(self.bounding_box_std_dev, tf.float32)
+        nms_threshold = tf.cast(self.detection_nms_threshold, tf.float32)
+
+        def _refine_detections(ROIs, probabilities, deltas):
+            return refine_detections(
+                ROIs, probabilities, deltas, bounding_box_std_dev,
+                self.window, self.detection_min_confidence,
+                self.detection_max_instances, nms_threshold)
+
+        output_signature = tf.TensorSpec(
+            (self.detection_max_instances, 6), tf.float32)
+        detections_batch = map_batch(
+            [ROIs, mrcnn_class, mrcnn_bounding_box], _refine_detections,
+            output_signature)
         return tf.reshape(detections_batch,
                           [self.batch_size, self.detection_max_instances, 6])
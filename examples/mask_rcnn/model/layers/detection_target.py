@@ -2,7 +2,7 @@ import numpy as np
 import tensorflow as tf
 from tensorflow.keras.layers import Layer
 
-from mask_rcnn.model.layer_utils import slice_batch
+from mask_rcnn.model.layer_utils import map_batch
 
 
 def trim_zeros(boxes):
@@ -550,13 +550,21 @@ class DetectionTargetLayer(Layer):
         proposals, prior_class_ids, prior_boxes, prior_masks = inputs
         names = ['ROIs', 'target_class_ids', 'target_bounding_box',
                  'target_mask']
-        outputs = slice_batch([proposals, prior_class_ids, prior_boxes,
-                               prior_masks],
-                              [self.train_ROIs_per_image,
-                               self.ROI_positive_ratio,
-                               self.mask_shape, self.use_mini_mask,
-                               tf.cast(self.bounding_box_std_dev,
-                                       dtype=tf.float32)],
-                              compute_targets_from_groundtruth_values,
-                              self.images_per_gpu, names=names)
+        bounding_box_std_dev = tf.cast(self.bounding_box_std_dev, tf.float32)
+
+        def _compute_targets(proposals, class_ids, boxes, masks):
+            return compute_targets_from_groundtruth_values(
+                proposals, class_ids, boxes, masks, self.train_ROIs_per_image,
+                self.ROI_positive_ratio, self.mask_shape, self.use_mini_mask,
+                bounding_box_std_dev)
+
+        num_ROIs = self.train_ROIs_per_image
+        output_signature = [
+            tf.TensorSpec((num_ROIs, 4), proposals.dtype),
+            tf.TensorSpec((num_ROIs,), prior_class_ids.dtype),
+            tf.TensorSpec((num_ROIs, 4), tf.float32),
+            tf.TensorSpec((num_ROIs, *self.mask_shape), tf.float32)]
+        outputs = map_batch([proposals, prior_class_ids, prior_boxes,
+                             prior_masks], _compute_targets,
+                            output_signature, names)
         return outputs
@@ -3,66 +3,62 @@ import tensorflow as tf
 from tensorflow.keras.layers import Layer
 from tensorflow.python.eager import context
 
-from mask_rcnn.model.layer_utils import apply_box_delta, slice_batch
+from mask_rcnn.model.layer_utils import apply_box_delta, map_batch
 from mask_rcnn.model.layer_utils import clip_boxes
 
 
-def trim_anchors(scores, deltas, anchors, images_per_gpu, pre_nms_limit):
+def trim_anchors(scores, deltas, anchors, pre_nms_limit):
     """Selects fixed number of anchors before NMS.
 
     # Arguments:
-        scores: [N] Predicted target class values.
-        deltas: [N, (dy, dx, log(dw), log(dh))] refinements to apply.
+        scores: [batch, N] Predicted target class values.
+        deltas: [batch, N, (dy, dx, log(dw), log(dh))] refinements to apply.
         anchors: [batch, num_anchors, (x_min, y_min, x_max, y_max)] anchors
                  in normalized coordinates.
-        images_per_gpu: Number of images to train with on each GPU.
         pre_nms_limit: type int, ROIs kept to keep
                        before non-maximum suppression.
     # Returns:
-        scores: [pre_nms_limit] Predicted target class values.
-        deltas: [pre_nms_limit, (dx, dy, log(dw), log(dh))] refinements to
-                apply.
+        scores: [batch, pre_nms_limit] Predicted target class values.
+        deltas: [batch, pre_nms_limit, (dx, dy, log(dw), log(dh))]
+                refinements to apply.
         anchors: [batch, pre_nms_limit, (x_min, y_min, x_max, y_max)].
     """
     pre_nms_limit = tf.minimum(pre_nms_limit, tf.shape(anchors)[1])
     indices = tf.nn.top_k(scores, pre_nms_limit, sorted=True,
                           name='top_anchors').indices
-    scores = slice_batch([scores, indices], [], tf.gather, images_per_gpu)
-    deltas = slice_batch([deltas, indices], [], tf.gather, images_per_gpu)
-    pre_nms_anchors = slice_batch([anchors, indices], [], tf.gather,
-                                  images_per_gpu, names=['pre_nms_anchors'])
+    scores = tf.gather(scores, indices, batch_dims=1)
+    deltas = tf.gather(deltas, indices, batch_dims=1)
+    pre_nms_anchors = tf.gather(anchors, indices, batch_dims=1,
+                                name='pre_nms_anchors')
     return scores, deltas, pre_nms_anchors
 
 
-def apply_box_deltas(pre_nms_anchors, deltas, images_per_gpu):
-    """Applies refinement to anchors based on delta values in slices.
+def apply_box_deltas(pre_nms_anchors, deltas):
+    """Applies refinement to anchors of all batch elements at once.
 
     # Arguments:
-        pre_nms_anchors: [N, (x_min, y_min, x_max, y_max)] boxes to update.
-        deltas: [N, (dx, dy, log(dw), log(dh))] refinements to apply.
-        images_per_gpu: Number of images to train with on each GPU.
+        pre_nms_anchors: [batch, N, (x_min, y_min, x_max, y_max)] boxes to
+                         update.
+        deltas: [batch, N, (dx, dy, log(dw), log(dh))] refinements to apply.
     # Returns:
-        boxes: [N, (x_min, y_min, x_max, y_max)].
+        boxes: [batch, N, (x_min, y_min, x_max, y_max)].
     """
-    boxes = slice_batch([pre_nms_anchors, deltas], [], apply_box_delta,
-                        images_per_gpu, names=['refined_anchors'])
-    return boxes
+    boxes = apply_box_delta(pre_nms_anchors, deltas)
+    return tf.identity(boxes, name='refined_anchors')
 
 
-def clip_image_boundaries(boxes, images_per_gpu):
+def clip_image_boundaries(boxes):
     """Clips boxes to the given window size in this case the normalised
     image boundaries.
 
     # Arguments:
-        boxes: [N, (dx, dy, log(dw), log(dh))] refinements to apply.
-        images_per_gpu: Number of images to train with on each GPU.
+        boxes: [batch, N, (x_min, y_min, x_max, y_max)] boxes to clip.
     # Returns:
-        boxes: [N, (dx, dy, log(dw), log(dh))].
+        boxes: [batch, N, (x_min, y_min, x_max, y_max)].
     """
     size = np.array([0, 0, 1, 1], dtype=np.float32)
-    boxes = slice_batch(boxes, [size], clip_boxes, images_per_gpu,
-                        names=['refined_anchors_clipped'])
-    return boxes
+    boxes = clip_boxes(boxes, size)
+    return tf.identity(boxes, name='refined_anchors_clipped')
 
 
 def compute_NMS(boxes, scores, proposal_count, nms_threshold):
@@ -119,17 +115,19 @@ class ProposalLayer(Layer):
         scores = scores[:, :, 1]
         deltas = deltas * np.reshape(self.RPN_bounding_box_std_dev, [1, 1, 4])
         scores, deltas, pre_nms_anchors = trim_anchors(scores, deltas, anchors,
-                                                       self.images_per_gpu,
                                                        self.pre_nms_limit)
 
-        boxes = apply_box_deltas(pre_nms_anchors, deltas, self.images_per_gpu)
-        boxes = clip_image_boundaries(boxes, self.images_per_gpu)
+        boxes = apply_box_deltas(pre_nms_anchors, deltas)
+        boxes = clip_image_boundaries(boxes)
+
+        def _compute_NMS(boxes, scores):
+            return compute_NMS(boxes, scores, self.proposal_count,
+                               self.nms_threshold)
 
-        proposals = slice_batch([boxes, scores],
-                                [self.proposal_count, self.nms_threshold],
-                                compute_NMS, self.images_per_gpu)
+        output_signature = tf.TensorSpec((self.proposal_count, 4), tf.float32)
+        proposals = map_batch([boxes, scores], _compute_NMS, output_signature)
         if not context.executing_eagerly():
             # Infer the static output shape:
-            out_shape = (None, self.proposal_count, 4)
+            out_shape = (self.images_per_gpu, self.proposal_count, 4)
             proposals.set_shape(out_shape)
         return proposals
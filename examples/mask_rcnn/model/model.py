@@ -19,8 +19,6 @@ import tensorflow.keras.backend as K
 from tensorflow.keras.models import Model
 from tensorflow.keras.layers import Layer
 
-from mask_rcnn.backend.boxes import normalized_boxes
-
 from mask_rcnn.model.layers.detection_target import DetectionTargetLayer
 from mask_rcnn.model.layers.proposal import ProposalLayer
 from mask_rcnn.model.layers.detection import DetectionLayer
@@ -33,8 +31,7 @@ from mask_rcnn.model.layers.feature_pyramid_network import FPN_classifier_graph
 from mask_rcnn.model.layers.feature_pyramid_network import build_FPN_mask_graph
 from mask_rcnn.model.rpn_model import RPN_model
 
-from mask_rcnn.backend.boxes import generate_pyramid_anchors
-from mask_rcnn.pipelines.data_generator import ComputeBackboneShapes
+from mask_rcnn.backend.boxes import generate_normalized_anchors
 from tensorflow.keras.layers import BatchNormalization as BatchNorm
 
 from tensorflow.python.framework.ops import disable_eager_execution
@@ -218,15 +215,9 @@ def build_anchors(image_shape, RPN_anchor_scales, backbone=None):
         anchors : Normalized to match the shape of
         the input image [N, (y1, x1, y2, x2)]
     """
-    backbone_shapes = ComputeBackboneShapes()(backbone, image_shape)
-    anchor_cache = {}
-    if not tuple(image_shape) in anchor_cache:
-        anchors = generate_pyramid_anchors(RPN_anchor_scales,
-                                           [0.5, 1, 2], backbone_shapes,
-                                           [4, 8, 16, 32, 64], 1)
-        anchor_cache[tuple(image_shape)] = normalized_boxes(
-            anchors, image_shape[:2])
-    return anchor_cache[tuple(image_shape)]
+    assert backbone in ["resnet50", "resnet101"]
+    return generate_normalized_anchors(RPN_anchor_scales, [0.5, 1, 2],
+                                       image_shape[:2])
 
 
 def convolution_block(inputs, filters, stride, name, padd='valid'):
@@ -6,10 +6,9 @@ from paz.abstract import Processor
 from paz.backend.image.opencv_image import resize_image
 from paz.backend.image.image import cast_image
 
-from mask_rcnn.pipelines.data_generator import ComputeBackboneShapes
 from mask_rcnn.backend.image import subtract_mean_image, cast_image
-from mask_rcnn.backend.image import resize_to_original_size
-from mask_rcnn.backend.boxes import generate_pyramid_anchors
+from mask_rcnn.backend.image import paste_masks
+from mask_rcnn.backend.boxes import generate_normalized_anchors
 from mask_rcnn.backend.boxes import normalized_boxes, denormalized_boxes
 
 
@@ -100,18 +99,8 @@ class Detect(Processor):
         return results
 
     def get_anchors(self, image_shape):
-        backbone_shapes = ComputeBackboneShapes()(backbone="resnet101",
-                                                  image_shape=image_shape)
-        if not hasattr(self, '_anchor_cache'):
-            self._anchor_cache = {}
-        if not tuple(image_shape) in self._anchor_cache:
-            self.anchors = generate_pyramid_anchors(self.anchor_scales,
-                                                    [0.5, 1, 2],
-                                                    backbone_shapes,
-                                                    [4, 8, 16, 32, 64], 1)
-            self._anchor_cache[tuple(image_shape)] = normalized_boxes(
-                self.anchors, image_shape[:2])
-        return self._anchor_cache[tuple(image_shape)]
+        return generate_normalized_anchors(self.anchor_scales, [0.5, 1, 2],
+                                           image_shape[:2])
 
 
 class PostprocessInputs(Processor):
@@ -182,11 +171,4 @@ class PostprocessInputs(Processor):
         return boxes, class_ids, scores, masks, N
 
     def unmold_masks(self, N, boxes, masks, original_image_shape):
-        full_masks = []
-        for index in range(N):
-            full_mask = resize_to_original_size(masks[index], boxes[index],
-                                                original_image_shape)
-            full_masks.append(full_mask)
-        full_masks = np.stack(full_masks, axis=-1) if full_masks else np.empty(
-            original_image_shape[:2] + (0,))
-        return full_masks
+        return paste_masks(masks[:N], boxes[:N], original_image_shape)
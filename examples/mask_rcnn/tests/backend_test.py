@@ -12,8 +12,10 @@ from mask_rcnn.backend.boxes import compute_anchor_boxes_overlaps
 
 from mask_rcnn.backend.image import subtract_mean_image, add_mean_image
 from mask_rcnn.backend.image import crop_resize_masks, resize_to_original_size
+from mask_rcnn.backend.image import paste_masks, resize_to_box
 
 from mask_rcnn.datasets.shapes import Shapes
+from mask_rcnn.tests.utils import evaluate_in_graph
 
 
 @pytest.fixture
@@ -154,3 +156,84 @@ def test_apply_box_refinement(refine_boxes):
     box = np.array([[5, 10, 20, 30]])
     refinement = encode_boxes(box, ground_box)
     assert np.all(refinement) == np.all(refine_boxes)
+
+
+def test_crop_resize_masks_multiple_instances():
+    mask = np.zeros((32, 32, 2), dtype=np.uint8)
+    mask[4:12, 4:12, 0] = 1
+    mask[10:30, 0:16, 1] = 1
+    boxes = np.array([[4, 4, 12, 12], [10, 0, 30, 16]])
+    small_masks = crop_resize_masks(boxes, mask, (8, 8))
+    assert small_masks.shape == (8, 8, 2)
+    assert np.all(small_masks)
+
+
+def test_paste_masks_matches_resize_to_original_size():
+    masks = np.random.rand(3, 28, 28)
+    boxes = np.array([[10, 20, 50, 70], [0, 0, 28, 28], [30, 5, 64, 40]])
+    full_masks = paste_masks(masks, boxes, (64, 80, 3))
+    for mask_arg in range(3):
+        full_mask = resize_to_original_size(masks[mask_arg], boxes[mask_arg],
+                                            (64, 80, 3))
+        assert np.array_equal(full_masks[..., mask_arg], full_mask)
+
+
+def test_paste_masks_clips_to_image():
+    masks = np.ones((1, 28, 28))
+    boxes = np.array([[-10, -10, 20, 100]])
+    full_masks = paste_masks(masks, boxes, (16, 32, 3))
+    assert full_masks.shape == (16, 32, 1)
+    assert np.all(full_masks)
+
+
+@pytest.mark.parametrize('small_mask_shape', [(7, 9), (1, 1)])
+def test_crop_resize_masks_equals_tf_crop_and_resize(small_mask_shape):
+    H, W, num_instances = 40, 50, 6
+    rows, cols = np.meshgrid(np.arange(H), np.arange(W), indexing='ij')
+    mask = np.zeros((H, W, num_instances), dtype=np.uint8)
+    for instance in range(num_instances):
+        block_size = instance + 2
+        checkerboard = ((rows // block_size) + (cols // block_size)) % 2
+        mask[..., instance] = checkerboard
+    random_state = np.random.RandomState(777)
+    y_min = random_state.randint(0, H - 10, num_instances)
+    x_min = random_state.randint(0, W - 10, num_instances)
+    y_max = y_min + random_state.randint(2, 10, num_instances)
+    x_max = x_min + random_state.randint(2, 10, num_instances)
+    boxes = np.stack([y_min, x_min, y_max, x_max], axis=1)
+
+    small_masks = crop_resize_masks(boxes, mask, small_mask_shape)
+
+    images = np.transpose(mask, [2, 0, 1])[..., np.newaxis]
+    normalized_boxes = np.stack([y_min / (H - 1), x_min / (W - 1),
+                                 (y_max - 1) / (H - 1),
+                                 (x_max - 1) / (W - 1)], axis=1)
+    crops = evaluate_in_graph(lambda: tf.image.crop_and_resize(
+        images.astype(np.float32), normalized_boxes.astype(np.float32),
+        np.arange(num_instances), small_mask_shape))
+    crops = np.transpose(crops[..., 0], [1, 2, 0])
+    # values at the rounding threshold can round either way
+    is_unambiguous = np.abs(crops - 0.5) > 1e-4
+    assert small_masks.shape == (*small_mask_shape, num_instances)
+    assert np.any(small_masks) and not np.all(small_masks)
+    assert np.array_equal(small_masks[is_unambiguous],
+                          np.around(crops[is_unambiguous]).astype(bool))
+
+
+def test_paste_masks_of_gradients_clipped_at_border():
+    H, W = 40, 60
+    gradient = np.linspace(0.0, 1.0, 28)
+    masks = np.stack([np.outer(gradient, np.ones(28)),
+                      np.outer(np.ones(28), gradient),
+                      np.outer(gradient, gradient[::-1])])
+    boxes = np.array([[-15, -20, 25, 30], [10, 35, 55, 80], [-5, 40, 45, 70]])
+    full_masks = paste_masks(masks, boxes, (H, W, 3))
+
+    padding = 40
+    for mask_arg, (mask, box) in enumerate(zip(masks, boxes)):
+        y_min, x_min, y_max, x_max = box + padding
+        canvas = np.zeros((H + 2 * padding, W + 2 * padding), dtype=bool)
+        canvas[y_min:y_max, x_min:x_max] = resize_to_box(mask, box)
+        expected_mask = canvas[padding:padding + H, padding:padding + W]
+        assert np.any(expected_mask) and not np.all(expected_mask)
+        assert np.array_equal(full_masks[..., mask_arg], expected_mask)
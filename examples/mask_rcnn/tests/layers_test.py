@@ -14,6 +14,7 @@ from mask_rcnn.model.layers.feature_pyramid_network import FPN_classifier_graph
 from mask_rcnn.model.model import MaskRCNN
 from mask_rcnn.model.RPN_model import RPN_model
 from mask_rcnn.backend.boxes import normalized_boxes
+from mask_rcnn.tests.utils import evaluate_in_graph
 
 
 @pytest.fixture
@@ -110,6 +111,26 @@ def test_proposal_layer(proposal_layer, ROI_shape):
 #     assert ROIs.shape[2] == target_box.shape[2] == 4
 
 
+def test_proposal_layer_batch():
+    random_state = np.random.RandomState(777)
+    batch_size, num_anchors = 3, 200
+    scores = random_state.rand(batch_size, num_anchors, 2).astype(np.float32)
+    deltas = 0.1 * random_state.randn(batch_size, num_anchors, 4)
+    corners = 0.8 * random_state.rand(batch_size, num_anchors, 2)
+    anchors = np.concatenate([corners, corners + 0.2], axis=-1)
+    std_dev = np.array([0.1, 0.1, 0.2, 0.2])
+    deltas, anchors = deltas.astype(np.float32), anchors.astype(np.float32)
+    layer = ProposalLayer(50, 0.7, std_dev, 100, batch_size, batch_size)
+    proposals = evaluate_in_graph(lambda: layer([scores, deltas, anchors]))
+    assert proposals.shape == (batch_size, 50, 4)
+    layer = ProposalLayer(50, 0.7, std_dev, 100, 1, 1)
+    for sample_arg in range(batch_size):
+        sample = slice(sample_arg, sample_arg + 1)
+        sample_proposals = evaluate_in_graph(lambda: layer(
+            [scores[sample], deltas[sample], anchors[sample]]))
+        assert np.allclose(proposals[sample_arg], sample_proposals[0])
+
+
 @pytest.mark.parametrize('shape', [(1, 100, 6)])
 def test_detection_layer(proposal_layer, FPN_classifier, shape):
     mrcnn_class, mrcnn_bounding_box = FPN_classifier
@@ -0,0 +1,18 @@
+import tensorflow as tf
+
+
+def evaluate_in_graph(build_tensors):
+    """Builds and evaluates tensors in a new graph. It gives the same
+    result with and without eager execution, which ``mask_rcnn.model.model``
+    disables at import.
+
+    # Arguments
+        build_tensors: Function without arguments returning the tensors.
+
+    # Returns
+        Numpy arrays of the evaluated tensors.
+    """
+    with tf.Graph().as_default():
+        tensors = build_tensors()
+        with tf.compat.v1.Session() as session:
+            return session.run(tensors)
@@ -0,0 +1,92 @@
+import time
+import argparse
+import numpy as np
+import tensorflow as tf
+import tensorflow.keras.backend as K
+from tensorflow.keras.optimizers import SGD
+
+from paz.models import SSD300
+from paz.optimization import MultiBoxLoss
+
+
+description = 'SSD300 training step time with batched hard-negative mining'
+parser = argparse.ArgumentParser(description=description)
+parser.add_argument('-b', '--batch_size', default=8, type=int,
+                    help='Batch size used during optimization')
+parser.add_argument('-n', '--num_steps', default=10, type=int,
+                    help='Number of timed training steps')
+parser.add_argument('-p', '--num_positives', default=20, type=int,
+                    help='Number of positive boxes per sample')
+parser.add_argument('-s', '--seed', default=777, type=int)
+args = parser.parse_args()
+
+
+class MapMultiBoxLoss(MultiBoxLoss):
+    """Previous miner running a ``top_k`` per sample with ``tf.map_fn``."""
+    def negative_classification(self, y_true, y_pred):
+        batch_size = tf.cast(tf.shape(y_pred)[0], tf.float32)
+        class_loss = self._cross_entropy(y_true[:, :, 4:], y_pred[:, :, 4:])
+        positive_mask, negative_mask = self._calculate_masks(y_true)
+        num_positives_per_sample = K.cast(K.sum(positive_mask, -1), 'int32')
+        num_hard_negatives = self.neg_pos_ratio * num_positives_per_sample
+        num_negatives_per_sample = K.minimum(
+            num_hard_negatives, self.max_num_negatives)
+        negative_class_losses = class_loss * negative_mask
+        elements = (negative_class_losses, num_negatives_per_sample)
+        negative_class_loss = tf.map_fn(
+            lambda x: K.sum(tf.nn.top_k(x[0], x[1])[0]),
+            elements, dtype=tf.float32)
+        num_positives = K.sum(K.cast(positive_mask, 'float32'))
+        num_positives = tf.maximum(1.0, num_positives)
+        return (negative_class_loss * batch_size) / num_positives
+
+
+num_classes = 21
+model = SSD300(num_classes, base_weights=None, head_weights=None)
+num_boxes = len(model.prior_boxes)
+RNG = np.random.default_rng(args.seed)
+images = RNG.uniform(0, 255, (args.batch_size, 300, 300, 3))
+classes = np.zeros((args.batch_size, num_boxes), dtype=int)
+for sample_classes in classes:
+    positive_args = RNG.choice(num_boxes, args.num_positives, replace=False)
+    sample_classes[positive_args] = RNG.integers(
+        1, num_classes, args.num_positives)
+y_true = np.concatenate([RNG.normal(size=(args.batch_size, num_boxes, 4)),
+                         np.eye(num_classes)[classes]], axis=-1)
+images, y_true = images.astype('float32'), y_true.astype('float32')
+
+y_pred = model(images)
+losses = [('map_fn', MapMultiBoxLoss()), ('batched', MultiBoxLoss())]
+values = [loss.negative_classification(y_true, y_pred) for _, loss in losses]
+print('max. negative loss difference:', float(K.max(K.abs(
+    values[0] - values[1]))))
+
+
+def time_loss_step(loss):
+    # loss and gradient only, isolating the miner from the network
+    @tf.function
+    def loss_step(y_true, y_pred):
+        with tf.GradientTape() as tape:
+            tape.watch(y_pred)
+            value = K.mean(loss.compute_loss(y_true, y_pred))
+        return tape.gradient(value, y_pred)
+    loss_step(y_true, y_pred)
+    start = time.time()
+    for step_arg in range(args.num_steps):
+        loss_step(y_true, y_pred)
+    return 1000 * (time.time() - start) / args.num_steps
+
+
+def time_train_step(loss):
+    model.compile(SGD(1e-6), loss.compute_loss)
+    model.train_on_batch(images, y_true)
+    start = time.time()
+    for step_arg in range(args.num_steps):
+        model.train_on_batch(images, y_true)
+    return 1000 * (time.time() - start) / args.num_steps
+
+
+print('{:>8} {:>10} {:>10}'.format('miner', 'loss [ms]', 'step [ms]'))
+for name, loss in losses:
+    loss_time, step_time = time_loss_step(loss), time_train_step(loss)
+    print('{:>8} {:>10.1f} {:>10.1f}'.format(name, loss_time, step_time))
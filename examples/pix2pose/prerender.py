@@ -0,0 +1,56 @@
+import os
+import argparse
+from functools import partial
+
+from tensorflow.keras.utils import get_file
+from paz.backend.render import render_shards
+
+from scenes import PixelMaskRenderer
+
+OBJ_FILE = 'textured.obj'
+cache_subdir = 'paz/datasets/ycb_video/035_power_drill'
+URL = 'https://github.com/oarriaga/altamira-data/releases/download/v0.12/'
+
+description = 'Pre-renders pix2pose training samples into shards'
+parser = argparse.ArgumentParser(description=description)
+parser.add_argument('--obj_path', default=None, type=str,
+                    help='Path to OBJ model')
+parser.add_argument('--save_path', default='shards', type=str,
+                    help='Directory for writing the shards')
+parser.add_argument('--num_samples', default=50000, type=int,
+                    help='Total number of rendered samples')
+parser.add_argument('--shard_size', default=1000, type=int,
+                    help='Number of samples per shard')
+parser.add_argument('--num_workers', default=os.cpu_count(), type=int,
+                    help='Number of rendering processes')
+parser.add_argument('--seed', default=777, type=int,
+                    help='Seed of the first shard')
+parser.add_argument('--light', nargs='+', type=float, default=[1.0, 30])
+parser.add_argument('--y_fov', default=3.14159 / 4.0, type=float,
+                    help='Field of view angle in radians')
+parser.add_argument('--distance', nargs='+', type=float, default=[0.3, 0.5],
+                    help='Distance from camera to origin in meters')
+parser.add_argument('--top_only', default=0, choices=[0, 1], type=int,
+                    help='Flag for full sphere or top half for rendering')
+parser.add_argument('--roll', default=3.14159, type=float,
+                    help='Threshold for camera roll in radians')
+parser.add_argument('--shift', default=0.05, type=float,
+                    help='Threshold of random shift of camera')
+parser.add_argument('--image_size', default=128, type=int,
+                    help='Size of the side of a square image e.g. 64')
+args = parser.parse_args()
+
+
+if __name__ == '__main__':
+    obj_path = args.obj_path
+    if obj_path is None:
+        obj_path = get_file(OBJ_FILE, URL + OBJ_FILE,
+                            cache_subdir=cache_subdir)
+    size = [args.image_size, args.image_size]
+    build_renderer = partial(
+        PixelMaskRenderer, obj_path, size, args.y_fov, args.distance,
+        args.light, args.top_only, args.roll, args.shift)
+    filepaths = render_shards(build_renderer, args.num_samples,
+                              args.save_path, args.shard_size,
+                              args.num_workers, args.seed)
+    print('Wrote {} shards into {}'.format(len(filepaths), args.save_path))
@@ -17,6 +17,7 @@ from paz.models.segmentation import UNET_VGG16
 from paz.optimization.callbacks import DrawInferences
 from paz.backend.camera import Camera
 from paz.backend.image import write_image
+from paz.backend.render import ShardRenderer
 from paz.optimization.losses import WeightedReconstruction
 # from paz.pipelines.pose import RGBMaskToPose6D
 from paz.pipelines.pose import SingleInstancePIX2POSE6D
@@ -78,6 +79,8 @@ parser.add_argument('--background_wildcard', type=str,
                     help='Wildcard for backgroun images', default=os.path.join(
                         root_path,
                         '.keras/paz/datasets/voc-backgrounds/*.png'))
+parser.add_argument('--shards_path', default=None, type=str,
+                    help='Directory of shards written by prerender.py')
 args = parser.parse_args()
 
 
@@ -92,11 +95,16 @@ renderer = PixelMaskRenderer(
     args.obj_path, [H, W], args.y_fov, args.distance, args.light,
     args.top_only, args.roll, args.shift)
 
+# replaying pre-rendered shards instead of rendering every step
+training_renderer = renderer
+if args.shards_path is not None:
+    training_renderer = ShardRenderer(args.shards_path)
+
 # building full processor
 inputs_to_shape = {'input_1': [H, W, num_channels]}    # inputs RGB
 labels_to_shape = {'masks': [H, W, num_channels + 1]}  # labels RGBMask + alpha
 processor = DomainRandomization(
-    renderer, image_shape, image_paths, inputs_to_shape,
+    training_renderer, image_shape, image_paths, inputs_to_shape,
     labels_to_shape, args.num_occlusions)
 
 
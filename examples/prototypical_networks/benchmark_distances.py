@@ -0,0 +1,57 @@
+import argparse
+import timeit
+import numpy as np
+import tensorflow as tf
+from paz.models.classification.protonet import compute_pairwise_distances
+from paz.models.classification.protonet import PrototypeHead
+
+
+description = 'Benchmark of pairwise distances used in prototypical networks'
+parser = argparse.ArgumentParser(description=description)
+parser.add_argument('--seed', default=777, type=int)
+parser.add_argument('--ways', nargs='+', type=int, default=[5, 20, 100])
+parser.add_argument('--queries', default=15, type=int,
+                    help='Number of queries per class')
+parser.add_argument('--embedding_sizes', nargs='+', type=int,
+                    default=[64, 256, 1024, 4096])
+parser.add_argument('--repeats', default=20, type=int)
+args = parser.parse_args()
+
+
+def compute_tiled_distances(x, y):
+    n = x.shape[0]
+    m = y.shape[0]
+    x = tf.tile(tf.expand_dims(x, 1), [1, m, 1])
+    y = tf.tile(tf.expand_dims(y, 0), [n, 1, 1])
+    return tf.reduce_mean(tf.math.pow(x - y, 2), 2)
+
+
+def measure(function, *function_args):
+    try:
+        function(*function_args)
+    except tf.errors.ResourceExhaustedError:
+        return 'OOM'
+    time = timeit.timeit(lambda: function(*function_args), number=args.repeats)
+    return '%.3f' % (1000 * time / args.repeats)
+
+
+tiled_distances = tf.function(compute_tiled_distances)
+GEMM_distances = tf.function(compute_pairwise_distances)
+RNG = np.random.default_rng(args.seed)
+message = '{:>5} {:>6} {:>9} {:>11} {:>10} {:>10} {:>13}'
+print(message.format('ways', 'z_dim', 'queries', 'tiled [ms]',
+                     'GEMM [ms]', 'head [ms]', 'tiled [MB]'))
+for ways in args.ways:
+    for embedding_size in args.embedding_sizes:
+        num_queries = ways * args.queries
+        queries = RNG.random((num_queries, embedding_size), np.float32)
+        prototypes = RNG.random((ways, embedding_size), np.float32)
+        queries = tf.constant(queries)
+        prototypes = tf.constant(prototypes)
+        head = PrototypeHead(prototypes)
+        tiled_memory = 2 * 4 * num_queries * ways * embedding_size / 1e6
+        print(message.format(
+            ways, embedding_size, num_queries,
+            measure(tiled_distances, queries, prototypes),
+            measure(GEMM_distances, queries, prototypes),
+            measure(head, queries), '%.1f' % tiled_memory))
@@ -30,3 +30,81 @@ def resize_image_with_nearest_neighbors(image, size):
             'Recieved Image is not of type numpy array', type(image))
     else:
         return cv2.resize(image, size, interpolation=cv2.INTER_NEAREST)
+
+
+def build_lookup_table(id_to_class, size=256):
+    """Builds a lookup table mapping label ids to class indices.
+
+    # Arguments
+        id_to_class: Dictionary mapping label ids to class indices.
+        size: Int. Number of label ids covered by the table.
+
+    # Returns
+        Numpy array of shape (size) and type int16. Ids not present in
+            ``id_to_class`` are set to ``-1``.
+    """
+    lookup_table = np.full(size, -1, dtype=np.int16)
+    for label_id, class_arg in id_to_class.items():
+        if 0 <= label_id < size:
+            lookup_table[label_id] = class_arg
+    return lookup_table
+
+
+def ids_to_classes(label_ids, lookup_table):
+    """Converts an image of label ids into an image of class indices.
+
+    # Arguments
+        label_ids: Numpy array of shape (H, W) or (H, W, C). If it contains
+            channels only the first one is used.
+        lookup_table: Numpy array built with ``build_lookup_table``.
+
+    # Returns
+        Numpy array of shape (H, W) and type uint8.
+    """
+    if label_ids.ndim == 3:
+        label_ids = label_ids[..., 0]
+    class_map = lookup_table[label_ids]
+    unknown_mask = class_map < 0
+    if np.any(unknown_mask):
+        raise KeyError(np.unique(label_ids[unknown_mask]).tolist())
+    return class_map.astype(np.uint8)
+
+
+def classes_to_masks(class_map, num_classes, dtype=np.float32):
+    """Converts an image of class indices into one-hot masks.
+
+    # Arguments
+        class_map: Numpy array of shape (H, W) with class indices.
+        num_classes: Int.
+        dtype: Data type of the masks.
+
+    # Returns
+        Numpy array of shape (H, W, num_classes).
+    """
+    return np.eye(num_classes, dtype=dtype)[class_map]
+
+
+def masks_to_colors(masks, palette):
+    """Colors masks by adding the palette colors weighted by their masks.
+
+    # Arguments
+        masks: Numpy array of shape (H, W, num_classes).
+        palette: Numpy array of shape (num_classes, 3).
+
+    # Returns
+        Numpy array of shape (H, W, 3).
+    """
+    return np.matmul(masks, palette)
+
+
+def classes_to_colors(class_map, palette):
+    """Colors an image of class indices using a palette lookup.
+
+    # Arguments
+        class_map: Numpy array of shape (H, W) with class indices.
+        palette: Numpy array of shape (num_classes, 3).
+
+    # Returns
+        Numpy array of shape (H, W, 3).
+    """
+    return palette[class_map]
@@ -2,6 +2,7 @@ from paz import processors as pr
 
 from processors import PreprocessImage, Round, MasksToColors
 from processors import FromIdToMask, ResizeImageWithNearestNeighbors
+from processors import FromIdToClasses, ClassesToColors, ClassesToMasks
 
 
 class PostprocessSegmentation(pr.SequentialProcessor):
@@ -30,7 +31,17 @@ class PreprocessSegmentation(pr.SequentialProcessor):
 
 
 class PreprocessSegmentationIds(pr.SequentialProcessor):
-    def __init__(self, image_shape, num_classes, input_name='input_1'):
+    """Loads and preprocesses images and label ids.
+
+    # Arguments
+        image_shape: List of two ints [H, W].
+        num_classes: Int.
+        input_name: String. Name of the model input.
+        sparse: Boolean. If True labels are uint8 class indices of shape
+            [H, W, 1] instead of one-hot masks.
+    """
+    def __init__(self, image_shape, num_classes, input_name='input_1',
+                 sparse=False):
         super(PreprocessSegmentationIds, self).__init__()
         self.add(pr.UnpackDictionary(['image_path', 'label_path']))
         preprocess_image = pr.SequentialProcessor()
@@ -42,19 +53,60 @@ class PreprocessSegmentationIds(pr.SequentialProcessor):
         preprocess_label = pr.SequentialProcessor()
         preprocess_label.add(pr.LoadImage())
         preprocess_label.add(ResizeImageWithNearestNeighbors(image_shape))
-        preprocess_label.add(FromIdToMask())
+        if sparse:
+            preprocess_label.add(FromIdToClasses())
+            preprocess_label.add(pr.ExpandDims(-1))
+            label_shape = [*image_shape[:2], 1]
+        else:
+            preprocess_label.add(FromIdToMask())
+            label_shape = [*image_shape[:2], num_classes]
 
         self.add(pr.ControlMap(preprocess_image, [0], [0]))
         self.add(pr.ControlMap(preprocess_label, [1], [1]))
         H, W = image_shape[:2]
         self.add(pr.SequenceWrapper({0: {input_name: [H, W, 3]}},
-                                    {1: {'masks': [H, W, num_classes]}}))
+                                    {1: {'masks': label_shape}}))
+
+
+class PreprocessSegmentationStore(pr.SequentialProcessor):
+    """Preprocesses images and class indices loaded from a sample store.
+
+    # Arguments
+        image_shape: List of two ints [H, W].
+        num_classes: Int.
+        input_name: String. Name of the model input.
+        sparse: Boolean. If True labels are uint8 class indices of shape
+            [H, W, 1] instead of one-hot masks.
+    """
+    def __init__(self, image_shape, num_classes, input_name='input_1',
+                 sparse=False):
+        super(PreprocessSegmentationStore, self).__init__()
+        self.add(pr.UnpackDictionary(['image', 'classes']))
+        preprocess_image = pr.SequentialProcessor()
+        preprocess_image.add(pr.ConvertColorSpace(pr.RGB2BGR))
+        preprocess_image.add(pr.CastImage('float32'))
+        preprocess_image.add(pr.SubtractMeanImage(pr.BGR_IMAGENET_MEAN))
+        if sparse:
+            preprocess_label = pr.ExpandDims(-1)
+            label_shape = [*image_shape[:2], 1]
+        else:
+            preprocess_label = ClassesToMasks(num_classes)
+            label_shape = [*image_shape[:2], num_classes]
+        self.add(pr.ControlMap(preprocess_image, [0], [0]))
+        self.add(pr.ControlMap(preprocess_label, [1], [1]))
+        H, W = image_shape[:2]
+        self.add(pr.SequenceWrapper({0: {input_name: [H, W, 3]}},
+                                    {1: {'masks': label_shape}}))
 
 
 class PostprocessSegmentationIds(pr.SequentialProcessor):
-    def __init__(self, num_classes, colors=None):
+    def __init__(self, num_classes, colors=None, sparse=False):
         super(PostprocessSegmentationIds, self).__init__()
-        self.add(MasksToColors(num_classes, colors))
+        if sparse:
+            self.add(pr.Squeeze(-1))
+            self.add(ClassesToColors(num_classes, colors))
+        else:
+            self.add(MasksToColors(num_classes, colors))
         self.add(pr.DenormalizeImage())
         self.add(pr.CastImage('uint8'))
 
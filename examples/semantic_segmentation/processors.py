@@ -2,6 +2,8 @@ from paz import processors as pr
 from paz.backend.image.draw import lincolor
 # from paz.backend.image import show_image
 from backend import resize_image_with_nearest_neighbors
+from backend import build_lookup_table, ids_to_classes, classes_to_masks
+from backend import masks_to_colors, classes_to_colors
 import numpy as np
 
 
@@ -19,23 +21,53 @@ CITY_ESCAPES_ID_TO_MASK = {
     31: 7, 32: 7, 33: 7, -1: 7}
 
 
-class FromIdToMask(pr.Processor):
+class FromIdToClasses(pr.Processor):
+    """Converts an image of label ids into a uint8 image of class indices.
+
+    # Arguments
+        id_to_mask: Dictionary mapping label ids to class indices.
+    """
     def __init__(self, id_to_mask=CITY_ESCAPES_ID_TO_MASK):
+        super(FromIdToClasses, self).__init__()
+        self.lookup_table = build_lookup_table(id_to_mask)
+        self.num_classes = len(set(list(id_to_mask.values())))
+
+    def call(self, image):
+        return ids_to_classes(image, self.lookup_table)
+
+
+class FromIdToMask(pr.Processor):
+    """Converts an image of label ids into one-hot masks.
+
+    # Arguments
+        id_to_mask: Dictionary mapping label ids to class indices.
+        dtype: Data type of the masks.
+    """
+    def __init__(self, id_to_mask=CITY_ESCAPES_ID_TO_MASK, dtype='float32'):
         super(FromIdToMask, self).__init__()
-        self.id_to_mask = id_to_mask
-        self.num_classes = len(set(list(self.id_to_mask.values())))
+        self.to_classes = FromIdToClasses(id_to_mask)
+        self.num_classes = self.to_classes.num_classes
+        self.dtype = dtype
 
     def call(self, image):
-        H, W = image.shape[:2]
-        masks = np.zeros((H, W, self.num_classes))
-        unique_ids = np.unique(image)
-        for unique_id in unique_ids:
-            mask_arg = self.id_to_mask[unique_id]
-            id_mask = image[:, :, 0] == unique_id
-            mask = masks[:, :, mask_arg]
-            mask = mask + id_mask.astype('int')
-            masks[:, :, mask_arg] = mask
-        return masks
+        class_map = self.to_classes(image)
+        return classes_to_masks(class_map, self.num_classes, self.dtype)
+
+
+class ClassesToMasks(pr.Processor):
+    """Converts an image of class indices into one-hot masks.
+
+    # Arguments
+        num_classes: Int.
+        dtype: Data type of the masks.
+    """
+    def __init__(self, num_classes, dtype='float32'):
+        super(ClassesToMasks, self).__init__()
+        self.num_classes = num_classes
+        self.dtype = dtype
+
+    def call(self, class_map):
+        return classes_to_masks(class_map, self.num_classes, self.dtype)
 
 
 class ResizeImageWithNearestNeighbors(pr.Processor):
@@ -54,21 +86,25 @@ class MasksToColors(pr.Processor):
         self.colors = colors
         if self.colors is None:
             self.colors = lincolor(self.num_classes, normalized=True)
+        self.palette = np.array(self.colors, dtype=np.float64)
 
     def call(self, masks):
         H, W, num_masks = masks.shape
         assert num_masks == self.num_classes
-        image = np.zeros((H, W, 3))
-        for mask_arg in range(self.num_classes):
-            mask = masks[..., mask_arg]
-            mask = np.expand_dims(mask, axis=-1)
-            mask = np.repeat(mask, 3, axis=-1)
-            color = self.colors[mask_arg]
-            color_mask = color * mask
-            # image = (image + color_mask) / 2.0
-            image = image + color_mask
-            # show_image((255 * image).astype('uint8'))
-        return image
+        return masks_to_colors(masks, self.palette)
+
+
+class ClassesToColors(pr.Processor):
+    def __init__(self, num_classes, colors=None):
+        super(ClassesToColors, self).__init__()
+        self.num_classes = num_classes
+        self.colors = colors
+        if self.colors is None:
+            self.colors = lincolor(self.num_classes, normalized=True)
+        self.palette = np.array(self.colors, dtype=np.float64)
+
+    def call(self, class_map):
+        return classes_to_colors(class_map, self.palette)
 
 
 class Round(pr.Processor):
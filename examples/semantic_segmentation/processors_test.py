@@ -0,0 +1,71 @@
+import pytest
+import numpy as np
+
+from processors import CITY_ESCAPES_ID_TO_MASK
+from processors import FromIdToMask, FromIdToClasses
+from processors import MasksToColors, ClassesToColors, ClassesToMasks
+
+
+def from_id_to_mask_loop(image, id_to_mask):
+    num_classes = len(set(list(id_to_mask.values())))
+    H, W = image.shape[:2]
+    masks = np.zeros((H, W, num_classes))
+    for unique_id in np.unique(image):
+        mask_arg = id_to_mask[unique_id]
+        masks[:, :, mask_arg] += (image[:, :, 0] == unique_id)
+    return masks
+
+
+def masks_to_colors_loop(masks, colors):
+    H, W, num_classes = masks.shape
+    image = np.zeros((H, W, 3))
+    for mask_arg in range(num_classes):
+        mask = np.repeat(masks[..., mask_arg:mask_arg + 1], 3, axis=-1)
+        image = image + np.asarray(colors[mask_arg]) * mask
+    return image
+
+
+@pytest.fixture
+def label_ids():
+    label_ids = np.random.RandomState(777).randint(0, 34, (12, 16))
+    return np.repeat(label_ids[..., np.newaxis], 3, axis=-1).astype('uint8')
+
+
+def test_from_id_to_mask_equals_loop(label_ids):
+    masks = FromIdToMask()(label_ids)
+    assert masks.dtype == np.float32
+    assert np.array_equal(
+        masks, from_id_to_mask_loop(label_ids, CITY_ESCAPES_ID_TO_MASK))
+
+
+def test_one_hot_and_uint8_outputs_agree(label_ids):
+    classes = FromIdToClasses()(label_ids)
+    masks = FromIdToMask()(label_ids)
+    assert classes.dtype == np.uint8
+    assert classes.shape == (12, 16)
+    assert np.array_equal(np.argmax(masks, axis=-1), classes)
+    assert np.array_equal(ClassesToMasks(8)(classes), masks)
+
+
+def test_unknown_label_ids_raise_key_error(label_ids):
+    label_ids[0, 0] = 200
+    with pytest.raises(KeyError):
+        FromIdToClasses()(label_ids)
+    with pytest.raises(KeyError):
+        FromIdToMask()(label_ids)
+
+
+def test_masks_to_colors_blends_soft_masks():
+    colors = np.random.RandomState(777).uniform(0, 1, (4, 3)).tolist()
+    masks = np.random.RandomState(7).uniform(0, 1, (5, 6, 4))
+    colored_masks = MasksToColors(4, colors)(masks)
+    assert colored_masks.shape == (5, 6, 3)
+    assert np.allclose(colored_masks, masks_to_colors_loop(masks, colors))
+
+
+def test_palette_colorization_of_classes(label_ids):
+    classes = FromIdToClasses()(label_ids)
+    masks = FromIdToMask()(label_ids)
+    colors = ClassesToColors(8)(classes)
+    assert colors.shape == (12, 16, 3)
+    assert np.allclose(colors, MasksToColors(8)(masks))
@@ -0,0 +1,113 @@
+import os
+import json
+import numpy as np
+from paz.backend.image import load_image, resize_image
+
+from backend import resize_image_with_nearest_neighbors
+from backend import build_lookup_table, ids_to_classes
+
+
+def _build_index(dataset, image_shape, id_to_class, chunk_size):
+    return {'image_shape': list(image_shape),
+            'id_to_class': {str(key): int(value)
+                            for key, value in sorted(id_to_class.items())},
+            'chunk_size': chunk_size,
+            'image_paths': [sample['image_path'] for sample in dataset],
+            'label_paths': [sample['label_path'] for sample in dataset]}
+
+
+def _chunk_filepaths(path, chunk_arg):
+    image_filepath = os.path.join(path, 'images_%05d.npy' % chunk_arg)
+    label_filepath = os.path.join(path, 'labels_%05d.npy' % chunk_arg)
+    return image_filepath, label_filepath
+
+
+def _has_chunks(path, num_samples, chunk_size):
+    num_chunks = int(np.ceil(num_samples / chunk_size))
+    for chunk_arg in range(num_chunks):
+        for filepath in _chunk_filepaths(path, chunk_arg):
+            if not os.path.exists(filepath):
+                return False
+    return True
+
+
+def write_sample_store(dataset, path, image_shape, id_to_class,
+                       chunk_size=500):
+    """Decodes, resizes and writes a split into chunked uint8 arrays.
+
+    # Arguments
+        dataset: List of dictionaries with keys ``image_path`` and
+            ``label_path`` e.g. the output of ``CityScapes.load_data``.
+        path: String. Directory in which the chunks are written.
+        image_shape: List of two ints [H, W].
+        id_to_class: Dictionary mapping label ids to class indices.
+        chunk_size: Int. Number of samples per chunk.
+
+    # Returns
+        Dictionary with the written index.
+    """
+    if not os.path.exists(path):
+        os.makedirs(path)
+    index_filepath = os.path.join(path, 'index.json')
+    if os.path.exists(index_filepath):
+        os.remove(index_filepath)
+    H, W = image_shape
+    lookup_table = build_lookup_table(id_to_class)
+    for chunk_arg, start in enumerate(range(0, len(dataset), chunk_size)):
+        chunk = dataset[start:start + chunk_size]
+        image_filepath, label_filepath = _chunk_filepaths(path, chunk_arg)
+        images = np.lib.format.open_memmap(
+            image_filepath, 'w+', np.uint8, (len(chunk), H, W, 3))
+        labels = np.lib.format.open_memmap(
+            label_filepath, 'w+', np.uint8, (len(chunk), H, W))
+        for sample_arg, sample in enumerate(chunk):
+            image = load_image(sample['image_path'])
+            images[sample_arg] = resize_image(image, (W, H))
+            label = load_image(sample['label_path'])
+            label = resize_image_with_nearest_neighbors(label, (W, H))
+            labels[sample_arg] = ids_to_classes(label, lookup_table)
+        images.flush()
+        labels.flush()
+    index = _build_index(dataset, image_shape, id_to_class, chunk_size)
+    with open(index_filepath, 'w') as filer:
+        json.dump(index, filer)
+    return index
+
+
+def load_sample_store(dataset, path, image_shape, id_to_class,
+                      chunk_size=500):
+    """Loads a split from memory-mapped chunks. The chunks are (re)written
+        if any of them is missing or if the image shape, class mapping,
+        chunk size or dataset paths changed.
+
+    # Arguments
+        dataset: List of dictionaries with keys ``image_path`` and
+            ``label_path`` e.g. the output of ``CityScapes.load_data``.
+        path: String. Directory of the chunks.
+        image_shape: List of two ints [H, W].
+        id_to_class: Dictionary mapping label ids to class indices.
+        chunk_size: Int. Number of samples per chunk.
+
+    # Returns
+        List of dictionaries with keys ``image`` of shape [H, W, 3] and
+            ``classes`` of shape [H, W]. Both are read-only memory maps.
+    """
+    index = _build_index(dataset, image_shape, id_to_class, chunk_size)
+    index_filepath = os.path.join(path, 'index.json')
+    stored_index = None
+    if os.path.exists(index_filepath):
+        with open(index_filepath, 'r') as filer:
+            stored_index = json.load(filer)
+    has_chunks = _has_chunks(path, len(dataset), chunk_size)
+    if stored_index != index or not has_chunks:
+        write_sample_store(dataset, path, image_shape, id_to_class,
+                           chunk_size)
+    samples = []
+    num_chunks = int(np.ceil(len(dataset) / chunk_size))
+    for chunk_arg in range(num_chunks):
+        image_filepath, label_filepath = _chunk_filepaths(path, chunk_arg)
+        images = np.load(image_filepath, mmap_mode='r')
+        labels = np.load(label_filepath, mmap_mode='r')
+        for image, label in zip(images, labels):
+            samples.append({'image': image, 'classes': label})
+    return samples
@@ -0,0 +1,93 @@
+import os
+
+import pytest
+import numpy as np
+from paz.backend.image import write_image
+
+from sample_store import load_sample_store
+
+
+ID_TO_CLASS = {0: 0, 7: 1, 26: 2}
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    random_state = np.random.RandomState(777)
+    label_ids = np.array(list(ID_TO_CLASS.keys()), dtype=np.uint8)
+    dataset = []
+    for sample_arg in range(5):
+        image = random_state.randint(0, 256, (8, 12, 3)).astype('uint8')
+        label = label_ids[random_state.randint(0, 3, (8, 12))]
+        label = np.repeat(label[..., np.newaxis], 3, axis=-1)
+        image_path = os.path.join(str(tmp_path), 'image_%d.png' % sample_arg)
+        label_path = os.path.join(str(tmp_path), 'label_%d.png' % sample_arg)
+        write_image(image_path, image)
+        write_image(label_path, label)
+        dataset.append({'image_path': image_path, 'label_path': label_path,
+                        'label': label[..., 0]})
+    return dataset
+
+
+def to_classes(label, id_to_class):
+    classes = np.zeros(label.shape, dtype=np.uint8)
+    for label_id, class_arg in id_to_class.items():
+        classes[label == label_id] = class_arg
+    return classes
+
+
+def test_round_trip(tmp_path, dataset):
+    path = os.path.join(str(tmp_path), 'store')
+    samples = load_sample_store(dataset, path, [4, 6], ID_TO_CLASS, 2)
+    assert len(samples) == 5
+    for sample, data in zip(samples, dataset):
+        assert sample['image'].shape == (4, 6, 3)
+        assert sample['image'].dtype == np.uint8
+        assert sample['classes'].shape == (4, 6)
+        assert sample['classes'].dtype == np.uint8
+        label = data['label'][::2, ::2]
+        assert np.array_equal(sample['classes'],
+                              to_classes(label, ID_TO_CLASS))
+    assert sorted(os.listdir(path)) == [
+        'images_00000.npy', 'images_00001.npy', 'images_00002.npy',
+        'index.json',
+        'labels_00000.npy', 'labels_00001.npy', 'labels_00002.npy']
+
+
+def test_changed_image_shape_rebuilds(tmp_path, dataset):
+    path = os.path.join(str(tmp_path), 'store')
+    load_sample_store(dataset, path, [4, 6], ID_TO_CLASS, 2)
+    samples = load_sample_store(dataset, path, [8, 12], ID_TO_CLASS, 2)
+    assert samples[0]['image'].shape == (8, 12, 3)
+    assert np.array_equal(samples[0]['classes'],
+                          to_classes(dataset[0]['label'], ID_TO_CLASS))
+
+
+def test_changed_id_to_class_rebuilds(tmp_path, dataset):
+    path = os.path.join(str(tmp_path), 'store')
+    load_sample_store(dataset, path, [4, 6], ID_TO_CLASS, 2)
+    id_to_class = {0: 2, 7: 0, 26: 1}
+    samples = load_sample_store(dataset, path, [4, 6], id_to_class, 2)
+    for sample, data in zip(samples, dataset):
+        label = data['label'][::2, ::2]
+        assert np.array_equal(sample['classes'],
+                              to_classes(label, id_to_class))
+
+
+def test_changed_chunk_size_rebuilds(tmp_path, dataset):
+    path = os.path.join(str(tmp_path), 'store')
+    load_sample_store(dataset, path, [4, 6], ID_TO_CLASS, 2)
+    samples = load_sample_store(dataset, path, [4, 6], ID_TO_CLASS, 5)
+    assert len(samples) == 5
+    images = np.load(os.path.join(path, 'images_00000.npy'), mmap_mode='r')
+    assert len(images) == 5
+
+
+def test_missing_chunk_rebuilds(tmp_path, dataset):
+    path = os.path.join(str(tmp_path), 'store')
+    load_sample_store(dataset, path, [4, 6], ID_TO_CLASS, 2)
+    os.remove(os.path.join(path, 'labels_00001.npy'))
+    samples = load_sample_store(dataset, path, [4, 6], ID_TO_CLASS, 2)
+    assert len(samples) == 5
+    label = dataset[2]['label'][::2, ::2]
+    assert np.array_equal(samples[2]['classes'],
+                          to_classes(label, ID_TO_CLASS))
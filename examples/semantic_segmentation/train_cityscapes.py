@@ -17,6 +17,9 @@ from paz.models import UNET_VGG16, UNET_VGG19, UNET_RESNET50
 from paz.datasets import CityScapes
 
 from pipelines import PreprocessSegmentationIds
+from pipelines import PreprocessSegmentationStore
+from processors import CITY_ESCAPES_ID_TO_MASK
+from sample_store import load_sample_store
 
 
 description = 'Training script for semantic segmentation'
@@ -53,6 +56,10 @@ parser.add_argument('-f', '--freeze_backbone', default=True, type=bool,
                     help='If True backbone in UNET is frozen.')
 parser.add_argument('-x', '--loss', default='dice', type=str,
                     choices=['dice', 'jaccard', 'focal', 'all'])
+parser.add_argument('-c', '--cache_path', default=None, type=str,
+                    help='Directory for caching decoded and resized splits')
+parser.add_argument('--chunk_size', default=500, type=int,
+                    help='Number of cached samples per chunk')
 args = parser.parse_args()
 
 
@@ -65,20 +72,27 @@ if args.validation_split not in splits:
 name_to_manager = {'CityScapes': CityScapes}
 
 # loading splits
+image_shape = (args.image_size, args.image_size)
 data_managers, datasets = {}, {}
 for split in splits:
     args_manager = [args.image_path, args.label_path, split]
     data_manager = name_to_manager[args.dataset](*args_manager)
     data_managers[split] = data_manager
     datasets[split] = data_manager.load_data()
+    if args.cache_path is not None:
+        datasets[split] = load_sample_store(
+            datasets[split], os.path.join(args.cache_path, split),
+            image_shape, CITY_ESCAPES_ID_TO_MASK, args.chunk_size)
 
 # instantiating sequencers
 sequencers = {}
 for split in splits:
     data_manager = data_managers[split]
     num_classes = data_manager.num_classes
-    image_shape = (args.image_size, args.image_size)
-    processor = PreprocessSegmentationIds(image_shape, num_classes)
+    if args.cache_path is not None:
+        processor = PreprocessSegmentationStore(image_shape, num_classes)
+    else:
+        processor = PreprocessSegmentationIds(image_shape, num_classes)
     sequencers[split] = ProcessingSequence(
         processor, args.batch_size, datasets[split])
 
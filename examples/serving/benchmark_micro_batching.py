@@ -0,0 +1,95 @@
+import time
+import asyncio
+import argparse
+import numpy as np
+from tensorflow.keras.layers import Conv2D
+
+from paz.models import SSD300
+from paz.pipelines import DetectSingleShot
+from paz.serving import MicroBatchingService
+
+
+description = 'Local load generator for the micro-batching service'
+parser = argparse.ArgumentParser(description=description)
+parser.add_argument('-c', '--clients', nargs='+', type=int, default=[1, 8, 32],
+                    help='Number of concurrent clients')
+parser.add_argument('-r', '--requests', default=8, type=int,
+                    help='Number of requests sent by every client')
+parser.add_argument('-b', '--max_batch_size', default=16, type=int,
+                    help='Maximum number of images per model call')
+parser.add_argument('-w', '--max_wait', default=0.005, type=float,
+                    help='Maximum seconds a batch waits for requests')
+parser.add_argument('-s', '--seed', default=777, type=int)
+args = parser.parse_args()
+
+
+def bias_towards_background(model, num_classes):
+    # randomly initialized heads score all classes alike and non-maximum
+    # suppression would dominate; trained detectors mostly see background
+    for layer in model.layers:
+        if not isinstance(layer, Conv2D) or layer.filters % num_classes:
+            continue
+        if layer.filters in [4 * num_classes, 6 * num_classes]:
+            kernel, bias = layer.get_weights()
+            bias[::num_classes] = 10.0
+            layer.set_weights([np.zeros_like(kernel), bias])
+
+
+# randomly initialized weights keep the benchmark free of downloads
+model = SSD300(base_weights=None, head_weights=None)
+class_names = ['background'] + ['class_%d' % arg for arg in range(20)]
+bias_towards_background(model, len(class_names))
+pipeline = DetectSingleShot(model, class_names, 0.6, 0.45, draw=False)
+RNG = np.random.default_rng(args.seed)
+image = RNG.integers(0, 256, (480, 640, 3), dtype=np.uint8)
+pipeline(image)
+
+
+async def client(predict, num_requests, latencies):
+    for request_arg in range(num_requests):
+        start = time.time()
+        await predict(image)
+        latencies.append(time.time() - start)
+
+
+async def run_sequential(num_clients):
+    # every request triggers its own forward pass
+    lock = asyncio.Lock()
+    loop = asyncio.get_running_loop()
+
+    async def predict(image):
+        async with lock:
+            return await loop.run_in_executor(None, pipeline, image)
+
+    latencies = []
+    await asyncio.gather(*[client(predict, args.requests, latencies)
+                           for _ in range(num_clients)])
+    return latencies, None
+
+
+async def run_batched(num_clients):
+    service = MicroBatchingService(
+        pipeline, args.max_batch_size, args.max_wait)
+    await service.start()
+    latencies = []
+    await asyncio.gather(*[client(service.predict, args.requests, latencies)
+                           for _ in range(num_clients)])
+    await service.stop()
+    return latencies, service.metrics
+
+
+message = '{:>8} {:>10} {:>10} {:>12} {:>12} {:>11}'
+print(message.format('clients', 'mode', 'img/s', 'p50 [ms]', 'p95 [ms]',
+                     'mean batch'))
+for num_clients in args.clients:
+    for mode, run in [('single', run_sequential), ('batched', run_batched)]:
+        start = time.time()
+        latencies, metrics = asyncio.run(run(num_clients))
+        seconds = time.time() - start
+        mean_batch_size = 1.0 if metrics is None else metrics[
+            'mean_batch_size']
+        print(message.format(
+            num_clients, mode, '%.1f' % (len(latencies) / seconds),
+            '%.1f' % (1000 * np.percentile(latencies, 50)),
+            '%.1f' % (1000 * np.percentile(latencies, 95)),
+            '%.2f' % mean_batch_size))
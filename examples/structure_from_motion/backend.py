@@ -418,12 +418,369 @@ def compute_sampson_distance(F, points1, points2):
     return distance
 
 
+def center_and_normalize_points_batch(points):
+    """
+    Center and normalize a batch of 2D point sets.
+
+    # Arguments
+        points -- numpy array of shape (n_sets, n_points, 2)
+                  containing the 2D points of every set
+
+    # Returns
+        T -- numpy array of shape (n_sets, 3, 3)
+             normalization matrices that were applied to each set
+        normalized_points -- numpy array of shape (n_sets, n_points, 2)
+                            containing the normalized points
+    """
+    num_sets, N, D = points.shape
+    centroid = np.mean(points, axis=1, keepdims=True)
+    centered_points = points - centroid
+    rms_distance = np.sqrt(np.sum(centered_points ** 2, axis=(1, 2)) / N)
+    with np.errstate(divide='ignore'):
+        scale = np.sqrt(D) / rms_distance
+
+    T = np.zeros((num_sets, 3, 3))
+    T[:, 0, 0] = scale
+    T[:, 1, 1] = scale
+    T[:, 0, 2] = -scale * centroid[:, 0, 0]
+    T[:, 1, 2] = -scale * centroid[:, 0, 1]
+    T[:, 2, 2] = 1
+    normalized_points = scale[:, None, None] * centered_points
+    return T, normalized_points
+
+
+def solve_null_space(A):
+    """
+    Solve a batch of homogeneous linear systems A x = 0 with the SVD.
+
+    # Arguments
+        A -- numpy array of shape (n_systems, n_rows, n_columns)
+             containing the stacked design matrices
+
+    # Returns
+        x -- numpy array of shape (n_systems, n_columns)
+             right singular vectors of the least singular values
+    """
+    num_rows, num_columns = A.shape[-2:]
+    # thin SVDs are only valid when the null space is fully determined
+    full_matrices = num_rows < num_columns
+    _, _, V = np.linalg.svd(A, full_matrices=full_matrices)
+    return V[:, -1, :]
+
+
+def compute_fundamental_matrices_np(points1, points2):
+    """
+    Compute a batch of fundamental matrices with the normalized
+    eight-point algorithm using a single stacked SVD.
+
+    # Arguments
+        points1 -- numpy array of shape (n_models, n_points, 2)
+                containing the 2D points in the first image
+        points2 -- numpy array of shape (n_models, n_points, 2)
+                containing the 2D points in the second image
+
+    # Returns
+        F -- numpy array of shape (n_models, 3, 3)
+            containing the fundamental matrices
+    """
+    T1, points1 = center_and_normalize_points_batch(points1)
+    T2, points2 = center_and_normalize_points_batch(points2)
+    x1, y1 = points1[..., 0], points1[..., 1]
+    x2, y2 = points2[..., 0], points2[..., 1]
+    ones = np.ones_like(x1)
+    A = np.stack([x1 * x2, x2 * y1, x2, y2 * x1, y1 * y2, y2, x1, y1, ones],
+                 axis=-1)
+    F = solve_null_space(A).reshape((-1, 3, 3))
+
+    # Enforce the rank-2 constraint on F
+    U, S, V = np.linalg.svd(F)
+    S[:, -1] = 0
+    F = np.matmul(U * S[:, None, :], V)
+
+    # De-normalize F
+    F = np.matmul(np.matmul(np.transpose(T2, (0, 2, 1)), F), T1)
+    return F
+
+
+def compute_homographies_np(points1, points2):
+    """
+    Compute a batch of homographies with the normalized direct linear
+    transform using a single stacked SVD.
+
+    # Arguments
+        points1 -- numpy array of shape (n_models, n_points, 2)
+                containing the 2D points in the first image
+        points2 -- numpy array of shape (n_models, n_points, 2)
+                containing the 2D points in the second image
+
+    # Returns
+        H -- numpy array of shape (n_models, 3, 3)
+            containing the homographies mapping points1 to points2
+    """
+    T1, points1 = center_and_normalize_points_batch(points1)
+    T2, points2 = center_and_normalize_points_batch(points2)
+    x1, y1 = points1[..., 0], points1[..., 1]
+    x2, y2 = points2[..., 0], points2[..., 1]
+    zeros, ones = np.zeros_like(x1), np.ones_like(x1)
+    rows_x = np.stack([-x1, -y1, -ones, zeros, zeros, zeros,
+                       x2 * x1, x2 * y1, x2], axis=-1)
+    rows_y = np.stack([zeros, zeros, zeros, -x1, -y1, -ones,
+                       y2 * x1, y2 * y1, y2], axis=-1)
+    A = np.concatenate([rows_x, rows_y], axis=1)
+    H = solve_null_space(A).reshape((-1, 3, 3))
+
+    # De-normalize H
+    with np.errstate(divide='ignore', invalid='ignore'):
+        H = np.matmul(np.matmul(np.linalg.pinv(T2), H), T1)
+        H = H / H[:, 2:3, 2:3]
+    return H
+
+
+def compute_sampson_distances(F, points1, points2):
+    """
+    Compute the Sampson distances of all corresponding points for a
+    batch of fundamental matrices.
+
+    # Arguments
+        F -- numpy array of shape (n_models, 3, 3)
+            containing the fundamental matrices
+        points1 -- numpy array of shape (n_points, 2)
+                containing the 2D points in the first image
+        points2 -- numpy array of shape (n_points, 2)
+                containing the corresponding 2D points in the second image
+
+    # Returns
+        distance -- numpy array of shape (n_models, n_points)
+                    containing the Sampson distance of every point
+                    for every model
+    """
+    ones = np.ones((points1.shape[0], 1))
+    points1_homogeneous = np.hstack((points1, ones))
+    points2_homogeneous = np.hstack((points2, ones))
+
+    points1_transformed = np.einsum('bij,nj->bni', F, points1_homogeneous)
+    points2_transformed = np.einsum('bji,nj->bni', F, points2_homogeneous)
+
+    numerator = np.sum(points2_homogeneous * points1_transformed, axis=2)
+    sum_points1 = np.sum(points1_transformed[..., :2] ** 2, axis=2)
+    sum_points2 = np.sum(points2_transformed[..., :2] ** 2, axis=2)
+    denominator = sum_points1 + sum_points2
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        distance = np.abs(numerator) / np.sqrt(denominator)
+    distance[~np.isfinite(distance)] = np.inf
+    return distance
+
+
+def compute_transfer_distances(H, points1, points2):
+    """
+    Compute the transfer errors of all corresponding points for a batch
+    of homographies.
+
+    # Arguments
+        H -- numpy array of shape (n_models, 3, 3)
+            containing the homographies mapping points1 to points2
+        points1 -- numpy array of shape (n_points, 2)
+                containing the 2D points in the first image
+        points2 -- numpy array of shape (n_points, 2)
+                containing the corresponding 2D points in the second image
+
+    # Returns
+        distance -- numpy array of shape (n_models, n_points)
+                    containing the transfer error of every point
+                    for every model
+    """
+    ones = np.ones((points1.shape[0], 1))
+    points1_homogeneous = np.hstack((points1, ones))
+    projected_points = np.einsum('bij,nj->bni', H, points1_homogeneous)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        points2_predicted = projected_points[..., :2] / projected_points[
+            ..., 2:]
+        distance = np.linalg.norm(points2 - points2_predicted, axis=2)
+    distance[~np.isfinite(distance)] = np.inf
+    return distance
+
+
+def sample_minimal_sets(num_points, min_samples, num_sets):
+    """
+    Draw a batch of random minimal sets of distinct point indices.
+
+    # Arguments
+        num_points -- int
+                    number of points to sample from
+        min_samples -- int
+                    number of indices in every set
+        num_sets -- int
+                    number of sets to draw
+
+    # Returns
+        indices -- numpy array of shape (num_sets, min_samples)
+                containing distinct indices in every row
+    """
+    indices = np.random.randint(0, num_points, (num_sets, min_samples))
+    while True:
+        sorted_indices = np.sort(indices, axis=1)
+        repeated = np.any(sorted_indices[:, 1:] == sorted_indices[:, :-1],
+                          axis=1)
+        num_repeated = np.count_nonzero(repeated)
+        if num_repeated == 0:
+            return indices
+        indices[repeated] = np.random.randint(
+            0, num_points, (num_repeated, min_samples))
+
+
+def score_hypotheses(distances, residual_threshold):
+    """
+    Score a batch of model hypotheses by their residuals.
+
+    # Arguments
+        distances -- numpy array of shape (n_models, n_points)
+                    containing the residual of every point for every model
+        residual_threshold -- float
+                            threshold for considering a point an inlier
+
+    # Returns
+        inliers -- boolean numpy array of shape (n_models, n_points)
+        num_inliers -- numpy array of shape (n_models,)
+        distance_sums -- numpy array of shape (n_models,)
+                        containing the sum of squared residuals
+    """
+    inliers = distances < residual_threshold
+    num_inliers = np.count_nonzero(inliers, axis=1)
+    distance_sums = np.sum(distances ** 2, axis=1)
+    return inliers, num_inliers, distance_sums
+
+
+def compute_num_ransac_trials(inlier_ratio, min_samples, confidence):
+    """
+    Compute the number of RANSAC trials required to draw at least one
+    outlier-free sample with the given confidence.
+
+    # Arguments
+        inlier_ratio -- float
+                        fraction of points that are inliers
+        min_samples -- int
+                    minimum number of samples required to fit the model
+        confidence -- float
+                    probability of drawing an outlier-free sample
+
+    # Returns
+        num_trials -- float
+                    required number of trials (``np.inf`` if unbounded)
+    """
+    probability = inlier_ratio ** min_samples
+    if probability >= 1.0:
+        return 1
+    if probability <= np.finfo(float).eps:
+        return np.inf
+    return np.ceil(np.log(1.0 - confidence) / np.log(1.0 - probability))
+
+
+def _is_better(num_inliers, distance_sum, best_num_inliers, best_distance_sum):
+    return (num_inliers > best_num_inliers or
+            (num_inliers == best_num_inliers and
+                distance_sum < best_distance_sum))
+
+
+def ransac_np(points1, points2, fit_models, compute_residuals, min_samples,
+              residual_threshold, max_trials=1000, batch_size=64,
+              confidence=0.99, local_iterations=0):
+    """
+    Robustly estimate a two-view model using batched RANSAC.
+
+    Minimal sets are drawn, solved and scored ``batch_size`` hypotheses at
+    a time. After every batch the number of required trials is updated from
+    the best inlier ratio found so far. If ``local_iterations`` is positive
+    every new best model is refined LO-RANSAC style by re-fitting it to all
+    its inliers until the consensus set stops growing.
+
+    # Arguments
+        points1 -- numpy array of shape (n_points, 2)
+                containing the 2D points in the first image
+        points2 -- numpy array of shape (n_points, 2)
+                containing the corresponding 2D points in the second image
+        fit_models -- function
+                    mapping two arrays of shape (n_models, n_samples, 2)
+                    to an array of models of shape (n_models, 3, 3)
+        compute_residuals -- function
+                    mapping models and all points to residuals of shape
+                    (n_models, n_points)
+        min_samples -- int
+                    minimum number of samples required to fit the model
+        residual_threshold -- float
+                            threshold for considering a point an inlier
+        max_trials -- int
+                    maximum number of hypotheses to evaluate
+        batch_size -- int
+                    number of hypotheses solved and scored at once
+        confidence -- float
+                    probability used for adaptive termination
+        local_iterations -- int
+                    maximum number of LO-RANSAC refinement steps
+
+    # Returns
+        model -- numpy array of shape (3, 3)
+                representing the estimated model
+        inliers -- boolean numpy array of shape (n_points,)
+                indicating which points are inliers to the estimated model
+    """
+    num_points = len(points1)
+    best_model = None
+    best_inliers = None
+    best_num_inliers = 0
+    best_distance_sum = np.inf
+    if num_points < min_samples:
+        return best_model, best_inliers
+
+    num_trials, trial_arg = max_trials, 0
+    while trial_arg < num_trials:
+        num_hypotheses = int(min(batch_size, num_trials - trial_arg))
+        indices = sample_minimal_sets(num_points, min_samples, num_hypotheses)
+        models = fit_models(points1[indices], points2[indices])
+        distances = compute_residuals(models, points1, points2)
+        inliers, num_inliers, distance_sums = score_hypotheses(
+            distances, residual_threshold)
+        trial_arg = trial_arg + num_hypotheses
+
+        best_arg = np.lexsort((distance_sums, -num_inliers))[0]
+        if not _is_better(num_inliers[best_arg], distance_sums[best_arg],
+                          best_num_inliers, best_distance_sum):
+            continue
+        best_model = models[best_arg]
+        best_inliers = inliers[best_arg]
+        best_num_inliers = num_inliers[best_arg]
+        best_distance_sum = distance_sums[best_arg]
+
+        for local_arg in range(local_iterations):
+            if best_num_inliers <= min_samples:
+                break
+            model = fit_models(points1[best_inliers][None],
+                               points2[best_inliers][None])
+            distances = compute_residuals(model, points1, points2)
+            inliers, num_inliers, distance_sums = score_hypotheses(
+                distances, residual_threshold)
+            if not _is_better(num_inliers[0], distance_sums[0],
+                              best_num_inliers, best_distance_sum):
+                break
+            best_model = model[0]
+            best_inliers = inliers[0]
+            best_num_inliers = num_inliers[0]
+            best_distance_sum = distance_sums[0]
+
+        inlier_ratio = best_num_inliers / num_points
+        num_trials = min(max_trials, compute_num_ransac_trials(
+            inlier_ratio, min_samples, confidence))
+    return best_model, best_inliers
+
+
 def estimate_fundamental_matrix_ransac_np(points1, points2, min_samples=8,
                                           residual_threshold=0.5,
-                                          max_trials=1000):
+                                          max_trials=1000, batch_size=64,
+                                          confidence=0.99,
+                                          local_iterations=0):
     """
     Estimate the fundamental matrix between two sets of corresponding
-    points using RANSAC.
+    points using batched RANSAC.
 
     # Arguments
         points1 -- numpy array of shape (n_points, 2)
@@ -436,6 +793,12 @@ def estimate_fundamental_matrix_ransac_np(points1, points2, min_samples=8,
                             threshold for considering a point an inlier
         max_trials -- int
                     maximum number of iterations to run RANSAC
+        batch_size -- int
+                    number of hypotheses solved and scored at once
+        confidence -- float
+                    probability used for adaptive termination
+        local_iterations -- int
+                    maximum number of LO-RANSAC refinement steps
 
     # Returns
         F -- numpy array of shape (3, 3)
@@ -444,41 +807,22 @@ def estimate_fundamental_matrix_ransac_np(points1, points2, min_samples=8,
                 indicating which points are inliers to the
                 estimated fundamental matrix
     """
-    best_F = None
-    best_inliers = None
-    best_num_inliers = 0
-    best_distance_sum = np.inf
-
-    for arg in range(max_trials):
-        indices = np.random.choice(len(points1), min_samples, replace=False)
-        sample_points1 = points1[indices]
-        sample_points2 = points2[indices]
-
-        F = compute_fundamental_matrix_np(sample_points1, sample_points2)
-        distance = np.abs(compute_sampson_distance(F, points1, points2))
-
-        inliers = distance < residual_threshold
-        num_inliers = np.count_nonzero(inliers)
-        distance_sum = distance.dot(distance)
-
-        if (num_inliers > best_num_inliers or
-                (num_inliers == best_num_inliers and
-                    distance_sum < best_distance_sum)):
-            best_F = F
-            best_inliers = inliers
-            best_num_inliers = num_inliers
-            best_distance_sum = distance_sum
-
-    if best_F is None:
+    F, inliers = ransac_np(
+        points1, points2, compute_fundamental_matrices_np,
+        compute_sampson_distances, min_samples, residual_threshold,
+        max_trials, batch_size, confidence, local_iterations)
+    if F is None:
         print("No inliers found. Model not fitted")
-    return best_F, best_inliers
+    return F, inliers
 
 
 def estimate_homography_ransac_np(points1, points2, min_samples=8,
-                                  residual_threshold=2, max_trials=1000):
+                                  residual_threshold=2, max_trials=1000,
+                                  batch_size=64, confidence=0.99,
+                                  local_iterations=0):
     """
     Estimate the homography between two sets of corresponding points
-    using RANSAC.
+    using batched RANSAC.
 
     # Arguments
         points1 -- numpy array of shape (n_points, 2)
@@ -491,42 +835,24 @@ def estimate_homography_ransac_np(points1, points2, min_samples=8,
                             threshold for considering a point an inlier
         max_trials -- int
                     maximum number of iterations to run RANSAC
+        batch_size -- int
+                    number of hypotheses solved and scored at once
+        confidence -- float
+                    probability used for adaptive termination
+        local_iterations -- int
+                    maximum number of LO-RANSAC refinement steps
 
     # Returns
         H -- numpy array of shape (3, 3)
             representing the estimated homography
         inliers -- boolean numpy array of shape (n_points,)
                 indicating which points are inliers to the
+                estimated homography
     """
-    best_H = None
-    best_inliers = None
-    best_num_inliers = 0
-    best_distance_sum = np.inf
-    for arg in range(max_trials):
-        indices = np.random.choice(len(points1), min_samples, replace=False)
-        sample_points1 = points1[indices]
-        sample_points2 = points2[indices]
-        H, _ = cv2.findHomography(sample_points1, sample_points2,
-                                  cv2.RANSAC, residual_threshold)
-        points2_predected = cv2.perspectiveTransform(
-            points1.reshape(-1, 1, 2), H).reshape(-1, 2)
-
-        distance = np.linalg.norm(points2 - points2_predected,
-                                  axis=1)
-        inliers = distance < residual_threshold
-
-        distance_sum = distance.dot(distance)
-        num_inliers = np.count_nonzero(inliers)
-
-        if (num_inliers > best_num_inliers or
-                (num_inliers == best_num_inliers and
-                    distance_sum < best_distance_sum)):
-            best_H = H
-            best_inliers = inliers
-            best_num_inliers = num_inliers
-            best_distance_sum = distance_sum
-
-    return best_H, best_inliers
+    return ransac_np(
+        points1, points2, compute_homographies_np, compute_transfer_distances,
+        min_samples, residual_threshold, max_trials, batch_size, confidence,
+        local_iterations)
 
 
 def triangulate_points_np(P1, P2, points1, points2):
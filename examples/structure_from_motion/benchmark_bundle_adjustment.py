@@ -0,0 +1,101 @@
+import argparse
+import time
+import numpy as np
+from bundle_adjustment import project_observations
+from bundle_adjustment import global_bundle_adjustment
+from bundle_adjustment import WindowedBundleAdjustment
+
+
+parser = argparse.ArgumentParser(description='Synthetic bundle adjustment')
+parser.add_argument('-c', '--num_cameras', type=int, default=10,
+                    help='Number of cameras')
+parser.add_argument('-p', '--num_points', type=int, default=1000,
+                    help='Number of 3D points')
+parser.add_argument('-v', '--visibility', type=float, default=0.5,
+                    help='Probability of a point being seen by a camera')
+parser.add_argument('-n', '--noise', type=float, default=0.5,
+                    help='Standard deviation of the 2D noise in pixels')
+parser.add_argument('-o', '--outliers', type=float, default=0.02,
+                    help='Fraction of observations replaced by outliers')
+parser.add_argument('-w', '--window_size', type=int, default=5,
+                    help='Number of cameras in the incremental window')
+parser.add_argument('-s', '--seed', type=int, default=777,
+                    help='Random seed')
+args = parser.parse_args()
+
+
+def build_synthetic_scene(num_cameras, num_points, visibility, noise,
+                          outliers, random_state):
+    camera_intrinsics = np.array([[500.0, 0.0, 320.0],
+                                  [0.0, 500.0, 240.0],
+                                  [0.0, 0.0, 1.0]])
+    points3D = random_state.uniform([-2, -2, 6], [2, 2, 10], (num_points, 3))
+    camera_poses = np.zeros((num_cameras, 6))
+    camera_poses[1:, :3] = random_state.normal(0, 0.05, (num_cameras - 1, 3))
+    camera_poses[:, 3] = np.linspace(0, 2, num_cameras)
+
+    visible = random_state.rand(num_cameras, num_points) < visibility
+    visible[:2] = True
+    camera_indices, point_indices = np.nonzero(visible)
+    points2D = project_observations(camera_poses[camera_indices],
+                                    points3D[point_indices],
+                                    camera_intrinsics)
+    points2D = points2D + random_state.normal(0, noise, points2D.shape)
+    is_outlier = random_state.rand(len(points2D)) < outliers
+    points2D[is_outlier] = random_state.uniform(
+        0, 640, (np.count_nonzero(is_outlier), 2))
+
+    initial_poses = camera_poses.copy()
+    initial_poses[1:] += random_state.normal(0, 0.002, (num_cameras - 1, 6))
+    initial_points3D = points3D + random_state.normal(0, 0.01, points3D.shape)
+    return (camera_intrinsics, initial_poses, initial_points3D,
+            camera_indices, point_indices, points2D, is_outlier)
+
+
+def compute_inlier_RMSE(camera_poses, points3D, camera_indices,
+                        point_indices, points2D, camera_intrinsics, inliers):
+    projected_points2D = project_observations(
+        camera_poses[camera_indices], points3D[point_indices],
+        camera_intrinsics)
+    squared_errors = np.sum((projected_points2D - points2D) ** 2, axis=1)
+    return np.sqrt(np.mean(squared_errors[inliers]))
+
+
+random_state = np.random.RandomState(args.seed)
+scene = build_synthetic_scene(args.num_cameras, args.num_points,
+                              args.visibility, args.noise, args.outliers,
+                              random_state)
+(camera_intrinsics, camera_poses, points3D,
+ camera_indices, point_indices, points2D, is_outlier) = scene
+inliers = np.logical_not(is_outlier)
+print('Cameras: {}, points: {}, observations: {}'.format(
+    args.num_cameras, args.num_points, len(points2D)))
+print('Initial inlier RMSE: {:.3f} px'.format(compute_inlier_RMSE(
+    camera_poses, points3D, camera_indices, point_indices, points2D,
+    camera_intrinsics, inliers)))
+
+start = time.time()
+optimized_poses, optimized_points3D = global_bundle_adjustment(
+    camera_poses, points3D, camera_indices, point_indices, points2D,
+    camera_intrinsics)
+print('Global BA: {:.2f} s, inlier RMSE: {:.3f} px'.format(
+    time.time() - start, compute_inlier_RMSE(
+        optimized_poses, optimized_points3D, camera_indices, point_indices,
+        points2D, camera_intrinsics, inliers)))
+
+start = time.time()
+bundle_adjustment = WindowedBundleAdjustment(camera_intrinsics,
+                                             args.window_size)
+point_ids = bundle_adjustment.add_points(points3D)
+for camera_arg in range(args.num_cameras):
+    camera_id = bundle_adjustment.add_camera(camera_poses[camera_arg])
+    observations = camera_indices == camera_arg
+    bundle_adjustment.add_observations(
+        camera_id, point_ids[point_indices[observations]],
+        points2D[observations])
+    if camera_arg > 0:
+        optimized_poses, optimized_points3D = bundle_adjustment.optimize()
+print('Windowed BA: {:.2f} s, inlier RMSE: {:.3f} px'.format(
+    time.time() - start, compute_inlier_RMSE(
+        optimized_poses, optimized_points3D, camera_indices, point_indices,
+        points2D, camera_intrinsics, inliers)))
@@ -1,5 +1,6 @@
 import numpy as np
 from scipy.optimize import least_squares
+from scipy.sparse import lil_matrix
 from paz.backend.keypoints import project_to_image
 from paz.backend.groups import rotation_matrix_to_compact_axis_angle
 from paz.backend.groups import rotation_vector_to_rotation_matrix
@@ -32,3 +33,284 @@ def local_bundle_adjustment(rotation, translation, points3D, points2D,
     optimized_point_cloud = optimized_params[6:].reshape((num_points, 3))
 
     return optimized_point_cloud, optimized_camera_poses
+
+
+def to_camera_pose(rotation, translation):
+    """
+    Build a compact camera pose from a rotation matrix and a translation.
+
+    # Arguments
+        rotation -- numpy array of shape (3, 3)
+        translation -- numpy array of shape (3,)
+
+    # Returns
+        camera_pose -- numpy array of shape (6,)
+                       containing the axis-angle rotation and translation
+    """
+    axis_angle = rotation_matrix_to_compact_axis_angle(rotation)
+    return np.concatenate([axis_angle, np.reshape(translation, -1)])
+
+
+def rotate_points(rotation_vectors, points3D):
+    """
+    Rotate every point by its own rotation vector using Rodrigues' formula.
+
+    # Arguments
+        rotation_vectors -- numpy array of shape (n_points, 3)
+                            containing axis-angle rotations
+        points3D -- numpy array of shape (n_points, 3)
+
+    # Returns
+        rotated_points -- numpy array of shape (n_points, 3)
+    """
+    angle = np.linalg.norm(rotation_vectors, axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        axis = np.nan_to_num(rotation_vectors / angle)
+    dot = np.sum(points3D * axis, axis=1, keepdims=True)
+    cos_angle, sin_angle = np.cos(angle), np.sin(angle)
+    return (cos_angle * points3D + sin_angle * np.cross(axis, points3D) +
+            dot * (1 - cos_angle) * axis)
+
+
+def project_observations(camera_poses, points3D, camera_intrinsics):
+    """
+    Project one 3D point per observation with its observing camera.
+
+    # Arguments
+        camera_poses -- numpy array of shape (n_observations, 6)
+                        containing axis-angle rotations and translations
+        points3D -- numpy array of shape (n_observations, 3)
+        camera_intrinsics -- numpy array of shape (3, 3)
+
+    # Returns
+        points2D -- numpy array of shape (n_observations, 2)
+    """
+    points3D = rotate_points(camera_poses[:, :3], points3D)
+    points3D = points3D + camera_poses[:, 3:6]
+    points2D = np.matmul(points3D, camera_intrinsics.T)
+    return points2D[:, :2] / points2D[:, 2:3]
+
+
+def reprojection_residuals(params, camera_poses, free_cameras, num_points,
+                           camera_indices, point_indices, points2D,
+                           camera_intrinsics):
+    """
+    Compute the stacked reprojection residuals of all observations.
+
+    # Arguments
+        params -- numpy array containing the poses of the free cameras
+                  followed by all 3D points
+        camera_poses -- numpy array of shape (n_cameras, 6)
+                        containing the poses of all cameras
+        free_cameras -- boolean numpy array of shape (n_cameras,)
+                        indicating which cameras are optimized
+        num_points -- int
+        camera_indices -- numpy array of shape (n_observations,)
+        point_indices -- numpy array of shape (n_observations,)
+        points2D -- numpy array of shape (n_observations, 2)
+        camera_intrinsics -- numpy array of shape (3, 3)
+
+    # Returns
+        residuals -- numpy array of shape (2 * n_observations,)
+    """
+    camera_poses = camera_poses.copy()
+    num_free_params = 6 * np.count_nonzero(free_cameras)
+    camera_poses[free_cameras] = params[:num_free_params].reshape((-1, 6))
+    points3D = params[num_free_params:].reshape((num_points, 3))
+    projected_points2D = project_observations(
+        camera_poses[camera_indices], points3D[point_indices],
+        camera_intrinsics)
+    return (projected_points2D - points2D).ravel()
+
+
+def build_jacobian_sparsity(free_cameras, num_points, camera_indices,
+                            point_indices):
+    """
+    Build the block-sparse structure of the bundle adjustment Jacobian.
+
+    Camera parameters come first and point parameters second, such that
+    the point block is block-diagonal and the normal equations can be
+    reduced to the cameras with the Schur complement.
+
+    # Arguments
+        free_cameras -- boolean numpy array of shape (n_cameras,)
+        num_points -- int
+        camera_indices -- numpy array of shape (n_observations,)
+        point_indices -- numpy array of shape (n_observations,)
+
+    # Returns
+        sparsity -- scipy.sparse.lil_matrix of shape
+                    (2 * n_observations, 6 * n_free_cameras + 3 * n_points)
+    """
+    num_observations = len(camera_indices)
+    free_camera_args = np.cumsum(free_cameras) - 1
+    num_free_params = 6 * np.count_nonzero(free_cameras)
+    num_params = num_free_params + 3 * num_points
+    sparsity = lil_matrix((2 * num_observations, num_params), dtype=int)
+
+    observation_args = np.arange(num_observations)
+    is_free = free_cameras[camera_indices]
+    free_observation_args = observation_args[is_free]
+    camera_args = free_camera_args[camera_indices[is_free]]
+    for param_arg in range(6):
+        for coordinate_arg in range(2):
+            sparsity[2 * free_observation_args + coordinate_arg,
+                     6 * camera_args + param_arg] = 1
+
+    for param_arg in range(3):
+        for coordinate_arg in range(2):
+            sparsity[2 * observation_args + coordinate_arg,
+                     num_free_params + 3 * point_indices + param_arg] = 1
+    return sparsity
+
+
+def global_bundle_adjustment(camera_poses, points3D, camera_indices,
+                             point_indices, points2D, camera_intrinsics,
+                             fixed_cameras=(0,), loss='cauchy', f_scale=2.0,
+                             max_nfev=None, tolerance=1e-4):
+    """
+    Jointly refine all cameras and 3D points by minimizing the
+    reprojection error with a sparse trust-region solver.
+
+    # Arguments
+        camera_poses -- numpy array of shape (n_cameras, 6)
+                        containing axis-angle rotations and translations
+        points3D -- numpy array of shape (n_points, 3)
+        camera_indices -- numpy array of shape (n_observations,)
+                          camera observing every 2D point
+        point_indices -- numpy array of shape (n_observations,)
+                         3D point of every 2D point
+        points2D -- numpy array of shape (n_observations, 2)
+                    containing the observed 2D points
+        camera_intrinsics -- numpy array of shape (3, 3)
+        fixed_cameras -- list of camera indices held constant to remove
+                         the gauge freedom
+        loss -- str
+                robust loss passed to ``scipy.optimize.least_squares``
+        f_scale -- float
+                   inlier scale of the robust loss in pixels
+        max_nfev -- int
+                    maximum number of function evaluations
+        tolerance -- float
+                     tolerance for the termination by the change of the cost
+
+    # Returns
+        camera_poses -- numpy array of shape (n_cameras, 6)
+        points3D -- numpy array of shape (n_points, 3)
+    """
+    camera_poses = np.asarray(camera_poses, dtype=np.float64)
+    points3D = np.asarray(points3D, dtype=np.float64)
+    camera_indices = np.asarray(camera_indices)
+    point_indices = np.asarray(point_indices)
+    num_points = len(points3D)
+    free_cameras = np.ones(len(camera_poses), dtype=bool)
+    free_cameras[list(fixed_cameras)] = False
+
+    sparsity = build_jacobian_sparsity(free_cameras, num_points,
+                                       camera_indices, point_indices)
+    param_init = np.hstack((camera_poses[free_cameras].ravel(),
+                            points3D.ravel()))
+    result = least_squares(
+        reprojection_residuals, param_init, jac_sparsity=sparsity,
+        method='trf', tr_solver='lsmr', x_scale='jac', loss=loss,
+        f_scale=f_scale, ftol=tolerance, max_nfev=max_nfev,
+        args=(camera_poses, free_cameras, num_points, camera_indices,
+              point_indices, points2D, camera_intrinsics))
+
+    num_free_params = 6 * np.count_nonzero(free_cameras)
+    optimized_camera_poses = camera_poses.copy()
+    optimized_camera_poses[free_cameras] = result.x[:num_free_params].reshape(
+        (-1, 6))
+    optimized_points3D = result.x[num_free_params:].reshape((num_points, 3))
+    return optimized_camera_poses, optimized_points3D
+
+
+class WindowedBundleAdjustment(object):
+    """
+    Incremental bundle adjustment over a sliding window of cameras.
+
+    Cameras, points and observations are accumulated as images stream in.
+    Every optimization refines the latest ``window_size`` cameras together
+    with all points they observe. Older cameras that share those points
+    are kept fixed and anchor the window to the rest of the map.
+
+    # Arguments
+        camera_intrinsics -- numpy array of shape (3, 3)
+        window_size -- int
+                       number of most recent cameras that are optimized
+        loss -- str
+                robust loss passed to ``scipy.optimize.least_squares``
+        f_scale -- float
+                   inlier scale of the robust loss in pixels
+        max_nfev -- int
+                    maximum number of function evaluations per window
+    """
+    def __init__(self, camera_intrinsics, window_size=5, loss='cauchy',
+                 f_scale=2.0, max_nfev=None):
+        self.camera_intrinsics = camera_intrinsics
+        self.window_size = window_size
+        self.loss = loss
+        self.f_scale = f_scale
+        self.max_nfev = max_nfev
+        self.camera_poses = np.zeros((0, 6))
+        self.points3D = np.zeros((0, 3))
+        self.camera_indices = np.zeros(0, dtype=int)
+        self.point_indices = np.zeros(0, dtype=int)
+        self.points2D = np.zeros((0, 2))
+
+    @property
+    def num_cameras(self):
+        return len(self.camera_poses)
+
+    def add_camera(self, camera_pose):
+        """Adds a camera pose of shape (6,) and returns its index."""
+        self.camera_poses = np.vstack([self.camera_poses, camera_pose])
+        return self.num_cameras - 1
+
+    def add_points(self, points3D):
+        """Adds 3D points of shape (n_points, 3) and returns their indices."""
+        start = len(self.points3D)
+        self.points3D = np.vstack([self.points3D, points3D])
+        return np.arange(start, len(self.points3D))
+
+    def add_observations(self, camera_index, point_indices, points2D):
+        """Adds the 2D observations of existing points in one camera."""
+        camera_indices = np.full(len(point_indices), camera_index)
+        self.camera_indices = np.concatenate(
+            [self.camera_indices, camera_indices])
+        self.point_indices = np.concatenate(
+            [self.point_indices, point_indices])
+        self.points2D = np.vstack([self.points2D, points2D])
+
+    def optimize(self):
+        """Refines the current window and writes the result back.
+
+        # Returns
+            camera_poses -- numpy array of shape (n_cameras, 6)
+            points3D -- numpy array of shape (n_points, 3)
+        """
+        first_camera = max(self.num_cameras - self.window_size, 0)
+        in_window = self.camera_indices >= first_camera
+        point_args = np.unique(self.point_indices[in_window])
+        observed = np.isin(self.point_indices, point_args)
+        camera_args = np.unique(self.camera_indices[observed])
+        if len(point_args) == 0:
+            return self.camera_poses, self.points3D
+
+        camera_map = np.full(self.num_cameras, -1)
+        camera_map[camera_args] = np.arange(len(camera_args))
+        point_map = np.full(len(self.points3D), -1)
+        point_map[point_args] = np.arange(len(point_args))
+
+        fixed_cameras = np.flatnonzero(camera_args < first_camera)
+        if len(fixed_cameras) == 0:
+            fixed_cameras = [0]
+        camera_poses, points3D = global_bundle_adjustment(
+            self.camera_poses[camera_args], self.points3D[point_args],
+            camera_map[self.camera_indices[observed]],
+            point_map[self.point_indices[observed]],
+            self.points2D[observed], self.camera_intrinsics, fixed_cameras,
+            self.loss, self.f_scale, self.max_nfev)
+        self.camera_poses[camera_args] = camera_poses
+        self.points3D[point_args] = points3D
+        return self.camera_poses, self.points3D
@@ -12,7 +12,7 @@ from processors import ComputeFundamentalMatrixRANSAC as RANSAC
 from backend import match_ratio_test, get_match_points, get_match_indices
 from backend import contruct_projection_matrix
 from backend import extract_keypoints_RGB
-from bundle_adjustment import local_bundle_adjustment
+from bundle_adjustment import WindowedBundleAdjustment, to_camera_pose
 from paz.backend.groups import to_affine_matrix
 
 ransac_thresh = 0.1
@@ -103,6 +103,7 @@ class InitializeSFM(pr.Processor):
         self.compute_essential_matrix = ComputeEssentialMatrix(self.K)
         self.recover_pose = RecoverPose(self.K)
         self.triangulate_points = TriangulatePoints()
+        self.rotation_vector_to_matrix = pr.RotationVectorToRotationMatrix()
         self.initial_transform = np.eye(4)
         self.warp = pr.WrapOutput(['points3D', 'base_features',
                                    'P2', 'colors', 'camera_position'])
@@ -124,17 +125,16 @@ class InitializeSFM(pr.Processor):
         F, _ = self.compute_fundamental_matrix(p1_inliers, p2_inliers)
         E = self.compute_essential_matrix(F)
         rotation, translation = self.recover_pose(E, p1_inliers, p2_inliers)
-        camera_position = np.matmul(rotation, translation)
-
-        transform = to_affine_matrix(rotation, translation)
 
         P1 = self.K @ np.eye(3, 4)
         P2 = contruct_projection_matrix(rotation, translation)
         P2 = self.K @ P2
         points3D = self.triangulate_points(P1, P2, p1_inliers.T, p2_inliers.T)
-        optimized_points3D, _ = local_bundle_adjustment(rotation, translation,
-                                                        points3D, p2_inliers,
-                                                        self.K)
+        optimized_points3D, rotation, translation = self.bundle_adjust(
+            rotation, translation, points3D, p1_inliers, p2_inliers)
+        P2 = self.K @ contruct_projection_matrix(rotation, translation)
+        camera_position = np.matmul(rotation, translation)
+        transform = to_affine_matrix(rotation, translation)
 
         current_transform = np.matmul(self.initial_transform, transform)
         optimized_points3D = np.matmul(current_transform[:3, :3],
@@ -148,6 +148,20 @@ class InitializeSFM(pr.Processor):
         return self.warp(np.array(optimized_points3D), [base_kps, base_des],
                          P2, colors, camera_position)
 
+    def bundle_adjust(self, rotation, translation, points3D, points1,
+                      points2):
+        bundle_adjustment = WindowedBundleAdjustment(self.K, window_size=2)
+        point_ids = bundle_adjustment.add_points(points3D)
+        camera1 = bundle_adjustment.add_camera(np.zeros(6))
+        camera2 = bundle_adjustment.add_camera(
+            to_camera_pose(rotation, translation))
+        bundle_adjustment.add_observations(camera1, point_ids, points1)
+        bundle_adjustment.add_observations(camera2, point_ids, points2)
+        camera_poses, points3D = bundle_adjustment.optimize()
+        rotation = self.rotation_vector_to_matrix(camera_poses[camera2, :3])
+        translation = camera_poses[camera2, 3:].reshape(np.shape(translation))
+        return points3D[point_ids], rotation, translation
+
 
 class StructureFromMotion(pr.Processor):
     def __init__(self, camera_intrinsics):
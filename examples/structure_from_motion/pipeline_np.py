@@ -9,6 +9,7 @@ from processors import ComputeFundamentalMatrixRANSAC as RANSAC
 from backend import match_ratio_test, get_match_points, get_match_indices
 from backend import contruct_projection_matrix
 from backend import triangulate_points_np
+from bundle_adjustment import WindowedBundleAdjustment, to_camera_pose
 
 
 class MatchFeatures(pr.Processor):
@@ -85,7 +86,8 @@ class InitializeSFM(pr.Processor):
         self.compute_fundamental_matrix = FindFundamentalMatrix()
         self.compute_essential_matrix = ComputeEssentialMatrix(self.K)
         self.recover_pose = RecoverPose(self.K)
-        self.warp = pr.WrapOutput(['points3D', 'base_features', 'P2'])
+        self.warp = pr.WrapOutput(['points3D', 'base_features', 'P2',
+                                   'points2D', 'pose'])
 
     def call(self, images):
         image1, image2 = images[:2]
@@ -113,11 +115,13 @@ class InitializeSFM(pr.Processor):
 
         base_kps = kps2[indices2[inliers]]
         base_des = des2[indices2[inliers]]
-        return self.warp(np.array(points3D), [base_kps, base_des], P2)
+        pose = to_camera_pose(rotation, translation)
+        return self.warp(np.array(points3D), [base_kps, base_des], P2,
+                         [p1_inliers, p2_inliers], pose)
 
 
 class StructureFromMotion(pr.Processor):
-    def __init__(self, camera_intrinsics):
+    def __init__(self, camera_intrinsics, window_size=5):
         super(StructureFromMotion, self).__init__()
         self.K = camera_intrinsics
         self.initialize_sfm = InitializeSFM(camera_intrinsics)
@@ -130,13 +134,22 @@ class StructureFromMotion(pr.Processor):
         self.triangulate_points = TriangulatePoints()
         self.points3D = []
         self.projection_matrix = np.eye(3, 4)
+        self.window_size = window_size
 
     def call(self, images):
+        bundle_adjustment = WindowedBundleAdjustment(self.K, self.window_size)
         inference = self.initialize_sfm(images[:2])
-        points3D = inference['points3D']
+        points1, points2 = inference['points2D']
+        point_ids = bundle_adjustment.add_points(inference['points3D'])
+        camera1 = bundle_adjustment.add_camera(np.zeros(6))
+        camera2 = bundle_adjustment.add_camera(inference['pose'])
+        bundle_adjustment.add_observations(camera1, point_ids, points1)
+        bundle_adjustment.add_observations(camera2, point_ids, points2)
+        camera_poses, all_points3D = bundle_adjustment.optimize()
+        points3D = all_points3D[point_ids]
         self.points3D.append(points3D)
         base_features = inference['base_features']
-        P2 = inference['P2']
+        P2 = self.K @ self.to_projection_matrix(camera_poses[camera2])
 
         for arg in range(len(images)-2):
             keypoints1, descriptor1 = self.detector(images[arg + 1])
@@ -149,6 +162,10 @@ class StructureFromMotion(pr.Processor):
                                                       p1_inliers)
 
             rotation = self.rotation_vector_to_matrix(rotation)
+            camera3 = bundle_adjustment.add_camera(
+                to_camera_pose(rotation, translation))
+            bundle_adjustment.add_observations(
+                camera3, point_ids[indices], p2_inliers)
             P3 = contruct_projection_matrix(rotation, translation)
             P3 = self.K @ P3
 
@@ -163,11 +180,21 @@ class StructureFromMotion(pr.Processor):
             print('Number of inliers', p1_inliers.shape[0])
 
             points3D = triangulate_points_np(P2, P3, p1_inliers, p2_inliers)
+            point_ids = bundle_adjustment.add_points(points3D)
+            bundle_adjustment.add_observations(camera2, point_ids, p1_inliers)
+            bundle_adjustment.add_observations(camera3, point_ids, p2_inliers)
+            camera_poses, all_points3D = bundle_adjustment.optimize()
+            points3D = all_points3D[point_ids]
 
             self.points3D.append(points3D)
-            P2 = P3.copy()
+            P2 = self.K @ self.to_projection_matrix(camera_poses[camera3])
+            camera2 = camera3
 
             arg = indices[1][inliers]
             base_features = [keypoints2[arg], descriptor2[arg]]
         plot_3D_keypoints(self.points3D)
         return self.points3D
+
+    def to_projection_matrix(self, camera_pose):
+        rotation = self.rotation_vector_to_matrix(camera_pose[:3])
+        return contruct_projection_matrix(rotation, camera_pose[3:])
@@ -226,6 +226,12 @@ class EstimateHomographyRANSAC(pr.Processor):
                          threshold for the reprojection error
         max_trials: int
                     maximum number of iterations to run RANSAC
+        batch_size: int
+                    number of hypotheses solved and scored at once
+        confidence: float
+                    confidence used to stop RANSAC adaptively
+        local_iterations: int
+                          maximum number of LO-RANSAC refinement steps
 
     Returns:
         homography: numpy array of shape (3, 3)
@@ -233,16 +239,21 @@ class EstimateHomographyRANSAC(pr.Processor):
         inlieres: numpy array of shape (num_inliers,)
                   containing the inlier indices
     """
-    def __init__(self, min_samples=8, residual_thresh=0.5, max_trials=1000):
+    def __init__(self, min_samples=8, residual_thresh=0.5, max_trials=1000,
+                 batch_size=64, confidence=0.99, local_iterations=0):
         super(EstimateHomographyRANSAC, self).__init__()
         self.min_samples = min_samples
         self.residual_thresh = residual_thresh
         self.max_trials = max_trials
+        self.batch_size = batch_size
+        self.confidence = confidence
+        self.local_iterations = local_iterations
 
     def call(self, points1, points2):
         homography, inlieres = estimate_homography_ransac_np(
             points1, points2, self.min_samples, self.residual_thresh,
-            self.max_trials)
+            self.max_trials, self.batch_size, self.confidence,
+            self.local_iterations)
         return homography, inlieres
 
 
@@ -289,6 +300,12 @@ class ComputeFundamentalMatrixRANSAC(pr.Processor):
             threshold for the reprojection error
         max_trials: int
                     maximum number of iterations to run RANSAC
+        batch_size: int
+                    number of hypotheses solved and scored at once
+        confidence: float
+                    confidence used to stop RANSAC adaptively
+        local_iterations: int
+                          maximum number of LO-RANSAC refinement steps
 
     Returns:
         fundamental_matrix: numpy array of shape (3, 3)
@@ -297,11 +314,18 @@ class ComputeFundamentalMatrixRANSAC(pr.Processor):
         inlieres: numpy array of shape (num_inliers,)
                   containing the inlier indices
     """
-    def __init__(self, min_samples=8, residual_thresh=0.5, max_trials=1000):
+    def __init__(self, min_samples=8, residual_thresh=0.5, max_trials=1000,
+                 batch_size=64, confidence=0.99, local_iterations=0):
         super(ComputeFundamentalMatrixRANSAC, self).__init__()
         self.min_samples = min_samples
         self.residual_thresh = residual_thresh
         self.max_trials = max_trials
+        self.batch_size = batch_size
+        self.confidence = confidence
+        self.local_iterations = local_iterations
 
     def call(self, points1, points2):
-        return estimate_fundamental_matrix_ransac_np(points1, points2)
+        return estimate_fundamental_matrix_ransac_np(
+            points1, points2, self.min_samples, self.residual_thresh,
+            self.max_trials, self.batch_size, self.confidence,
+            self.local_iterations)
@@ -5,6 +5,17 @@ from backend import compute_fundamental_matrix_np
 from backend import compute_sampson_distance
 from backend import triangulate_points_np
 from backend import triangulate_points_cv
+from backend import compute_fundamental_matrices_np
+from backend import compute_sampson_distances
+from backend import compute_homographies_np
+from backend import sample_minimal_sets
+from backend import compute_num_ransac_trials
+from backend import estimate_fundamental_matrix_ransac_np
+from backend import estimate_homography_ransac_np
+from bundle_adjustment import project_observations
+from bundle_adjustment import build_jacobian_sparsity
+from bundle_adjustment import global_bundle_adjustment
+from bundle_adjustment import WindowedBundleAdjustment
 
 
 @pytest.fixture()
@@ -178,3 +189,188 @@ def test_triangulate_points_np(projection_matrix_a, projection_matrix_b,
     assert np.allclose(points3D_np, projected_points3D)
     assert np.allclose(points3D_cv, projected_points3D)
     assert np.allclose(points3D_np, points3D_cv)
+
+
+@pytest.fixture()
+def outlier_mask():
+    return np.random.RandomState(777).rand(500) < 0.3
+
+
+@pytest.fixture()
+def homography():
+    return np.array([[1.1, 0.05, 10.0],
+                     [0.02, 0.95, -5.0],
+                     [1e-4, 2e-4, 1.0]])
+
+
+@pytest.fixture()
+def homography_points(homography, outlier_mask):
+    random_state = np.random.RandomState(777)
+    points1 = random_state.uniform(0, 640, (500, 2))
+    points2 = np.hstack([points1, np.ones((500, 1))]) @ homography.T
+    points2 = points2[:, :2] / points2[:, 2:]
+    num_outliers = np.count_nonzero(outlier_mask)
+    points2[outlier_mask] = random_state.uniform(0, 640, (num_outliers, 2))
+    return points1, points2
+
+
+@pytest.fixture()
+def epipolar_points(outlier_mask):
+    random_state = np.random.RandomState(777)
+    points3D = random_state.uniform([-2, -2, 4], [2, 2, 8], (500, 3))
+    K = np.array([[500.0, 0, 320], [0, 500.0, 240], [0, 0, 1]])
+    angle = 0.1
+    rotation = np.array([[np.cos(angle), 0, np.sin(angle)],
+                         [0, 1, 0],
+                         [-np.sin(angle), 0, np.cos(angle)]])
+    translation = np.array([1.0, 0.1, 0.0])
+    points1 = (K @ points3D.T).T
+    points2 = (K @ (points3D @ rotation.T + translation).T).T
+    points1 = points1[:, :2] / points1[:, 2:]
+    points2 = points2[:, :2] / points2[:, 2:]
+    num_outliers = np.count_nonzero(outlier_mask)
+    points2[outlier_mask] = random_state.uniform(0, 640, (num_outliers, 2))
+    return points1, points2
+
+
+def test_compute_fundamental_matrices_np(points2D_a, points2D_b,
+                                         fundamental_matrix):
+    points1 = np.stack([points2D_a, points2D_a])
+    points2 = np.stack([points2D_b, points2D_b])
+    F = compute_fundamental_matrices_np(points1, points2)
+    F_single = compute_fundamental_matrix_np(points2D_a, points2D_b)
+    F_single = F_single / np.linalg.norm(F_single)
+    for F_batch in F:
+        F_batch = F_batch / np.linalg.norm(F_batch)
+        F_batch = F_batch * np.sign(np.sum(F_batch * F_single))
+        assert np.allclose(F_batch, F_single)
+
+
+def test_compute_sampson_distances(points2D_a, points2D_b,
+                                   fundamental_matrix, sampson_distance):
+    F = np.stack([fundamental_matrix, fundamental_matrix])
+    distances = compute_sampson_distances(F, points2D_a, points2D_b)
+    assert distances.shape == (2, len(points2D_a))
+    assert np.allclose(distances, sampson_distance, rtol=1e-03)
+
+
+def test_compute_homographies_np(homography_points, homography,
+                                 outlier_mask):
+    points1, points2 = homography_points
+    points1 = points1[~outlier_mask][None, :4]
+    points2 = points2[~outlier_mask][None, :4]
+    H = compute_homographies_np(points1, points2)
+    assert np.allclose(H[0], homography)
+
+
+def test_sample_minimal_sets():
+    np.random.seed(777)
+    indices = sample_minimal_sets(10, 8, 1000)
+    assert indices.shape == (1000, 8)
+    assert np.all(indices < 10)
+    sorted_indices = np.sort(indices, axis=1)
+    assert np.all(sorted_indices[:, 1:] != sorted_indices[:, :-1])
+
+
+@pytest.mark.parametrize('inlier_ratio, num_trials',
+                         [(1.0, 1), (0.0, np.inf), (0.5, 1177)])
+def test_compute_num_ransac_trials(inlier_ratio, num_trials):
+    assert compute_num_ransac_trials(inlier_ratio, 8, 0.99) == num_trials
+
+
+@pytest.mark.parametrize('local_iterations', [0, 5])
+def test_estimate_fundamental_matrix_ransac_np(
+        epipolar_points, outlier_mask, local_iterations):
+    np.random.seed(777)
+    points1, points2 = epipolar_points
+    F, inliers = estimate_fundamental_matrix_ransac_np(
+        points1, points2, residual_threshold=0.5,
+        local_iterations=local_iterations)
+    assert F.shape == (3, 3)
+    assert np.all(inliers[~outlier_mask])
+    assert np.count_nonzero(inliers[outlier_mask]) < 10
+
+
+@pytest.mark.parametrize('local_iterations', [0, 5])
+def test_estimate_homography_ransac_np(homography_points, homography,
+                                       outlier_mask, local_iterations):
+    np.random.seed(777)
+    points1, points2 = homography_points
+    H, inliers = estimate_homography_ransac_np(
+        points1, points2, min_samples=4, local_iterations=local_iterations)
+    assert np.array_equal(inliers, ~outlier_mask)
+    assert np.allclose(H, homography)
+
+
+@pytest.fixture()
+def bundle_adjustment_scene():
+    random_state = np.random.RandomState(777)
+    num_cameras, num_points = 4, 60
+    camera_intrinsics = np.array([[500.0, 0.0, 320.0],
+                                  [0.0, 500.0, 240.0],
+                                  [0.0, 0.0, 1.0]])
+    points3D = random_state.uniform([-2, -2, 6], [2, 2, 10], (num_points, 3))
+    camera_poses = np.zeros((num_cameras, 6))
+    camera_poses[1:, :3] = random_state.normal(0, 0.05, (num_cameras - 1, 3))
+    camera_poses[:, 3] = np.linspace(0, 1, num_cameras)
+    camera_indices = np.repeat(np.arange(num_cameras), num_points)
+    point_indices = np.tile(np.arange(num_points), num_cameras)
+    points2D = project_observations(camera_poses[camera_indices],
+                                    points3D[point_indices],
+                                    camera_intrinsics)
+    noisy_poses = camera_poses.copy()
+    noisy_poses[1:] += random_state.normal(0, 0.002, (num_cameras - 1, 6))
+    noisy_points3D = points3D + random_state.normal(0, 0.01, points3D.shape)
+    return (camera_intrinsics, noisy_poses, noisy_points3D, camera_indices,
+            point_indices, points2D)
+
+
+def compute_reprojection_error(camera_poses, points3D, camera_indices,
+                               point_indices, points2D, camera_intrinsics):
+    projected_points2D = project_observations(
+        camera_poses[camera_indices], points3D[point_indices],
+        camera_intrinsics)
+    return np.max(np.linalg.norm(projected_points2D - points2D, axis=1))
+
+
+def test_build_jacobian_sparsity():
+    free_cameras = np.array([False, True, True])
+    camera_indices = np.array([0, 1, 2, 1])
+    point_indices = np.array([0, 0, 1, 1])
+    sparsity = build_jacobian_sparsity(free_cameras, 2, camera_indices,
+                                       point_indices)
+    assert sparsity.shape == (8, 6 * 2 + 3 * 2)
+    assert sparsity.nnz == 2 * 3 * 4 + 2 * 6 * 3
+    assert sparsity[0:2, :12].nnz == 0
+    assert sparsity[0:2, 12:15].nnz == 6
+
+
+def test_global_bundle_adjustment(bundle_adjustment_scene):
+    (camera_intrinsics, camera_poses, points3D, camera_indices,
+     point_indices, points2D) = bundle_adjustment_scene
+    optimized_poses, optimized_points3D = global_bundle_adjustment(
+        camera_poses, points3D, camera_indices, point_indices, points2D,
+        camera_intrinsics, tolerance=1e-10)
+    assert np.allclose(optimized_poses[0], camera_poses[0])
+    assert compute_reprojection_error(
+        optimized_poses, optimized_points3D, camera_indices, point_indices,
+        points2D, camera_intrinsics) < 1e-2
+
+
+def test_windowed_bundle_adjustment(bundle_adjustment_scene):
+    (camera_intrinsics, camera_poses, points3D, camera_indices,
+     point_indices, points2D) = bundle_adjustment_scene
+    bundle_adjustment = WindowedBundleAdjustment(camera_intrinsics, 2)
+    point_ids = bundle_adjustment.add_points(points3D)
+    for camera_arg, camera_pose in enumerate(camera_poses):
+        camera_id = bundle_adjustment.add_camera(camera_pose)
+        observations = camera_indices == camera_arg
+        bundle_adjustment.add_observations(
+            camera_id, point_ids[point_indices[observations]],
+            points2D[observations])
+        if camera_arg > 0:
+            optimized_poses, optimized_points3D = bundle_adjustment.optimize()
+    assert np.allclose(optimized_poses[0], camera_poses[0])
+    assert compute_reprojection_error(
+        optimized_poses, optimized_points3D, camera_indices, point_indices,
+        points2D, camera_intrinsics) < 1.0
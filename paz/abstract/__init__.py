@@ -1,4 +1,18 @@
-from .loader import Loader
-from .sequence import GeneratingSequence, ProcessingSequence
-from .messages import Box2D, Pose6D
-from .processor import Processor, SequentialProcessor
+from ..utils.lazy import lazy_import
+
+_LAZY_ATTRIBUTES = {
+    'Loader': '.loader',
+    'GeneratingSequence': '.sequence',
+    'ProcessingSequence': '.sequence',
+    'Box2D': '.messages',
+    'Boxes2DView': '.messages',
+    'Pose6D': '.messages',
+    'Processor': '.processor',
+    'SequentialProcessor': '.processor',
+    'build_generator': '.processor',
+    'get_generator': '.processor',
+    'use_generator': '.processor',
+}
+
+__all__ = list(_LAZY_ATTRIBUTES.keys())
+__getattr__, __dir__ = lazy_import(__name__, _LAZY_ATTRIBUTES)
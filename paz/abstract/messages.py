@@ -1,3 +1,5 @@
+import numpy as np
+
 from ..backend.groups.quaternion import rotation_vector_to_quaternion
 
 
@@ -86,6 +88,61 @@ class Box2D(object):
         return (inside_range_x and inside_range_y)
 
 
+class Boxes2DView(object):
+    """Lazy sequence of ``Box2D`` messages over an array of boxes.
+    Each ``Box2D`` is only built when it is accessed.
+
+    # Arguments
+        boxes: Numpy array of shape `(num_boxes, 4 + num_classes)` with
+            corner coordinates followed by the class scores.
+        arg_to_class: Dictionary or list mapping class arguments to
+            class names.
+        integer_coordinates: Bool. If ``True`` coordinates are cast to ints.
+
+    # Properties
+        boxes: Numpy array of shape `(num_boxes, 4 + num_classes)`.
+        class_args: Numpy array of shape `(num_boxes)`.
+        scores: Numpy array of shape `(num_boxes)`.
+
+    # Methods
+        to_list()
+    """
+    def __init__(self, boxes, arg_to_class, integer_coordinates=False):
+        self.boxes = boxes
+        self.arg_to_class = arg_to_class
+        self.integer_coordinates = integer_coordinates
+        self.class_args = np.argmax(boxes[:, 4:], axis=1)
+        self.scores = boxes[np.arange(len(boxes)), 4 + self.class_args]
+
+    def __len__(self):
+        return len(self.boxes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return Boxes2DView(self.boxes[index], self.arg_to_class,
+                               self.integer_coordinates)
+        coordinates = self.boxes[index, :4]
+        if self.integer_coordinates:
+            coordinates = coordinates.astype(int)
+        class_name = self.arg_to_class[self.class_args[index]]
+        return Box2D(coordinates, self.scores[index], class_name)
+
+    def __iter__(self):
+        for box_arg in range(len(self)):
+            yield self[box_arg]
+
+    def __repr__(self):
+        return 'Boxes2DView({} boxes)'.format(len(self))
+
+    def to_list(self):
+        """Builds all ``Box2D`` messages.
+
+        # Returns
+            List of ``Box2D`` messages.
+        """
+        return list(self)
+
+
 class Pose6D(object):
     """ Pose estimation results with 6D coordinates.
 
@@ -1,3 +1,134 @@
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+
+class _GlobalBitGenerator(object):
+    @property
+    def state(self):
+        return np.random.get_state()
+
+    @state.setter
+    def state(self, state):
+        np.random.set_state(state)
+
+
+class _GlobalGenerator(object):
+    """Draws from the global ``np.random`` state with the methods of
+    ``numpy.random.Generator`` used by the processors.
+    """
+    bit_generator = _GlobalBitGenerator()
+
+    def integers(self, low, high=None, size=None):
+        return np.random.randint(low, high, size)
+
+    def __getattr__(self, name):
+        return getattr(np.random, name)
+
+
+_GLOBAL_GENERATOR = _GlobalGenerator()
+_LOCAL = threading.local()
+
+
+def build_generator(seed, *keys):
+    """Builds a random generator whose stream only depends on ``seed`` and
+    ``keys``. It equals spawning a child of ``SeedSequence(seed)`` for every
+    key e.g. ``build_generator(seed, epoch, batch_index)``.
+
+    # Arguments
+        seed: Int.
+        keys: Ints indexing the spawned child e.g. the epoch and batch index.
+
+    # Returns
+        ``numpy.random.Generator``.
+    """
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=keys))
+
+
+def get_generator():
+    """Returns the random generator of the current thread set by
+    ``use_generator`` or a generator drawing from the global ``np.random``
+    state if none is set.
+    """
+    rng = getattr(_LOCAL, 'rng', None)
+    if rng is None:
+        return _GLOBAL_GENERATOR
+    return rng
+
+
+@contextmanager
+def use_generator(rng):
+    """Sets the random generator of all processors without an own ``rng``
+    in the current thread.
+
+    # Arguments
+        rng: ``numpy.random.Generator``.
+
+    # Example
+    ```python
+    with use_generator(build_generator(777, epoch, batch_index)):
+        sample = augment(sample)
+    ```
+    """
+    previous_rng = getattr(_LOCAL, 'rng', None)
+    _LOCAL.rng = rng
+    try:
+        yield rng
+    finally:
+        _LOCAL.rng = previous_rng
+
+
+def _get_children(processor):
+    children = []
+    for value in vars(processor).values():
+        values = value if isinstance(value, (list, tuple)) else [value]
+        for child in values:
+            if isinstance(child, (Processor, SequentialProcessor)):
+                children.append(child)
+    return children
+
+
+def _set_generator(processor, rng, visited):
+    if id(processor) in visited:
+        return
+    visited.add(id(processor))
+    processor._rng = rng
+    for child in _get_children(processor):
+        _set_generator(child, rng, visited)
+
+
+def _get_generator(processor):
+    rng = getattr(processor, '_rng', None)
+    if rng is None:
+        return get_generator()
+    return rng
+
+
+def _call_step(processor):
+    if (isinstance(processor, Processor) and
+            type(processor).__call__ is Processor.__call__):
+        processor = processor.call
+    return lambda args, stack: processor(*args)
+
+
+def _compile_processor(processor):
+    """Returns a flat list of steps ``step(args, stack)`` equivalent to
+    calling ``processor``. Nested sequences are inlined and processors with
+    a ``_compile`` method e.g. ``ControlMap`` provide their own steps.
+    """
+    if (isinstance(processor, SequentialProcessor) and
+            type(processor).__call__ is SequentialProcessor.__call__):
+        steps = []
+        for child in processor.processors:
+            steps.extend(_compile_processor(child))
+        return steps
+    compile_processor = getattr(processor, '_compile', None)
+    if compile_processor is not None:
+        return compile_processor(_compile_processor)
+    return [_call_step(processor)]
+
+
 class Processor(object):
     """Abstract class for creating a processor unit.
 
@@ -45,6 +176,17 @@ class Processor(object):
             name = self.__class__.__name__
         self._name = name
 
+    @property
+    def rng(self):
+        """Random generator of the processor. If none was set the generator
+        of ``use_generator`` or the global ``np.random`` state is used.
+        """
+        return _get_generator(self)
+
+    @rng.setter
+    def rng(self, rng):
+        _set_generator(self, rng, set())
+
     def call(self, X):
         """Custom user's logic should be implemented here.
         """
@@ -95,14 +237,32 @@ class SequentialProcessor(object):
             name = self.__class__.__name__
         self._name = name
 
+    @property
+    def rng(self):
+        """Random generator shared by all processors in the sequence.
+        Setting it also sets the generator of all nested processors.
+        """
+        return _get_generator(self)
+
+    @rng.setter
+    def rng(self, rng):
+        _set_generator(self, rng, set())
+
     def add(self, processor):
         """Adds a process to the sequence of processes to be applied to input.
 
         # Arguments
             processor: An instantiated child class of of ``Processor``.
         """
+        self._share_generator(processor)
         self.processors.append(processor)
 
+    def _share_generator(self, processor):
+        rng = getattr(self, '_rng', None)
+        if rng is not None and isinstance(processor, (Processor,
+                                                      SequentialProcessor)):
+            processor.rng = rng
+
     def __call__(self, *args, **kwargs):
         # first call can take list or dictionary values.
         args = self.processors[0](*args, **kwargs)
@@ -114,6 +274,35 @@ class SequentialProcessor(object):
                 args = processor(args)
         return args
 
+    def compile(self):
+        """Flattens all nested ``SequentialProcessor`` and ``ControlMap``
+        processors into a single list of steps run in one loop, removing
+        the nested calls and argument bookkeeping of every call.
+        Later changes to the processors of the sequence are not reflected
+        in the compiled function.
+
+        # Returns
+            Function with the same inputs and outputs as the sequence.
+        """
+        first_processor = self.processors[0]
+        first_steps = _compile_processor(first_processor)
+        steps = list(first_steps)
+        for processor in self.processors[1:]:
+            steps.extend(_compile_processor(processor))
+
+        def run(*args, **kwargs):
+            outputs, run_steps = args, steps
+            if kwargs:
+                outputs = first_processor(*args, **kwargs)
+                run_steps = steps[len(first_steps):]
+            stack = []
+            for step in run_steps:
+                if not isinstance(outputs, tuple):
+                    outputs = (outputs,)
+                outputs = step(outputs, stack)
+            return outputs
+        return run
+
     def remove(self, name):
         """Removes processor from sequence
 
@@ -139,6 +328,7 @@ class SequentialProcessor(object):
             index: Int.
             processor: An instantiated child class of of ``Processor``.
         """
+        self._share_generator(processor)
         return self.processors.insert(index, processor)
 
     def get_processor(self, name):
@@ -1,10 +1,12 @@
 from tensorflow.keras.utils import Sequence
 import numpy as np
 from .processor import SequentialProcessor
+from .processor import build_generator, use_generator
 
 
 class SequenceExtra(Sequence):
-    def __init__(self, pipeline, batch_size, as_list=False):
+    def __init__(self, pipeline, batch_size, as_list=False,
+                 batch_processor=None, seed=None):
         if not isinstance(pipeline, SequentialProcessor):
             raise ValueError('``processor`` must be a ``SequentialProcessor``')
         self.output_wrapper = pipeline.processors[-1]
@@ -15,6 +17,12 @@ class SequenceExtra(Sequence):
         self.ordered_label_names = self.output_wrapper.ordered_label_names
         self.batch_size = batch_size
         self.as_list = as_list
+        self.batch_processor = batch_processor
+        self.seed = seed
+        self.epoch = 0
+
+    def on_epoch_end(self):
+        self.epoch = self.epoch + 1
 
     def make_empty_batches(self, name_to_shape):
         batch = {}
@@ -36,9 +44,20 @@ class SequenceExtra(Sequence):
         return unprocessed_batch
 
     def __getitem__(self, batch_index):
+        if self.seed is None:
+            return self._get_batch(batch_index)
+        # every batch draws from its own stream making batches independent
+        # of the number of workers and of the order they are processed
+        rng = build_generator(self.seed, self.epoch, batch_index)
+        with use_generator(rng):
+            return self._get_batch(batch_index)
+
+    def _get_batch(self, batch_index):
         inputs = self.make_empty_batches(self.inputs_name_to_shape)
         labels = self.make_empty_batches(self.labels_name_to_shape)
         inputs, labels = self.process_batch(inputs, labels, batch_index)
+        if self.batch_processor is not None:
+            inputs, labels = self.batch_processor(inputs, labels)
         if self.as_list:
             inputs = self._to_list(inputs, self.ordered_input_names)
             labels = self._to_list(labels, self.ordered_label_names)
@@ -58,11 +77,18 @@ class ProcessingSequence(SequenceExtra):
         as_list: Bool, if True ``inputs`` and ``labels`` are dispatched as
             lists. If false ``inputs`` and ``labels`` are dispatched as
             dictionaries.
+        batch_processor: Function applied to the dictionaries of batched
+            ``inputs`` and ``labels`` e.g. ``AugmentDetectionBatch``.
+        seed: Int. If given, every batch of every epoch is processed with
+            its own random generator, which makes augmentations
+            reproducible for any number of workers. If ``None`` the global
+            ``np.random`` state is used.
     """
-    def __init__(self, processor, batch_size, data, as_list=False):
+    def __init__(self, processor, batch_size, data, as_list=False,
+                 batch_processor=None, seed=None):
         self.data = data
         super(ProcessingSequence, self).__init__(
-            processor, batch_size, as_list)
+            processor, batch_size, as_list, batch_processor, seed)
 
     def __len__(self):
         return int(np.ceil(len(self.data) / float(self.batch_size)))
@@ -87,11 +113,17 @@ class GeneratingSequence(SequenceExtra):
         as_list: Bool, if True ``inputs`` and ``labels`` are dispatched as
             lists. If false ``inputs`` and ``labels`` are dispatched as
             dictionaries.
+        batch_processor: Function applied to the dictionaries of batched
+            ``inputs`` and ``labels``.
+        seed: Int. If given, every batch of every epoch is generated with
+            its own random generator. If ``None`` the global ``np.random``
+            state is used.
     """
-    def __init__(self, processor, batch_size, num_steps, as_list=False):
+    def __init__(self, processor, batch_size, num_steps, as_list=False,
+                 batch_processor=None, seed=None):
         self.num_steps = num_steps
         super(GeneratingSequence, self).__init__(
-            processor, batch_size, as_list)
+            processor, batch_size, as_list, batch_processor, seed)
 
     def __len__(self):
         return self.num_steps
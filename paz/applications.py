@@ -1,31 +1,75 @@
-from .pipelines import SSD512COCO
-from .pipelines import SSD300VOC
-from .pipelines import SSD512YCBVideo
-from .pipelines import SSD300FAT
-from .pipelines import DetectMiniXceptionFER
-from .pipelines import MiniXceptionFER
-from .pipelines import FaceKeypointNet2D32
-from .pipelines import HeadPoseKeypointNet2D32
-from .pipelines import HaarCascadeFrontalFace
-from .pipelines import EFFICIENTDETD0COCO
-from .pipelines import EFFICIENTDETD1COCO
-from .pipelines import EFFICIENTDETD2COCO
-from .pipelines import EFFICIENTDETD3COCO
-from .pipelines import EFFICIENTDETD4COCO
-from .pipelines import EFFICIENTDETD5COCO
-from .pipelines import EFFICIENTDETD6COCO
-from .pipelines import EFFICIENTDETD7COCO
-from .pipelines import EFFICIENTDETD0VOC
-
-from .pipelines import SinglePowerDrillPIX2POSE6D
-from .pipelines import MultiPowerDrillPIX2POSE6D
-from .pipelines import PIX2POSEPowerDrill
-from .pipelines import PIX2YCBTools6D
-
-from .pipelines import HigherHRNetHumanPose2D
-from .pipelines import DetNetHandKeypoints
-from .pipelines import MinimalHandPoseEstimation
-from .pipelines import DetectMinimalHand
-from .pipelines import ClassifyHandClosure
-from .pipelines import SSD512MinimalHandPose
-from .pipelines import EstimateHumanPose
+from importlib import import_module
+
+
+def lazy_application(pipeline_class):
+    """Subclasses ``pipeline_class`` such that its models are only built
+    on the first call, on the first access of one of its attributes or
+    when ``warmup`` is called.
+
+    # Arguments
+        pipeline_class: Pipeline class e.g. ``paz.pipelines.SSD512COCO``.
+
+    # Returns
+        Subclass of ``pipeline_class``.
+    """
+    def __init__(self, *args, **kwargs):
+        self.__dict__['_lazy_arguments'] = (args, kwargs)
+
+    def warmup(self):
+        """Builds the pipeline and its models if not built yet.
+
+        # Returns
+            The built pipeline.
+        """
+        if '_lazy_arguments' in self.__dict__:
+            args, kwargs = self.__dict__.pop('_lazy_arguments')
+            pipeline_class.__init__(self, *args, **kwargs)
+        return self
+
+    def __getattr__(self, name):
+        if '_lazy_arguments' not in self.__dict__:
+            raise AttributeError('%r object has no attribute %r' % (
+                pipeline_class.__name__, name))
+        return getattr(self.warmup(), name)
+
+    def __call__(self, *args, **kwargs):
+        return pipeline_class.__call__(self.warmup(), *args, **kwargs)
+
+    attributes = {'__init__': __init__, 'warmup': warmup,
+                  '__getattr__': __getattr__, '__call__': __call__,
+                  '__doc__': pipeline_class.__doc__,
+                  '__module__': __name__}
+    return type(pipeline_class.__name__, (pipeline_class,), attributes)
+
+
+_APPLICATIONS = [
+    'SSD512COCO', 'SSD300VOC', 'SSD512YCBVideo', 'SSD300FAT',
+    'DetectMiniXceptionFER', 'MiniXceptionFER', 'FaceKeypointNet2D32',
+    'HeadPoseKeypointNet2D32', 'HaarCascadeFrontalFace', 'EFFICIENTDETD0COCO',
+    'EFFICIENTDETD1COCO', 'EFFICIENTDETD2COCO', 'EFFICIENTDETD3COCO',
+    'EFFICIENTDETD4COCO', 'EFFICIENTDETD5COCO', 'EFFICIENTDETD6COCO',
+    'EFFICIENTDETD7COCO', 'EFFICIENTDETD0VOC',
+
+    'SinglePowerDrillPIX2POSE6D', 'MultiPowerDrillPIX2POSE6D',
+    'PIX2POSEPowerDrill', 'PIX2YCBTools6D',
+
+    'HigherHRNetHumanPose2D', 'DetNetHandKeypoints',
+    'MinimalHandPoseEstimation', 'DetectMinimalHand', 'ClassifyHandClosure',
+    'SSD512MinimalHandPose', 'EstimateHumanPose',
+]
+
+__all__ = _APPLICATIONS
+
+
+def __getattr__(name):
+    if name not in _APPLICATIONS:
+        raise AttributeError('module %r has no attribute %r' % (
+            __name__, name))
+    pipelines = import_module('.pipelines', __package__)
+    application = lazy_application(getattr(pipelines, name))
+    globals()[name] = application
+    return application
+
+
+def __dir__():
+    return sorted(set(globals().keys()) | set(_APPLICATIONS))
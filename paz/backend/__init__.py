@@ -1,8 +1,11 @@
 from .anchors import build_anchors
+from .anchors import build_prior_boxes
+from .anchors import build_pyramid_anchors
 from .anchors import build_octaves
 from .anchors import build_aspect
 from .anchors import build_scales
 from .anchors import build_strides
+from .anchors import compute_strides
 from .anchors import make_branch_boxes
 from .anchors import compute_box_coordinates
 from .anchors import build_base_anchor
@@ -1,3 +1,4 @@
+from functools import lru_cache
 import numpy as np
 from .boxes import to_center_form
 
@@ -10,6 +11,9 @@ def build_anchors(image_shape, branches, num_scales, aspect_ratios, scale):
     define regions of image where objects are likely to be found. They
     help object detector to accurately localize and classify objects at
     the same time handling variations in object size and shape.
+    Anchors are memoized by configuration and input shape and returned
+    as read-only arrays, therefore models with equal configurations
+    share the same anchors.
 
     # Arguments
         image_shape: List, input image shape.
@@ -19,20 +23,132 @@ def build_anchors(image_shape, branches, num_scales, aspect_ratios, scale):
         scale: Float, anchor box scale.
 
     # Returns
-        anchor_boxes: Array of shape `(num_boxes, 4)`.
+        anchor_boxes: Read-only array of shape `(num_boxes, 4)`.
     """
+    feature_shapes = tuple(tuple(branch.shape[1:3]) for branch in branches)
+    return _build_anchors(tuple(image_shape), feature_shapes, num_scales,
+                          tuple(aspect_ratios), scale)
+
+
+@lru_cache(maxsize=None)
+def _build_anchors(image_shape, feature_shapes, num_scales,
+                   aspect_ratios, scale):
     num_scale_aspect = num_scales * len(aspect_ratios)
-    args = (image_shape, branches, num_scale_aspect)
     octave = build_octaves(num_scales, aspect_ratios)
     aspect = build_aspect(num_scales, aspect_ratios)
     scales = build_scales(scale, num_scale_aspect)
     anchor_boxes = []
-    for branch_arg in range(len(branches)):
-        stride = build_strides(branch_arg, *args)
+    for feature_shape in feature_shapes:
+        stride = compute_strides(image_shape, feature_shape, num_scale_aspect)
         boxes = make_branch_boxes(*stride, octave, aspect, scales, image_shape)
         anchor_boxes.append(boxes.reshape([-1, 4]))
     anchor_boxes = np.concatenate(anchor_boxes, axis=0).astype('float32')
-    return to_center_form(anchor_boxes)
+    return _read_only(to_center_form(anchor_boxes))
+
+
+def build_prior_boxes(image_size, feature_map_sizes, steps, min_sizes,
+                      max_sizes, aspect_ratios):
+    """Builds SSD prior boxes in normalized centre form.
+    For every feature map a square box of size `min_size`, a square box
+    of size `sqrt(min_size * max_size)` and two boxes per aspect ratio
+    are centred over every cell. Prior boxes are memoized by
+    configuration and returned as read-only arrays.
+
+    # Arguments
+        image_size: Int, input image size.
+        feature_map_sizes: List of ints, size of every feature map.
+        steps: List of ints, stride in pixels of every feature map.
+        min_sizes: List of ints, minimum box size of every feature map.
+        max_sizes: List of ints, maximum box size of every feature map.
+        aspect_ratios: List of lists, aspect ratios of every feature map.
+
+    # Returns
+        prior_boxes: Read-only array of shape `(num_boxes, 4)`.
+    """
+    aspect_ratios = tuple(tuple(ratios) for ratios in aspect_ratios)
+    return _build_prior_boxes(image_size, tuple(feature_map_sizes),
+                              tuple(steps), tuple(min_sizes),
+                              tuple(max_sizes), aspect_ratios)
+
+
+@lru_cache(maxsize=None)
+def _build_prior_boxes(image_size, feature_map_sizes, steps, min_sizes,
+                       max_sizes, aspect_ratios):
+    prior_boxes = []
+    for feature_map_size, step, min_size, max_size, ratios in zip(
+            feature_map_sizes, steps, min_sizes, max_sizes, aspect_ratios):
+        f_k = image_size / step
+        centres = (np.arange(feature_map_size) + 0.5) / f_k
+        center_x, center_y = np.meshgrid(centres, centres)
+        centres = np.stack([center_x.ravel(), center_y.ravel()], axis=1)
+        s_k = min_size / image_size
+        s_k_prime = np.sqrt(s_k * (max_size / image_size))
+        sizes = [[s_k, s_k], [s_k_prime, s_k_prime]]
+        for aspect_ratio in ratios:
+            sizes.append([s_k * np.sqrt(aspect_ratio),
+                          s_k / np.sqrt(aspect_ratio)])
+            sizes.append([s_k / np.sqrt(aspect_ratio),
+                          s_k * np.sqrt(aspect_ratio)])
+        sizes = np.array(sizes)
+        shape = (len(centres), len(sizes), 2)
+        boxes = np.concatenate([
+            np.broadcast_to(centres[:, np.newaxis], shape),
+            np.broadcast_to(sizes[np.newaxis], shape)], axis=2)
+        prior_boxes.append(boxes.reshape(-1, 4))
+    return _read_only(np.concatenate(prior_boxes, axis=0))
+
+
+def build_pyramid_anchors(scales, ratios, feature_shapes, feature_strides,
+                          anchor_stride):
+    """Builds Mask R-CNN anchor boxes at every level of a feature pyramid.
+    Each scale is associated with a level of the pyramid, while every
+    ratio is used in all levels. Anchors are memoized by configuration
+    and returned as read-only arrays.
+
+    # Arguments
+        scales: List of floats, anchor size in pixels of every level.
+        ratios: List of floats, anchor ratios of width over height.
+        feature_shapes: List of [H, W] shapes of every feature map.
+        feature_strides: List of ints, stride in pixels of every level.
+        anchor_stride: Int, anchor stride in feature map cells.
+
+    # Returns
+        anchor_boxes: Read-only array of shape `(num_boxes, 4)` in pixel
+            coordinates `(y_min, x_min, y_max, x_max)`.
+    """
+    feature_shapes = tuple(tuple(int(size) for size in feature_shape)
+                           for feature_shape in feature_shapes)
+    return _build_pyramid_anchors(
+        tuple(np.ravel(scales).tolist()), tuple(np.ravel(ratios).tolist()),
+        feature_shapes, tuple(np.ravel(feature_strides).tolist()),
+        anchor_stride)
+
+
+@lru_cache(maxsize=None)
+def _build_pyramid_anchors(scales, ratios, feature_shapes, feature_strides,
+                           anchor_stride):
+    ratios = np.array(ratios)
+    anchor_boxes = []
+    for scale, feature_shape, feature_stride in zip(
+            scales, feature_shapes, feature_strides):
+        heights = scale / np.sqrt(ratios)
+        widths = scale * np.sqrt(ratios)
+        shifts_Y = np.arange(0, feature_shape[0], anchor_stride)
+        shifts_X = np.arange(0, feature_shape[1], anchor_stride)
+        shifts_X, shifts_Y = np.meshgrid(shifts_X * feature_stride,
+                                         shifts_Y * feature_stride)
+        centres = np.stack([shifts_Y.ravel(), shifts_X.ravel()], axis=1)
+        sizes = np.stack([heights, widths], axis=1)
+        centres, sizes = centres[:, np.newaxis], sizes[np.newaxis]
+        boxes = np.concatenate([centres - 0.5 * sizes,
+                                centres + 0.5 * sizes], axis=2)
+        anchor_boxes.append(boxes.reshape(-1, 4))
+    return _read_only(np.concatenate(anchor_boxes, axis=0))
+
+
+def _read_only(array):
+    array.flags.writeable = False
+    return array
 
 
 def build_octaves(num_scales, aspect_ratios):
@@ -165,11 +281,26 @@ def build_strides(branch_arg, image_shape, branches, num_scale_aspect):
         branches: List, EfficientNet branch tensors.
         num_scale_aspect: Int, count of scale aspect ratio combinations.
 
+    # Returns
+        Tuple: Containing strides in y and x direction.
+    """
+    feature_shape = branches[branch_arg].shape[1:3]
+    return compute_strides(image_shape, feature_shape, num_scale_aspect)
+
+
+def compute_strides(image_shape, feature_shape, num_scale_aspect):
+    """Computes anchor box strides of a feature map.
+
+    # Arguments
+        image_shape: List, input image shape.
+        feature_shape: List, feature map shape.
+        num_scale_aspect: Int, count of scale aspect ratio combinations.
+
     # Returns
         Tuple: Containing strides in y and x direction.
     """
     H_image, W_image = image_shape
-    feature_H, feature_W = branches[branch_arg].shape[1:3]
+    feature_H, feature_W = feature_shape
     features_H = np.repeat(feature_H, num_scale_aspect).astype('float32')
     features_W = np.repeat(feature_W, num_scale_aspect).astype('float32')
     strides_y = H_image / features_H
@@ -192,11 +323,16 @@ def make_branch_boxes(stride_y, stride_x, octave,
     # Returns
         branch_boxes: Array of shape `(num_boxes,num_scale_aspect,4)`.
     """
-    branch_boxes = []
-    for branch_config in zip(stride_y, stride_x, scales, octave, aspect):
-        boxes = compute_box_coordinates(image_shape, *branch_config)
-        branch_boxes.append(np.expand_dims(boxes.T, axis=1))
-    branch_boxes = np.concatenate(branch_boxes, axis=1)
+    base_anchor = build_base_anchor(stride_y, stride_x, scales, octave)
+    aspect_size = compute_aspect_size(aspect)
+    anchor_half_W, anchor_half_H = compute_anchor_dims(
+        *base_anchor, *aspect_size, image_shape)
+    center_x, center_y = compute_anchor_centres(
+        stride_y[0], stride_x[0], image_shape)
+    center_x, center_y = center_x[:, np.newaxis], center_y[:, np.newaxis]
+    branch_boxes = np.stack([
+        center_x - anchor_half_W, center_y - anchor_half_H,
+        center_x + anchor_half_W, center_y + anchor_half_H], axis=2)
     return branch_boxes
 
 
@@ -604,6 +604,92 @@ def denormalize_box(box, image_shape):
     return (x_min, y_min, x_max, y_max)
 
 
+def make_boxes_square(boxes):
+    """Makes all boxes square with sides equal to their longest original
+    side as in ``make_box_square``.
+
+    # Arguments
+        boxes: Numpy array of shape `(num_boxes, 4 + N)` with corner
+            coordinates.
+
+    # Returns
+        Numpy array of shape `(num_boxes, 4 + N)`.
+    """
+    x_min, y_min, x_max, y_max = boxes[:, :4].T
+    center_x = (x_max + x_min) / 2.0
+    center_y = (y_max + y_min) / 2.0
+    width = x_max - x_min
+    height = y_max - y_min
+    half_box = np.maximum(width, height) / 2.0
+    is_tall = height >= width
+    is_wide = np.logical_not(is_tall)
+    square_boxes = boxes.astype(np.result_type(boxes, float))
+    square_boxes[is_tall, 0] = np.trunc(center_x - half_box)[is_tall]
+    square_boxes[is_tall, 2] = np.trunc(center_x + half_box)[is_tall]
+    square_boxes[is_wide, 1] = np.trunc(center_y - half_box)[is_wide]
+    square_boxes[is_wide, 3] = np.trunc(center_y + half_box)[is_wide]
+    return square_boxes
+
+
+def offset_boxes(boxes, offset_scales):
+    """Apply offsets to all boxes as in ``offset``.
+
+    # Arguments
+        boxes: Numpy array of shape `(num_boxes, 4 + N)` with corner
+            coordinates.
+        offset_scales: List of floats having x and y scales respectively.
+
+    # Returns
+        Numpy array of shape `(num_boxes, 4 + N)`.
+    """
+    x_offset_scale, y_offset_scale = offset_scales
+    x_offsets = (boxes[:, 2] - boxes[:, 0]) * x_offset_scale
+    y_offsets = (boxes[:, 3] - boxes[:, 1]) * y_offset_scale
+    # same coordinate and offset pairing as ``offset``
+    offsets = np.stack([-x_offsets, -y_offsets, y_offsets, x_offsets], 1)
+    offset_boxes = boxes.astype(np.result_type(boxes, float))
+    offset_boxes[:, :4] = np.trunc(boxes[:, :4] + offsets)
+    return offset_boxes
+
+
+def clip_boxes(boxes, image_shape):
+    """Clip all boxes to valid image coordinates as in ``clip``.
+
+    # Arguments
+        boxes: Numpy array of shape `(num_boxes, 4 + N)` with corner
+            coordinates.
+        image_shape: List of two integers indicating height and width of image
+            respectively.
+
+    # Returns
+        Numpy array of shape `(num_boxes, 4 + N)`.
+    """
+    height, width = image_shape[:2]
+    clipped_boxes = boxes.copy()
+    clipped_boxes[:, :2] = np.maximum(boxes[:, :2], 0)
+    clipped_boxes[:, 2:4] = np.minimum(boxes[:, 2:4], [width, height])
+    return clipped_boxes
+
+
+def denormalize_boxes(boxes, image_shape):
+    """Scales all boxes from normalized values to image dimensions as in
+    ``denormalize_box``.
+
+    # Arguments
+        boxes: Numpy array of shape `(num_boxes, 4 + N)` with corner
+            coordinates.
+        image_shape: List of integers with (height, width).
+
+    # Returns
+        Numpy array of shape `(num_boxes, 4 + N)`.
+    """
+    height, width = image_shape[:2]
+    denormalized_boxes = boxes.astype(np.result_type(boxes, float))
+    scales = np.array([width, height, width, height])
+    denormalized_boxes[:, :4] = np.trunc(boxes[:, :4] * scales)
+    return denormalized_boxes
+
+
 def flip_left_right(boxes, width):
     """Flips box coordinates from left-to-right and vice-versa.
     # Arguments
@@ -612,7 +698,7 @@ def flip_left_right(boxes, width):
         Numpy array of shape `[num_boxes, 4]`.
     """
     flipped_boxes = boxes.copy()
-    flipped_boxes[:, [0, 2]] = width - boxes[:, [2, 0]]
+    flipped_boxes[..., [0, 2]] = width - boxes[..., [2, 0]]
     return flipped_boxes
 
 
@@ -722,3 +808,36 @@ def change_box_coordinates(outputs):
     classes = classes[np.newaxis]
     outputs = np.concatenate([boxes, classes], axis=2)
     return outputs
+
+
+def pad_boxes(boxes, max_num_boxes, value=-1):
+    """Pads boxes to a fixed number of rows allowing them to be batched.
+
+    # Arguments
+        boxes: Numpy array of shape `(num_boxes, N)` whose last column
+            contains the class arguments.
+        max_num_boxes: Int. Number of rows of the padded boxes.
+        value: Float. Value of all entries of the padding rows.
+
+    # Returns
+        Numpy array of shape `(max_num_boxes, N)`.
+    """
+    num_boxes = len(boxes)
+    if num_boxes > max_num_boxes:
+        raise ValueError('Number of boxes %d is larger than %d' % (
+            num_boxes, max_num_boxes))
+    padding = np.full((max_num_boxes - num_boxes, boxes.shape[1]), value)
+    return np.concatenate([boxes, padding.astype(boxes.dtype)], axis=0)
+
+
+def unpad_boxes(boxes, value=-1):
+    """Removes the padding rows of boxes given by ``pad_boxes``.
+
+    # Arguments
+        boxes: Numpy array of shape `(max_num_boxes, N)`.
+        value: Float. Class argument of the padding rows.
+
+    # Returns
+        Numpy array of shape `(num_boxes, N)`.
+    """
+    return boxes[boxes[:, -1] != value]
@@ -223,29 +223,35 @@ def draw_filled_polygon(image, vertices, color):
     return image
 
 
-def draw_random_polygon(image, max_radius_scale=.5):
+def draw_random_polygon(image, max_radius_scale=.5, rng=None):
     """Draw random polygon image.
 
     # Arguments
         image: Numpy array with shape ``[H, W, 3]``.
         max_radius_scale: Float between [0, 1].
+        rng: ``numpy.random.Generator`` or ``None``. If ``None`` the polygon
+            is sampled from the global ``np.random`` state.
 
     # Returns
         Numpy array with shape ``[H, W, 3]``. Image with polygon.
     """
+    if rng is None:
+        rng, randint = np.random, np.random.randint
+    else:
+        randint = rng.integers
     height, width = image.shape[:2]
     max_distance = np.max((height, width)) * max_radius_scale
-    num_vertices = np.random.randint(3, 7)
+    num_vertices = randint(3, 7)
     angle_between_vertices = 2 * np.pi / num_vertices
-    initial_angle = np.random.uniform(0, 2 * np.pi)
-    center = np.random.rand(2) * np.array([width, height])
+    initial_angle = rng.uniform(0, 2 * np.pi)
+    center = rng.random(2) * np.array([width, height])
     vertices = np.zeros((num_vertices, 2), dtype=np.int32)
     for vertex_arg in range(num_vertices):
         angle = initial_angle + (vertex_arg * angle_between_vertices)
         vertex = np.array([np.cos(angle), np.sin(angle)])
-        vertex = np.random.uniform(0, max_distance) * vertex
+        vertex = rng.uniform(0, max_distance) * vertex
         vertices[vertex_arg] = (vertex + center).astype(np.int32)
-    color = np.random.randint(0, 256, 3).tolist()
+    color = randint(0, 256, 3).tolist()
     draw_filled_polygon(image, vertices, color)
     return image
 
@@ -302,19 +308,14 @@ def make_mosaic(images, shape, border=0):
     if num_images > (num_rows * num_cols):
         raise ValueError('Number of images is bigger than shape')
 
-    total_rows = (num_rows * H) + ((num_rows - 1) * border)
-    total_cols = (num_cols * W) + ((num_cols - 1) * border)
-    mosaic = np.ones((total_rows, total_cols, num_channels))
-
     padded_H = H + border
     padded_W = W + border
-
-    for image_arg, image in enumerate(images):
-        row = int(np.floor(image_arg / num_cols))
-        col = image_arg % num_cols
-        mosaic[row * padded_H:row * padded_H + H,
-               col * padded_W:col * padded_W + W, :] = image
-    return mosaic
+    tiles = np.ones((num_rows * num_cols, padded_H, padded_W, num_channels))
+    tiles[:num_images, :H, :W] = images
+    tiles = tiles.reshape(num_rows, num_cols, padded_H, padded_W, -1)
+    mosaic = tiles.transpose(0, 2, 1, 3, 4).reshape(
+        num_rows * padded_H, num_cols * padded_W, num_channels)
+    return mosaic[:mosaic.shape[0] - border, :mosaic.shape[1] - border]
 
 
 def draw_points2D(image, points2D, colors):
@@ -441,10 +442,299 @@ def draw_RGB_masks(image, points2D, points3D, object_sizes):
     # Returns
         Image array with drawn masks
     """
-    for instance_points2D, instance_points3D in zip(points2D, points3D):
-        image = draw_RGB_mask(
-            image, instance_points2D, instance_points3D, object_sizes)
-    return image
+    if len(points2D) == 0:
+        return image
+    points2D = np.concatenate([np.reshape(points, (-1, 2))
+                               for points in points2D])
+    points3D = np.concatenate([np.reshape(points, (-1, 3))
+                               for points in points3D])
+    return draw_RGB_mask(image, points2D, points3D, object_sizes)
+
+
+def _build_disk_offsets(radius):
+    """Computes the pixel offsets covered by a filled ``cv2.circle``.
+
+    # Arguments
+        radius: Int. Radius of the circle.
+
+    # Returns
+        Two arrays with the row and column offsets from the center.
+    """
+    stamp = np.zeros((2 * radius + 1, 2 * radius + 1), dtype=np.uint8)
+    cv2.circle(stamp, (radius, radius), radius, 1, FILLED)
+    row_offsets, col_offsets = np.nonzero(stamp)
+    return row_offsets - radius, col_offsets - radius
+
+
+def _group_by_color(colors, num_primitives):
+    """Groups consecutive primitive arguments having the same color. Only
+    consecutive primitives are grouped so that drawing the groups one after
+    the other keeps the drawing order of the primitives.
+
+    # Arguments
+        colors: List of length three with one color for all primitives
+            or array ``(num_primitives, 3)`` with one color per primitive.
+        num_primitives: Int.
+
+    # Returns
+        List of tuples containing a color and its primitive arguments.
+    """
+    colors = np.asarray(colors)
+    if colors.ndim == 1:
+        return [(colors, np.arange(num_primitives))]
+    if num_primitives == 0:
+        return []
+    is_new_color = np.any(colors[1:] != colors[:-1], axis=1)
+    starts = np.concatenate([[0], np.flatnonzero(is_new_color) + 1])
+    stops = np.append(starts[1:], num_primitives)
+    return [(colors[start], np.arange(start, stop))
+            for start, stop in zip(starts, stops)]
+
+
+class Overlay(object):
+    """Rasterizes all drawing primitives of a frame into a single
+    preallocated overlay that is alpha-composited with the image once.
+
+    Consecutive lines and boxes sharing a color are rasterized with one
+    ``cv2.polylines`` call and points and dots are splatted with NumPy.
+    Primitives are drawn in the order they are given, which results in the
+    same image as drawing them one by one with the OpenCV functions.
+    An opaque overlay is drawn directly into the image since compositing it
+    would only copy its pixels.
+
+    # Arguments
+        alpha: Float between [0, 1]. Opacity of the overlay.
+
+    # Properties
+        canvas: Array in which primitives are drawn. Either the image or an
+            array ``(H, W, 4)`` with colors premultiplied by the coverage
+            stored in the last channel between [0, 255].
+
+    # Methods
+        reset()
+        draw_points()
+        draw_dots()
+        draw_keypoints()
+        draw_lines()
+        draw_skeletons()
+        draw_boxes()
+        draw_text()
+        render()
+    """
+    def __init__(self, alpha=1.0):
+        self.alpha = alpha
+        self.image = None
+        self.canvas = None
+        self._buffer = None
+        self._disk_offsets = {}
+
+    def reset(self, image):
+        """Starts drawing a new frame. Memory is only allocated again if the
+        shape or the data type of the images changed.
+
+        # Arguments
+            image: Array ``(H, W, 3)``. Image in which the overlay is drawn.
+        """
+        self.image = image
+        if self.alpha == 1.0:
+            self.canvas = image
+            return
+        buffer_shape = (image.shape[0], image.shape[1], 4)
+        if ((self._buffer is None) or (self._buffer.shape != buffer_shape) or
+                (self._buffer.dtype != image.dtype)):
+            self._buffer = np.zeros(buffer_shape, dtype=image.dtype)
+        else:
+            self._buffer.fill(0)
+        self.canvas = self._buffer
+
+    def _to_canvas_color(self, color):
+        color = tuple(float(channel) for channel in color[:3])
+        if self.canvas is self._buffer:
+            color = color + (255.0,)
+        return color
+
+    def _splat(self, points, colors, row_offsets, col_offsets):
+        """Writes ``colors`` at ``points`` plus offsets. Pixels written
+        later overwrite earlier ones i.e. points are drawn in order.
+
+        # Arguments
+            points: Array ``(num_points, 2)`` in ``(U, V)`` coordinates.
+            colors: Color, array ``(num_points, 3)`` or array
+                ``(num_points, num_offsets, 3)`` with one color per offset.
+            row_offsets: Array ``(num_offsets)``.
+            col_offsets: Array ``(num_offsets)``.
+        """
+        height, width = self.canvas.shape[:2]
+        points = np.asarray(points)[:, :2].astype(int)
+        colors = np.asarray(colors)[..., :3]
+        if colors.ndim < 3:
+            colors = colors.reshape(-1, 1, 3)
+        colors = np.broadcast_to(colors, (len(points), len(row_offsets), 3))
+        rows = (points[:, 1:2] + row_offsets).reshape(-1)
+        cols = (points[:, 0:1] + col_offsets).reshape(-1)
+        inside = (rows >= 0) & (rows < height) & (cols >= 0) & (cols < width)
+        rows, cols = rows[inside], cols[inside]
+        self.canvas[rows, cols, :3] = colors.reshape(-1, 3)[inside]
+        if self.canvas is self._buffer:
+            self.canvas[rows, cols, 3] = 255
+
+    def _get_disk_offsets(self, radius):
+        if radius not in self._disk_offsets:
+            self._disk_offsets[radius] = _build_disk_offsets(radius)
+        return self._disk_offsets[radius]
+
+    def draw_points(self, points2D, colors):
+        """Draws one pixel per point as ``draw_points2D``.
+
+        # Arguments
+            points2D: Array ``(num_points, 2)`` in ``(U, V)`` coordinates.
+            colors: Color or array ``(num_points, 3)`` with RGB colors.
+        """
+        self._splat(points2D, colors, np.zeros(1, int), np.zeros(1, int))
+
+    def draw_dots(self, points, colors, radius=5):
+        """Draws filled circles with the same pixels as ``draw_circle``.
+
+        # Arguments
+            points: Array ``(num_points, 2)`` in ``(U, V)`` coordinates.
+            colors: Color or array ``(num_points, 3)`` with RGB colors.
+            radius: Int. Radius of all circles.
+        """
+        row_offsets, col_offsets = self._get_disk_offsets(radius)
+        self._splat(points, colors, row_offsets, col_offsets)
+
+    def draw_keypoints(self, keypoints, colors, radius=5):
+        """Draws keypoints as ``draw_keypoint`` i.e. a colored circle
+        inside a black circle.
+
+        # Arguments
+            keypoints: Array ``(num_keypoints, 2)`` in ``(U, V)``
+                coordinates.
+            colors: Color or array ``(num_keypoints, 3)`` with RGB colors.
+            radius: Int. Radius of the outer black circles.
+        """
+        outer_offsets = self._get_disk_offsets(radius)
+        inner_offsets = self._get_disk_offsets(int(0.8 * radius))
+        row_offsets = np.concatenate([outer_offsets[0], inner_offsets[0]])
+        col_offsets = np.concatenate([outer_offsets[1], inner_offsets[1]])
+        # every keypoint writes its black disk and then its colored disk
+        num_outer, num_offsets = len(outer_offsets[0]), len(row_offsets)
+        colors = np.asarray(colors)[..., :3].reshape(-1, 1, 3)
+        colors = np.broadcast_to(colors, (len(keypoints), num_offsets, 3))
+        colors = colors.copy()
+        colors[:, :num_outer] = 0
+        self._splat(keypoints, colors, row_offsets, col_offsets)
+
+    def draw_lines(self, points_A, points_B, colors, thickness=5):
+        """Draws lines from ``points_A`` to ``points_B`` as ``draw_line``.
+
+        # Arguments
+            points_A: Array ``(num_lines, 2)`` in ``(U, V)`` coordinates.
+            points_B: Array ``(num_lines, 2)`` in ``(U, V)`` coordinates.
+            colors: Color or array ``(num_lines, 3)`` with RGB colors.
+            thickness: Int. Thickness of all lines.
+        """
+        points_A = np.asarray(points_A)[:, :2].astype(np.int32)
+        points_B = np.asarray(points_B)[:, :2].astype(np.int32)
+        segments = np.stack([points_A, points_B], axis=1)
+        if len(segments) == 0:
+            return
+        for color, line_args in _group_by_color(colors, len(segments)):
+            cv2.polylines(self.canvas, segments[line_args], False,
+                          self._to_canvas_color(color), thickness)
+
+    def draw_skeletons(self, keypoints, link_args, link_colors,
+                       keypoint_colors, check_scores=False, link_width=2,
+                       keypoint_radius=6):
+        """Draws the skeletons of many instances as ``draw_keypoints_link``
+        and ``draw_keypoints``.
+
+        # Arguments
+            keypoints: Array ``(num_instances, num_keypoints, 2 + 1)``
+                with ``(U, V)`` coordinates and optionally a score.
+            link_args: Array ``(num_links, 2)`` with the keypoint arguments
+                of each link.
+            link_colors: Array ``(num_links, 3)`` with RGB colors.
+            keypoint_colors: Array ``(num_keypoints, 3)`` with RGB colors.
+            check_scores: Boolean. If ``True`` only keypoints with positive
+                scores and links between them are drawn.
+            link_width: Int. Thickness of the links.
+            keypoint_radius: Int. Radius of the keypoints.
+        """
+        link_args = np.asarray(link_args)
+        link_colors = np.asarray(link_colors)
+        keypoint_colors = np.asarray(keypoint_colors)
+        # instances are drawn one after the other as overlapping instances
+        # would otherwise change their order
+        for instance_keypoints in np.asarray(keypoints):
+            points_A = instance_keypoints[link_args[:, 0]]
+            points_B = instance_keypoints[link_args[:, 1]]
+            instance_link_colors = link_colors
+            instance_keypoint_colors = keypoint_colors
+            if check_scores:
+                valid_links = (points_A[:, 2] > 0) & (points_B[:, 2] > 0)
+                points_A = points_A[valid_links]
+                points_B = points_B[valid_links]
+                instance_link_colors = link_colors[valid_links]
+                valid_keypoints = instance_keypoints[:, 2] > 0
+                instance_keypoints = instance_keypoints[valid_keypoints]
+                instance_keypoint_colors = keypoint_colors[valid_keypoints]
+            self.draw_lines(points_A, points_B, instance_link_colors,
+                            link_width)
+            self.draw_keypoints(instance_keypoints, instance_keypoint_colors,
+                                keypoint_radius)
+
+    def draw_boxes(self, boxes, colors, thickness=2):
+        """Draws box outlines as ``draw_rectangle``.
+
+        # Arguments
+            boxes: Array ``(num_boxes, 4)`` with
+                ``(x_min, y_min, x_max, y_max)`` coordinates.
+            colors: Color or array ``(num_boxes, 3)`` with RGB colors.
+            thickness: Int. Thickness of all box lines.
+        """
+        x_min, y_min, x_max, y_max = np.asarray(boxes)[:, :4].astype(int).T
+        corners = np.stack([np.stack([x_min, y_min], axis=1),
+                            np.stack([x_max, y_min], axis=1),
+                            np.stack([x_max, y_max], axis=1),
+                            np.stack([x_min, y_max], axis=1)], axis=1)
+        corners = corners.astype(np.int32)
+        if len(corners) == 0:
+            return
+        for color, box_args in _group_by_color(colors, len(corners)):
+            cv2.polylines(self.canvas, corners[box_args], True,
+                          self._to_canvas_color(color), thickness)
+
+    def draw_text(self, text, point, scale, color, thickness):
+        """Draws text as ``put_text``.
+
+        # Arguments
+            text: String. Text to be drawn.
+            point: Tuple of coordinates indicating the top corner of the text.
+            scale: Float. Scale of text.
+            color: Tuple of integers. RGB color coordinates.
+            thickness: Integer. Thickness of the lines used for drawing text.
+        """
+        put_text(self.canvas, text, point, scale,
+                 self._to_canvas_color(color), thickness)
+
+    def render(self):
+        """Alpha-composites the overlay into the image given to ``reset``.
+
+        # Returns
+            Array ``(H, W, 3)``. Image with the drawn overlay.
+        """
+        if self.canvas is self.image:
+            return self.image
+        rows, cols = np.nonzero(self.canvas[..., 3])
+        pixels = self.canvas[rows, cols].astype(np.float32)
+        weights = (self.alpha / 255.0) * pixels[:, 3:]
+        blended = ((1.0 - weights) * self.image[rows, cols] +
+                   self.alpha * pixels[:, :3])
+        if np.issubdtype(self.image.dtype, np.integer):
+            blended = np.rint(blended)
+        self.image[rows, cols] = blended
+        return self.image
 
 
 def draw_human_pose6D(image, rotation, translation, camaera_intrinsics):
@@ -18,6 +18,98 @@ def cast_image(image, dtype):
     return image.astype(dtype)
 
 
+def _per_image(values, array):
+    # reshapes one value per image to broadcast against a batch
+    values = np.asarray(values, dtype=np.float32)
+    if values.ndim == 0:
+        return values
+    return np.reshape(values, (-1,) + (1,) * (array.ndim - 1))
+
+
+def _convert_color_space(image, flag):
+    # color conversions are per pixel, hence batches are converted at once
+    shape = image.shape
+    image = np.ascontiguousarray(image).reshape(-1, *shape[-2:])
+    return convert_color_space(image, flag).reshape(shape)
+
+
+def adjust_saturation(image, factor):
+    """Multiplies the saturation of RGB images.
+
+    # Arguments
+        image: Numpy array of shape ``(H, W, 3)`` or batch of images of
+            shape ``(num_images, H, W, 3)`` in RGB format.
+        factor: Float or numpy array with one factor per image.
+
+    # Returns
+        Numpy array of type ``uint8``.
+    """
+    image = _convert_color_space(image, RGB2HSV)
+    image = cast_image(image, np.float32)
+    image[..., 1] = image[..., 1] * _per_image(factor, image[..., 1])
+    image[..., 1] = np.clip(image[..., 1], 0, 255)
+    image = cast_image(image, np.uint8)
+    image = _convert_color_space(image, HSV2RGB)
+    return image
+
+
+def adjust_brightness(image, delta):
+    """Adds a brightness offset to RGB images.
+
+    # Arguments
+        image: Numpy array of shape ``(H, W, 3)`` or batch of images of
+            shape ``(num_images, H, W, 3)`` in RGB format.
+        delta: Float or numpy array with one offset per image.
+
+    # Returns
+        Numpy array of type ``uint8``.
+    """
+    image = cast_image(image, np.float32)
+    image = image + _per_image(delta, image)
+    image = np.clip(image, 0, 255)
+    image = cast_image(image, np.uint8)
+    return image
+
+
+def adjust_contrast(image, alpha):
+    """Multiplies the contrast of RGB images.
+
+    # Arguments
+        image: Numpy array of shape ``(H, W, 3)`` or batch of images of
+            shape ``(num_images, H, W, 3)`` in RGB format.
+        alpha: Float or numpy array with one factor per image.
+
+    # Returns
+        Numpy array of type ``uint8``.
+    """
+    image = cast_image(image, np.float32)
+    image = image * _per_image(alpha, image)
+    image = np.clip(image, 0, 255)
+    image = cast_image(image, np.uint8)
+    return image
+
+
+def adjust_hue(image, delta):
+    """Shifts the hue of RGB images.
+
+    # Arguments
+        image: Numpy array of shape ``(H, W, 3)`` or batch of images of
+            shape ``(num_images, H, W, 3)`` in RGB format.
+        delta: Float or numpy array with one shift per image.
+
+    # Returns
+        Numpy array of type ``uint8``.
+    """
+    image = _convert_color_space(image, RGB2HSV)
+    image = cast_image(image, np.float32)
+    image[..., 0] = image[..., 0] + _per_image(delta, image[..., 0])
+    image[..., 0][image[..., 0] > 179.0] -= 179.0
+    image[..., 0][image[..., 0] < 0.0] += 179.0
+    image = cast_image(image, np.uint8)
+    image = _convert_color_space(image, HSV2RGB)
+    return image
+
+
 def random_saturation(image, lower=0.3, upper=1.5):
     """Applies random saturation to an RGB image.
 
@@ -26,13 +118,7 @@ def random_saturation(image, lower=0.3, upper=1.5):
         lower: Float.
         upper: Float.
     """
-    image = convert_color_space(image, RGB2HSV)
-    image = cast_image(image, np.float32)
-    image[:, :, 1] = image[:, :, 1] * np.random.uniform(lower, upper)
-    image[:, :, 1] = np.clip(image[:, :, 1], 0, 255)
-    image = cast_image(image, np.uint8)
-    image = convert_color_space(image, HSV2RGB)
-    return image
+    return adjust_saturation(image, np.random.uniform(lower, upper))
 
 
 def random_brightness(image, delta=32):
@@ -42,12 +128,7 @@ def random_brightness(image, delta=32):
         image: Numpy array representing an image RGB format.
         delta: Int.
     """
-    image = cast_image(image, np.float32)
-    random_brightness = np.random.uniform(-delta, delta)
-    image = image + random_brightness
-    image = np.clip(image, 0, 255)
-    image = cast_image(image, np.uint8)
-    return image
+    return adjust_brightness(image, np.random.uniform(-delta, delta))
 
 
 def random_contrast(image, lower=0.5, upper=1.5):
@@ -58,12 +139,7 @@ def random_contrast(image, lower=0.5, upper=1.5):
         lower: Float.
         upper: Float.
     """
-    alpha = np.random.uniform(lower, upper)
-    image = cast_image(image, np.float32)
-    image = image * alpha
-    image = np.clip(image, 0, 255)
-    image = cast_image(image, np.uint8)
-    return image
+    return adjust_contrast(image, np.random.uniform(lower, upper))
 
 
 def random_hue(image, delta=18):
@@ -73,14 +149,7 @@ def random_hue(image, delta=18):
         image: Numpy array representing an image RGB format.
         delta: Int.
     """
-    image = convert_color_space(image, RGB2HSV)
-    image = cast_image(image, np.float32)
-    image[:, :, 0] = image[:, :, 0] + np.random.uniform(-delta, delta)
-    image[:, :, 0][image[:, :, 0] > 179.0] -= 179.0
-    image[:, :, 0][image[:, :, 0] < 0.0] += 179.0
-    image = cast_image(image, np.uint8)
-    image = convert_color_space(image, HSV2RGB)
-    return image
+    return adjust_hue(image, np.random.uniform(-delta, delta))
 
 
 def flip_left_right(image):
@@ -98,7 +167,7 @@ def random_flip_left_right(image):
     # Arguments
         image: Numpy array.
     """
-    if np.random.uniform([1], 0, 2) == 1:
+    if np.random.randint(0, 2):
         image = flip_left_right(image)
     return image
 
@@ -134,12 +203,14 @@ def normalized_device_coordinates_to_image(image):
     return (image + 1.0) * 127.5
 
 
-def random_shape_crop(image, shape):
+def random_shape_crop(image, shape, rng=None):
     """Randomly crops an image of the given ``shape``.
 
     # Arguments
         image: Numpy array.
         shape: List of two ints ''(H, W)''.
+        rng: ``numpy.random.Generator`` or ``None``. If ``None`` the crop
+            is sampled from the global ``np.random`` state.
 
     # Returns
         Numpy array of cropped image.
@@ -147,26 +218,30 @@ def random_shape_crop(image, shape):
     H, W = image.shape[:2]
     if (shape[0] >= H) or (shape[1] >= W):
         return None
-    x_min = np.random.randint(0, W - shape[1])
-    y_min = np.random.randint(0, H - shape[0])
+    randint = np.random.randint if rng is None else rng.integers
+    x_min = randint(0, W - shape[1])
+    y_min = randint(0, H - shape[0])
     x_max = int(x_min + shape[1])
     y_max = int(y_min + shape[0])
     cropped_image = image[y_min:y_max, x_min:x_max]
     return cropped_image
 
 
-def make_random_plain_image(shape):
+def make_random_plain_image(shape, rng=None):
     """Makes random plain image by sampling three random values.
 
     # Arguments
         shape: Image shape e.g. ''(H, W, 3)''.
+        rng: ``numpy.random.Generator`` or ``None``. If ``None`` the color
+            is sampled from the global ``np.random`` state.
 
     # Returns
         Numpy array of shape ''(H, W, 3)''.
     """
     if len(shape) != 3:
         raise ValueError('``shape`` must have three values')
-    return (np.ones(shape) * np.random.randint(0, 256, shape[-1]))
+    randint = np.random.randint if rng is None else rng.integers
+    return (np.ones(shape) * randint(0, 256, shape[-1]))
 
 
 def blend_alpha_channel(image, background):
@@ -22,7 +22,7 @@ def resize(image, size):
     return tf.image.resize(image, size)
 
 
-def random_saturation(image, upper, lower):
+def random_saturation(image, lower, upper):
     return tf.image.random_saturation(image, lower, upper)
 
 
@@ -92,7 +92,7 @@ def random_crop(image, size):
 def split_alpha_channel(image):
     if image.shape[-1] != 4:
         raise ValueError('Provided image does not contain alpha mask.')
-    image, alpha_channel = tf.split(image, [3], -1)
+    image, alpha_channel = tf.split(image, [3, 1], -1)
     alpha_channel = alpha_channel / 255.0
     return image, alpha_channel
 
@@ -110,14 +110,14 @@ def random_plain_background(image):
     image, alpha_channel = split_alpha_channel(image)
     random_color = tf.random.uniform([3], 0, 255)
     random_color = tf.reshape(random_color, [1, 1, 3])
-    H, W = image.shape[:2]
+    H, W = tf.unstack(tf.shape(image)[:2])
     background = tf.tile(random_color, [H, W, 1])
     return alpha_blend(image, background, alpha_channel)
 
 
 def random_cropped_background(image, background):
     image, alpha_channel = split_alpha_channel(image)
-    background = random_crop(background, size=image.shape)
+    background = random_crop(background, size=tf.shape(image))
     return alpha_blend(image, background, alpha_channel)
 
 
@@ -126,9 +126,34 @@ def flip_left_right(image):
 
 
 def random_flip_left_right(image):
-    if tf.random.uniform([1], 0, 2) == 1:
-        image = flip_left_right(image)
-    return image
+    return tf.image.random_flip_left_right(image)
+
+
+def transform_image(image, matrix, fill_color):
+    """Transforms an image with an affine matrix as ``warp_affine``.
+
+    # Arguments
+        image: Tensor of shape ``(H, W, num_channels)``.
+        matrix: Tensor of shape ``(2, 3)`` mapping input to output pixels.
+        fill_color: Tensor with the per-channel values of pixels outside
+            of the image.
+
+    # Returns
+        Tensor of type float32 with the shape of ``image``.
+    """
+    matrix = tf.concat([tf.cast(matrix, tf.float32), [[0.0, 0.0, 1.0]]], 0)
+    # projective transforms map output into input pixels
+    inverse = tf.reshape(tf.linalg.inv(matrix), [9])[:8]
+    image = tf.cast(image, tf.float32)
+    mask = tf.ones_like(image[..., :1])
+    images = tf.stack([tf.concat([image, mask], axis=-1)])
+    images = tf.raw_ops.ImageProjectiveTransformV3(
+        images=images, transforms=inverse[tf.newaxis],
+        output_shape=tf.shape(image)[:2], interpolation='BILINEAR',
+        fill_mode='CONSTANT', fill_value=0.0)
+    image, mask = images[0, ..., :-1], images[0, ..., -1:]
+    fill_color = tf.cast(fill_color, tf.float32)
+    return image + ((1.0 - mask) * fill_color)
 
 
 def imagenet_preprocess_input(image, data_format=None, mode='torch'):
@@ -1,3 +1,6 @@
+import os
+import glob
+import multiprocessing
 import numpy as np
 
 
@@ -206,3 +209,145 @@ def split_alpha_channel(image):
     if image_shape[-1] != 4:
         raise ValueError('Invalid number of channels')
     return image[..., :3], image[..., 3:4]
+
+
+def stack_samples(samples):
+    """Stacks rendered samples into arrays with a leading sample axis.
+
+    # Arguments
+        samples: List of samples. Each sample is either a list of arrays or a
+            dictionary of arrays as returned by a renderer.
+
+    # Returns
+        Dictionary of stacked arrays. List samples are stored with the keys
+            ``output_0``, ``output_1``, etc.
+    """
+    if isinstance(samples[0], dict):
+        names = list(samples[0].keys())
+        samples = [[sample[name] for name in names] for sample in samples]
+    else:
+        names = ['output_%d' % arg for arg in range(len(samples[0]))]
+    arrays = {}
+    for arg, name in enumerate(names):
+        arrays[name] = np.stack([sample[arg] for sample in samples])
+    return arrays
+
+
+def write_shard(filepath, samples):
+    """Writes rendered samples into a compressed ``.npz`` shard.
+
+    # Arguments
+        filepath: String. Path of the shard.
+        samples: List of samples as returned by a renderer.
+    """
+    np.savez_compressed(filepath, **stack_samples(samples))
+
+
+def load_shard(filepath):
+    """Loads all arrays of a shard written by ``write_shard``.
+
+    # Arguments
+        filepath: String. Path of the shard.
+
+    # Returns
+        Dictionary of arrays with a leading sample axis.
+    """
+    with np.load(filepath) as shard:
+        return {name: shard[name] for name in shard.files}
+
+
+_WORKER_RENDERER = None
+
+
+def _initialize_worker(build_renderer):
+    global _WORKER_RENDERER
+    _WORKER_RENDERER = build_renderer()
+
+
+def _render_shard(arguments):
+    filepath, num_samples, seed = arguments
+    np.random.seed(seed)
+    samples = [_WORKER_RENDERER.render() for _ in range(num_samples)]
+    write_shard(filepath, samples)
+    return filepath
+
+
+def render_shards(build_renderer, num_samples, path, shard_size=1000,
+                  num_workers=1, seed=777):
+    """Pre-renders samples into compressed shards using many processes.
+
+    # Arguments
+        build_renderer: Picklable function without arguments returning an
+            object with a ``render`` method e.g.
+            ``functools.partial(PixelMaskRenderer, path_OBJ)``.
+            Every worker builds its own renderer.
+        num_samples: Int. Total number of rendered samples.
+        path: String. Directory in which shards are written.
+        shard_size: Int. Number of samples per shard.
+        num_workers: Int. Number of rendering processes.
+        seed: Int. Seed of the first shard. Shard ``i`` uses ``seed + i``.
+
+    # Returns
+        List of shard filepaths.
+    """
+    if not os.path.exists(path):
+        os.makedirs(path)
+    tasks = []
+    for shard_arg, start in enumerate(range(0, num_samples, shard_size)):
+        filepath = os.path.join(path, 'shard_%05d.npz' % shard_arg)
+        size = min(shard_size, num_samples - start)
+        tasks.append((filepath, size, seed + shard_arg))
+    if num_workers == 1:
+        _initialize_worker(build_renderer)
+        return [_render_shard(task) for task in tasks]
+    with multiprocessing.Pool(num_workers, _initialize_worker,
+                              (build_renderer,)) as pool:
+        return pool.map(_render_shard, tasks, chunksize=1)
+
+
+class ShardRenderer(object):
+    """Replays pre-rendered shards with the interface of a renderer.
+
+    Only one shard is kept in memory at a time. Shards and the samples
+    inside every shard are visited in a new random order after every pass.
+
+    # Arguments
+        path: String. Directory containing the shards.
+        shuffle: Boolean. If True shards and samples are shuffled.
+        seed: Int. Seed of the shuffling.
+
+    # Methods
+        render()
+    """
+    def __init__(self, path, shuffle=True, seed=777):
+        self.filepaths = sorted(glob.glob(os.path.join(path, '*.npz')))
+        if len(self.filepaths) == 0:
+            raise ValueError('No shards found in', path)
+        self.shuffle = shuffle
+        self.random_state = np.random.RandomState(seed)
+        self._shard_order = []
+        self._sample_order = []
+
+    def _load_next_shard(self):
+        if len(self._shard_order) == 0:
+            self._shard_order = list(range(len(self.filepaths)))
+            if self.shuffle:
+                self.random_state.shuffle(self._shard_order)
+        self.shard = load_shard(self.filepaths[self._shard_order.pop()])
+        num_samples = len(next(iter(self.shard.values())))
+        self._sample_order = list(range(num_samples))
+        if self.shuffle:
+            self.random_state.shuffle(self._sample_order)
+
+    def render(self):
+        """Returns the next sample in the same structure given by the
+        original renderer.
+        """
+        if len(self._sample_order) == 0:
+            self._load_next_shard()
+        sample_arg = self._sample_order.pop()
+        sample = {name: np.copy(array[sample_arg])
+                  for name, array in self.shard.items()}
+        if all(name.startswith('output_') for name in sample):
+            return [sample['output_%d' % arg] for arg in range(len(sample))]
+        return sample
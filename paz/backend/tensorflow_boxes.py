@@ -0,0 +1,127 @@
+import tensorflow as tf
+
+
+def to_center_form(boxes):
+    """Transform from corner coordinates to center coordinates.
+
+    # Arguments
+        boxes: Tensor with shape `(num_boxes, 4)`.
+
+    # Returns
+        Tensor with shape `(num_boxes, 4)`.
+    """
+    x_min, y_min, x_max, y_max = tf.unstack(boxes[:, :4], axis=1)
+    center_x = (x_max + x_min) / 2.0
+    center_y = (y_max + y_min) / 2.0
+    W = x_max - x_min
+    H = y_max - y_min
+    return tf.stack([center_x, center_y, W, H], axis=1)
+
+
+def to_corner_form(boxes):
+    """Transform from center coordinates to corner coordinates.
+
+    # Arguments
+        boxes: Tensor with shape `(num_boxes, 4)`.
+
+    # Returns
+        Tensor with shape `(num_boxes, 4)`.
+    """
+    center_x, center_y, W, H = tf.unstack(boxes[:, :4], axis=1)
+    x_min = center_x - (W / 2.0)
+    x_max = center_x + (W / 2.0)
+    y_min = center_y - (H / 2.0)
+    y_max = center_y + (H / 2.0)
+    return tf.stack([x_min, y_min, x_max, y_max], axis=1)
+
+
+def compute_ious(boxes_A, boxes_B):
+    """Calculates the intersection over union between `boxes_A` and `boxes_B`
+    in corner coordinates.
+
+    # Arguments
+        boxes_A: Tensor with shape `(num_boxes_A, 4)`.
+        boxes_B: Tensor with shape `(num_boxes_B, 4)`.
+
+    # Returns
+        Tensor of shape `(num_boxes_A, num_boxes_B)`.
+    """
+    xy_min = tf.maximum(boxes_A[:, tf.newaxis, 0:2], boxes_B[:, 0:2])
+    xy_max = tf.minimum(boxes_A[:, tf.newaxis, 2:4], boxes_B[:, 2:4])
+    intersection = tf.maximum(0.0, xy_max - xy_min)
+    intersection_area = intersection[:, :, 0] * intersection[:, :, 1]
+    areas_A = (boxes_A[:, 2] - boxes_A[:, 0]) * (boxes_A[:, 3] - boxes_A[:, 1])
+    areas_B = (boxes_B[:, 2] - boxes_B[:, 0]) * (boxes_B[:, 3] - boxes_B[:, 1])
+    union_area = (areas_A[:, tf.newaxis] + areas_B) - intersection_area
+    union_area = tf.maximum(union_area, 1e-8)
+    return tf.clip_by_value(intersection_area / union_area, 0.0, 1.0)
+
+
+def match(boxes, prior_boxes, iou_threshold=0.5):
+    """Matches each prior box with a ground truth box as in
+    ``paz.backend.boxes.match``.
+
+    # Arguments
+        boxes: Tensor of shape `(num_boxes, 4 + 1)` with corner
+            coordinates and class arguments.
+        prior_boxes: Tensor of shape `(num_prior_boxes, 4)` in center form.
+        iou_threshold: Float between [0, 1]. Intersection over union
+            used to determine which box is considered a positive box.
+
+    # Returns
+        Tensor of shape `(num_prior_boxes, 4 + 1)`.
+    """
+    ious = compute_ious(boxes, to_corner_form(prior_boxes))
+    per_prior_which_box_iou = tf.reduce_max(ious, axis=0)
+    per_prior_which_box_arg = tf.argmax(ious, axis=0, output_type=tf.int32)
+
+    # overwriting per_prior_which_box_arg if they are the best prior box
+    per_box_which_prior_arg = tf.argmax(ious, axis=1, output_type=tf.int32)
+    best_prior_args = per_box_which_prior_arg[:, tf.newaxis]
+    num_boxes = tf.shape(boxes)[0]
+    per_prior_which_box_iou = tf.tensor_scatter_nd_update(
+        per_prior_which_box_iou, best_prior_args, tf.fill([num_boxes], 2.0))
+    per_prior_which_box_arg = tf.tensor_scatter_nd_update(
+        per_prior_which_box_arg, best_prior_args, tf.range(num_boxes))
+
+    matches = tf.gather(boxes, per_prior_which_box_arg)
+    is_positive = per_prior_which_box_iou >= iou_threshold
+    class_args = tf.where(is_positive, matches[:, 4], 0.0)
+    return tf.concat([matches[:, :4], class_args[:, tf.newaxis]], axis=1)
+
+
+def encode(matched, priors, variances=[0.1, 0.1, 0.2, 0.2]):
+    """Encodes matched boxes with respect to their prior boxes as in
+    ``paz.backend.boxes.encode``.
+
+    # Arguments
+        matched: Tensor of shape `(num_priors, 4 + N)` with boxes in
+            corner form.
+        priors: Tensor of shape `(num_priors, 4)` with boxes in center form.
+        variances: List of four floats.
+
+    # Returns
+        Tensor of shape `(num_priors, 4 + N)`.
+    """
+    boxes = to_center_form(matched[:, :4])
+    encoded_center = (boxes[:, 0:2] - priors[:, 0:2]) / priors[:, 2:4]
+    encoded_center = encoded_center / variances[0:2]
+    encoded_size = tf.math.log((boxes[:, 2:4] / priors[:, 2:4]) + 1e-8)
+    encoded_size = encoded_size / variances[2:4]
+    return tf.concat([encoded_center, encoded_size, matched[:, 4:]], axis=1)
+
+
+def flip_left_right(boxes, width=1.0):
+    """Flips box coordinates from left-to-right and vice-versa.
+
+    # Arguments
+        boxes: Tensor of shape `(num_boxes, 4 + N)`.
+        width: Float. Image width, ``1.0`` for normalized coordinates.
+
+    # Returns
+        Tensor of shape `(num_boxes, 4 + N)`.
+    """
+    x_min, y_min, x_max, y_max = tf.unstack(boxes[:, :4], axis=1)
+    flipped_boxes = tf.stack(
+        [width - x_max, y_min, width - x_min, y_max], axis=1)
+    return tf.concat([flipped_boxes, boxes[:, 4:]], axis=1)
@@ -1,16 +1,23 @@
-from .utils import get_class_names
-from .voc import VOC
-from .fat import FAT
-from .open_images import OpenImages
-from .ferplus import FERPlus
-from .fer import FER
-from .cityscapes import CityScapes
-from .coco import JOINT_CONFIG
-from .coco import FLIP_CONFIG
-from .coco import HUMAN_JOINT_CONFIG
-from .CMU_poanoptic import MINIMAL_HAND_CONFIG
-from .CMU_poanoptic import IK_UNIT_LENGTH
-from .CMU_poanoptic import MANOHandJoints
-from .CMU_poanoptic import MPIIHandJoints
-from .shapes import Shapes
-from .omniglot import Omniglot
+from ..utils.lazy import lazy_import
+
+_LAZY_ATTRIBUTES = {
+    'get_class_names': '.utils',
+    'VOC': '.voc',
+    'FAT': '.fat',
+    'OpenImages': '.open_images',
+    'FERPlus': '.ferplus',
+    'FER': '.fer',
+    'CityScapes': '.cityscapes',
+    'JOINT_CONFIG': '.coco',
+    'FLIP_CONFIG': '.coco',
+    'HUMAN_JOINT_CONFIG': '.coco',
+    'MINIMAL_HAND_CONFIG': '.CMU_poanoptic',
+    'IK_UNIT_LENGTH': '.CMU_poanoptic',
+    'MANOHandJoints': '.CMU_poanoptic',
+    'MPIIHandJoints': '.CMU_poanoptic',
+    'Shapes': '.shapes',
+    'Omniglot': '.omniglot',
+}
+
+__all__ = list(_LAZY_ATTRIBUTES.keys())
+__getattr__, __dir__ = lazy_import(__name__, _LAZY_ATTRIBUTES)
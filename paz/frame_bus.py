@@ -0,0 +1,404 @@
+import os
+import sys
+import traceback
+import multiprocessing
+
+try:
+    from multiprocessing import shared_memory
+    from multiprocessing import resource_tracker
+except ImportError:
+    shared_memory = resource_tracker = None
+
+import numpy as np
+
+from .abstract.messages import Box2D, Pose6D
+
+BOX2D_DTYPE = np.dtype([('coordinates', np.float32, 4),
+                        ('score', np.float32),
+                        ('class_id', np.int32)])
+
+POSE6D_DTYPE = np.dtype([('quaternion', np.float32, 4),
+                         ('translation', np.float32, 3),
+                         ('class_id', np.int32)])
+
+TOPICS = ['image', 'boxes2D', 'poses6D']
+
+
+def _align(offset, alignment=8):
+    return ((offset + alignment - 1) // alignment) * alignment
+
+
+def _attach(name, shares_tracker):
+    """Attaches to an existing shared memory block without handing its
+    ownership to the resource tracker of this process.
+
+    # Arguments
+        name: String. Name of the shared memory block.
+        shares_tracker: Boolean. If ``True`` this process uses the
+            resource tracker of the creator and the registration of the
+            block is left untouched.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name, track=False)
+    block = shared_memory.SharedMemory(name)
+    # unregistering in a shared tracker would drop the creator registration
+    if not shares_tracker:
+        resource_tracker.unregister(block._name, 'shared_memory')
+    return block
+
+
+def _shares_tracker(tracker_pids):
+    """Checks if this process uses the resource tracker of the processes
+    in ``tracker_pids``. Processes started by ``multiprocessing`` in either
+    start method inherit the resource tracker of their parent.
+    """
+    # ``multiprocessing.parent_process`` is not set yet while ``spawn``
+    # unpickles the arguments of the process
+    return os.getpid() in tracker_pids or os.getppid() in tracker_pids
+
+
+class FrameBus(object):
+    """Ring buffer of fixed-shape uint8 frames with per-frame ``Box2D`` and
+    ``Pose6D`` results living in a single shared memory block.
+
+    Processes exchange slot indices instead of pickled frames. A producer
+    ``acquire`` s a free slot, writes into it and sends the slot index
+    downstream; the last consumer ``release`` s it. Since ``acquire``
+    blocks while all slots are in flight, the number of slots bounds the
+    latency of a multi-process pipeline.
+
+    # Arguments
+        frame_shape: List of integers. Shape of every frame e.g. [H, W, 3].
+        num_slots: Int. Number of frames that can be in flight.
+        max_boxes: Int. Maximum number of ``Box2D`` and ``Pose6D`` per frame.
+        class_names: List of strings. Class names of the messages.
+        context: String or ``None``. Multiprocessing start method of the
+            processes sharing the bus e.g. ``spawn``. ``None`` uses the
+            default start method.
+
+    # Properties
+        frames: Array of shape ``(num_slots, *frame_shape)``.
+
+    # Methods
+        acquire()
+        release()
+        write()
+        read()
+        close()
+        unlink()
+    """
+    def __init__(self, frame_shape, num_slots=8, max_boxes=64,
+                 class_names=None, context=None):
+        if shared_memory is None:
+            raise ImportError('FrameBus requires Python 3.8 or higher')
+        self.frame_shape = tuple(frame_shape)
+        self.num_slots = num_slots
+        self.max_boxes = max_boxes
+        self.class_names = [] if class_names is None else list(class_names)
+        self._shared_memory = shared_memory.SharedMemory(
+            create=True, size=self._compute_size())
+        self.context = context
+        self._tracker_pids = [os.getpid()]
+        context = multiprocessing.get_context(context)
+        self._free_slots = context.Queue(num_slots)
+        for slot in range(num_slots):
+            self._free_slots.put(slot)
+        self._build_views()
+
+    def _compute_layout(self):
+        frames_size = self.num_slots * int(np.prod(self.frame_shape))
+        counts_offset = _align(frames_size)
+        boxes_offset = _align(counts_offset + self.num_slots * 2 * 4)
+        boxes_size = self.num_slots * self.max_boxes * BOX2D_DTYPE.itemsize
+        poses_offset = _align(boxes_offset + boxes_size)
+        poses_size = self.num_slots * self.max_boxes * POSE6D_DTYPE.itemsize
+        return counts_offset, boxes_offset, poses_offset, poses_size
+
+    def _compute_size(self):
+        counts_offset, boxes_offset, poses_offset, poses_size = (
+            self._compute_layout())
+        return poses_offset + poses_size
+
+    def _build_views(self):
+        buffer = self._shared_memory.buf
+        counts_offset, boxes_offset, poses_offset, _ = self._compute_layout()
+        self.frames = np.ndarray((self.num_slots, *self.frame_shape),
+                                 np.uint8, buffer, 0)
+        self._counts = np.ndarray((self.num_slots, 2), np.int32,
+                                  buffer, counts_offset)
+        self._boxes2D = np.ndarray((self.num_slots, self.max_boxes),
+                                   BOX2D_DTYPE, buffer, boxes_offset)
+        self._poses6D = np.ndarray((self.num_slots, self.max_boxes),
+                                   POSE6D_DTYPE, buffer, poses_offset)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for key in ['_shared_memory', 'frames', '_counts',
+                    '_boxes2D', '_poses6D']:
+            state.pop(key)
+        state['name'] = self._shared_memory.name
+        return state
+
+    def __setstate__(self, state):
+        name = state.pop('name')
+        self.__dict__.update(state)
+        shares_tracker = _shares_tracker(self._tracker_pids)
+        if shares_tracker:
+            self._tracker_pids = self._tracker_pids + [os.getpid()]
+        # only the creating process owns the block and may unlink it
+        self._shared_memory = _attach(name, shares_tracker)
+        self._build_views()
+
+    @property
+    def name(self):
+        return self._shared_memory.name
+
+    def acquire(self, timeout=None):
+        """Returns the index of a free slot blocking until one is released.
+
+        # Arguments
+            timeout: Float or ``None``. Maximum waiting time in seconds.
+
+        # Returns
+            Int. Slot index.
+        """
+        slot = self._free_slots.get(timeout=timeout)
+        self._counts[slot] = 0
+        return slot
+
+    def release(self, slot):
+        """Returns ``slot`` to the free slots.
+        """
+        self._free_slots.put(slot)
+
+    def _to_class_id(self, class_name):
+        if class_name in self.class_names:
+            return self.class_names.index(class_name)
+        return -1
+
+    def _to_class_name(self, class_id):
+        return None if class_id < 0 else self.class_names[class_id]
+
+    def write(self, slot, image=None, boxes2D=None, poses6D=None):
+        """Writes messages into ``slot``. ``None`` values are left untouched.
+
+        # Arguments
+            slot: Int. Slot index.
+            image: Array of shape ``frame_shape`` or ``None``.
+            boxes2D: List of ``Box2D`` or ``None``.
+            poses6D: List of ``Pose6D`` or ``None``.
+        """
+        if image is not None:
+            if image.shape != self.frame_shape:
+                raise ValueError('Invalid frame shape', image.shape)
+            if image.dtype != np.uint8:
+                raise ValueError('Invalid frame dtype', image.dtype)
+            self.frames[slot] = image
+        if boxes2D is not None:
+            if len(boxes2D) > self.max_boxes:
+                raise ValueError('Too many boxes', len(boxes2D))
+            records = self._boxes2D[slot, :len(boxes2D)]
+            for box_arg, box2D in enumerate(boxes2D):
+                records[box_arg]['coordinates'] = box2D.coordinates
+                records[box_arg]['score'] = box2D.score
+                records[box_arg]['class_id'] = self._to_class_id(
+                    box2D.class_name)
+            self._counts[slot, 0] = len(boxes2D)
+        if poses6D is not None:
+            if len(poses6D) > self.max_boxes:
+                raise ValueError('Too many poses', len(poses6D))
+            records = self._poses6D[slot, :len(poses6D)]
+            for pose_arg, pose6D in enumerate(poses6D):
+                records[pose_arg]['quaternion'] = pose6D.quaternion
+                records[pose_arg]['translation'] = pose6D.translation
+                records[pose_arg]['class_id'] = self._to_class_id(
+                    pose6D.class_name)
+            self._counts[slot, 1] = len(poses6D)
+
+    def read(self, slot, topic):
+        """Reads a message of ``slot``. Images are returned as views into
+        the shared block and are not copied.
+
+        # Arguments
+            slot: Int. Slot index.
+            topic: String. One of ``image``, ``boxes2D`` or ``poses6D``.
+
+        # Returns
+            Array view, list of ``Box2D`` or list of ``Pose6D``.
+        """
+        if topic == 'image':
+            return self.frames[slot]
+        if topic == 'boxes2D':
+            records = self._boxes2D[slot, :self._counts[slot, 0]]
+            return [Box2D(record['coordinates'].tolist(),
+                          float(record['score']),
+                          self._to_class_name(record['class_id']))
+                    for record in records]
+        if topic == 'poses6D':
+            records = self._poses6D[slot, :self._counts[slot, 1]]
+            return [Pose6D(record['quaternion'].copy(),
+                           record['translation'].copy(),
+                           self._to_class_name(record['class_id']))
+                    for record in records]
+        raise ValueError('Invalid topic', topic)
+
+    def close(self):
+        """Detaches this process from the shared block."""
+        self.frames = self._counts = self._boxes2D = self._poses6D = None
+        self._shared_memory.close()
+
+    def unlink(self):
+        """Frees the shared block. Only called by the creating process."""
+        self._shared_memory.unlink()
+
+
+class StageFailure(object):
+    """Marker sent downstream instead of a slot index when a stage failed
+    on that slot. The slot is released by the failing stage.
+
+    # Arguments
+        message: String. Traceback of the failure.
+    """
+    def __init__(self, message):
+        self.message = message
+
+
+def _run_stage(build_processor, bus, inputs, outputs, topics):
+    try:
+        processor, message = build_processor(), None
+    except Exception:
+        processor, message = None, traceback.format_exc()
+    while True:
+        slot = inputs.get()
+        if slot is None:
+            break
+        if isinstance(slot, StageFailure):
+            outputs.put(slot)
+            continue
+        try:
+            if processor is None:
+                raise RuntimeError('Stage could not be built:\n' + message)
+            output = processor(*[bus.read(slot, topic) for topic in topics])
+            if isinstance(output, dict):
+                bus.write(slot, **{topic: output[topic]
+                                   for topic in TOPICS if topic in output})
+        except Exception:
+            bus.release(slot)
+            outputs.put(StageFailure(traceback.format_exc()))
+            continue
+        outputs.put(slot)
+    outputs.put(None)
+    bus.close()
+
+
+class BusStage(object):
+    """Hosts a ``Processor`` in its own process fed by ``FrameBus`` slots.
+
+    The processor is called with the messages in ``topics`` of every
+    received slot. If it returns a dictionary its ``image``, ``boxes2D``
+    and ``poses6D`` values are written back into the slot before the
+    slot index is forwarded to ``outputs``. If the processor raises, the
+    slot is released and a ``StageFailure`` is forwarded instead.
+
+    # Arguments
+        build_processor: Function without arguments returning the
+            processor. It is called inside the stage process.
+        bus: ``FrameBus``.
+        inputs: Multiprocessing queue of slot indices.
+        outputs: Multiprocessing queue of slot indices.
+        topics: List of strings. Messages passed to the processor.
+
+    # Methods
+        start()
+        join()
+    """
+    def __init__(self, build_processor, bus, inputs, outputs,
+                 topics=['image']):
+        for topic in topics:
+            if topic not in TOPICS:
+                raise ValueError('Invalid topic', topic)
+        self.inputs, self.outputs = inputs, outputs
+        context = multiprocessing.get_context(bus.context)
+        self.process = context.Process(
+            target=_run_stage, daemon=True,
+            args=(build_processor, bus, inputs, outputs, topics))
+
+    def start(self):
+        self.process.start()
+
+    def join(self, timeout=None):
+        self.process.join(timeout)
+
+
+class BusPipeline(object):
+    """Chains ``BusStage`` processes over a ``FrameBus``.
+
+    Frames are written once into the bus; every stage receives only slot
+    indices and the results are read back in submission order.
+
+    # Arguments
+        bus: ``FrameBus``.
+        stages: List of tuples ``(build_processor, topics)``.
+
+    # Methods
+        start()
+        submit()
+        receive()
+        stop()
+    """
+    def __init__(self, bus, stages):
+        self.bus = bus
+        context = multiprocessing.get_context(bus.context)
+        self.queues = [context.Queue() for _ in range(len(stages) + 1)]
+        self.stages = []
+        for stage_arg, (build_processor, topics) in enumerate(stages):
+            self.stages.append(BusStage(
+                build_processor, bus, self.queues[stage_arg],
+                self.queues[stage_arg + 1], topics))
+
+    def start(self):
+        for stage in self.stages:
+            stage.start()
+
+    def submit(self, image, timeout=None):
+        """Writes ``image`` into a free slot and sends it to the first stage.
+
+        # Returns
+            Int. Slot index.
+        """
+        slot = self.bus.acquire(timeout)
+        self.bus.write(slot, image=image)
+        self.queues[0].put(slot)
+        return slot
+
+    def receive(self, topics=TOPICS, timeout=None):
+        """Waits for the next processed slot, copies its messages and
+        releases the slot.
+
+        # Arguments
+            topics: List of strings. Messages to read.
+            timeout: Float or ``None``. Maximum waiting time in seconds.
+
+        # Returns
+            Dictionary with ``topics`` as keys or ``None`` if stopped.
+
+        # Raises
+            RuntimeError if a stage failed on the frame.
+        """
+        slot = self.queues[-1].get(timeout=timeout)
+        if slot is None:
+            return None
+        if isinstance(slot, StageFailure):
+            raise RuntimeError('Bus stage failed:\n' + slot.message)
+        messages = {}
+        for topic in topics:
+            message = self.bus.read(slot, topic)
+            messages[topic] = message.copy() if topic == 'image' else message
+        self.bus.release(slot)
+        return messages
+
+    def stop(self):
+        """Sends the stop signal through all stages and waits for them."""
+        self.queues[0].put(None)
+        for stage in self.stages:
+            stage.join()
@@ -0,0 +1,398 @@
+import os
+import glob
+import json
+import time
+import argparse
+import threading
+import multiprocessing
+from queue import Queue, Full
+
+import cv2
+import numpy as np
+
+from .abstract.messages import Box2D, Pose6D
+from .backend.image import load_image, convert_color_space
+from .backend.image import BGR2RGB, RGB2BGR
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff')
+
+
+def is_image_directory(source):
+    """Checks if ``source`` is a directory of images or a video file.
+
+    # Arguments
+        source: String. Path to a video file or a directory of images.
+
+    # Returns
+        Boolean.
+    """
+    return os.path.isdir(source)
+
+
+def list_images(directory):
+    """Lists all images inside ``directory`` sorted by name.
+
+    # Arguments
+        directory: String. Path to a directory of images.
+
+    # Returns
+        List of strings with the image paths.
+    """
+    filepaths = glob.glob(os.path.join(directory, '*'))
+    filepaths = [filepath for filepath in filepaths
+                 if filepath.lower().endswith(IMAGE_EXTENSIONS)]
+    return sorted(filepaths)
+
+
+def read_frames(source):
+    """Yields RGB frames of a video file or of a directory of images.
+
+    # Arguments
+        source: String. Path to a video file or a directory of images.
+
+    # Returns
+        Generator of RGB images.
+    """
+    if is_image_directory(source):
+        for filepath in list_images(source):
+            yield load_image(filepath)
+        return
+    video = cv2.VideoCapture(source)
+    if not video.isOpened():
+        raise ValueError('Could not open video file', source)
+    try:
+        while True:
+            is_frame_received, frame = video.read()
+            if not is_frame_received:
+                break
+            yield convert_color_space(frame, BGR2RGB)
+    finally:
+        video.release()
+
+
+def get_fps(source, default_fps=20):
+    """Returns the frame rate of a video file or ``default_fps``.
+
+    # Arguments
+        source: String. Path to a video file or a directory of images.
+        default_fps: Float. Frame rate used for image directories.
+
+    # Returns
+        Float.
+    """
+    if is_image_directory(source):
+        return default_fps
+    video = cv2.VideoCapture(source)
+    fps = video.get(cv2.CAP_PROP_FPS)
+    video.release()
+    return fps if fps > 0 else default_fps
+
+
+class FrameReader(object):
+    """Decodes frames of a video file or image directory in a background
+    thread and yields them in batches.
+
+    # Arguments
+        source: String. Path to a video file or a directory of images.
+        batch_size: Int. Number of frames per batch.
+        queue_size: Int. Maximum number of decoded batches held in memory.
+
+    # Methods
+        close()
+    """
+    def __init__(self, source, batch_size=8, queue_size=4):
+        self.source = source
+        self.batch_size = batch_size
+        self._queue = Queue(queue_size)
+        self._error = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._decode, daemon=True)
+        self._thread.start()
+
+    def _put(self, batch):
+        while not self._stop.is_set():
+            try:
+                self._queue.put(batch, timeout=0.1)
+                return True
+            except Full:
+                pass
+        return False
+
+    def _decode(self):
+        batch, frames = [], read_frames(self.source)
+        try:
+            for frame in frames:
+                batch.append(frame)
+                if len(batch) == self.batch_size:
+                    if not self._put(batch):
+                        return
+                    batch = []
+        except Exception as error:
+            self._error = error
+        finally:
+            frames.close()
+        if len(batch) > 0:
+            self._put(batch)
+        self._put(None)
+
+    def close(self):
+        """Stops decoding and releases the source. Required if the batches
+        are not consumed until the end.
+        """
+        self._stop.set()
+        self._thread.join()
+
+    def __iter__(self):
+        while True:
+            batch = self._queue.get()
+            if batch is None:
+                break
+            yield batch
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+
+def serialize(value):
+    """Converts pipeline outputs into JSON serializable values.
+
+    # Arguments
+        value: Pipeline output e.g. ``Box2D``, ``Pose6D``, arrays or lists.
+
+    # Returns
+        JSON serializable value.
+    """
+    if isinstance(value, Box2D):
+        return {'coordinates': serialize(value.coordinates),
+                'score': serialize(value.score),
+                'class_name': value.class_name}
+    if isinstance(value, Pose6D):
+        return {'quaternion': serialize(value.quaternion),
+                'translation': serialize(value.translation),
+                'class_name': value.class_name}
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, dict):
+        return {key: serialize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [serialize(item) for item in value]
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return repr(value)
+
+
+def build_pipeline(name):
+    """Instantiates a pipeline of ``paz.applications`` by its class name.
+
+    # Arguments
+        name: String or callable. Class name in ``paz.applications`` e.g.
+            ``SSD512COCO`` or a function without arguments returning a
+            pipeline.
+
+    # Returns
+        Pipeline.
+    """
+    if callable(name):
+        return name()
+    from . import applications
+    if not hasattr(applications, name):
+        raise ValueError('Invalid pipeline name', name)
+    return getattr(applications, name)()
+
+
+def build_output_names(sources):
+    """Builds a unique output file name for every source. Sources sharing
+    their basename are named after their path relative to the common
+    directory of all sources e.g. ``a/clip.mp4`` and ``b/clip.mp4`` are
+    named ``a_clip`` and ``b_clip``.
+
+    # Arguments
+        sources: List of strings. Paths to video files or image directories.
+
+    # Returns
+        List of strings.
+    """
+    sources = [os.path.normpath(os.path.abspath(source)) for source in sources]
+    names = [os.path.splitext(os.path.basename(source))[0]
+             for source in sources]
+    if len(set(names)) == len(names):
+        return names
+    common_path = os.path.commonpath(sources)
+    names = []
+    for source in sources:
+        name = os.path.splitext(os.path.relpath(source, common_path))[0]
+        names.append(name.replace(os.sep, '_'))
+    if len(set(names)) != len(names):
+        raise ValueError('Sources without unique output names', sources)
+    return names
+
+
+def process_source(pipeline, source, output_directory, batch_size=8,
+                   topic='image', fourCC='XVID', write_video=True, name=None):
+    """Runs ``pipeline`` over all frames of ``source`` without a display.
+    Frames are decoded in a background thread and every batch of frames is
+    passed through the model with a single call using the batch adapter
+    of ``pipeline`` (see ``paz.serving.build_adapter``). Pipelines without
+    an adapter are called once per frame. The annotated frames found in
+    ``topic`` are written into a video and all remaining outputs are
+    written as one JSON line per frame.
+
+    # Arguments
+        pipeline: Function taking an RGB image and returning a dictionary.
+        source: String. Path to a video file or a directory of images.
+        output_directory: String. Directory of the written files.
+        batch_size: Int. Number of frames per model call.
+        topic: String. Key of the annotated image in the pipeline output.
+        fourCC: String. Four character code of the written video.
+        write_video: Boolean. If ``False`` only detections are written.
+        name: String or ``None``. Name of the written files. If ``None``
+            the basename of ``source`` is used.
+
+    # Returns
+        Dictionary with the source, number of frames and elapsed seconds.
+    """
+    from .serving import build_adapter
+    if not os.path.exists(output_directory):
+        os.makedirs(output_directory)
+    if name is None:
+        name = build_output_names([source])[0]
+    video_path = os.path.join(output_directory, name + '.avi')
+    detections_path = os.path.join(output_directory, name + '.jsonl')
+    adapter = build_adapter(pipeline)
+    fps = get_fps(source)
+    start, frame_arg, writer = time.time(), 0, None
+    reader = FrameReader(source, batch_size)
+    try:
+        with open(detections_path, 'w') as detections_file:
+            for batch in reader:
+                inputs, contexts = [], []
+                for frame in batch:
+                    model_input, context = adapter.preprocess(frame)
+                    inputs.append(model_input)
+                    contexts.append(context)
+                model_outputs = adapter.predict(inputs)
+                lines = []
+                for frame, model_output, context in zip(
+                        batch, model_outputs, contexts):
+                    output = adapter.postprocess(frame, model_output, context)
+                    if output is None:
+                        output = {}
+                    image = output.get(topic, None)
+                    if write_video and (image is not None):
+                        if writer is None:
+                            H, W = image.shape[:2]
+                            writer = cv2.VideoWriter(
+                                video_path, cv2.VideoWriter_fourcc(*fourCC),
+                                fps, (W, H))
+                        writer.write(convert_color_space(image, RGB2BGR))
+                    detections = {key: serialize(value)
+                                  for key, value in output.items()
+                                  if key != topic}
+                    detections['frame'] = frame_arg
+                    lines.append(json.dumps(detections))
+                    frame_arg = frame_arg + 1
+                detections_file.write('\n'.join(lines) + '\n')
+    finally:
+        reader.close()
+        if writer is not None:
+            writer.release()
+    return {'source': source, 'num_frames': frame_arg,
+            'seconds': time.time() - start}
+
+
+_WORKER_PIPELINE = None
+
+
+def _initialize_worker(pipeline_name):
+    global _WORKER_PIPELINE
+    _WORKER_PIPELINE = build_pipeline(pipeline_name)
+
+
+def _process_source(task):
+    return process_source(_WORKER_PIPELINE, *task)
+
+
+def process_sources(pipeline_name, sources, output_directory, batch_size=8,
+                    num_workers=1, topic='image', fourCC='XVID',
+                    write_video=True):
+    """Processes many sources in parallel, each worker process builds its
+    own pipeline once. Output files are named with ``build_output_names``.
+
+    # Arguments
+        pipeline_name: String or callable. See ``build_pipeline``.
+        sources: List of strings. Paths to video files or image directories.
+        output_directory: String. Directory of the written files.
+        batch_size: Int. Number of frames per model call.
+        num_workers: Int. Number of worker processes.
+        topic: String. Key of the annotated image in the pipeline output.
+        fourCC: String. Four character code of the written videos.
+        write_video: Boolean. If ``False`` only detections are written.
+
+    # Returns
+        List of dictionaries returned by ``process_source``.
+    """
+    names = build_output_names(sources)
+    tasks = [(source, output_directory, batch_size, topic, fourCC,
+              write_video, name) for source, name in zip(sources, names)]
+    if num_workers == 1:
+        _initialize_worker(pipeline_name)
+        return [_process_source(task) for task in tasks]
+    with multiprocessing.Pool(num_workers, _initialize_worker,
+                              (pipeline_name,)) as pool:
+        return pool.map(_process_source, tasks, chunksize=1)
+
+
+def summarize(results, seconds):
+    """Builds a throughput report of ``process_sources`` results.
+
+    # Arguments
+        results: List of dictionaries returned by ``process_source``.
+        seconds: Float. Total wall time.
+
+    # Returns
+        String.
+    """
+    lines = []
+    for result in results:
+        frames_per_second = result['num_frames'] / max(result['seconds'], 1e-9)
+        lines.append('%s: %d frames in %.2f s (%.2f FPS)' % (
+            result['source'], result['num_frames'], result['seconds'],
+            frames_per_second))
+    num_frames = sum([result['num_frames'] for result in results])
+    lines.append('Total: %d frames in %.2f s (%.2f FPS)' % (
+        num_frames, seconds, num_frames / max(seconds, 1e-9)))
+    return '\n'.join(lines)
+
+
+def main(args=None):
+    description = 'Headless batch inference over videos or image directories'
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('pipeline', type=str,
+                        help='Pipeline class name in paz.applications')
+    parser.add_argument('sources', nargs='+', type=str,
+                        help='Video files or directories of images')
+    parser.add_argument('-o', '--output_directory', default='inferences',
+                        type=str, help='Directory of the written files')
+    parser.add_argument('-b', '--batch_size', default=8, type=int,
+                        help='Number of frames per model call')
+    parser.add_argument('-w', '--num_workers', default=1, type=int,
+                        help='Number of worker processes')
+    parser.add_argument('-t', '--topic', default='image', type=str,
+                        help='Output key of the annotated image')
+    parser.add_argument('--fourCC', default='XVID', type=str,
+                        help='Four character code of the written videos')
+    parser.add_argument('--no_video', action='store_true',
+                        help='Only write detections')
+    args = parser.parse_args(args)
+    start = time.time()
+    results = process_sources(
+        args.pipeline, args.sources, args.output_directory, args.batch_size,
+        args.num_workers, args.topic, args.fourCC, not args.no_video)
+    print(summarize(results, time.time() - start))
+    return results
+
+
+if __name__ == '__main__':
+    main()
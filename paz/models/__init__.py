@@ -1,29 +1,37 @@
-from .detection import SSD300
-from .detection import SSD512
-from .detection import HaarCascadeDetector
-from .detection import EFFICIENTDETD0
-from .detection import EFFICIENTDETD1
-from .detection import EFFICIENTDETD2
-from .detection import EFFICIENTDETD3
-from .detection import EFFICIENTDETD4
-from .detection import EFFICIENTDETD5
-from .detection import EFFICIENTDETD6
-from .detection import EFFICIENTDETD7
-from .keypoint.simplebaselines import SimpleBaseline
-from .keypoint.projector import Projector
-from .keypoint.keypointnet import KeypointNet
-from .keypoint.keypointnet import KeypointNetShared
-from .keypoint.keypointnet import KeypointNet2D
-from .keypoint.hrnet import HRNetResidual
-from .keypoint.hrnet import HRNetDense
-from .keypoint.detnet import DetNet
-from .keypoint.iknet import IKNet
-from .classification import build_xception
-from .classification import MiniXception
-from .classification import ProtoEmbedding
-from .classification import ProtoNet
-from .segmentation import UNET
-from .segmentation import UNET_VGG16
-from .segmentation import UNET_VGG19
-from .segmentation import UNET_RESNET50
-from .pose_estimation import HigherHRNet
+from ..utils.lazy import lazy_import
+
+_LAZY_ATTRIBUTES = {
+    'SSD300': '.detection',
+    'SSD512': '.detection',
+    'HaarCascadeDetector': '.detection',
+    'EFFICIENTDETD0': '.detection',
+    'EFFICIENTDETD1': '.detection',
+    'EFFICIENTDETD2': '.detection',
+    'EFFICIENTDETD3': '.detection',
+    'EFFICIENTDETD4': '.detection',
+    'EFFICIENTDETD5': '.detection',
+    'EFFICIENTDETD6': '.detection',
+    'EFFICIENTDETD7': '.detection',
+    'SimpleBaseline': '.keypoint.simplebaselines',
+    'Projector': '.keypoint.projector',
+    'KeypointNet': '.keypoint.keypointnet',
+    'KeypointNetShared': '.keypoint.keypointnet',
+    'KeypointNet2D': '.keypoint.keypointnet',
+    'HRNetResidual': '.keypoint.hrnet',
+    'HRNetDense': '.keypoint.hrnet',
+    'DetNet': '.keypoint.detnet',
+    'IKNet': '.keypoint.iknet',
+    'build_xception': '.classification',
+    'MiniXception': '.classification',
+    'ProtoEmbedding': '.classification',
+    'ProtoNet': '.classification',
+    'ProtoClassifier': '.classification',
+    'UNET': '.segmentation',
+    'UNET_VGG16': '.segmentation',
+    'UNET_VGG19': '.segmentation',
+    'UNET_RESNET50': '.segmentation',
+    'HigherHRNet': '.pose_estimation',
+}
+
+__all__ = list(_LAZY_ATTRIBUTES.keys())
+__getattr__, __dir__ = lazy_import(__name__, _LAZY_ATTRIBUTES)
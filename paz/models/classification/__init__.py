@@ -2,3 +2,4 @@ from .xception import build_xception
 from .xception import MiniXception
 from .protonet import ProtoEmbedding
 from .protonet import ProtoNet
+from .protonet import ProtoClassifier
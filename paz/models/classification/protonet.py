@@ -63,9 +63,23 @@ class ComputePrototypes(Layer):
         return class_prototypes
 
 
+def _reduce_mean_dimension(squared_distances, x):
+    """Divides summed squared distances by the vector dimension keeping
+    the semantics of ``tf.reduce_mean`` for integer and float tensors.
+    """
+    dimension = tf.cast(tf.shape(x)[-1], squared_distances.dtype)
+    if squared_distances.dtype.is_integer:
+        return tf.math.floordiv(squared_distances, dimension)
+    return squared_distances / dimension
+
+
 def compute_pairwise_distances(x, y):
     """Compute euclidean distance for each vector x with each vector y
 
+    The distances are computed with the expansion
+    `||x||^2 + ||y||^2 - 2 x y^T` which only requires a matrix product
+    instead of building tensors of shape `(n, m, vector_dim)`.
+
     # Arguments:
         x: Tensor with shape `(n, vector_dim)`
         y: Tensor with shape `(m, vector_dim)`
@@ -74,23 +88,167 @@ def compute_pairwise_distances(x, y):
         Tensor with shape `(n, m)` where each value pair n, m corresponds to
         the distance between the vector `n` of `x` with the vector `m` of `y`
     """
-    n = x.shape[0]
-    m = y.shape[0]
-    x = tf.tile(tf.expand_dims(x, 1), [1, m, 1])
-    y = tf.tile(tf.expand_dims(y, 0), [n, 1, 1])
-    return tf.reduce_mean(tf.math.pow(x - y, 2), 2)
+    x = tf.convert_to_tensor(x)
+    y = tf.cast(y, x.dtype)
+    x_norms = tf.reduce_sum(tf.square(x), axis=1, keepdims=True)
+    y_norms = tf.reduce_sum(tf.square(y), axis=1, keepdims=True)
+    products = tf.matmul(x, y, transpose_b=True)
+    squared_distances = x_norms + tf.transpose(y_norms) - 2 * products
+    squared_distances = tf.maximum(squared_distances, 0)
+    return _reduce_mean_dimension(squared_distances, x)
+
+
+def compute_pairwise_cosine_distances(x, y, epsilon=1e-12):
+    """Compute cosine distance for each vector x with each vector y
+
+    # Arguments:
+        x: Tensor with shape `(n, vector_dim)`
+        y: Tensor with shape `(m, vector_dim)`
+        epsilon: Float. Lower bound of the vector norms.
+
+    # Returns:
+        Tensor with shape `(n, m)` with values `1 - cos(x_n, y_m)`.
+    """
+    x = tf.convert_to_tensor(x)
+    x = tf.cast(x, tf.float32) if x.dtype.is_integer else x
+    y = tf.cast(y, x.dtype)
+    x = tf.math.l2_normalize(x, axis=1, epsilon=epsilon)
+    y = tf.math.l2_normalize(y, axis=1, epsilon=epsilon)
+    return 1.0 - tf.matmul(x, y, transpose_b=True)
+
+
+def compute_pairwise_mahalanobis_distances(x, y, precision):
+    """Compute Mahalanobis distance for each vector x with each vector y
+
+    The distances are averaged over the vector dimension such that an
+    identity `precision` returns the same values as
+    `compute_pairwise_distances`.
+
+    # Arguments:
+        x: Tensor with shape `(n, vector_dim)`
+        y: Tensor with shape `(m, vector_dim)`
+        precision: Tensor with shape `(vector_dim, vector_dim)` containing
+            a symmetric positive semi-definite inverse covariance matrix.
+
+    # Returns:
+        Tensor with shape `(n, m)` with the squared Mahalanobis distances.
+    """
+    x = tf.convert_to_tensor(x)
+    x = tf.cast(x, tf.float32) if x.dtype.is_integer else x
+    y = tf.cast(y, x.dtype)
+    precision = tf.cast(precision, x.dtype)
+    x_projected = tf.matmul(x, precision)
+    y_projected = tf.matmul(y, precision)
+    x_norms = tf.reduce_sum(x_projected * x, axis=1, keepdims=True)
+    y_norms = tf.reduce_sum(y_projected * y, axis=1, keepdims=True)
+    products = tf.matmul(x_projected, y, transpose_b=True)
+    squared_distances = x_norms + tf.transpose(y_norms) - 2 * products
+    squared_distances = tf.maximum(squared_distances, 0)
+    return _reduce_mean_dimension(squared_distances, x)
 
 
 @docstring(compute_pairwise_distances)
 class ComputePairwiseDistances(Layer):
-    def __init__(self, **kwargs):
+    def __init__(self, metric='euclidean', precision=None, **kwargs):
         super(ComputePairwiseDistances, self).__init__(**kwargs)
+        if metric not in ['euclidean', 'cosine', 'mahalanobis']:
+            raise ValueError('Invalid metric', metric)
+        if (metric == 'mahalanobis') and (precision is None):
+            raise ValueError('Mahalanobis metric requires a precision matrix')
+        self.metric = metric
+        self.precision = precision
 
     def call(self, z_queries, class_prototypes):
-        return compute_pairwise_distances(z_queries, class_prototypes)
+        if self.metric == 'euclidean':
+            distances = compute_pairwise_distances(
+                z_queries, class_prototypes)
+        elif self.metric == 'cosine':
+            distances = compute_pairwise_cosine_distances(
+                z_queries, class_prototypes)
+        elif self.metric == 'mahalanobis':
+            distances = compute_pairwise_mahalanobis_distances(
+                z_queries, class_prototypes, self.precision)
+        return distances
+
+
+class PrototypeHead(Layer):
+    """Classifies embeddings against cached class prototypes.
+
+    The prototypes are folded into a linear kernel and bias such that
+    `softmax(x W + b)` equals `softmax(-distances(x, prototypes))`. Once the
+    prototypes are cached, classifying a batch of queries costs a single
+    matrix multiplication.
+
+    # Arguments:
+        class_prototypes: Tensor with shape `(num_classes, vector_dim)`.
+        metric: String. Either `euclidean` or `cosine`.
+    """
+    def __init__(self, class_prototypes, metric='euclidean', **kwargs):
+        super(PrototypeHead, self).__init__(**kwargs)
+        if metric not in ['euclidean', 'cosine']:
+            raise ValueError('Invalid metric', metric)
+        self.metric = metric
+        kernel, bias = self._fold(class_prototypes)
+        self.kernel = tf.Variable(kernel, trainable=False, name='kernel')
+        self.bias = tf.Variable(bias, trainable=False, name='bias')
+
+    def _fold(self, class_prototypes):
+        class_prototypes = tf.cast(class_prototypes, tf.float32)
+        if self.metric == 'cosine':
+            kernel = tf.math.l2_normalize(class_prototypes, axis=1)
+            bias = tf.zeros(tf.shape(class_prototypes)[0])
+        else:
+            # ||x||^2 is shared by all classes and cancels in the softmax
+            dimension = tf.cast(tf.shape(class_prototypes)[1], tf.float32)
+            kernel = 2.0 * class_prototypes / dimension
+            bias = -tf.reduce_sum(tf.square(class_prototypes), 1) / dimension
+        return tf.transpose(kernel), bias
+
+    def update(self, class_prototypes):
+        """Replaces the cached prototypes by new ones of the same shape.
+
+        # Arguments:
+            class_prototypes: Tensor with shape `(num_classes, vector_dim)`.
+        """
+        kernel, bias = self._fold(class_prototypes)
+        if kernel.shape != self.kernel.shape:
+            raise ValueError('Prototypes shape must be', self.kernel.shape)
+        self.kernel.assign(kernel)
+        self.bias.assign(bias)
+
+    def call(self, z_queries):
+        z_queries = tf.cast(z_queries, tf.float32)
+        if self.metric == 'cosine':
+            z_queries = tf.math.l2_normalize(z_queries, axis=1)
+        return tf.nn.softmax(tf.matmul(z_queries, self.kernel) + self.bias)
+
+
+def ProtoClassifier(embed, class_prototypes, image_shape, metric='euclidean'):
+    """Prototypical network for classifying streaming queries against
+    support prototypes that have already been computed.
+
+    # Arguments:
+        embed: Keras network for embedding images into metric space.
+        class_prototypes: Tensor with shape `(num_classes, vector_dim)`
+            e.g. computed with `embed` and `ComputePrototypes`.
+        image_shape: List with image shape `(H, W, channels)`.
+        metric: String. Either `euclidean` or `cosine`.
+
+    # Returns:
+        Keras model mapping a batch of images to class probabilities.
+
+    # References:
+        [prototypical networks](https://arxiv.org/abs/1703.05175)
+    """
+    queries = Input(image_shape, name='queries')
+    z_queries = embed(queries)
+    outputs = PrototypeHead(class_prototypes, metric, name='prototypes')(
+        z_queries)
+    return Model(inputs=queries, outputs=outputs, name='PROTOCLASSIFIER')
 
 
-def ProtoNet(embed, num_classes, num_support, num_queries, image_shape):
+def ProtoNet(embed, num_classes, num_support, num_queries, image_shape,
+             metric='euclidean', precision=None):
     """Prototypical networks used for few-shot classification
     # Arguments:
         embed: Keras network for embedding images into metric space.
@@ -98,6 +256,9 @@ def ProtoNet(embed, num_classes, num_support, num_queries, image_shape):
         num_support: Number of `shots` used for meta learning.
         num_queries: Number of test images to query.
         image_shape: List with image shape `(H, W, channels)`.
+        metric: String. Either `euclidean`, `cosine` or `mahalanobis`.
+        precision: Tensor with shape `(vector_dim, vector_dim)` used only
+            for the `mahalanobis` metric.
 
     # Returns:
         Keras model.
@@ -115,6 +276,7 @@ def ProtoNet(embed, num_classes, num_support, num_queries, image_shape):
     z_support = FullReshape((num_classes, num_support, z_dim))(z_support)
     z_queries = FullReshape((num_classes * num_queries, z_dim))(z_queries)
     class_prototypes = ComputePrototypes(axis=1)(z_support)
-    distances = ComputePairwiseDistances()(z_queries, class_prototypes)
+    distances = ComputePairwiseDistances(metric, precision)(
+        z_queries, class_prototypes)
     outputs = Softmax()(-distances)
     return Model(inputs=[support, queries], outputs=outputs, name='PROTONET')
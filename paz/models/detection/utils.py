@@ -8,9 +8,7 @@ from tensorflow.keras.regularizers import l2
 import tensorflow.keras.backend as K
 
 from ..layers import Conv2DNormalization
-
-import numpy as np
-from itertools import product
+from ...backend.anchors import build_prior_boxes
 
 
 def create_multibox_head(tensors, num_classes, num_priors, l2_loss=0.0005,
@@ -67,36 +65,20 @@ def create_multibox_head(tensors, num_classes, num_priors, l2_loss=0.0005,
 
 
 def create_prior_boxes(configuration_name='VOC'):
-    configuration = get_prior_box_configuration(configuration_name)
-    image_size = configuration['image_size']
-    feature_map_sizes = configuration['feature_map_sizes']
-    min_sizes = configuration['min_sizes']
-    max_sizes = configuration['max_sizes']
-    steps = configuration['steps']
-    model_aspect_ratios = configuration['aspect_ratios']
-    mean = []
-    for feature_map_arg, feature_map_size in enumerate(feature_map_sizes):
-        step = steps[feature_map_arg]
-        min_size = min_sizes[feature_map_arg]
-        max_size = max_sizes[feature_map_arg]
-        aspect_ratios = model_aspect_ratios[feature_map_arg]
-        for y, x in product(range(feature_map_size), repeat=2):
-            f_k = image_size / step
-            center_x = (x + 0.5) / f_k
-            center_y = (y + 0.5) / f_k
-            s_k = min_size / image_size
-            mean = mean + [center_x, center_y, s_k, s_k]
-            s_k_prime = np.sqrt(s_k * (max_size / image_size))
-            mean = mean + [center_x, center_y, s_k_prime, s_k_prime]
-            for aspect_ratio in aspect_ratios:
-                mean = mean + [center_x, center_y, s_k * np.sqrt(aspect_ratio),
-                               s_k / np.sqrt(aspect_ratio)]
-                mean = mean + [center_x, center_y, s_k / np.sqrt(aspect_ratio),
-                               s_k * np.sqrt(aspect_ratio)]
+    """Returns the shared read-only SSD prior boxes of a configuration.
+
+    # Arguments
+        configuration_name: String. One of `VOC`, `FAT`, `COCO` or
+            `YCBVideo`.
 
-    output = np.asarray(mean).reshape((-1, 4))
-    # output = np.clip(output, 0, 1)
-    return output
+    # Returns
+        Read-only array of shape `(num_boxes, 4)` in normalized centre form.
+    """
+    configuration = get_prior_box_configuration(configuration_name)
+    return build_prior_boxes(
+        configuration['image_size'], configuration['feature_map_sizes'],
+        configuration['steps'], configuration['min_sizes'],
+        configuration['max_sizes'], configuration['aspect_ratios'])
 
 
 def get_prior_box_configuration(configuration_name='VOC'):
@@ -37,6 +37,19 @@ class MultiBoxLoss(object):
         positive_mask = 1.0 - negative_mask
         return positive_mask, negative_mask
 
+    def _sum_hard_negatives(self, negative_losses, num_negatives):
+        """Sums the ``num_negatives`` largest losses of every sample with a
+        single batched ``top_k`` and a rank mask.
+        """
+        num_boxes = tf.shape(negative_losses)[1]
+        max_num_negatives = tf.minimum(self.max_num_negatives, num_boxes)
+        hard_negatives = tf.nn.top_k(negative_losses, max_num_negatives)[0]
+        ranks = tf.range(max_num_negatives)
+        rank_mask = ranks[tf.newaxis, :] < num_negatives[:, tf.newaxis]
+        hard_negatives = tf.where(
+            rank_mask, hard_negatives, tf.zeros_like(hard_negatives))
+        return K.sum(hard_negatives, axis=-1)
+
     def compute_loss(self, y_true, y_pred):
         """Computes localization and classification losses in a batch.
 
@@ -118,10 +131,8 @@ class MultiBoxLoss(object):
         num_negatives_per_sample = K.minimum(
             num_hard_negatives, self.max_num_negatives)
         negative_class_losses = class_loss * negative_mask
-        elements = (negative_class_losses, num_negatives_per_sample)
-        negative_class_loss = tf.map_fn(
-            lambda x: K.sum(tf.nn.top_k(x[0], x[1])[0]),
-            elements, dtype=tf.float32)
+        negative_class_loss = self._sum_hard_negatives(
+            negative_class_losses, num_negatives_per_sample)
         num_positives = K.sum(K.cast(positive_mask, 'float32'))
         num_positives = tf.maximum(1.0, num_positives)
         return (negative_class_loss * batch_size) / num_positives
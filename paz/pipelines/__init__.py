@@ -1,75 +1,92 @@
-from .image import AugmentImage
-from .image import PreprocessImage
-from .image import AutoEncoderPredictor
-from .image import EncoderPredictor
-from .image import DecoderPredictor
-from .image import PreprocessImageHigherHRNet
+from ..utils.lazy import lazy_import
 
-from .detection import AugmentBoxes
-from .detection import PreprocessBoxes
-from .detection import AugmentDetection
-from .detection import PostprocessBoxes2D
-from .detection import DetectSingleShot
-from .detection import SSD512COCO
-from .detection import SSD512YCBVideo
-from .detection import SSD300VOC
-from .detection import SSD300FAT
-from .detection import DetectHaarCascade
-from .detection import HaarCascadeFrontalFace
-from .detection import DetectMiniXceptionFER
-from .detection import DetectKeypoints2D
-from .detection import DetectFaceKeypointNet2D32
-from .detection import SSD512HandDetection
-from .detection import SSD512MinimalHandPose
-from .detection import SSDPreprocess
-from .detection import SSDPostprocess
-from .detection import DetectSingleShotEfficientDet
-from .detection import EfficientDetPreprocess
-from .detection import EfficientDetPostprocess
-from .detection import EFFICIENTDETD0COCO
-from .detection import EFFICIENTDETD1COCO
-from .detection import EFFICIENTDETD2COCO
-from .detection import EFFICIENTDETD3COCO
-from .detection import EFFICIENTDETD4COCO
-from .detection import EFFICIENTDETD5COCO
-from .detection import EFFICIENTDETD6COCO
-from .detection import EFFICIENTDETD7COCO
-from .detection import EFFICIENTDETD0VOC
+_LAZY_ATTRIBUTES = {
+    'AugmentImage': '.image',
+    'AugmentImageBatch': '.image',
+    'PreprocessImage': '.image',
+    'AutoEncoderPredictor': '.image',
+    'EncoderPredictor': '.image',
+    'DecoderPredictor': '.image',
+    'PreprocessImageHigherHRNet': '.image',
 
-from .keypoints import KeypointNetSharedAugmentation
-from .keypoints import KeypointNetInference
-from .keypoints import EstimateKeypoints2D
-from .keypoints import FaceKeypointNet2D32
-from .keypoints import GetKeypoints
-from .keypoints import TransformKeypoints
-from .keypoints import HigherHRNetHumanPose2D
-from .keypoints import DetNetHandKeypoints
-from .keypoints import MinimalHandPoseEstimation
-from .keypoints import DetectMinimalHand
-from .keypoints import EstimateHumanPose3D
-from .keypoints import EstimateHumanPose
+    'AugmentBoxes': '.detection',
+    'PreprocessBoxes': '.detection',
+    'AugmentDetection': '.detection',
+    'AugmentBoxesBatch': '.detection',
+    'LoadDetection': '.detection',
+    'AugmentDetectionBatch': '.detection',
+    'PostprocessBoxes2D': '.detection',
+    'DetectSingleShot': '.detection',
+    'SSD512COCO': '.detection',
+    'SSD512YCBVideo': '.detection',
+    'SSD300VOC': '.detection',
+    'SSD300FAT': '.detection',
+    'DetectHaarCascade': '.detection',
+    'HaarCascadeFrontalFace': '.detection',
+    'DetectMiniXceptionFER': '.detection',
+    'DetectKeypoints2D': '.detection',
+    'DetectFaceKeypointNet2D32': '.detection',
+    'SSD512HandDetection': '.detection',
+    'SSD512MinimalHandPose': '.detection',
+    'SSDPreprocess': '.detection',
+    'SSDPostprocess': '.detection',
+    'DetectSingleShotEfficientDet': '.detection',
+    'EfficientDetPreprocess': '.detection',
+    'EfficientDetPostprocess': '.detection',
+    'EFFICIENTDETD0COCO': '.detection',
+    'EFFICIENTDETD1COCO': '.detection',
+    'EFFICIENTDETD2COCO': '.detection',
+    'EFFICIENTDETD3COCO': '.detection',
+    'EFFICIENTDETD4COCO': '.detection',
+    'EFFICIENTDETD5COCO': '.detection',
+    'EFFICIENTDETD6COCO': '.detection',
+    'EFFICIENTDETD7COCO': '.detection',
+    'EFFICIENTDETD0VOC': '.detection',
 
-from .renderer import RenderTwoViews
-from .renderer import RandomizeRenderedImage
+    'KeypointNetSharedAugmentation': '.keypoints',
+    'KeypointNetInference': '.keypoints',
+    'EstimateKeypoints2D': '.keypoints',
+    'FaceKeypointNet2D32': '.keypoints',
+    'GetKeypoints': '.keypoints',
+    'TransformKeypoints': '.keypoints',
+    'HigherHRNetHumanPose2D': '.keypoints',
+    'DetNetHandKeypoints': '.keypoints',
+    'MinimalHandPoseEstimation': '.keypoints',
+    'DetectMinimalHand': '.keypoints',
+    'EstimateHumanPose3D': '.keypoints',
+    'EstimateHumanPose': '.keypoints',
 
-from .classification import MiniXceptionFER
-from .classification import ClassifyHandClosure
+    'RenderTwoViews': '.renderer',
+    'RandomizeRenderedImage': '.renderer',
 
-from .pose import EstimatePoseKeypoints
-from .pose import HeadPoseKeypointNet2D32
-from .pose import SingleInstancePIX2POSE6D
-from .pose import MultiInstancePIX2POSE6D
-from .pose import MultiInstanceMultiClassPIX2POSE6D
-from .pose import SinglePowerDrillPIX2POSE6D
-from .pose import MultiPowerDrillPIX2POSE6D
-from .pose import PIX2POSEPowerDrill
-from .pose import PIX2YCBTools6D
+    'MiniXceptionFER': '.classification',
+    'ClassifyHandClosure': '.classification',
 
-from .masks import RGBMaskToImagePoints2D
-from .masks import RGBMaskToObjectPoints3D
-from .masks import PredictRGBMask
-from .masks import Pix2Points
+    'EstimatePoseKeypoints': '.pose',
+    'HeadPoseKeypointNet2D32': '.pose',
+    'SingleInstancePIX2POSE6D': '.pose',
+    'MultiInstancePIX2POSE6D': '.pose',
+    'MultiInstanceMultiClassPIX2POSE6D': '.pose',
+    'SinglePowerDrillPIX2POSE6D': '.pose',
+    'MultiPowerDrillPIX2POSE6D': '.pose',
+    'PIX2POSEPowerDrill': '.pose',
+    'PIX2YCBTools6D': '.pose',
 
-from .heatmaps import GetHeatmapsAndTags
+    'RGBMaskToImagePoints2D': '.masks',
+    'RGBMaskToObjectPoints3D': '.masks',
+    'PredictRGBMask': '.masks',
+    'Pix2Points': '.masks',
 
-from .angles import IKNetHandJointAngles
+    'GetHeatmapsAndTags': '.heatmaps',
+
+    'IKNetHandJointAngles': '.angles',
+
+    'build_dataset': '.tf_data',
+    'AugmentImageTF': '.tf_data',
+    'AugmentClassificationTF': '.tf_data',
+    'AugmentKeypointsTF': '.tf_data',
+    'AugmentDetectionTF': '.tf_data',
+}
+
+__all__ = list(_LAZY_ATTRIBUTES.keys())
+__getattr__, __dir__ = lazy_import(__name__, _LAZY_ATTRIBUTES)
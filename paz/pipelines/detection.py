@@ -9,6 +9,7 @@ from ..models import (
 from ..datasets import get_class_names
 
 from .image import AugmentImage, PreprocessImage
+from .image import AugmentImageBatch
 from .classification import MiniXceptionFER
 from .keypoints import FaceKeypointNet2D32, DetectMinimalHand
 from .keypoints import MinimalHandPoseEstimation
@@ -92,6 +93,91 @@ class AugmentDetection(SequentialProcessor):
             {1: {'boxes': [len(prior_boxes), 4 + num_classes]}}))
 
 
+class AugmentBoxesBatch(SequentialProcessor):
+    """Perform data augmentation on a batch of images and their normalized,
+    padded bounding boxes.
+
+    # Arguments
+        mean: List of three elements used to fill empty image spaces.
+    """
+    def __init__(self, mean=pr.BGR_IMAGENET_MEAN):
+        super(AugmentBoxesBatch, self).__init__()
+        self.add(pr.ExpandBatch(mean=mean))
+        self.add(pr.RandomSampleCropBatch(1.0))
+        self.add(pr.RandomFlipBoxesLeftRightBatch())
+
+
+class LoadDetection(SequentialProcessor):
+    """Loads and resizes a detection sample and pads its boxes, leaving
+    augmentation and box encoding to ``AugmentDetectionBatch``.
+
+    # Arguments
+        size: Int. Image size.
+        max_num_boxes: Int. Maximum number of boxes in a sample.
+    """
+    def __init__(self, size=300, max_num_boxes=64):
+        super(LoadDetection, self).__init__()
+        self.add(pr.UnpackDictionary(['image', 'boxes']))
+        self.add(pr.ControlMap(pr.LoadImage(), [0], [0]))
+        self.add(pr.ControlMap(pr.ResizeImage((size, size)), [0], [0]))
+        self.add(pr.ControlMap(pr.PadBoxes(max_num_boxes), [1], [1]))
+        self.add(pr.SequenceWrapper(
+            {0: {'image': [size, size, 3]}},
+            {1: {'boxes': [max_num_boxes, 5]}}))
+
+
+class AugmentDetectionBatch(Processor):
+    """Augment batches of boxes and images for object detection. Used as
+    ``batch_processor`` of a ``ProcessingSequence`` with ``LoadDetection``
+    samples, it applies photometric and geometric augmentations to whole
+    batches while drawing random values per sample.
+
+    # Arguments
+        prior_boxes: Numpy array of shape ``[num_boxes, 4]`` containing
+            prior/default bounding boxes.
+        split: Flag from `paz.processors.TRAIN`, ``paz.processors.VAL``
+            or ``paz.processors.TEST``. Certain transformations would take
+            place depending on the flag.
+        num_classes: Int.
+        mean: List of three elements indicating the per channel mean.
+        IOU: Float. Intersection over union used to match boxes.
+        variances: List of two floats indicating variances to be encoded
+            for encoding bounding boxes.
+    """
+    def __init__(self, prior_boxes, split=pr.TRAIN, num_classes=21,
+                 mean=pr.BGR_IMAGENET_MEAN, IOU=.5,
+                 variances=[0.1, 0.1, 0.2, 0.2]):
+        super(AugmentDetectionBatch, self).__init__()
+        self.split = split
+        self.mean = mean
+        self.augment_image = AugmentImageBatch()
+        self.augment_boxes = AugmentBoxesBatch()
+        self.unpad_boxes = pr.UnpadBoxes()
+        args = (num_classes, prior_boxes, IOU, variances)
+        self.preprocess_boxes = PreprocessBoxes(*args)
+        self.num_boxes = len(prior_boxes)
+        self.num_classes = num_classes
+
+    def call(self, inputs, labels):
+        images, boxes = inputs['image'].astype(np.uint8), labels['boxes']
+        # samples missing from the last batch only contain zeros and are
+        # removed before augmenting and left empty in the outputs
+        sample_args = np.flatnonzero(np.any(boxes != 0, axis=(1, 2)))
+        images, boxes = images[sample_args], boxes[sample_args]
+        if self.split == pr.TRAIN:
+            images = self.augment_image(images)
+            images, boxes = self.augment_boxes(images, boxes)
+        # RGB to BGR followed by mean subtraction
+        batch_images = np.zeros(inputs['image'].shape)
+        batch_images[sample_args] = images[..., ::-1].astype(float) - self.mean
+        encoded_boxes = np.zeros(
+            (len(labels['boxes']), self.num_boxes, 4 + self.num_classes))
+        for sample_arg, sample_boxes in zip(sample_args, boxes):
+            sample_boxes = self.unpad_boxes(sample_boxes)
+            encoded_boxes[sample_arg] = self.preprocess_boxes(sample_boxes)
+        return {'image': batch_images}, {'boxes': encoded_boxes}
+
+
 class PostprocessBoxes2D(SequentialProcessor):
     """Filters, squares and offsets 2D bounding boxes
 
@@ -271,7 +357,7 @@ class EfficientDetPostprocess(Processor):
     def __init__(self, model, class_names, score_thresh, nms_thresh,
                  variances=[1.0, 1.0, 1.0, 1.0], class_arg=None):
         super(EfficientDetPostprocess, self).__init__()
-        model.prior_boxes = model.prior_boxes * model.input_shape[1]
+        self.input_size = model.input_shape[1]
         self.postprocess = pr.SequentialProcessor([
             pr.Squeeze(axis=None),
             pr.DecodeBoxes(model.prior_boxes, variances),
@@ -285,7 +371,7 @@ class EfficientDetPostprocess(Processor):
 
     def call(self, output, image_scale):
         box_data = self.postprocess(output)
-        box_data = self.scale(box_data, image_scale)
+        box_data = self.scale(box_data, image_scale * self.input_size)
         box_data, class_labels = self.nms_per_class(box_data)
         box_data = self.merge_box_and_class(box_data, class_labels)
         box_data = self.filter_boxes(box_data)
@@ -15,6 +15,18 @@ class AugmentImage(SequentialProcessor):
         self.add(pr.RandomHue())
 
 
+class AugmentImageBatch(SequentialProcessor):
+    """Augments a batch of RGB images by randomly changing contrast,
+        brightness saturation and hue of every image.
+    """
+    def __init__(self):
+        super(AugmentImageBatch, self).__init__()
+        self.add(pr.RandomContrastBatch())
+        self.add(pr.RandomBrightnessBatch())
+        self.add(pr.RandomSaturationBatch(0.7))
+        self.add(pr.RandomHueBatch())
+
+
 class PreprocessImage(SequentialProcessor):
     """Preprocess RGB image by resizing it to the given ``shape``. If a
     ``mean`` is given it is substracted from image and it not the image gets
@@ -0,0 +1,308 @@
+import numpy as np
+import tensorflow as tf
+
+from .. import processors as pr
+from ..abstract import Processor
+from ..backend.boxes import pad_boxes
+from ..backend import tensorflow_boxes as tf_boxes
+from ..backend.image import tensorflow_image as tf_image
+
+
+def build_dataset(data, pipeline, batch_size, shuffle=False, seed=None,
+                  max_num_boxes=None):
+    """Builds a ``tf.data`` dataset mapping a TensorFlow pipeline over all
+    samples in parallel and prefetching its batches.
+
+    # Arguments
+        data: List of dictionaries e.g. ``{'image': filepath, 'boxes': boxes}``
+            as given by the ``load_data`` method of the paz datasets.
+            Images are either filepaths or arrays of equal shape.
+        pipeline: Processor of ``tf.Tensor`` taking a sample dictionary and
+            returning ``(inputs, labels)`` e.g. ``AugmentDetectionTF``.
+        batch_size: Int.
+        shuffle: Boolean. If ``True`` samples are shuffled every epoch.
+        seed: Int. Seed of the shuffling order.
+        max_num_boxes: Int. Number of rows to which the ``boxes`` of every
+            sample are padded. If ``None`` the largest number of boxes in
+            ``data`` is used.
+
+    # Returns
+        ``tf.data.Dataset`` yielding batches of ``(inputs, labels)``.
+    """
+    samples = {}
+    for key in data[0].keys():
+        values = [sample[key] for sample in data]
+        if key == 'boxes':
+            if max_num_boxes is None:
+                max_num_boxes = max([len(boxes) for boxes in values])
+            values = [pad_boxes(np.asarray(boxes, dtype=np.float32),
+                                max_num_boxes) for boxes in values]
+        samples[key] = np.array(values)
+    dataset = tf.data.Dataset.from_tensor_slices(samples)
+    if shuffle:
+        dataset = dataset.shuffle(len(data), seed)
+    dataset = dataset.map(pipeline, num_parallel_calls=tf.data.AUTOTUNE)
+    dataset = dataset.batch(batch_size)
+    return dataset.prefetch(tf.data.AUTOTUNE)
+
+
+def _load_image(image, num_channels=3):
+    if image.dtype == tf.string:
+        image = tf_image.load_image(image, num_channels)
+    image = tf.cast(image, tf.float32)
+    if image.shape.rank == 2:
+        image = image[..., tf.newaxis]
+    return image
+
+
+def _reverse_channels(image):
+    return tf.reverse(image, axis=[-1])
+
+
+def _normalize_or_subtract_mean(image, mean):
+    if mean is None:
+        return image / 255.0
+    return image - tf.constant(mean, tf.float32)
+
+
+class AugmentImageTF(Processor):
+    """Augments a float RGB image with values in ``[0, 255]`` by randomly
+    changing contrast, brightness saturation and hue as ``AugmentImage``.
+    Grayscale images are only augmented in contrast and brightness.
+    """
+    def __init__(self):
+        super(AugmentImageTF, self).__init__()
+
+    def call(self, image):
+        image = image / 255.0
+        image = tf_image.random_contrast(image, 0.5, 1.5)
+        image = tf_image.random_brightness(image, 32 / 255.0)
+        if image.shape[-1] == 3:
+            image = tf_image.random_saturation(image, 0.7, 1.5)
+            image = tf_image.random_hue(image, 18 / 180.0)
+        return tf.clip_by_value(image, 0.0, 1.0) * 255.0
+
+
+class AugmentClassificationTF(Processor):
+    """Augments images and one-hot encodes labels for classification.
+
+    # Arguments
+        size: Int. Image size.
+        num_classes: Int.
+        split: Flag from `paz.processors.TRAIN`, ``paz.processors.VAL``
+            or ``paz.processors.TEST``. Certain transformations would take
+            place depending on the flag.
+        mean: List of three elements indicating the per channel mean. If
+            ``None`` images are normalized to ``[0, 1]``.
+        num_channels: Int. Number of channels of loaded images.
+    """
+    def __init__(self, size, num_classes, split=pr.TRAIN, mean=None,
+                 num_channels=3):
+        super(AugmentClassificationTF, self).__init__()
+        self.size = size
+        self.num_classes = num_classes
+        self.split = split
+        self.mean = mean
+        self.num_channels = num_channels
+        self.augment_image = AugmentImageTF()
+
+    def call(self, sample):
+        image = _load_image(sample['image'], self.num_channels)
+        if self.split == pr.TRAIN:
+            image = self.augment_image(image)
+            image = tf_image.random_flip_left_right(image)
+        image = tf_image.resize(image, (self.size, self.size))
+        image = _normalize_or_subtract_mean(image, self.mean)
+        label = sample['label']
+        if label.shape.rank == 0:
+            label = tf.one_hot(tf.cast(label, tf.int32), self.num_classes)
+        return {'image': image}, {'label': tf.cast(label, tf.float32)}
+
+
+class AugmentKeypointsTF(Processor):
+    """Augments images and their keypoints in image coordinates as
+    ``RandomKeypointRotation`` and ``RandomKeypointTranslation``, filling
+    empty pixels with the image mean.
+
+    # Arguments
+        size: Int. Image size of the dataset samples.
+        split: Flag from `paz.processors.TRAIN`, ``paz.processors.VAL``
+            or ``paz.processors.TEST``. Certain transformations would take
+            place depending on the flag.
+        rotation_range: Float. Maximum rotation in degrees.
+        delta_scale: List of two floats with the maximum translation
+            normalized by the image width and height.
+        probability: Float. Probability of a rotation and of a translation.
+        num_channels: Int. Number of channels of loaded images.
+    """
+    def __init__(self, size, split=pr.TRAIN, rotation_range=30,
+                 delta_scale=[0.2, 0.2], probability=0.5, num_channels=1):
+        super(AugmentKeypointsTF, self).__init__()
+        self.size = size
+        self.split = split
+        self.rotation_range = rotation_range
+        self.delta_scale = delta_scale
+        self.probability = probability
+        self.num_channels = num_channels
+
+    def _sample_rotation(self):
+        # same convention as openCV i.e. positive angles are anti-clockwise
+        radians = np.pi * tf.random.uniform(
+            [], -self.rotation_range, self.rotation_range) / 180.0
+        cos, sin = tf.cos(radians), tf.sin(radians)
+        center_x, center_y = self.size / 2.0, self.size / 2.0
+        return tf.stack([
+            [cos, sin, (1.0 - cos) * center_x - sin * center_y],
+            [-sin, cos, sin * center_x + (1.0 - cos) * center_y]])
+
+    def _sample_translation(self):
+        translation = tf.random.uniform(
+            [2], [-scale for scale in self.delta_scale], self.delta_scale)
+        translation = self.size * translation
+        return tf.concat([tf.eye(2), translation[:, tf.newaxis]], axis=1)
+
+    def _transform(self, image, keypoints, matrix):
+        fill_color = tf.reduce_mean(image, axis=[0, 1])
+        image = tf_image.transform_image(image, matrix, fill_color)
+        keypoints = tf.matmul(keypoints, matrix[:, :2], transpose_b=True)
+        return image, keypoints + matrix[:, 2]
+
+    def _random_transform(self, image, keypoints, sample_matrix):
+        return tf.cond(
+            tf.random.uniform([]) < self.probability,
+            lambda: self._transform(image, keypoints, sample_matrix()),
+            lambda: (image, keypoints))
+
+    def call(self, sample):
+        image = _load_image(sample['image'], self.num_channels)
+        keypoints = tf.cast(sample['keypoints'], tf.float32)
+        if self.split == pr.TRAIN:
+            image = image / 255.0
+            image = tf_image.random_brightness(image, 32 / 255.0)
+            image = tf_image.random_contrast(image, 0.5, 1.5)
+            image = tf.clip_by_value(image, 0.0, 1.0) * 255.0
+            image, keypoints = self._random_transform(
+                image, keypoints, self._sample_rotation)
+            image, keypoints = self._random_transform(
+                image, keypoints, self._sample_translation)
+        image = image / 255.0
+        # same as ``normalize_keypoints2D``
+        keypoints = (2.0 * keypoints / self.size) - 1.0
+        image = tf.ensure_shape(image, [self.size, self.size, None])
+        return {'image': image}, {'keypoints': keypoints}
+
+
+class AugmentDetectionTF(Processor):
+    """Augment boxes and images for object detection as ``AugmentDetection``
+    using TensorFlow operations only.
+
+    # Arguments
+        prior_boxes: Numpy array of shape ``[num_boxes, 4]`` containing
+            prior/default bounding boxes.
+        split: Flag from `paz.processors.TRAIN`, ``paz.processors.VAL``
+            or ``paz.processors.TEST``. Certain transformations would take
+            place depending on the flag.
+        num_classes: Int.
+        size: Int. Image size.
+        mean: List of three elements indicating the per channel mean.
+        IOU: Float. Intersection over union used to match boxes.
+        variances: List of two floats indicating variances to be encoded
+            for encoding bounding boxes.
+        max_ratio: Float. Maximum size of the expanded images.
+    """
+    def __init__(self, prior_boxes, split=pr.TRAIN, num_classes=21, size=300,
+                 mean=pr.BGR_IMAGENET_MEAN, IOU=.5,
+                 variances=[0.1, 0.1, 0.2, 0.2], max_ratio=2):
+        super(AugmentDetectionTF, self).__init__()
+        self.prior_boxes = tf.constant(prior_boxes, tf.float32)
+        self.split = split
+        self.num_classes = num_classes
+        self.size = size
+        self.mean = mean
+        self.IOU = IOU
+        self.variances = variances
+        self.max_ratio = max_ratio
+        # minimum object coverage of each mode of ``RandomSampleCrop``
+        self.min_object_covered = tf.constant([0.1, 0.3, 0.7, 0.9, 0.0])
+        self.augment_image = AugmentImageTF()
+
+    def _expand(self, image, boxes):
+        H, W = tf.unstack(tf.cast(tf.shape(image)[:2], tf.float32))
+        ratio = tf.random.uniform([], 1.0, self.max_ratio)
+        left = tf.floor(tf.random.uniform([], 0.0, W * ratio - W))
+        top = tf.floor(tf.random.uniform([], 0.0, H * ratio - H))
+        expanded_H, expanded_W = tf.floor(H * ratio), tf.floor(W * ratio)
+        fill_color = tf.constant(self.mean, tf.float32)
+        image = tf.image.pad_to_bounding_box(
+            image - fill_color, tf.cast(top, tf.int32),
+            tf.cast(left, tf.int32), tf.cast(expanded_H, tf.int32),
+            tf.cast(expanded_W, tf.int32)) + fill_color
+        coordinates = boxes[:, :4] * tf.stack([W, H, W, H])
+        coordinates = coordinates + tf.stack([left, top, left, top])
+        coordinates = coordinates / tf.stack(
+            [expanded_W, expanded_H, expanded_W, expanded_H])
+        return image, tf.concat([coordinates, boxes[:, 4:]], axis=1)
+
+    def _crop(self, image, boxes):
+        mode_arg = tf.random.uniform(
+            [], 0, len(self.min_object_covered), tf.int32)
+        coordinates = tf.clip_by_value(boxes[:, :4], 0.0, 1.0)
+        coordinates = tf.gather(coordinates, [1, 0, 3, 2], axis=1)
+        begin, crop_size, window = tf.image.sample_distorted_bounding_box(
+            tf.shape(image), coordinates[tf.newaxis],
+            min_object_covered=self.min_object_covered[mode_arg],
+            aspect_ratio_range=[0.5, 2.0], area_range=[0.09, 1.0],
+            max_attempts=50, use_image_if_no_bounding_boxes=True)
+        y_min, x_min, y_max, x_max = tf.unstack(window[0, 0])
+        centers = (boxes[:, 0:2] + boxes[:, 2:4]) / 2.0
+        is_inside = tf.reduce_all(tf.logical_and(
+            centers > tf.stack([x_min, y_min]),
+            centers < tf.stack([x_max, y_max])), axis=1)
+        cropped_boxes = tf.boolean_mask(boxes, is_inside)
+        offset = tf.stack([x_min, y_min, x_min, y_min])
+        scale = tf.stack([x_max - x_min, y_max - y_min] * 2)
+        coordinates = (cropped_boxes[:, :4] - offset) / scale
+        coordinates = tf.clip_by_value(coordinates, 0.0, 1.0)
+        cropped_boxes = tf.concat([coordinates, cropped_boxes[:, 4:]], axis=1)
+        cropped_image = tf.slice(image, begin, crop_size)
+        return tf.cond(
+            tf.reduce_any(is_inside),
+            lambda: (cropped_image, cropped_boxes),
+            lambda: (image, boxes))
+
+    def _flip(self, image, boxes):
+        return tf_image.flip_left_right(image), tf_boxes.flip_left_right(boxes)
+
+    def augment_boxes(self, image, boxes):
+        image, boxes = tf.cond(
+            tf.random.uniform([]) < 0.5,
+            lambda: self._expand(image, boxes),
+            lambda: (image, boxes))
+        # first mode of ``RandomSampleCrop`` keeps the image uncropped
+        image, boxes = tf.cond(
+            tf.random.uniform([]) < 1.0 / (len(self.min_object_covered) + 1),
+            lambda: (image, boxes),
+            lambda: self._crop(image, boxes))
+        return tf.cond(
+            tf.random.uniform([]) < 0.5,
+            lambda: self._flip(image, boxes),
+            lambda: (image, boxes))
+
+    def preprocess_boxes(self, boxes):
+        boxes = tf_boxes.match(boxes, self.prior_boxes, self.IOU)
+        boxes = tf_boxes.encode(boxes, self.prior_boxes, self.variances)
+        class_args = tf.cast(boxes[:, 4], tf.int32)
+        one_hot_vectors = tf.one_hot(class_args, self.num_classes)
+        return tf.concat([boxes[:, :4], one_hot_vectors], axis=1)
+
+    def call(self, sample):
+        image = _load_image(sample['image'])
+        boxes = tf.cast(sample['boxes'], tf.float32)
+        boxes = tf.boolean_mask(boxes, boxes[:, -1] != -1)
+        if self.split == pr.TRAIN:
+            image = self.augment_image(image)
+            image, boxes = self.augment_boxes(image, boxes)
+        image = _reverse_channels(tf_image.resize(image, (self.size,
+                                                          self.size)))
+        image = _normalize_or_subtract_mean(image, self.mean)
+        return {'image': image}, {'boxes': self.preprocess_boxes(boxes)}
@@ -1,189 +1,206 @@
-# imports are done directly to keep user's auto-complete clean
-
-from .detection import SquareBoxes2D
-from .detection import DenormalizeBoxes2D
-from .detection import RoundBoxes2D
-from .detection import ClipBoxes2D
-from .detection import FilterClassBoxes2D
-from .detection import CropBoxes2D
-from .detection import ToBoxes2D
-from .detection import MatchBoxes
-from .detection import EncodeBoxes
-from .detection import DecodeBoxes
-from .detection import NonMaximumSuppressionPerClass
-from .detection import FilterBoxes
-from .detection import OffsetBoxes2D
-from .detection import CropImage
-from .detection import RemoveClass
-from .detection import ScaleBox
-from .detection import BoxesToBoxes2D
-from .detection import BoxesWithOneHotVectorsToBoxes2D
-from .detection import BoxesWithClassArgToBoxes2D
-from .detection import RoundBoxes
-from .detection import MergeNMSBoxWithClass
-
-from .draw import DrawBoxes2D
-from .draw import DrawKeypoints2D
-from .draw import DrawBoxes3D
-from .draw import DrawRandomPolygon
-from .draw import DrawPose6D
-from .draw import DrawPoses6D
-from .draw import DrawHumanSkeleton
-from .draw import DrawHandSkeleton
-from .draw import DrawRGBMask
-from .draw import DrawRGBMasks
-from .draw import DrawText
-from .draw import DrawHumanPose6D
-
-from .image import CastImage
-from .image import SubtractMeanImage
-from .image import AddMeanImage
-from .image import NormalizeImage
-from .image import DenormalizeImage
-from .image import LoadImage
-from .image import RandomSaturation
-from .image import RandomBrightness
-from .image import RandomContrast
-from .image import RandomHue
-from .image import ResizeImage
-from .image import ResizeImages
-from .image import RandomImageBlur
-from .image import RandomGaussianBlur
-from .image import RandomFlipImageLeftRight
-from .image import ConvertColorSpace
-from .image import ShowImage
-from .image import ImageDataProcessor
-from .image import AlphaBlending
-from .image import RandomShapeCrop
-from .image import RandomImageCrop
-from .image import MakeRandomPlainImage
-from .image import ConcatenateAlphaMask
-from .image import BlendRandomCroppedBackground
-from .image import AddOcclusion
-from .image import ImageToNormalizedDeviceCoordinates
-from .image import NormalizedDeviceCoordinatesToImage
-from .image import ReplaceLowerThanThreshold
-from .image import GetNonZeroArguments
-from .image import GetNonZeroValues
-from .image import FlipLeftRightImage
-from .image import ImagenetPreprocessInput
-from .image import DivideStandardDeviationImage
-from .image import ScaledResize
-
-
-from .image import BGR_IMAGENET_MEAN
-from .image import RGB_IMAGENET_MEAN
-from .image import RGB_IMAGENET_STDEV
-
-from .renderer import Render
-
-from .geometric import RandomFlipBoxesLeftRight
-from .geometric import ToImageBoxCoordinates
-from .geometric import ToNormalizedBoxCoordinates
-from .geometric import RandomSampleCrop
-from .geometric import Expand
-from .geometric import ApplyTranslation
-from .geometric import RandomTranslation
-from .geometric import RandomKeypointTranslation
-from .geometric import RandomKeypointRotation
-from .geometric import RandomRotation
-from .geometric import TranslateImage
-from .geometric import GetTransformationSize
-from .geometric import GetTransformationScale
-from .geometric import GetSourceDestinationPoints
-from .geometric import GetImageCenter
-from .geometric import WarpAffine
-
-
-from .keypoints import ChangeKeypointsCoordinateSystem
-from .keypoints import DenormalizeKeypoints
-from .keypoints import NormalizeKeypoints
-from .keypoints import PartitionKeypoints
-from .keypoints import ProjectKeypoints
-from .keypoints import RemoveKeypointsDepth
-from .keypoints import TranslateKeypoints
-from .keypoints import DenormalizeKeypoints2D
-from .keypoints import NormalizeKeypoints2D
-from .keypoints import ArgumentsToImageKeypoints2D
-from .keypoints import ScaleKeypoints
-from .keypoints import ComputeOrientationVector
-from .keypoints import MergeKeypoints2D
-from .keypoints import FilterKeypoints2D
-from .keypoints import StandardizeKeypoints2D
-from .keypoints import DestandardizeKeypoints2D
-from .keypoints import OptimizeHumanPose3D
-
-
-from .standard import ControlMap
-from .standard import ExpandDomain
-from .standard import CopyDomain
-from .standard import ExtendInputs
-from .standard import SequenceWrapper
-from .standard import Predict
-from .standard import ToClassName
-from .standard import ExpandDims
-from .standard import BoxClassToOneHotVector
-from .standard import Squeeze
-from .standard import Copy
-from .standard import Lambda
-from .standard import UnpackDictionary
-from .standard import WrapOutput
-from .standard import Concatenate
-from .standard import SelectElement
-from .standard import StochasticProcessor
-from .standard import Stochastic
-from .standard import UnwrapDictionary
-from .standard import Scale
-from .standard import AppendValues
-from .standard import BooleanToTextMessage
-from .standard import PrintTopics
-
-from .pose import SolvePNP
-from .pose import SolveChangingObjectPnPRANSAC
-from .pose import Translation3DFromBoxWidth
-
-from .groups import ToAffineMatrix
-from .groups import RotationVectorToQuaternion
-from .groups import RotationVectorToRotationMatrix
-
-from ..backend.image.opencv_image import RGB2BGR
-from ..backend.image.opencv_image import BGR2RGB
-from ..backend.image.opencv_image import RGB2GRAY
-from ..backend.image.opencv_image import RGB2HSV
-from ..backend.image.opencv_image import HSV2RGB
-
-from ..backend.keypoints import UPNP
-from ..backend.keypoints import LEVENBERG_MARQUARDT
-
-from ..backend.image.draw import GREEN
-from ..backend.image.draw import FONT
-from ..backend.image.draw import LINE
-
-from ..abstract import Processor
-from ..abstract import SequentialProcessor
-
-
-from .heatmaps import TransposeOutput
-from .heatmaps import ScaleOutput
-from .heatmaps import GetHeatmaps
-from .heatmaps import GetTags
-from .heatmaps import RemoveLastElement
-from .heatmaps import AggregateResults
-from .heatmaps import TopKDetections
-from .heatmaps import GroupKeypointsByTag
-from .heatmaps import AdjustKeypointsLocations
-from .heatmaps import GetScores
-from .heatmaps import RefineKeypointsLocations
-from .heatmaps import TransformKeypoints
-from .heatmaps import ExtractKeypointsLocations
-
-from .munkres import Munkres
-
-from .angles import ChangeLinkOrder
-from .angles import CalculateRelativeAngles
-from .angles import IsHandOpen
-
+from ..utils.lazy import lazy_import
+
+# modules are only imported once one of their attributes is accessed
+_LAZY_ATTRIBUTES = {
+    'SquareBoxes2D': '.detection',
+    'DenormalizeBoxes2D': '.detection',
+    'RoundBoxes2D': '.detection',
+    'ClipBoxes2D': '.detection',
+    'FilterClassBoxes2D': '.detection',
+    'CropBoxes2D': '.detection',
+    'ToBoxes2D': '.detection',
+    'PadBoxes': '.detection',
+    'UnpadBoxes': '.detection',
+    'MatchBoxes': '.detection',
+    'EncodeBoxes': '.detection',
+    'DecodeBoxes': '.detection',
+    'NonMaximumSuppressionPerClass': '.detection',
+    'FilterBoxes': '.detection',
+    'OffsetBoxes2D': '.detection',
+    'CropImage': '.detection',
+    'RemoveClass': '.detection',
+    'ScaleBox': '.detection',
+    'BoxesToBoxes2D': '.detection',
+    'BoxesWithOneHotVectorsToBoxes2D': '.detection',
+    'BoxesWithClassArgToBoxes2D': '.detection',
+    'RoundBoxes': '.detection',
+    'MergeNMSBoxWithClass': '.detection',
+    'SquareBoxes': '.detection',
+    'DenormalizeBoxes': '.detection',
+    'TruncateBoxes': '.detection',
+    'ClipBoxes': '.detection',
+    'OffsetBoxes': '.detection',
+    'FilterClassBoxes': '.detection',
+    'ToBoxes2DView': '.detection',
+
+    'DrawBoxes2D': '.draw',
+    'DrawKeypoints2D': '.draw',
+    'DrawBoxes3D': '.draw',
+    'DrawRandomPolygon': '.draw',
+    'DrawPose6D': '.draw',
+    'DrawPoses6D': '.draw',
+    'DrawHumanSkeleton': '.draw',
+    'DrawHandSkeleton': '.draw',
+    'DrawRGBMask': '.draw',
+    'DrawRGBMasks': '.draw',
+    'DrawText': '.draw',
+    'DrawHumanPose6D': '.draw',
+
+    'CastImage': '.image',
+    'SubtractMeanImage': '.image',
+    'AddMeanImage': '.image',
+    'NormalizeImage': '.image',
+    'DenormalizeImage': '.image',
+    'LoadImage': '.image',
+    'RandomSaturation': '.image',
+    'RandomBrightness': '.image',
+    'RandomContrast': '.image',
+    'RandomHue': '.image',
+    'RandomSaturationBatch': '.image',
+    'RandomBrightnessBatch': '.image',
+    'RandomContrastBatch': '.image',
+    'RandomHueBatch': '.image',
+    'ResizeImage': '.image',
+    'ResizeImages': '.image',
+    'RandomImageBlur': '.image',
+    'RandomGaussianBlur': '.image',
+    'RandomFlipImageLeftRight': '.image',
+    'ConvertColorSpace': '.image',
+    'ShowImage': '.image',
+    'ImageDataProcessor': '.image',
+    'AlphaBlending': '.image',
+    'RandomShapeCrop': '.image',
+    'RandomImageCrop': '.image',
+    'MakeRandomPlainImage': '.image',
+    'ConcatenateAlphaMask': '.image',
+    'BlendRandomCroppedBackground': '.image',
+    'AddOcclusion': '.image',
+    'ImageToNormalizedDeviceCoordinates': '.image',
+    'NormalizedDeviceCoordinatesToImage': '.image',
+    'ReplaceLowerThanThreshold': '.image',
+    'GetNonZeroArguments': '.image',
+    'GetNonZeroValues': '.image',
+    'FlipLeftRightImage': '.image',
+    'ImagenetPreprocessInput': '.image',
+    'DivideStandardDeviationImage': '.image',
+    'ScaledResize': '.image',
+
+    'BGR_IMAGENET_MEAN': '.image',
+    'RGB_IMAGENET_MEAN': '.image',
+    'RGB_IMAGENET_STDEV': '.image',
+
+    'Render': '.renderer',
+
+    'RandomFlipBoxesLeftRight': '.geometric',
+    'ToImageBoxCoordinates': '.geometric',
+    'ToNormalizedBoxCoordinates': '.geometric',
+    'RandomSampleCrop': '.geometric',
+    'Expand': '.geometric',
+    'RandomFlipBoxesLeftRightBatch': '.geometric',
+    'ExpandBatch': '.geometric',
+    'RandomSampleCropBatch': '.geometric',
+    'ApplyTranslation': '.geometric',
+    'RandomTranslation': '.geometric',
+    'RandomKeypointTranslation': '.geometric',
+    'RandomKeypointRotation': '.geometric',
+    'RandomRotation': '.geometric',
+    'TranslateImage': '.geometric',
+    'GetTransformationSize': '.geometric',
+    'GetTransformationScale': '.geometric',
+    'GetSourceDestinationPoints': '.geometric',
+    'GetImageCenter': '.geometric',
+    'WarpAffine': '.geometric',
+
+    'ChangeKeypointsCoordinateSystem': '.keypoints',
+    'DenormalizeKeypoints': '.keypoints',
+    'NormalizeKeypoints': '.keypoints',
+    'PartitionKeypoints': '.keypoints',
+    'ProjectKeypoints': '.keypoints',
+    'RemoveKeypointsDepth': '.keypoints',
+    'TranslateKeypoints': '.keypoints',
+    'DenormalizeKeypoints2D': '.keypoints',
+    'NormalizeKeypoints2D': '.keypoints',
+    'ArgumentsToImageKeypoints2D': '.keypoints',
+    'ScaleKeypoints': '.keypoints',
+    'ComputeOrientationVector': '.keypoints',
+    'MergeKeypoints2D': '.keypoints',
+    'FilterKeypoints2D': '.keypoints',
+    'StandardizeKeypoints2D': '.keypoints',
+    'DestandardizeKeypoints2D': '.keypoints',
+    'OptimizeHumanPose3D': '.keypoints',
+
+    'ControlMap': '.standard',
+    'ExpandDomain': '.standard',
+    'CopyDomain': '.standard',
+    'ExtendInputs': '.standard',
+    'SequenceWrapper': '.standard',
+    'Predict': '.standard',
+    'ToClassName': '.standard',
+    'ExpandDims': '.standard',
+    'BoxClassToOneHotVector': '.standard',
+    'Squeeze': '.standard',
+    'Copy': '.standard',
+    'Lambda': '.standard',
+    'UnpackDictionary': '.standard',
+    'WrapOutput': '.standard',
+    'Concatenate': '.standard',
+    'SelectElement': '.standard',
+    'StochasticProcessor': '.standard',
+    'Stochastic': '.standard',
+    'UnwrapDictionary': '.standard',
+    'Scale': '.standard',
+    'AppendValues': '.standard',
+    'BooleanToTextMessage': '.standard',
+    'PrintTopics': '.standard',
+
+    'SolvePNP': '.pose',
+    'SolveChangingObjectPnPRANSAC': '.pose',
+    'Translation3DFromBoxWidth': '.pose',
+
+    'ToAffineMatrix': '.groups',
+    'RotationVectorToQuaternion': '.groups',
+    'RotationVectorToRotationMatrix': '.groups',
+
+    'RGB2BGR': '..backend.image.opencv_image',
+    'BGR2RGB': '..backend.image.opencv_image',
+    'RGB2GRAY': '..backend.image.opencv_image',
+    'RGB2HSV': '..backend.image.opencv_image',
+    'HSV2RGB': '..backend.image.opencv_image',
+
+    'UPNP': '..backend.keypoints',
+    'LEVENBERG_MARQUARDT': '..backend.keypoints',
+
+    'GREEN': '..backend.image.draw',
+    'FONT': '..backend.image.draw',
+    'LINE': '..backend.image.draw',
+
+    'Processor': '..abstract',
+    'SequentialProcessor': '..abstract',
+
+    'TransposeOutput': '.heatmaps',
+    'ScaleOutput': '.heatmaps',
+    'GetHeatmaps': '.heatmaps',
+    'GetTags': '.heatmaps',
+    'RemoveLastElement': '.heatmaps',
+    'AggregateResults': '.heatmaps',
+    'TopKDetections': '.heatmaps',
+    'GroupKeypointsByTag': '.heatmaps',
+    'AdjustKeypointsLocations': '.heatmaps',
+    'GetScores': '.heatmaps',
+    'RefineKeypointsLocations': '.heatmaps',
+    'TransformKeypoints': '.heatmaps',
+    'ExtractKeypointsLocations': '.heatmaps',
+
+    'Munkres': '.munkres',
+
+    'ChangeLinkOrder': '.angles',
+    'CalculateRelativeAngles': '.angles',
+    'IsHandOpen': '.angles',
+}
 
 TRAIN = 0
 VAL = 1
 TEST = 2
+
+__all__ = list(_LAZY_ATTRIBUTES.keys()) + ['TRAIN', 'VAL', 'TEST']
+__getattr__, __dir__ = lazy_import(__name__, _LAZY_ATTRIBUTES)
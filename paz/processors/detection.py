@@ -2,7 +2,7 @@ from __future__ import division
 
 import numpy as np
 
-from ..abstract import Processor, Box2D
+from ..abstract import Processor, Box2D, Boxes2DView
 from ..backend.boxes import match
 from ..backend.boxes import encode
 from ..backend.boxes import decode
@@ -14,6 +14,12 @@ from ..backend.boxes import denormalize_box
 from ..backend.boxes import make_box_square
 from ..backend.boxes import filter_boxes
 from ..backend.boxes import scale_box
+from ..backend.boxes import pad_boxes
+from ..backend.boxes import unpad_boxes
+from ..backend.boxes import make_boxes_square
+from ..backend.boxes import offset_boxes
+from ..backend.boxes import clip_boxes
+from ..backend.boxes import denormalize_boxes
 
 
 class SquareBoxes2D(Processor):
@@ -255,6 +261,36 @@ class RoundBoxes(Processor):
         return boxes2D
 
 
+class PadBoxes(Processor):
+    """Pads boxes to a fixed number of rows allowing them to be batched.
+
+    # Arguments
+        max_num_boxes: Int. Number of rows of the padded boxes.
+        value: Float. Value of all entries of the padding rows.
+    """
+    def __init__(self, max_num_boxes, value=-1):
+        self.max_num_boxes = max_num_boxes
+        self.value = value
+        super(PadBoxes, self).__init__()
+
+    def call(self, boxes):
+        return pad_boxes(boxes, self.max_num_boxes, self.value)
+
+
+class UnpadBoxes(Processor):
+    """Removes the padding rows of boxes given by ``PadBoxes``.
+
+    # Arguments
+        value: Float. Class argument of the padding rows.
+    """
+    def __init__(self, value=-1):
+        self.value = value
+        super(UnpadBoxes, self).__init__()
+
+    def call(self, boxes):
+        return unpad_boxes(boxes, self.value)
+
+
 class MatchBoxes(Processor):
     """Match prior boxes with ground truth boxes.
 
@@ -420,3 +456,104 @@ class ScaleBox(Processor):
     def call(self, boxes, scales):
         boxes = scale_box(boxes, scales)
         return boxes
+
+
+class SquareBoxes(Processor):
+    """Transforms an array of rectangular boxes into square boxes.
+    Array version of ``SquareBoxes2D``.
+    """
+    def __init__(self):
+        super(SquareBoxes, self).__init__()
+
+    def call(self, boxes):
+        return make_boxes_square(boxes)
+
+
+class DenormalizeBoxes(Processor):
+    """Denormalizes an array of boxes to be in accordance to the original
+    image size. Array version of ``DenormalizeBoxes2D``.
+    """
+    def __init__(self):
+        super(DenormalizeBoxes, self).__init__()
+
+    def call(self, image, boxes):
+        return denormalize_boxes(boxes, image.shape[:2])
+
+
+class TruncateBoxes(Processor):
+    """Truncates box coordinates to integer values. Array version of
+    ``RoundBoxes2D``.
+    """
+    def __init__(self):
+        super(TruncateBoxes, self).__init__()
+
+    def call(self, boxes):
+        boxes = boxes.copy()
+        boxes[:, :4] = np.trunc(boxes[:, :4])
+        return boxes
+
+
+class ClipBoxes(Processor):
+    """Clips an array of boxes into the image dimensions. Array version of
+    ``ClipBoxes2D``.
+    """
+    def __init__(self):
+        super(ClipBoxes, self).__init__()
+
+    def call(self, image, boxes):
+        return clip_boxes(boxes, image.shape[:2])
+
+
+class OffsetBoxes(Processor):
+    """Offsets the height and width of an array of boxes. Array version of
+    ``OffsetBoxes2D``.
+
+    # Arguments
+        offsets: Float between [0, 1].
+    """
+    def __init__(self, offsets):
+        super(OffsetBoxes, self).__init__()
+        self.offsets = offsets
+
+    def call(self, boxes):
+        return offset_boxes(boxes, self.offsets)
+
+
+class FilterClassBoxes(Processor):
+    """Filters an array of boxes with class scores keeping the boxes whose
+    most likely class is valid. Array version of ``FilterClassBoxes2D``.
+
+    # Arguments
+        class_names: List of class names ordered with respect to the
+            class scores of the boxes.
+        valid_class_names: List of strings indicating class names to be kept.
+    """
+    def __init__(self, class_names, valid_class_names):
+        self.class_names = class_names
+        self.valid_class_names = valid_class_names
+        self.valid_class_args = [class_arg for class_arg, class_name
+                                 in enumerate(class_names)
+                                 if class_name in valid_class_names]
+        super(FilterClassBoxes, self).__init__()
+
+    def call(self, boxes):
+        class_args = np.argmax(boxes[:, 4:], axis=1)
+        return boxes[np.isin(class_args, self.valid_class_args)]
+
+
+class ToBoxes2DView(Processor):
+    """Wraps an array of boxes with class scores into a lazy sequence of
+    ``Box2D`` messages. Array version of ``BoxesWithOneHotVectorsToBoxes2D``.
+
+    # Arguments
+        class_names: List of class names ordered with respect to the
+            class scores of the boxes.
+        integer_coordinates: Bool. If ``True`` coordinates are cast to ints.
+    """
+    def __init__(self, class_names, integer_coordinates=False):
+        self.class_names = class_names
+        self.integer_coordinates = integer_coordinates
+        super(ToBoxes2DView, self).__init__()
+
+    def call(self, boxes):
+        return Boxes2DView(boxes, self.class_names, self.integer_coordinates)
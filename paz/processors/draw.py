@@ -2,17 +2,14 @@ import numpy as np
 
 from ..abstract import Processor
 from ..backend.image import lincolor
-from ..backend.image import draw_rectangle
 from ..backend.image import put_text
-from ..backend.image import draw_keypoint
 from ..backend.image import draw_cube
 from ..backend.image import GREEN
 from ..backend.image import draw_random_polygon
-from ..backend.image import draw_keypoints_link
-from ..backend.image import draw_keypoints
 from ..backend.image import draw_RGB_mask
 from ..backend.image import draw_RGB_masks
 from ..backend.image import draw_human_pose6D
+from ..backend.image import Overlay
 from ..backend.keypoints import project_points3D
 from ..backend.keypoints import build_cube_points3D
 from ..backend.groups import quaternion_to_rotation_matrix
@@ -54,9 +51,13 @@ class DrawBoxes2D(Processor):
             self.class_to_color = dict(zip(self.class_names, self.colors))
         else:
             self.class_to_color = {None: self.colors, '': self.colors}
+        self.overlay = Overlay()
         super(DrawBoxes2D, self).__init__()
 
     def call(self, image, boxes2D):
+        if len(boxes2D) == 0:
+            return image
+        self.overlay.reset(image)
         for box2D in boxes2D:
             x_min, y_min, x_max, y_max = box2D.coordinates
             class_name = box2D.class_name
@@ -67,9 +68,10 @@ class DrawBoxes2D(Processor):
                 text = '{:0.2f}, {}'.format(box2D.score, class_name)
             if not self.with_score:
                 text = '{}'.format(class_name)
-            put_text(image, text, (x_min, y_min - 10), self.scale, color, 1)
-            draw_rectangle(image, (x_min, y_min), (x_max, y_max), color, 2)
-        return image
+            self.overlay.draw_text(
+                text, (int(x_min), int(y_min) - 10), self.scale, color, 1)
+            self.overlay.draw_boxes([box2D.coordinates], color, 2)
+        return self.overlay.render()
 
 
 class DrawKeypoints2D(Processor):
@@ -83,12 +85,13 @@ class DrawKeypoints2D(Processor):
         super(DrawKeypoints2D, self).__init__()
         self.colors = lincolor(num_keypoints, normalized=normalized)
         self.radius = radius
+        self.overlay = Overlay()
 
     def call(self, image, keypoints):
-        for keypoint_arg, keypoint in enumerate(keypoints):
-            color = self.colors[keypoint_arg]
-            draw_keypoint(image, keypoint.astype('int'), color, self.radius)
-        return image
+        self.overlay.reset(image)
+        colors = np.array(self.colors)[:len(keypoints)]
+        self.overlay.draw_keypoints(keypoints, colors, self.radius)
+        return self.overlay.render()
 
 
 class DrawBoxes3D(Processor):
@@ -140,7 +143,7 @@ class DrawRandomPolygon(Processor):
         self.max_radius_scale = max_radius_scale
 
     def call(self, image):
-        return draw_random_polygon(image)
+        return draw_random_polygon(image, self.max_radius_scale, self.rng)
 
 
 def draw_pose6D(image, pose6D, points3D, intrinsics, thickness):
@@ -239,16 +242,19 @@ class DrawHumanSkeleton(Processor):
         self.check_scores = check_scores
         self.link_width = link_width
         self.keypoint_radius = keypoint_radius
+        self.overlay = Overlay()
+        self._link_args = [[self.link_args[part_A], self.link_args[part_B]]
+                           for part_A, part_B in self.link_orders]
 
     def call(self, image, grouped_joints):
-        for one_person_joints in grouped_joints:
-            image = draw_keypoints_link(
-                image, one_person_joints, self.link_args, self.link_orders,
-                self.link_colors, self.check_scores, self.link_width)
-            image = draw_keypoints(image, one_person_joints,
-                                   self.keypoint_colors, self.check_scores,
-                                   self.keypoint_radius)
-        return image
+        if len(grouped_joints) == 0:
+            return image
+        self.overlay.reset(image)
+        self.overlay.draw_skeletons(
+            np.array(grouped_joints), self._link_args, self.link_colors,
+            self.keypoint_colors, self.check_scores, self.link_width,
+            self.keypoint_radius)
+        return self.overlay.render()
 
 
 class DrawHandSkeleton(Processor):
@@ -270,14 +276,17 @@ class DrawHandSkeleton(Processor):
         self.check_scores = check_scores
         self.link_width = link_width
         self.keypoint_radius = keypoint_radius
+        self.overlay = Overlay()
+        self._link_args = [[self.link_args[part_A], self.link_args[part_B]]
+                           for part_A, part_B in self.link_orders]
 
     def call(self, image, keypoints):
-        image = draw_keypoints_link(
-            image, keypoints, self.link_args, self.link_orders,
-            self.link_colors, self.check_scores, self.link_width)
-        image = draw_keypoints(image, keypoints, self.keypoint_colors,
-                               self.check_scores, self.keypoint_radius)
-        return image
+        self.overlay.reset(image)
+        self.overlay.draw_skeletons(
+            np.array(keypoints)[np.newaxis], self._link_args,
+            self.link_colors, self.keypoint_colors, self.check_scores,
+            self.link_width, self.keypoint_radius)
+        return self.overlay.render()
 
 
 class DrawRGBMask(Processor):
@@ -5,10 +5,9 @@ from ..abstract import Processor
 from ..backend.boxes import flip_left_right
 from ..backend.boxes import to_image_coordinates
 from ..backend.boxes import to_normalized_coordinates
-from ..backend.boxes import compute_iou
+from ..backend.boxes import compute_ious
 from ..backend.image import warp_affine
 from ..backend.image import translate_image
-from ..backend.image import sample_scaled_translation
 from ..backend.image import get_rotation_matrix
 from ..backend.image import calculate_image_center
 from ..backend.keypoints import translate_keypoints
@@ -24,7 +23,7 @@ class RandomFlipBoxesLeftRight(Processor):
         super(RandomFlipBoxesLeftRight, self).__init__()
 
     def call(self, image, boxes):
-        if np.random.randint(0, 2):
+        if self.rng.integers(0, 2):
             boxes = flip_left_right(boxes, image.shape[1])
             image = image[:, ::-1]
         return image, boxes
@@ -70,46 +69,79 @@ class RandomSampleCrop(Processor):
             (0.9, np.inf),
             (-np.inf, np.inf))
 
+    def _walk_trials(self, is_valid_aspect):
+        # a trial draws width and height and only draws its corner if the
+        # aspect ratio is valid. Trial starts in the random stream are
+        # found by pointer jumping over all stream positions at once.
+        num_draws = len(is_valid_aspect)
+        next_arg = np.arange(num_draws) + 2 + (2 * is_valid_aspect)
+        next_arg = np.minimum(next_arg, num_draws - 1)
+        trial_args = np.zeros(1, dtype=int)
+        while len(trial_args) < self.max_trials:
+            trial_args = np.concatenate([trial_args, next_arg[trial_args]])
+            next_arg = next_arg[next_arg]
+        return trial_args[:self.max_trials]
+
+    def _sample_crop(self, H_original, W_original, boxes, min_iou, max_iou):
+        rng = self.rng
+        state = rng.bit_generator.state
+        draws = rng.random(4 * self.max_trials + 4)
+        W = 0.3 * W_original + (W_original - 0.3 * W_original) * draws
+        H = 0.3 * H_original + (H_original - 0.3 * H_original) * draws
+        aspect_ratios = H[1:] / W[:-1]
+        is_valid_aspect = np.logical_and(
+            aspect_ratios >= 0.5, aspect_ratios <= 2)
+
+        trial_args = self._walk_trials(is_valid_aspect)
+        W, H = W[trial_args], H[trial_args + 1]
+        x_min = (W_original - W) + (1.0 - (W_original - W)) * draws[
+            trial_args + 2]
+        y_min = (H_original - H) + (1.0 - (H_original - H)) * draws[
+            trial_args + 3]
+        crop_boxes = np.stack([x_min, y_min, x_min + W, y_min + H], axis=1)
+        crop_boxes = crop_boxes.astype(int)
+
+        overlaps = compute_ious(crop_boxes, boxes)
+        is_valid_overlap = np.logical_not(np.logical_or(
+            overlaps.max(axis=1) < min_iou, overlaps.min(axis=1) > max_iou))
+
+        centers = (boxes[:, :2] + boxes[:, 2:]) / 2.0
+        masks = np.logical_and(
+            np.all(crop_boxes[:, None, :2] < centers, axis=-1),
+            np.all(crop_boxes[:, None, 2:] > centers, axis=-1))
+
+        is_valid_aspect = is_valid_aspect[trial_args]
+        is_valid = is_valid_aspect & is_valid_overlap & masks.any(axis=1)
+        crop_arg = np.argmax(is_valid)
+        if is_valid[crop_arg]:
+            num_draws = trial_args[crop_arg] + 4
+        else:
+            crop_arg = None
+            num_draws = trial_args[-1] + 2 + (2 * is_valid_aspect[-1])
+        # leaves the random stream as if trials were drawn one at a time
+        rng.bit_generator.state = state
+        rng.random(num_draws)
+        if crop_arg is None:
+            return None
+        return crop_boxes[crop_arg], masks[crop_arg]
+
     def call(self, image, boxes):
 
-        if self.probability < np.random.rand():
+        if self.probability < self.rng.random():
             return image, boxes
 
         labels = boxes[:, -1:]
         boxes = boxes[:, :4]
         H_original, W_original = image.shape[:2]
 
-        mode = np.random.randint(0, len(self.jaccard_min_max), 1)[0]
+        mode = self.rng.integers(0, len(self.jaccard_min_max), 1)[0]
         if self.jaccard_min_max[mode] is not None:
             min_iou, max_iou = self.jaccard_min_max[mode]
-            for trial_arg in range(self.max_trials):
-                W = np.random.uniform(0.3 * W_original, W_original)
-                H = np.random.uniform(0.3 * H_original, H_original)
-                aspect_ratio = H / W
-                if (aspect_ratio < 0.5) or (aspect_ratio > 2):
-                    continue
-                x_min = np.random.uniform(W_original - W)
-                y_min = np.random.uniform(H_original - H)
-                x_max = int(x_min + W)
-                y_max = int(y_min + H)
-                x_min = int(x_min)
-                y_min = int(y_min)
-
-                image_crop_box = np.array([x_min, y_min, x_max, y_max])
-                overlap = compute_iou(image_crop_box, boxes)
-                if ((overlap.max() < min_iou) or (overlap.min() > max_iou)):
-                    continue
-
-                centers = (boxes[:, :2] + boxes[:, 2:]) / 2.0
-                centers_above_x_min = x_min < centers[:, 0]
-                centers_above_y_min = y_min < centers[:, 1]
-                centers_below_x_max = x_max > centers[:, 0]
-                centers_below_y_max = y_max > centers[:, 1]
-                mask = (centers_above_x_min * centers_above_y_min *
-                        centers_below_x_max * centers_below_y_max)
-                if not mask.any():
-                    continue
-
+            crop = self._sample_crop(
+                H_original, W_original, boxes, min_iou, max_iou)
+            if crop is not None:
+                image_crop_box, mask = crop
+                x_min, y_min, x_max, y_max = image_crop_box
                 cropped_image = image[y_min:y_max, x_min:x_max, :].copy()
                 masked_boxes = boxes[mask, :].copy()
                 masked_labels = labels[mask].copy()
@@ -145,12 +177,12 @@ class Expand(Processor):
         self.probability = probability
 
     def call(self, image, boxes):
-        if self.probability < np.random.rand():
+        if self.probability < self.rng.random():
             return image, boxes
         height, width, num_channels = image.shape
-        ratio = np.random.uniform(1, self.max_ratio)
-        left = np.random.uniform(0, width * ratio - width)
-        top = np.random.uniform(0, height * ratio - height)
+        ratio = self.rng.uniform(1, self.max_ratio)
+        left = self.rng.uniform(0, width * ratio - width)
+        top = self.rng.uniform(0, height * ratio - height)
         expanded_image = np.zeros((int(height * ratio),
                                    int(width * ratio), num_channels),
                                   dtype=image.dtype)
@@ -168,6 +200,127 @@ class Expand(Processor):
         return expanded_image, expanded_boxes
 
 
+def _transform_batch(images, boxes, scales, offsets, image_args, fill):
+    # maps normalized coordinates ``x`` into ``x * scale + offset``
+    images, boxes = images.copy(), boxes.copy()
+    H, W = images.shape[1:3]
+    for image_arg in image_args:
+        (scale_x, scale_y), (offset_x, offset_y) = (
+            scales[image_arg], offsets[image_arg])
+        matrix = np.array([[scale_x, 0.0, offset_x * W],
+                           [0.0, scale_y, offset_y * H]])
+        image = images[image_arg]
+        fill_color = np.mean(image, axis=(0, 1)) if fill is None else fill
+        images[image_arg] = warp_affine(
+            image, matrix, np.asarray(fill_color).tolist(), (W, H))
+    scales, offsets = np.tile(scales, 2), np.tile(offsets, 2)
+    boxes[..., :4] = (boxes[..., :4] * scales[:, np.newaxis]
+                      + offsets[:, np.newaxis])
+    return images, boxes
+
+
+class RandomFlipBoxesLeftRightBatch(Processor):
+    """Flips a batch of images and their normalized, padded boxes
+    horizontally, drawing one flip per image.
+    """
+    def __init__(self):
+        super(RandomFlipBoxesLeftRightBatch, self).__init__()
+
+    def call(self, images, boxes):
+        flip_args = np.flatnonzero(self.rng.integers(0, 2, len(images)))
+        images, boxes = images.copy(), boxes.copy()
+        images[flip_args] = images[flip_args, :, ::-1]
+        boxes[flip_args] = flip_left_right(boxes[flip_args], 1.0)
+        return images, boxes
+
+
+class ExpandBatch(Processor):
+    """Expands a batch of images up to ``max_ratio`` drawing one ratio
+    and placement per image. Expanded images are resized back to the
+    batch size and their normalized, padded boxes are adjusted.
+
+    # Arguments
+        max_ratio: Float.
+        mean: None/List: If `None` expanded images are filled with
+            the image mean.
+        probability: Float between ''[0, 1]''.
+    """
+    def __init__(self, max_ratio=2, mean=None, probability=0.5):
+        super(ExpandBatch, self).__init__()
+        self.max_ratio = max_ratio
+        self.mean = mean
+        self.probability = probability
+
+    def call(self, images, boxes):
+        num_images = len(images)
+        is_expanded = self.rng.random(num_images) <= self.probability
+        ratios = self.rng.uniform(1, self.max_ratio, num_images)
+        ratios = np.where(is_expanded, ratios, 1.0)
+        # placements are kept in whole pixels as in ``Expand``
+        H, W = images.shape[1:3]
+        lefts = self.rng.uniform(0, 1, num_images) * (W * ratios - W)
+        tops = self.rng.uniform(0, 1, num_images) * (H * ratios - H)
+        lefts, tops = lefts.astype(int) / W, tops.astype(int) / H
+        scales = np.repeat(1.0 / ratios[:, np.newaxis], 2, axis=1)
+        offsets = np.stack([lefts, tops], axis=1) * scales
+        image_args = np.flatnonzero(is_expanded)
+        return _transform_batch(
+            images, boxes, scales, offsets, image_args, self.mean)
+
+
+class RandomSampleCropBatch(RandomSampleCrop):
+    """Crops a batch of images and resizes the crops back to the batch
+    size. Crops are sampled for every image as in ``RandomSampleCrop``
+    and boxes whose centers fall outside of their crop become padding.
+
+    # Arguments
+        probability: Float between ''[0, 1]''.
+        max_trials: Int. Maximum number of sampled crops per image.
+        value: Float. Class argument of padding boxes.
+    """
+    def __init__(self, probability=0.50, max_trials=50, value=-1):
+        super(RandomSampleCropBatch, self).__init__(probability, max_trials)
+        self.value = value
+
+    def call(self, images, boxes):
+        num_images, H, W = images.shape[:3]
+        crop_boxes = np.tile(np.array([0.0, 0.0, 1.0, 1.0]), (num_images, 1))
+        masks = boxes[:, :, -1] != self.value
+        is_cropped = np.zeros(num_images, dtype=bool)
+        for image_arg in range(num_images):
+            if self.probability < self.rng.random():
+                continue
+            mode = self.rng.integers(0, len(self.jaccard_min_max), 1)[0]
+            if self.jaccard_min_max[mode] is None:
+                continue
+            box_args = np.flatnonzero(masks[image_arg])
+            if len(box_args) == 0:
+                continue
+            image_boxes = boxes[image_arg, box_args, :4] * [W, H, W, H]
+            crop = self._sample_crop(
+                H, W, image_boxes, *self.jaccard_min_max[mode])
+            if crop is None:
+                continue
+            crop_box, mask = crop
+            crop_boxes[image_arg] = crop_box / np.array([W, H, W, H])
+            masks[image_arg, box_args[np.logical_not(mask)]] = False
+            is_cropped[image_arg] = True
+
+        boxes = boxes.copy()
+        clipped_boxes = np.concatenate([
+            np.maximum(boxes[:, :, :2], crop_boxes[:, np.newaxis, :2]),
+            np.minimum(boxes[:, :, 2:4], crop_boxes[:, np.newaxis, 2:])], -1)
+        boxes[:, :, :4] = np.where(
+            is_cropped[:, np.newaxis, np.newaxis], clipped_boxes,
+            boxes[:, :, :4])
+        boxes[:, :, -1] = np.where(masks, boxes[:, :, -1], self.value)
+        scales = 1.0 / (crop_boxes[:, 2:] - crop_boxes[:, :2])
+        offsets = -crop_boxes[:, :2] * scales
+        image_args = np.flatnonzero(is_cropped)
+        return _transform_batch(images, boxes, scales, offsets, image_args,
+                                [0, 0, 0])
+
+
 class ApplyTranslation(Processor):
     """Applies a translation of image and labels.
 
@@ -239,8 +392,8 @@ class RandomTranslation(Processor):
     def call(self, image):
         height, width = image.shape[:2]
         x_delta_scale, y_delta_scale = self.delta_scale
-        x = image.shape[1] * np.random.uniform(-x_delta_scale, x_delta_scale)
-        y = image.shape[0] * np.random.uniform(-y_delta_scale, y_delta_scale)
+        x = image.shape[1] * self.rng.uniform(-x_delta_scale, x_delta_scale)
+        y = image.shape[0] * self.rng.uniform(-y_delta_scale, y_delta_scale)
         self.apply_translation.translation = [x, y]
         return self.apply_translation(image)
 
@@ -287,14 +440,15 @@ class RandomKeypointTranslation(Processor):
 
     def _sample_random_translation(self, delta_scale, image_shape):
         x_delta_scale, y_delta_scale = delta_scale
-        x = image_shape[1] * np.random.uniform(-x_delta_scale, x_delta_scale)
-        y = image_shape[0] * np.random.uniform(-y_delta_scale, y_delta_scale)
+        x = image_shape[1] * self.rng.uniform(-x_delta_scale, x_delta_scale)
+        y = image_shape[0] * self.rng.uniform(-y_delta_scale, y_delta_scale)
         return [x, y]
 
     def call(self, image, keypoints):
-        if self.probability >= np.random.rand():
+        if self.probability >= self.rng.random():
             shape = image.shape[:2]
-            translation = sample_scaled_translation(self.delta_scale, shape)
+            translation = self._sample_random_translation(
+                self.delta_scale, shape)
             if self.fill_color is None:
                 fill_color = np.mean(image, axis=(0, 1))
             image = translate_image(image, translation, fill_color)
@@ -355,10 +509,10 @@ class RandomKeypointRotation(Processor):
         return keypoints
 
     def _sample_rotation(self, rotation_range):
-        return np.random.uniform(-rotation_range, rotation_range)
+        return self.rng.uniform(-rotation_range, rotation_range)
 
     def call(self, image, keypoints):
-        if self.probability >= np.random.rand():
+        if self.probability >= self.rng.random():
             degrees = self._sample_rotation(self.rotation_range)
             image = self._rotate_image(image, degrees)
             center = self._calculate_image_center(image)
@@ -406,10 +560,10 @@ class RandomRotation(Processor):
         return warp_affine(image, matrix, fill_color)
 
     def _sample_rotation(self, rotation_range):
-        return np.random.uniform(-rotation_range, rotation_range)
+        return self.rng.uniform(-rotation_range, rotation_range)
 
     def call(self, image):
-        if self.probability >= np.random.rand():
+        if self.probability >= self.rng.random():
             degrees = self._sample_rotation(self.rotation_range)
             image = self._rotate_image(image, degrees)
         return image
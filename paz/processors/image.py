@@ -4,22 +4,21 @@ from ..abstract import Processor
 
 from ..backend.image import cast_image
 from ..backend.image import load_image
-from ..backend.image import random_saturation
-from ..backend.image import random_brightness
-from ..backend.image import random_contrast
-from ..backend.image import random_hue
+from ..backend.image import adjust_saturation
+from ..backend.image import adjust_brightness
+from ..backend.image import adjust_contrast
+from ..backend.image import adjust_hue
 from ..backend.image import resize_image
 from ..backend.image import scale_resize
-from ..backend.image import random_image_blur
-from ..backend.image import random_flip_left_right
 from ..backend.image import convert_color_space
 from ..backend.image import show_image
 from ..backend.image import blend_alpha_channel
+from ..backend.image import concatenate_alpha_mask
 from ..backend.image import random_shape_crop
 from ..backend.image import make_random_plain_image
-from ..backend.image import concatenate_alpha_mask
 from ..backend.image import draw_filled_polygon
 from ..backend.image import gaussian_image_blur
+from ..backend.image import median_image_blur
 from ..backend.image import normalized_device_coordinates_to_image
 from ..backend.image import image_to_normalized_device_coordinates
 from ..backend.image import replace_lower_than_threshold
@@ -124,7 +123,8 @@ class RandomSaturation(Processor):
         super(RandomSaturation, self).__init__()
 
     def call(self, image):
-        return random_saturation(image, self.lower, self.upper)
+        return adjust_saturation(image, self.rng.uniform(self.lower,
+                                                         self.upper))
 
 
 class RandomBrightness(Processor):
@@ -138,7 +138,8 @@ class RandomBrightness(Processor):
         super(RandomBrightness, self).__init__()
 
     def call(self, image):
-        return random_brightness(image, self.delta)
+        return adjust_brightness(image, self.rng.uniform(-self.delta,
+                                                         self.delta))
 
 
 class RandomContrast(Processor):
@@ -156,7 +157,8 @@ class RandomContrast(Processor):
         super(RandomContrast, self).__init__()
 
     def call(self, image):
-        return random_contrast(image, self.lower, self.upper)
+        return adjust_contrast(image, self.rng.uniform(self.lower,
+                                                       self.upper))
 
 
 class RandomHue(Processor):
@@ -171,7 +173,78 @@ class RandomHue(Processor):
         super(RandomHue, self).__init__()
 
     def call(self, image):
-        return random_hue(image, self.delta)
+        return adjust_hue(image, self.rng.uniform(-self.delta, self.delta))
+
+
+class RandomSaturationBatch(Processor):
+    """Applies random saturation to a batch of RGB images drawing one
+    factor per image.
+
+    # Arguments
+        lower: Float, lower bound for saturation factor.
+        upper: Float, upper bound for saturation factor.
+    """
+    def __init__(self, lower=0.3, upper=1.5):
+        self.lower = lower
+        self.upper = upper
+        super(RandomSaturationBatch, self).__init__()
+
+    def call(self, images):
+        factors = self.rng.uniform(self.lower, self.upper, len(images))
+        return adjust_saturation(images, factors)
+
+
+class RandomBrightnessBatch(Processor):
+    """Adjusts random brightness to a batch of RGB images drawing one
+    offset per image.
+
+    # Arguments
+        max_delta: Float.
+    """
+    def __init__(self, delta=32):
+        self.delta = delta
+        super(RandomBrightnessBatch, self).__init__()
+
+    def call(self, images):
+        deltas = self.rng.uniform(-self.delta, self.delta, len(images))
+        return adjust_brightness(images, deltas)
+
+
+class RandomContrastBatch(Processor):
+    """Applies random contrast to a batch of RGB images drawing one
+    factor per image.
+
+    # Arguments
+        lower: Float, indicating the lower bound of the random number
+            to be multiplied with the BGR/RGB images.
+        upper: Float, indicating the upper bound of the random number
+        to be multiplied with the BGR/RGB images.
+    """
+    def __init__(self, lower=0.5, upper=1.5):
+        self.lower = lower
+        self.upper = upper
+        super(RandomContrastBatch, self).__init__()
+
+    def call(self, images):
+        alphas = self.rng.uniform(self.lower, self.upper, len(images))
+        return adjust_contrast(images, alphas)
+
+
+class RandomHueBatch(Processor):
+    """Applies random hue to a batch of RGB images drawing one shift per
+    image.
+
+    # Arguments
+        delta: Int, indicating the range (-delta, delta ) of possible
+            hue values.
+    """
+    def __init__(self, delta=18):
+        self.delta = delta
+        super(RandomHueBatch, self).__init__()
+
+    def call(self, images):
+        deltas = self.rng.uniform(-self.delta, self.delta, len(images))
+        return adjust_hue(images, deltas)
 
 
 class ResizeImage(Processor):
@@ -215,8 +288,9 @@ class RandomImageBlur(Processor):
         self.probability = probability
 
     def call(self, image):
-        if self.probability >= np.random.rand():
-            image = random_image_blur(image)
+        if self.probability >= self.rng.random():
+            blur = self.rng.choice([gaussian_image_blur, median_image_blur])
+            image = blur(image)
         return image
 
 
@@ -233,7 +307,7 @@ class RandomGaussianBlur(Processor):
         self.probability = probability
 
     def call(self, image):
-        if self.probability >= np.random.rand():
+        if self.probability >= self.rng.random():
             image = gaussian_image_blur(image, self.kernel_size)
         return image
 
@@ -245,7 +319,9 @@ class RandomFlipImageLeftRight(Processor):
         super(RandomFlipImageLeftRight, self).__init__()
 
     def call(self, image):
-        return random_flip_left_right(image)
+        if self.rng.integers(0, 2):
+            image = flip_left_right(image)
+        return image
 
 
 class ConvertColorSpace(Processor):
@@ -289,8 +365,19 @@ class ImageDataProcessor(Processor):
         super(ImageDataProcessor, self).__init__()
         self.generator = generator
 
+    def _get_random_transform(self, shape):
+        if not isinstance(self.rng, np.random.Generator):
+            return self.generator.get_random_transform(shape)
+        # Keras samples from the global state, seeded here from ``self.rng``
+        global_state = np.random.get_state()
+        try:
+            seed = int(self.rng.integers(0, 2**32))
+            return self.generator.get_random_transform(shape, seed)
+        finally:
+            np.random.set_state(global_state)
+
     def call(self, image):
-        random_parameters = self.generator.get_random_transform(image.shape)
+        random_parameters = self._get_random_transform(image.shape)
         image = self.generator.apply_transform(image, random_parameters)
         image = self.generator.standardize(image)
         return image
@@ -318,7 +405,7 @@ class RandomShapeCrop(Processor):
         self.shape = shape
 
     def call(self, image):
-        return random_shape_crop(image, self.shape)
+        return random_shape_crop(image, self.shape, self.rng)
 
 
 class MakeRandomPlainImage(Processor):
@@ -333,7 +420,7 @@ class MakeRandomPlainImage(Processor):
         self.shape = shape
 
     def call(self):
-        return make_random_plain_image(self.shape)
+        return make_random_plain_image(self.shape, self.rng)
 
 
 class ConcatenateAlphaMask(Processor):
@@ -362,15 +449,16 @@ class BlendRandomCroppedBackground(Processor):
         self.background_paths = background_paths
 
     def call(self, image):
-        random_arg = np.random.randint(0, len(self.background_paths))
+        random_arg = self.rng.integers(0, len(self.background_paths))
         background_path = self.background_paths[random_arg]
         background = load_image(background_path)
-        background = random_shape_crop(background, image.shape[:2])
+        background = random_shape_crop(background, image.shape[:2], self.rng)
         if background is None:
             H, W, num_channels = image.shape
             # background contains always a channel less
             num_channels = num_channels - 1
-            background = make_random_plain_image((H, W, num_channels))
+            background = make_random_plain_image(
+                (H, W, num_channels), self.rng)
         return blend_alpha_channel(image, background)
 
 
@@ -391,14 +479,14 @@ class AddOcclusion(Processor):
         self.probability = probability
 
     def _random_vertices(self, center, max_radius, min_vertices, max_vertices):
-        num_vertices = np.random.randint(min_vertices, max_vertices)
+        num_vertices = self.rng.integers(min_vertices, max_vertices)
         angle_delta = 2 * np.pi / num_vertices
-        initial_angle = np.random.uniform(0, 2 * np.pi)
+        initial_angle = self.rng.uniform(0, 2 * np.pi)
         angles = initial_angle + np.arange(0, num_vertices) * angle_delta
         x_component = np.cos(angles).reshape(-1, 1)
         y_component = np.sin(angles).reshape(-1, 1)
         vertices = np.concatenate([x_component, y_component], -1)
-        random_lengths = np.random.uniform(0, max_radius, num_vertices)
+        random_lengths = self.rng.uniform(0, max_radius, num_vertices)
         random_lengths = random_lengths.reshape(num_vertices, 1)
         vertices = vertices * random_lengths
         vertices = vertices + center
@@ -407,13 +495,13 @@ class AddOcclusion(Processor):
     def add_occlusion(self, image, max_radius_scale):
         height, width = image.shape[:2]
         max_radius = np.max((height, width)) * max_radius_scale
-        center = np.random.rand(2) * np.array([width, height])
+        center = self.rng.random(2) * np.array([width, height])
         vertices = self._random_vertices(center, max_radius, 3, 7)
-        color = np.random.randint(0, 256, 3).tolist()
+        color = self.rng.integers(0, 256, 3).tolist()
         return draw_filled_polygon(image, vertices, color)
 
     def call(self, image):
-        if self.probability >= np.random.rand():
+        if self.probability >= self.rng.random():
             image = self.add_occlusion(image, self.max_radius_scale)
         return image
 
@@ -431,13 +519,13 @@ class RandomImageCrop(Processor):
         super(RandomImageCrop, self).__init__()
 
     def call(self, image):
-        if self.probability < np.random.rand():
+        if self.probability < self.rng.random():
             return image
         H, W = image.shape[:2]
-        W_crop = np.random.uniform(self.crop_factor * W, W)
-        H_crop = np.random.uniform(self.crop_factor * H, H)
-        x_min = np.random.uniform(W - W_crop)
-        y_min = np.random.uniform(H - H_crop)
+        W_crop = self.rng.uniform(self.crop_factor * W, W)
+        H_crop = self.rng.uniform(self.crop_factor * H, H)
+        x_min = self.rng.uniform(W - W_crop)
+        y_min = self.rng.uniform(H - H_crop)
         x_max = x_min + W_crop
         y_max = y_min + H_crop
         cropped_image = image[int(x_min):int(x_max), int(y_min):int(y_max), :]
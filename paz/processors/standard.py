@@ -1,3 +1,5 @@
+from operator import itemgetter
+
 import numpy as np
 
 from ..abstract import Processor
@@ -5,6 +7,16 @@ from ..backend.boxes import to_one_hot
 from ..backend.standard import append_values, predict
 
 
+def _build_getter(indices):
+    """Returns a function selecting the ``indices`` of a tuple as a tuple."""
+    if len(indices) == 0:
+        return lambda values: ()
+    if len(indices) == 1:
+        index = indices[0]
+        return lambda values: (values[index],)
+    return itemgetter(*indices)
+
+
 class ControlMap(Processor):
     """Controls which inputs are passed ''processor'' and the order of its
         outputs.
@@ -29,12 +41,14 @@ class ControlMap(Processor):
         self.outro_indices = outro_indices
         name = '-'.join([self.__class__.__name__, self.processor.name])
         self.keep = keep
+        self._routes = {}
         super(ControlMap, self).__init__(name)
 
     def _select(self, inputs, indices):
         return [inputs[index] for index in indices]
 
     def _remove(self, inputs, indices):
+        indices = set(indices)
         return [inputs[i] for i in range(len(inputs)) if i not in indices]
 
     def _split(self, inputs, indices):
@@ -44,21 +58,46 @@ class ControlMap(Processor):
         [args.insert(index, arg) for index, arg in zip(indices, extra_args)]
         return args
 
-    def call(self, *args):
-        selected_args, remaining_args = self._split(args, self.intro_indices)
-        processed_args = self.processor(*selected_args)
-        if not isinstance(processed_args, tuple):
-            processed_args = [processed_args]
-        return_args = self._insert(
-            remaining_args, processed_args, self.outro_indices)
-
+    def _build_route(self, num_args, num_outputs):
+        # positions of the returned values in ``args + outputs`` found by
+        # moving the positions themselves as ``args`` and ``outputs``.
+        args = list(range(num_args))
+        outputs = list(range(num_args, num_args + num_outputs))
+        route = self._insert(self._remove(args, self.intro_indices),
+                             outputs, self.outro_indices)
         if self.keep is not None:
-            keep_intro = list(self.keep.keys())
-            keep_outro = list(self.keep.values())
-            keep_args = self._select(args, keep_intro)
-            return_args = self._insert(return_args, keep_args, keep_outro)
+            keep_args = self._select(args, list(self.keep.keys()))
+            route = self._insert(route, keep_args, list(self.keep.values()))
+        return _build_getter(route)
+
+    def _route(self, args, outputs):
+        """Places ``args`` and the ``outputs`` of ``processor`` in their
+        returned order. Routes are built once per number of arguments.
+        """
+        if not isinstance(outputs, tuple):
+            outputs = (outputs,)
+        key = (len(args), len(outputs))
+        route = self._routes.get(key)
+        if route is None:
+            route = self._routes[key] = self._build_route(*key)
+        return route(args + outputs)
+
+    def _compile(self, compile_processor):
+        if type(self).call is not ControlMap.call:
+            return [lambda args, stack: self(*args)]
+        select = _build_getter(self.intro_indices)
+
+        def enter(args, stack):
+            stack.append(args)
+            return select(args)
+
+        def leave(outputs, stack):
+            return self._route(stack.pop(), outputs)
+        return [enter] + compile_processor(self.processor) + [leave]
 
-        return tuple(return_args)
+    def call(self, *args):
+        selected_args = [args[index] for index in self.intro_indices]
+        return self._route(args, self.processor(*selected_args))
 
 
 class ExpandDomain(ControlMap):
@@ -368,7 +407,7 @@ class StochasticProcessor(Processor):
         raise NotImplementedError
 
     def __call__(self, X):
-        if self.probability >= np.random.rand():
+        if self.probability >= self.rng.random():
             return self.call(X)
         return X
 
@@ -403,7 +442,7 @@ class Stochastic(Processor):
         self._probability = probability
 
     def call(self, X):
-        if self.probability >= np.random.rand():
+        if self.probability >= self.rng.random():
             return self.function(X)
         return X
 
@@ -0,0 +1,260 @@
+import time
+import asyncio
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import tensorflow as tf
+
+from .pipelines.detection import DetectSingleShot
+from .pipelines.detection import DetectSingleShotEfficientDet
+from .backend.boxes import change_box_coordinates
+
+
+def _cancel(futures):
+    for future in futures:
+        if not future.done():
+            future.cancel()
+
+
+def _to_numpy(outputs):
+    if isinstance(outputs, tf.Tensor):
+        outputs = outputs.numpy()
+    return outputs
+
+
+class SequentialAdapter(object):
+    """Batch adapter of pipelines without a separable model call.
+    Every image of a batch is passed through the full pipeline.
+
+    # Arguments
+        pipeline: Function taking an image and returning its result.
+    """
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+
+    def preprocess(self, image):
+        return image, None
+
+    def predict(self, inputs):
+        return [self.pipeline(image) for image in inputs]
+
+    def postprocess(self, image, output, context):
+        return output
+
+
+class SingleShotAdapter(object):
+    """Batch adapter of ``DetectSingleShot`` pipelines e.g. ``SSD512COCO``.
+
+    # Arguments
+        pipeline: ``DetectSingleShot`` instance.
+    """
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+
+    def preprocess(self, image):
+        return self.pipeline.predict.preprocess(image)[0], None
+
+    def predict(self, inputs):
+        return _to_numpy(self.pipeline.model(np.stack(inputs)))
+
+    def postprocess(self, image, output, context):
+        pipeline = self.pipeline
+        boxes2D = pipeline.predict.postprocess(output[np.newaxis])
+        boxes2D = pipeline.denormalize(image, boxes2D)
+        if pipeline.draw:
+            image = pipeline.draw_boxes2D(image, boxes2D)
+        return pipeline.wrap(image, boxes2D)
+
+
+class EfficientDetAdapter(object):
+    """Batch adapter of ``DetectSingleShotEfficientDet`` pipelines e.g.
+    ``EFFICIENTDETD0COCO``.
+
+    # Arguments
+        pipeline: ``DetectSingleShotEfficientDet`` instance.
+    """
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+
+    def preprocess(self, image):
+        preprocessed_image, image_scales = self.pipeline.preprocess(image)
+        return preprocessed_image[0], image_scales
+
+    def predict(self, inputs):
+        return _to_numpy(self.pipeline.model(np.stack(inputs)))
+
+    def postprocess(self, image, output, image_scales):
+        pipeline = self.pipeline
+        outputs = change_box_coordinates(output[np.newaxis])
+        boxes2D = pipeline.postprocess(outputs, image_scales)
+        if pipeline.draw:
+            image = pipeline.draw_boxes2D(image, boxes2D)
+        return pipeline.wrap(image, boxes2D)
+
+
+def build_adapter(pipeline):
+    """Returns the batch adapter of ``pipeline``.
+
+    # Arguments
+        pipeline: Pipeline e.g. an instance of ``paz.applications``.
+
+    # Returns
+        Adapter with ``preprocess``, ``predict`` and ``postprocess``.
+    """
+    if isinstance(pipeline, DetectSingleShot):
+        return SingleShotAdapter(pipeline)
+    if isinstance(pipeline, DetectSingleShotEfficientDet):
+        return EfficientDetAdapter(pipeline)
+    return SequentialAdapter(pipeline)
+
+
+class MicroBatchingService(object):
+    """Asyncio serving core that groups concurrent requests into dynamic
+    micro-batches.
+
+    Requests are queued and a batch is closed once it holds
+    ``max_batch_size`` images or ``max_wait`` seconds passed since its
+    first request arrived. Every batch is pre-processed, predicted with a
+    single model call and post-processed on one worker thread, and each
+    request receives its own result.
+
+    # Arguments
+        pipeline: Pipeline e.g. an instance of ``paz.applications``.
+        max_batch_size: Int. Maximum number of images per model call.
+        max_wait: Float. Maximum seconds a batch waits for more requests.
+        adapter: Batch adapter or ``None`` to select it with
+            ``build_adapter``.
+
+    # Properties
+        metrics: Dictionary with queue depth and batch size statistics.
+
+    # Methods
+        start()
+        stop()
+        predict()
+    """
+    def __init__(self, pipeline, max_batch_size=8, max_wait=0.005,
+                 adapter=None):
+        if adapter is None:
+            adapter = build_adapter(pipeline)
+        self.adapter = adapter
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue = None
+        self._task = None
+        self._executor = None
+        self._batch_sizes = Counter()
+        self._num_requests = 0
+        self._busy_time = 0.0
+
+    @property
+    def metrics(self):
+        num_batches = sum(self._batch_sizes.values())
+        return {'queue_depth': 0 if self._queue is None else
+                self._queue.qsize(),
+                'num_requests': self._num_requests,
+                'num_batches': num_batches,
+                'mean_batch_size': (self._num_requests / num_batches
+                                    if num_batches > 0 else 0.0),
+                'batch_sizes': dict(sorted(self._batch_sizes.items())),
+                'busy_time': self._busy_time}
+
+    async def start(self):
+        """Starts the batching loop in the running event loop."""
+        self._queue = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(1)
+        self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        """Cancels the batching loop, cancels all requests without a result
+        and shuts down the worker thread.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._queue is not None:
+            while not self._queue.empty():
+                image, future = self._queue.get_nowait()
+                future.cancel()
+            self._queue = None
+        if self._executor is not None:
+            # waiting for an in-flight batch must not block the event loop
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._executor.shutdown)
+            self._executor = None
+
+    async def predict(self, image):
+        """Queues ``image`` and waits for its result.
+
+        # Arguments
+            image: Numpy array.
+
+        # Returns
+            Output of the pipeline for ``image``.
+        """
+        if self._queue is None:
+            raise RuntimeError('Service is not running, call ``start`` first')
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((image, future))
+        return await future
+
+    async def _collect(self):
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        try:
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(
+                        self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+        except asyncio.CancelledError:
+            _cancel([future for image, future in batch])
+            raise
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            images = [image for image, future in batch]
+            futures = [future for image, future in batch]
+            try:
+                results = await loop.run_in_executor(
+                    self._executor, self._process, images)
+            except asyncio.CancelledError:
+                _cancel(futures)
+                raise
+            except Exception as error:
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+            for future, result in zip(futures, results):
+                if not future.done():
+                    future.set_result(result)
+
+    def _process(self, images):
+        start = time.time()
+        inputs, contexts = [], []
+        for image in images:
+            model_input, context = self.adapter.preprocess(image)
+            inputs.append(model_input)
+            contexts.append(context)
+        outputs = self.adapter.predict(inputs)
+        results = []
+        for image, output, context in zip(images, outputs, contexts):
+            results.append(self.adapter.postprocess(image, output, context))
+        self._batch_sizes[len(images)] += 1
+        self._num_requests = self._num_requests + len(images)
+        self._busy_time = self._busy_time + (time.time() - start)
+        return results
@@ -0,0 +1,36 @@
+from importlib import import_module
+
+
+def lazy_import(package, attributes):
+    """Builds module level ``__getattr__`` and ``__dir__`` functions that
+    import the module of an attribute only when it is first accessed.
+
+    # Arguments:
+        package: String. Name of the package e.g. ``__name__``.
+        attributes: Dictionary mapping attribute names to the relative
+            module names that define them e.g. ``{'SSD300': '.detection'}``.
+
+    # Returns
+        Tuple with the ``__getattr__`` and ``__dir__`` functions.
+    """
+    namespace = import_module(package).__dict__
+
+    def __getattr__(name):
+        if name in attributes:
+            module = import_module(attributes[name], package)
+            value = getattr(module, name)
+        else:
+            try:
+                value = import_module('.' + name, package)
+            except ModuleNotFoundError as error:
+                if error.name != package + '.' + name:
+                    raise
+                raise AttributeError('module %r has no attribute %r' % (
+                    package, name)) from None
+        namespace[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(namespace.keys()) | set(attributes.keys()))
+
+    return __getattr__, __dir__
@@ -197,3 +197,148 @@ def test_copy_with_controlmap_using_3_channels_plus():
     assert len(values) == 2
     assert np.allclose(values[0], A_random_values + B_random_values)
     assert np.allclose(values[1], A_random_values)
+
+
+def build_augmentation():
+    augment = SequentialProcessor()
+    augment.add(pr.ControlMap(pr.RandomContrast(), [0], [0]))
+    augment.add(pr.ControlMap(pr.Stochastic(pr.RandomBrightness()), [0], [0]))
+    augment.add(pr.RandomKeypointTranslation(probability=1.0))
+    return augment
+
+
+def test_generator_is_shared_with_nested_processors():
+    augment = build_augmentation()
+    rng = np.random.default_rng(7)
+    augment.rng = rng
+    augment.add(pr.RandomHue())
+    assert augment.processors[0].processor.rng is rng
+    assert augment.processors[1].processor.function.rng is rng
+    assert augment.processors[-1].rng is rng
+
+
+def test_processors_with_equal_generators_are_equal():
+    image = np.full((32, 32, 3), 128, dtype=np.uint8)
+    keypoints = np.array([[10.0, 12.0]])
+    outputs = []
+    for _ in range(2):
+        augment = build_augmentation()
+        augment.rng = np.random.default_rng(7)
+        outputs.append(augment(image, keypoints))
+    assert np.allclose(outputs[0][0], outputs[1][0])
+    assert np.allclose(outputs[0][1], outputs[1][1])
+
+
+def test_processors_without_generator_use_global_state():
+    from paz.backend.image import random_brightness
+    processor = pr.RandomBrightness()
+    image = np.full((8, 8, 3), 128, dtype=np.uint8)
+    np.random.seed(7)
+    expected_image = random_brightness(image)
+    np.random.seed(7)
+    assert np.allclose(processor(image), expected_image)
+
+
+def test_use_generator_sets_generator_of_current_thread():
+    from paz.abstract.processor import use_generator, get_generator
+    processor = pr.RandomBrightness()
+    rng = np.random.default_rng(7)
+    with use_generator(rng):
+        assert processor.rng is rng
+    assert processor.rng is get_generator()
+    assert processor.rng is not rng
+
+
+class SwapValues(Processor):
+    def __init__(self):
+        super(SwapValues, self).__init__()
+
+    def call(self, A, B):
+        return B, A
+
+
+def build_nested_pipeline(depth):
+    pipeline = SequentialProcessor()
+    if depth > 0:
+        nested_pipeline = build_nested_pipeline(depth - 1)
+        pipeline.add(pr.ControlMap(nested_pipeline, [0, 1, 2], [0, 1, 2]))
+    pipeline.add(pr.ControlMap(ProcessorC(), [0], [0], {1: 3}))
+    pipeline.add(pr.ControlMap(SwapValues(), [1, 3], [3, 1]))
+    pipeline.add(pr.ControlMap(TransformA(), [3], [1]))
+    pipeline.add(pr.ExpandDomain(ProcessorC()))
+    pipeline.add(pr.ControlMap(SumTwoValues(), [0, 2], [2]))
+    return pipeline
+
+
+@pytest.mark.parametrize('pipeline', [
+    TransformA(), TransformB(), PipelineWithThreeChannelsPlus(),
+    build_nested_pipeline(3)])
+def test_compiled_sequential_processor_equals_sequential_processor(pipeline):
+    values = np.random.random((4, 3, 2))
+    args = [values[arg] for arg in range(len(values))]
+    num_compared = 0
+    for num_args in range(1, 5):
+        try:
+            expected_values = pipeline(*args[:num_args])
+        except (TypeError, IndexError):
+            continue
+        compiled_values = pipeline.compile()(*args[:num_args])
+        assert isinstance(compiled_values, type(expected_values))
+        assert np.allclose(compiled_values, expected_values)
+        num_compared = num_compared + 1
+    assert num_compared > 0
+
+
+def test_compiled_sequential_processor_with_kwargs():
+    compiled_transform = TransformB().compile()
+    assert np.allclose([2.0, -4.0], compiled_transform(boxes=1.0, image=2.0))
+
+
+def test_control_map_returns_single_outputs_as_tuple():
+    control_map = pr.ControlMap(ProcessorC(), [1], [0])
+    assert control_map(1.0, 255.0) == (1.0, 1.0)
+    assert control_map(1.0, 255.0, 3.0) == (1.0, 1.0, 3.0)
+
+
+def test_backend_functions_draw_from_generator():
+    from paz.backend.image import random_shape_crop, make_random_plain_image
+    image = np.arange(32 * 32 * 3).reshape(32, 32, 3)
+    for processor, function, args in [
+            (pr.RandomShapeCrop((8, 8)), random_shape_crop, (image, (8, 8))),
+            (pr.MakeRandomPlainImage((4, 4, 3)), make_random_plain_image,
+             ((4, 4, 3),))]:
+        processor.rng = np.random.default_rng(7)
+        expected_output = function(*args, rng=np.random.default_rng(7))
+        assert np.allclose(processor(*args[:-1]), expected_output)
+        np.random.seed(7)
+        expected_output = function(*args)
+        processor.rng = None
+        np.random.seed(7)
+        assert np.allclose(processor(*args[:-1]), expected_output)
+
+
+def test_draw_random_polygon_draws_from_generator():
+    images = []
+    for _ in range(2):
+        processor = pr.DrawRandomPolygon(0.3)
+        processor.rng = np.random.default_rng(7)
+        state = np.random.get_state()
+        images.append(processor(np.zeros((32, 32, 3), dtype=np.uint8)))
+        assert np.array_equal(state[1], np.random.get_state()[1])
+    assert np.array_equal(images[0], images[1])
+    assert np.any(images[0] != 0)
+
+
+def test_image_data_processor_draws_from_generator():
+    from tensorflow.keras.preprocessing.image import ImageDataGenerator
+    generator = ImageDataGenerator(rotation_range=30, width_shift_range=0.2)
+    image = np.random.RandomState(7).uniform(0, 255, (16, 16, 3))
+    images = []
+    for _ in range(2):
+        processor = pr.ImageDataProcessor(generator)
+        processor.rng = np.random.default_rng(7)
+        state = np.random.get_state()
+        images.append(processor(image))
+        assert np.array_equal(state[1], np.random.get_state()[1])
+    assert np.allclose(images[0], images[1])
+    assert not np.allclose(images[0], image)
@@ -28,3 +28,60 @@ for _ in range(10):
     batch = sequence.__getitem__(0)
     value_A, value_B = batch[0]['value_A'][0], batch[1]['value_B'][0]
     print(value_B)
+
+
+def test_batch_processor_is_applied_to_batches():
+    def add_batch_size(inputs, labels):
+        batch_size = len(inputs['value_A'])
+        return ({'value_A': inputs['value_A'] + batch_size},
+                {'value_B': labels['value_B']})
+
+    sequence = ProcessingSequence(
+        processor, 1, data, batch_processor=add_batch_size)
+    inputs, labels = sequence.__getitem__(0)
+    assert inputs['value_A'].shape == (1, 1, 4)
+    assert np.allclose(np.sort(inputs['value_A'][0, 0]), [2, 3, 4, 5])
+
+
+def build_random_sequence(seed):
+    random_data = [{'value_A': np.zeros((1, 4)),
+                    'value_B': np.zeros((2, 3))} for _ in range(8)]
+    pipeline = SequentialProcessor()
+    pipeline.add(pr.UnpackDictionary(['value_A', 'value_B']))
+    pipeline.add(pr.ControlMap(pr.Stochastic(lambda x: x + 1), [0], [0]))
+    pipeline.add(pr.ControlMap(pr.Stochastic(lambda x: x - 1), [1], [1]))
+    pipeline.add(pr.SequenceWrapper(
+        {0: {'value_A': [1, 4]}}, {1: {'value_B': [2, 3]}}))
+    return ProcessingSequence(pipeline, 2, random_data, seed=seed)
+
+
+def test_seeded_batches_are_independent_of_order():
+    sequence_A, sequence_B = build_random_sequence(7), build_random_sequence(7)
+    batches_A = [sequence_A.__getitem__(arg) for arg in range(4)]
+    np.random.seed(1)
+    batches_B = [sequence_B.__getitem__(arg) for arg in [3, 1, 0, 2]]
+    batches_B = [batches_B[arg] for arg in [2, 1, 3, 0]]
+    for batch_A, batch_B in zip(batches_A, batches_B):
+        assert np.allclose(batch_A[0]['value_A'], batch_B[0]['value_A'])
+        assert np.allclose(batch_A[1]['value_B'], batch_B[1]['value_B'])
+
+
+def test_seeded_batches_are_independent_of_threads():
+    from multiprocessing.pool import ThreadPool
+    sequence = build_random_sequence(7)
+    batches = [sequence.__getitem__(arg) for arg in range(4)]
+    with ThreadPool(4) as pool:
+        threaded_batches = pool.map(sequence.__getitem__, range(4))
+    for (inputs_A, _), (inputs_B, _) in zip(batches, threaded_batches):
+        assert np.allclose(inputs_A['value_A'], inputs_B['value_A'])
+
+
+def test_seeded_batches_change_every_epoch():
+    sequence = build_random_sequence(7)
+    values = []
+    for epoch in range(4):
+        inputs, labels = sequence.__getitem__(0)
+        values.append(inputs['value_A'][:, 0, 0])
+        sequence.on_epoch_end()
+    assert sequence.epoch == 4
+    assert len(set(tuple(value) for value in values)) > 1
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from paz.backend.anchors import build_anchors
+from paz.backend.anchors import build_prior_boxes
+from paz.backend.anchors import build_pyramid_anchors
+from paz.models.detection.utils import create_prior_boxes
+
+
+class Branch(object):
+    def __init__(self, H, W):
+        self.shape = (None, H, W, 64)
+
+
+@pytest.fixture
+def branches():
+    return [Branch(64 // (2 ** arg), 64 // (2 ** arg)) for arg in range(3)]
+
+
+def test_build_anchors_is_memoized(branches):
+    anchors_A = build_anchors([512, 512], branches, 3, [1.0, 2.0, 0.5], 4.0)
+    anchors_B = build_anchors((512, 512), branches, 3, (1.0, 2.0, 0.5), 4.0)
+    assert anchors_A is anchors_B
+
+
+def test_build_anchors_is_read_only(branches):
+    anchors = build_anchors([512, 512], branches, 3, [1.0, 2.0, 0.5], 4.0)
+    with pytest.raises(ValueError):
+        anchors[0, 0] = 1.0
+
+
+def test_build_anchors_shape(branches):
+    anchors = build_anchors([512, 512], branches, 3, [1.0, 2.0, 0.5], 4.0)
+    num_boxes = 9 * (64 ** 2 + 32 ** 2 + 16 ** 2)
+    assert anchors.shape == (num_boxes, 4)
+    assert anchors.dtype == np.float32
+
+
+def test_build_anchors_depends_on_input_shape(branches):
+    anchors_A = build_anchors([512, 512], branches, 3, [1.0, 2.0, 0.5], 4.0)
+    anchors_B = build_anchors([640, 640], branches, 3, [1.0, 2.0, 0.5], 4.0)
+    assert anchors_A is not anchors_B
+
+
+def test_build_prior_boxes_centres():
+    prior_boxes = build_prior_boxes(300, [2], [150], [30], [60], [[2]])
+    assert prior_boxes.shape == (2 * 2 * 4, 4)
+    assert np.allclose(prior_boxes[0:4, :2], [0.25, 0.25])
+    assert np.allclose(prior_boxes[4:8, :2], [0.75, 0.25])
+    assert np.allclose(prior_boxes[0, 2:], [0.1, 0.1])
+
+
+def test_create_prior_boxes_is_shared():
+    prior_boxes = create_prior_boxes('VOC')
+    assert prior_boxes is create_prior_boxes('VOC')
+    assert not prior_boxes.flags.writeable
+    assert prior_boxes.shape == (8732, 4)
+
+
+def test_build_pyramid_anchors():
+    anchors = build_pyramid_anchors([8, 16], [0.5, 1, 2],
+                                    [[4, 4], [2, 2]], [4, 8], 1)
+    assert anchors.shape == (3 * (4 * 4 + 2 * 2), 4)
+    assert np.allclose(anchors[1], [-4.0, -4.0, 4.0, 4.0])
+    assert not anchors.flags.writeable
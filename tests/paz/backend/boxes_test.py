@@ -16,6 +16,13 @@ from paz.models.detection.utils import create_prior_boxes
 from paz.backend.boxes import extract_bounding_box_corners
 from paz.backend.boxes import nms_per_class
 from paz.backend.boxes import merge_nms_box_with_class
+from paz.backend.boxes import make_box_square
+from paz.backend.boxes import make_boxes_square
+from paz.backend.boxes import offset
+from paz.backend.boxes import offset_boxes
+from paz.backend.boxes import clip
+from paz.backend.boxes import clip_boxes
+from paz.backend.boxes import denormalize_boxes
 from paz.models import SSD300
 
 # from paz.datasets import VOC
@@ -278,6 +285,42 @@ def test_nms_per_class_and_merge_box(
     assert np.all(retained_scores == row_wise_score_sum), (
         'Other scores are not all zeros')
 
+
+@pytest.fixture
+def random_boxes():
+    RNG = np.random.default_rng(777)
+    x_min, y_min = RNG.uniform(0.0, 0.5, (2, 50))
+    x_max, y_max = RNG.uniform(0.55, 1.0, (2, 50))
+    scores = RNG.uniform(0.0, 1.0, (50, 3))
+    coordinates = np.stack([x_min, y_min, x_max, y_max], axis=1)
+    return np.concatenate([coordinates, scores], axis=1)
+
+
+@pytest.mark.parametrize('image_shape', [(100, 120), (300, 80)])
+def test_array_boxes_functions_equal_box_functions(random_boxes, image_shape):
+    boxes = denormalize_boxes(random_boxes, image_shape)
+    assert np.all(boxes[:, :4] == [denormalize_box(box, image_shape)
+                                   for box in random_boxes])
+    assert np.all(boxes[:, 4:] == random_boxes[:, 4:])
+    functions = [(make_boxes_square, make_box_square, []),
+                 (offset_boxes, offset, [[0.1, 0.3]]),
+                 (clip_boxes, clip, [image_shape])]
+    for array_function, box_function, arguments in functions:
+        target_boxes = [box_function(box[:4], *arguments) for box in boxes]
+        boxes = array_function(boxes, *arguments)
+        assert np.all(boxes[:, :4] == target_boxes)
+        assert np.all(boxes[:, 4:] == random_boxes[:, 4:])
+
+
+def test_array_boxes_functions_pass_by_value(random_boxes):
+    original_boxes = random_boxes.copy()
+    make_boxes_square(random_boxes)
+    offset_boxes(random_boxes, [0.1, 0.1])
+    clip_boxes(random_boxes, (0.5, 0.5))
+    denormalize_boxes(random_boxes, (100, 100))
+    assert np.all(random_boxes == original_boxes)
+
+
 # def test_data_loader_check():
 #     voc_root = './examples/object_detection/data/VOCdevkit/'
 #     data_names = [['VOC2007', 'VOC2012'], 'VOC2007']
@@ -6,6 +6,10 @@ from paz.backend.image import image_to_normalized_device_coordinates
 from paz.backend.image import normalized_device_coordinates_to_image
 from paz.backend.image import normalize_min_max
 from paz.backend.image import get_scaling_factor
+from paz.backend.image import adjust_saturation
+from paz.backend.image import adjust_brightness
+from paz.backend.image import adjust_contrast
+from paz.backend.image import adjust_hue
 
 
 def test_replace_lower_than_threshold():
@@ -41,3 +45,17 @@ def test_get_scaling_factor(output_scaling_factor, scale=2, shape=(128, 128)):
     image = np.ones((512, 768, 3))
     scaling_factor = get_scaling_factor(image, scale, shape)
     assert np.allclose(output_scaling_factor, scaling_factor)
+
+
+@pytest.mark.parametrize('adjust, values', [
+    (adjust_saturation, [0.3, 1.0, 1.5]),
+    (adjust_brightness, [-32.0, 0.0, 32.0]),
+    (adjust_contrast, [0.5, 1.0, 1.5]),
+    (adjust_hue, [-18.0, 0.0, 18.0])])
+def test_adjust_batch_matches_single_images(adjust, values):
+    images = np.random.randint(0, 256, (3, 16, 24, 3)).astype('uint8')
+    adjusted_images = adjust(images.copy(), np.array(values))
+    assert adjusted_images.shape == images.shape
+    assert adjusted_images.dtype == np.uint8
+    for image, value, adjusted_image in zip(images, values, adjusted_images):
+        assert np.all(adjust(image.copy(), value) == adjusted_image)
@@ -14,6 +14,23 @@ from paz.backend.render import sample_uniformly
 from paz.backend.render import split_alpha_channel
 from paz.backend.render import roll_camera
 from paz.backend.render import translate_camera
+from paz.backend.render import render_shards
+from paz.backend.render import load_shard
+from paz.backend.render import ShardRenderer
+
+
+class NumpyRenderer(object):
+    def __init__(self, size=8, as_dictionary=False):
+        self.size = size
+        self.as_dictionary = as_dictionary
+
+    def render(self):
+        image = np.random.randint(0, 256, (self.size, self.size, 3), 'uint8')
+        alpha = np.random.randint(0, 2, (self.size, self.size, 1), 'uint8')
+        matrices = np.random.rand(4, 4)
+        if self.as_dictionary:
+            return {'image': image, 'alpha': alpha, 'matrices': matrices}
+        return image, alpha, matrices
 
 
 @pytest.fixture
@@ -191,3 +208,53 @@ def test_translate_camera_random_axis(transform_B):
         translation = np.random.uniform(-10, 10, 2)
         transform = translate_camera(transform_B.copy(), translation)
         assert np.allclose(transform[:3, :3], transform_B[:3, :3])
+
+
+@pytest.mark.parametrize('num_workers', [1, 2])
+def test_render_shards_sizes(tmp_path, num_workers):
+    filepaths = render_shards(NumpyRenderer, 25, str(tmp_path), 10,
+                              num_workers)
+    sizes = [len(load_shard(filepath)['output_0']) for filepath in filepaths]
+    assert sizes == [10, 10, 5]
+
+
+def test_render_shards_dtypes(tmp_path):
+    filepath = render_shards(NumpyRenderer, 4, str(tmp_path), 4)[0]
+    shard = load_shard(filepath)
+    assert shard['output_0'].shape == (4, 8, 8, 3)
+    assert shard['output_0'].dtype == np.uint8
+    assert shard['output_2'].shape == (4, 4, 4)
+
+
+def test_render_shards_seeds(tmp_path):
+    filepaths = render_shards(NumpyRenderer, 20, str(tmp_path), 10)
+    shard_A, shard_B = load_shard(filepaths[0]), load_shard(filepaths[1])
+    assert not np.allclose(shard_A['output_2'], shard_B['output_2'])
+
+
+def test_shard_renderer_replays_all_samples(tmp_path):
+    render_shards(NumpyRenderer, 25, str(tmp_path), 10)
+    renderer = ShardRenderer(str(tmp_path))
+    matrices = [renderer.render()[2] for _ in range(25)]
+    matrices = np.unique(np.array(matrices).reshape(25, -1), axis=0)
+    assert len(matrices) == 25
+
+
+def test_shard_renderer_returns_writable_lists(tmp_path):
+    render_shards(NumpyRenderer, 3, str(tmp_path), 3)
+    image, alpha, matrices = ShardRenderer(str(tmp_path)).render()
+    image[0, 0] = 0
+    assert image.shape == (8, 8, 3)
+
+
+def test_shard_renderer_returns_dictionaries(tmp_path):
+    def build_renderer():
+        return NumpyRenderer(as_dictionary=True)
+    render_shards(build_renderer, 3, str(tmp_path), 3)
+    sample = ShardRenderer(str(tmp_path)).render()
+    assert set(sample.keys()) == {'image', 'alpha', 'matrices'}
+
+
+def test_shard_renderer_without_shards(tmp_path):
+    with pytest.raises(ValueError):
+        ShardRenderer(str(tmp_path))
@@ -0,0 +1,194 @@
+import os
+import sys
+import subprocess
+import textwrap
+
+import pytest
+import numpy as np
+
+from paz.abstract import Box2D, Pose6D
+from paz.frame_bus import FrameBus
+from paz.frame_bus import BusPipeline
+from paz.frame_bus import shared_memory
+from paz.frame_bus import _shares_tracker
+
+requires_shared_memory = pytest.mark.skipif(
+    shared_memory is None, reason='requires multiprocessing.shared_memory')
+
+
+def build_detector():
+    def detect(image):
+        value = float(image[0, 0, 0])
+        box2D = Box2D([value, 0.0, value + 2.0, 2.0], 0.5, 'cat')
+        return {'boxes2D': [box2D]}
+    return detect
+
+
+def build_failing_detector():
+    detect = build_detector()
+
+    def detect_even_frames(image):
+        if int(image[0, 0, 0]) % 2 == 1:
+            raise ValueError('odd frame')
+        return detect(image)
+    return detect_even_frames
+
+
+def build_estimator():
+    def estimate(image, boxes2D):
+        poses6D = [Pose6D([1.0, 0.0, 0.0, 0.0], [box2D.coordinates[0], 0, 1],
+                          box2D.class_name) for box2D in boxes2D]
+        return {'image': 255 - image, 'poses6D': poses6D}
+    return estimate
+
+
+@pytest.fixture
+def bus():
+    bus = FrameBus([4, 6, 3], num_slots=2, max_boxes=4,
+                   class_names=['cat', 'dog'])
+    yield bus
+    bus.close()
+    bus.unlink()
+
+
+@requires_shared_memory
+def test_image_is_written_in_place(bus):
+    slot = bus.acquire()
+    bus.write(slot, image=np.full((4, 6, 3), 7, dtype='uint8'))
+    image = bus.read(slot, 'image')
+    assert np.all(image == 7)
+    assert np.shares_memory(image, bus.frames)
+
+
+@requires_shared_memory
+def test_boxes2D_round_trip(bus):
+    slot = bus.acquire()
+    boxes2D = [Box2D([1, 2, 3, 4], 0.75, 'dog'),
+               Box2D([0, 0, 5, 5], 0.25, 'bird')]
+    bus.write(slot, boxes2D=boxes2D)
+    boxes2D = bus.read(slot, 'boxes2D')
+    assert len(boxes2D) == 2
+    assert boxes2D[0].coordinates == [1, 2, 3, 4]
+    assert boxes2D[0].class_name == 'dog'
+    assert boxes2D[1].class_name is None
+    assert bus.read(slot, 'poses6D') == []
+
+
+@requires_shared_memory
+def test_invalid_frame_shape(bus):
+    slot = bus.acquire()
+    with pytest.raises(ValueError):
+        bus.write(slot, image=np.zeros((5, 6, 3), dtype='uint8'))
+
+
+@requires_shared_memory
+def test_invalid_frame_dtype(bus):
+    slot = bus.acquire()
+    with pytest.raises(ValueError):
+        bus.write(slot, image=np.ones((4, 6, 3), dtype='float32'))
+
+
+@requires_shared_memory
+def test_acquire_is_bounded_by_num_slots(bus):
+    bus.acquire(), bus.acquire()
+    with pytest.raises(Exception):
+        bus.acquire(timeout=0.1)
+
+
+@requires_shared_memory
+def test_bus_pipeline(bus):
+    pipeline = BusPipeline(bus, [(build_detector, ['image']),
+                                 (build_estimator, ['image', 'boxes2D'])])
+    pipeline.start()
+    outputs = []
+    for frame_arg in range(5):
+        pipeline.submit(np.full((4, 6, 3), frame_arg, dtype='uint8'))
+        outputs.append(pipeline.receive())
+    pipeline.stop()
+    for frame_arg, output in enumerate(outputs):
+        assert np.all(output['image'] == 255 - frame_arg)
+        assert output['boxes2D'][0].coordinates[0] == frame_arg
+        assert output['poses6D'][0].translation[0] == frame_arg
+        assert output['poses6D'][0].class_name == 'cat'
+
+
+@requires_shared_memory
+def test_stage_failures_are_raised_by_receive(bus):
+    pipeline = BusPipeline(bus, [(build_failing_detector, ['image']),
+                                 (build_estimator, ['image', 'boxes2D'])])
+    pipeline.start()
+    for frame_arg in range(5):
+        pipeline.submit(np.full((4, 6, 3), frame_arg, dtype='uint8'),
+                        timeout=5)
+        if frame_arg % 2 == 1:
+            with pytest.raises(RuntimeError, match='odd frame'):
+                pipeline.receive(timeout=5)
+        else:
+            output = pipeline.receive(timeout=5)
+            assert output['poses6D'][0].translation[0] == frame_arg
+    pipeline.stop()
+    assert all(stage.process.exitcode == 0 for stage in pipeline.stages)
+
+
+@requires_shared_memory
+def test_spawned_worker_does_not_unregister_block():
+    script = textwrap.dedent("""
+        import multiprocessing
+        from paz.frame_bus import FrameBus
+
+        if __name__ == '__main__':
+            bus = FrameBus([4, 6, 3], num_slots=2, context='spawn')
+            worker = multiprocessing.get_context('spawn').Process(
+                target=bus.close)
+            worker.start()
+            worker.join()
+            assert worker.exitcode == 0
+            bus.close()
+            bus.unlink()
+        """)
+    process = subprocess.run([sys.executable, '-c', script],
+                             capture_output=True, text=True, timeout=120)
+    assert process.returncode == 0, process.stderr
+    assert 'KeyError' not in process.stderr
+    assert 'leaked' not in process.stderr
+
+
+def test_frame_bus_without_shared_memory():
+    script = textwrap.dedent("""
+        import sys
+        sys.modules['multiprocessing.shared_memory'] = None
+        sys.modules['multiprocessing.resource_tracker'] = None
+        from paz.frame_bus import FrameBus
+
+        try:
+            FrameBus([4, 6, 3])
+        except ImportError as error:
+            assert 'Python 3.8' in str(error)
+        else:
+            raise AssertionError('FrameBus did not raise ImportError')
+        """)
+    process = subprocess.run([sys.executable, '-c', script],
+                             capture_output=True, text=True, timeout=120)
+    assert process.returncode == 0, process.stderr
+
+
+@requires_shared_memory
+def test_shares_tracker():
+    assert _shares_tracker([os.getpid()])
+    assert not _shares_tracker([])
+
+
+@requires_shared_memory
+def test_unrelated_process_does_not_unlink_block(bus):
+    script = textwrap.dedent("""
+        import sys
+        from paz.frame_bus import _attach
+        block = _attach(sys.argv[1], shares_tracker=False)
+        block.close()
+        """)
+    process = subprocess.run([sys.executable, '-c', script, bus.name],
+                             capture_output=True, text=True, timeout=120)
+    assert process.returncode == 0, process.stderr
+    assert 'leaked' not in process.stderr
+    attached = shared_memory.SharedMemory(bus.name)
+    attached.close()
@@ -0,0 +1,127 @@
+import os
+import json
+import threading
+import pytest
+import numpy as np
+
+from paz.abstract import Box2D
+from paz.backend.image import write_image
+from paz.inference import FrameReader
+from paz.inference import serialize
+from paz.inference import build_output_names
+from paz.inference import process_source
+from paz.inference import process_sources
+from paz.inference import summarize
+
+
+def build_box_pipeline():
+    def pipeline(image):
+        box2D = Box2D(np.array([0, 0, 4, 4]), np.float32(0.5), 'box')
+        return {'image': image, 'boxes2D': [box2D]}
+    return pipeline
+
+
+@pytest.fixture
+def image_directory(tmp_path):
+    directory = os.path.join(str(tmp_path), 'frames')
+    for frame_arg in range(5):
+        image = np.full((16, 24, 3), 10 * frame_arg, dtype='uint8')
+        write_image(os.path.join(directory, '%03d.png' % frame_arg), image)
+    return directory
+
+
+def test_frame_reader_batches(image_directory):
+    batches = list(FrameReader(image_directory, batch_size=2))
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert batches[0][0].shape == (16, 24, 3)
+    assert np.all(batches[2][0] == 40)
+
+
+def test_frame_reader_close_stops_decoding(image_directory):
+    reader = FrameReader(image_directory, batch_size=1, queue_size=1)
+    batches = iter(reader)
+    assert len(next(batches)) == 1
+    reader.close()
+    assert not reader._thread.is_alive()
+
+
+def test_process_source_errors_stop_decoding(image_directory, tmp_path):
+    def pipeline(image):
+        raise ValueError('invalid image')
+    num_threads = threading.active_count()
+    with pytest.raises(ValueError):
+        process_source(pipeline, image_directory, str(tmp_path), 1)
+    assert threading.active_count() == num_threads
+
+
+def test_serialize_box2D():
+    box2D = Box2D(np.array([1, 2, 3, 4]), np.float32(0.25), 'cat')
+    serialized = serialize({'boxes2D': [box2D]})
+    assert serialized == {'boxes2D': [{'coordinates': [1, 2, 3, 4],
+                                       'score': 0.25, 'class_name': 'cat'}]}
+
+
+def test_process_sources(image_directory, tmp_path):
+    output_directory = os.path.join(str(tmp_path), 'outputs')
+    results = process_sources(build_box_pipeline, [image_directory],
+                              output_directory, batch_size=2)
+    assert results[0]['num_frames'] == 5
+    assert os.path.exists(os.path.join(output_directory, 'frames.avi'))
+    with open(os.path.join(output_directory, 'frames.jsonl')) as filer:
+        lines = [json.loads(line) for line in filer]
+    assert [line['frame'] for line in lines] == list(range(5))
+    assert lines[0]['boxes2D'][0]['class_name'] == 'box'
+    assert 'image' not in lines[0]
+    assert 'Total: 5 frames' in summarize(results, 1.0)
+
+
+class CountingAdapter(object):
+    def __init__(self):
+        self.batch_sizes = []
+
+    def preprocess(self, image):
+        return image, image.shape
+
+    def predict(self, inputs):
+        self.batch_sizes.append(len(inputs))
+        return [np.mean(image) for image in inputs]
+
+    def postprocess(self, image, output, context):
+        return {'mean': output, 'shape': context}
+
+
+def test_process_source_batches_model_calls(image_directory, tmp_path,
+                                            monkeypatch):
+    adapter = CountingAdapter()
+    monkeypatch.setattr('paz.serving.build_adapter', lambda pipeline: adapter)
+    output_directory = os.path.join(str(tmp_path), 'outputs')
+    process_source(None, image_directory, output_directory, batch_size=2)
+    assert adapter.batch_sizes == [2, 2, 1]
+    with open(os.path.join(output_directory, 'frames.jsonl')) as filer:
+        lines = [json.loads(line) for line in filer]
+    assert [line['mean'] for line in lines] == [0, 10, 20, 30, 40]
+    assert lines[0]['shape'] == [16, 24, 3]
+
+
+def test_build_output_names(tmp_path):
+    directory = str(tmp_path)
+    sources = [os.path.join(directory, 'a', 'clip.mp4'),
+               os.path.join(directory, 'b', 'clip.mp4'),
+               os.path.join(directory, 'a', 'frames')]
+    assert build_output_names(sources) == ['a_clip', 'b_clip', 'a_frames']
+    assert build_output_names(sources[1:]) == ['clip', 'frames']
+    with pytest.raises(ValueError):
+        build_output_names([sources[0], sources[0]])
+
+
+def test_process_sources_with_equal_basenames(image_directory, tmp_path):
+    other_directory = os.path.join(str(tmp_path), 'other', 'frames')
+    write_image(os.path.join(other_directory, '000.png'),
+                np.zeros((16, 24, 3), dtype='uint8'))
+    output_directory = os.path.join(str(tmp_path), 'outputs')
+    results = process_sources(build_box_pipeline,
+                              [image_directory, other_directory],
+                              output_directory, write_video=False)
+    assert [result['num_frames'] for result in results] == [5, 1]
+    assert sorted(os.listdir(output_directory)) == [
+        'frames.jsonl', 'other_frames.jsonl']
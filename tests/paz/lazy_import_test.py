@@ -0,0 +1,74 @@
+import sys
+import subprocess
+import pytest
+
+from paz.utils.lazy import lazy_import
+
+
+def imported_modules(statement):
+    script = '\n'.join([statement, 'import sys',
+                        'print(",".join(sorted(sys.modules.keys())))'])
+    output = subprocess.check_output([sys.executable, '-c', script])
+    return output.decode().strip().splitlines()[-1].split(',')
+
+
+@pytest.mark.parametrize('package', ['paz.applications', 'paz.pipelines',
+                                     'paz.models', 'paz.processors',
+                                     'paz.datasets', 'paz.abstract'])
+def test_import_does_not_load_tensorflow(package):
+    modules = imported_modules('import ' + package)
+    assert 'tensorflow' not in modules
+    assert 'paz.datasets.human36m' not in modules
+
+
+def test_lazy_attributes_are_resolved():
+    import paz.processors as pr
+    from paz.processors.standard import Predict
+    assert pr.Predict is Predict
+    assert pr.TRAIN == 0
+    assert 'Predict' in dir(pr)
+
+
+def test_submodules_are_resolved():
+    import paz.processors as pr
+    from paz.processors import detection
+    assert pr.detection is detection
+
+
+def test_missing_attribute_raises():
+    import paz.models
+    with pytest.raises(AttributeError):
+        paz.models.NotAModel
+
+
+def test_lazy_import_missing_module_name():
+    getattr_, dir_ = lazy_import('paz.utils', {'Missing': '.missing'})
+    with pytest.raises(ModuleNotFoundError):
+        getattr_('Missing')
+
+
+def test_applications_are_built_on_warmup():
+    from paz.abstract import Processor
+    from paz.applications import lazy_application
+
+    class CountBuilds(Processor):
+        num_builds = 0
+
+        def __init__(self, offset):
+            super(CountBuilds, self).__init__()
+            CountBuilds.num_builds = CountBuilds.num_builds + 1
+            self.offset = offset
+
+        def call(self, x):
+            return x + self.offset
+
+    LazyCountBuilds = lazy_application(CountBuilds)
+    pipeline = LazyCountBuilds(2)
+    assert CountBuilds.num_builds == 0
+    assert isinstance(pipeline, CountBuilds)
+    assert pipeline.warmup() is pipeline
+    assert CountBuilds.num_builds == 1
+    assert pipeline(1) == 3
+    assert LazyCountBuilds(3)(1) == 4
+    assert CountBuilds.num_builds == 2
+    assert pipeline.name == 'CountBuilds'
@@ -1,7 +1,10 @@
 import pytest
 import numpy as np
+import tensorflow as tf
 from paz.models.classification.protonet import (
-    ProtoEmbedding, ProtoNet, compute_pairwise_distances)
+    ProtoEmbedding, ProtoNet, ProtoClassifier, PrototypeHead,
+    compute_pairwise_distances, compute_pairwise_cosine_distances,
+    compute_pairwise_mahalanobis_distances)
 
 
 def parametrize(Model, model_args, output_shape, params, static_params):
@@ -92,6 +95,72 @@ def test_pairwise_distances_with_values_to_negative():
     assert np.allclose(values, distances)
 
 
+def test_pairwise_distances_matches_tiled_distances():
+    a = np.random.rand(12, 64).astype(np.float32)
+    b = np.random.rand(5, 64).astype(np.float32)
+    values = compute_pairwise_distances(a, b).numpy()
+    distances = np.mean((a[:, None, :] - b[None, :, :]) ** 2, axis=2)
+    assert np.allclose(values, distances, atol=1e-6)
+
+
+def test_pairwise_cosine_distances():
+    a = np.array([[1.0, 0.0], [0.0, 2.0], [-3.0, 0.0]])
+    b = np.array([[2.0, 0.0], [0.0, 1.0]])
+    values = compute_pairwise_cosine_distances(a, b).numpy()
+    distances = np.array([[0.0, 1.0], [1.0, 0.0], [2.0, 1.0]])
+    assert np.allclose(values, distances)
+
+
+def test_pairwise_mahalanobis_identity_is_euclidean():
+    a = np.random.rand(7, 16)
+    b = np.random.rand(3, 16)
+    values = compute_pairwise_mahalanobis_distances(a, b, np.eye(16))
+    distances = compute_pairwise_distances(a, b)
+    assert np.allclose(values.numpy(), distances.numpy())
+
+
+def test_pairwise_mahalanobis_with_values():
+    a = np.array([[1.0, 1.0]])
+    b = np.array([[0.0, 0.0]])
+    precision = np.array([[2.0, 0.0], [0.0, 4.0]])
+    values = compute_pairwise_mahalanobis_distances(a, b, precision)
+    assert np.allclose(values.numpy(), [[3.0]])
+
+
+@pytest.mark.parametrize('metric', ['euclidean', 'cosine'])
+def test_prototype_head_matches_distances(metric):
+    queries = np.random.rand(9, 32).astype(np.float32)
+    prototypes = np.random.rand(4, 32).astype(np.float32)
+    if metric == 'euclidean':
+        distances = compute_pairwise_distances(queries, prototypes)
+    else:
+        distances = compute_pairwise_cosine_distances(queries, prototypes)
+    probabilities = PrototypeHead(prototypes, metric)(queries).numpy()
+    expected_probabilities = tf.nn.softmax(-distances).numpy()
+    assert np.allclose(probabilities, expected_probabilities, atol=1e-5)
+
+
+def test_prototype_head_update():
+    queries = np.random.rand(6, 8).astype(np.float32)
+    head = PrototypeHead(np.random.rand(3, 8).astype(np.float32))
+    prototypes = np.random.rand(3, 8).astype(np.float32)
+    head.update(prototypes)
+    distances = compute_pairwise_distances(queries, prototypes)
+    expected_probabilities = tf.nn.softmax(-distances).numpy()
+    assert np.allclose(head(queries).numpy(), expected_probabilities,
+                       atol=1e-5)
+    with pytest.raises(ValueError):
+        head.update(np.random.rand(4, 8))
+
+
+def test_proto_classifier_output_shape():
+    embed = ProtoEmbedding((28, 28, 1), 4)
+    prototypes = np.random.rand(20, 64).astype(np.float32)
+    model = ProtoClassifier(embed, prototypes, (28, 28, 1))
+    assert model.output_shape == (None, 20)
+    del model
+
+
 def count_params(weights):
     """Count the total number of scalars composing the weights.
     This function is taken from the repository of [Keras]
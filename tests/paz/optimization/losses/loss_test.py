@@ -121,3 +121,29 @@ def test_negative_classification_loss(y_true, y_pred, loss,
         negative_classification_loss, dtype='float32')
     assert np.allclose(
         negative_classification_loss, target_negative_classification_loss)
+
+
+def test_negative_classification_loss_is_batched(loss):
+    random_state = np.random.RandomState(777)
+    num_classes, num_boxes = 5, 40
+    classes = random_state.randint(0, num_classes, (4, num_boxes))
+    classes[0, :] = 0
+    classes[1, :30] = random_state.randint(1, num_classes, 30)
+    y_true = np.concatenate([random_state.rand(4, num_boxes, 4),
+                             np.eye(num_classes)[classes]], axis=-1)
+    y_pred = random_state.rand(4, num_boxes, 4 + num_classes)
+    y_true, y_pred = y_true.astype('float32'), y_pred.astype('float32')
+    negative_loss = loss.negative_classification(y_true, y_pred)
+
+    class_loss = loss._cross_entropy(y_true[:, :, 4:], y_pred[:, :, 4:])
+    negative_mask = y_true[:, :, 4]
+    negative_losses = np.asarray(class_loss) * negative_mask
+    num_positives = np.sum(1.0 - negative_mask, axis=-1).astype(int)
+    num_negatives = np.minimum(3 * num_positives, loss.max_num_negatives)
+    target_loss = []
+    for sample_losses, num_sample_negatives in zip(
+            negative_losses, num_negatives):
+        sorted_losses = np.sort(sample_losses)[::-1]
+        target_loss.append(np.sum(sorted_losses[:num_sample_negatives]))
+    target_loss = np.array(target_loss) * 4 / np.sum(num_positives)
+    assert np.allclose(negative_loss, target_loss)
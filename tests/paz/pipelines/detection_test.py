@@ -15,6 +15,11 @@ from paz.pipelines import HaarCascadeFrontalFace
 from paz.pipelines import DetectFaceKeypointNet2D32
 from paz.pipelines import DetectMiniXceptionFER
 from paz.abstract.messages import Box2D
+from paz.abstract import ProcessingSequence
+from paz.pipelines import AugmentDetection, AugmentDetectionBatch
+from paz.pipelines import LoadDetection
+from paz.models.detection.utils import create_prior_boxes
+from paz import processors as pr
 
 
 @pytest.fixture
@@ -312,3 +317,51 @@ def test_EFFICIENTDETDXCOCO(
     boxes_EFFICIENTDETDXCOCO = boxes_EFFICIENTDETDXCOCO()
     assert_inferences(
         detector, image_with_multiple_objects, boxes_EFFICIENTDETDXCOCO)
+
+
+@pytest.fixture
+def detection_data(tmp_path):
+    random_state = np.random.RandomState(777)
+    data = []
+    for sample_arg in range(3):
+        image = random_state.randint(0, 256, (60, 80, 3)).astype('uint8')
+        image_path = os.path.join(str(tmp_path), '%d.png' % sample_arg)
+        cv2.imwrite(image_path, image)
+        boxes = np.array([[0.1, 0.2, 0.6, 0.7, 3.0],
+                          [0.4, 0.3, 0.9, 0.8, 12.0]])
+        data.append({'image': image_path, 'boxes': boxes})
+    return data
+
+
+@pytest.mark.parametrize('split', [pr.TRAIN, pr.VAL])
+def test_AugmentDetectionBatch_leaves_padding_samples_empty(
+        detection_data, split):
+    prior_boxes = create_prior_boxes('VOC')
+    sequence = ProcessingSequence(
+        LoadDetection(300, 8), 2, detection_data,
+        batch_processor=AugmentDetectionBatch(prior_boxes, split), seed=777)
+    inputs, labels = sequence[1]
+    assert inputs['image'].shape == (2, 300, 300, 3)
+    assert labels['boxes'].shape == (2, len(prior_boxes), 4 + 21)
+    assert np.all(inputs['image'][1] == 0)
+    assert np.all(labels['boxes'][1] == 0)
+    assert np.any(labels['boxes'][0, :, 4] != 1)
+
+
+def test_AugmentDetectionBatch_equals_AugmentDetection_without_augment(
+        detection_data):
+    prior_boxes = create_prior_boxes('VOC')
+    sequence = ProcessingSequence(
+        LoadDetection(300, 8), 2, detection_data,
+        batch_processor=AugmentDetectionBatch(prior_boxes, pr.VAL))
+    augment = AugmentDetection(prior_boxes, pr.VAL)
+    for batch_index in range(len(sequence)):
+        inputs, labels = sequence[batch_index]
+        samples = detection_data[2 * batch_index:2 * (batch_index + 1)]
+        for sample_arg, sample in enumerate(samples):
+            sample = augment(sample.copy())
+            assert np.allclose(labels['boxes'][sample_arg],
+                               sample['labels']['boxes'])
+            difference = np.abs(inputs['image'][sample_arg] -
+                                sample['inputs']['image'])
+            assert np.max(difference) <= 1.0
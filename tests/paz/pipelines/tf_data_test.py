@@ -0,0 +1,105 @@
+import pytest
+import numpy as np
+import tensorflow as tf
+
+from paz.backend.boxes import match, encode, flip_left_right
+from paz.backend import tensorflow_boxes
+from paz.backend.image import write_image
+from paz.backend.image.tensorflow_image import transform_image
+from paz.models.detection.utils import create_prior_boxes
+from paz.pipelines.tf_data import (
+    build_dataset, AugmentClassificationTF, AugmentKeypointsTF,
+    AugmentDetectionTF)
+from paz.processors import TRAIN, VAL
+
+
+@pytest.fixture
+def boxes():
+    return np.array([[0.10, 0.20, 0.40, 0.60, 3],
+                     [0.50, 0.10, 0.90, 0.50, 7],
+                     [0.05, 0.55, 0.35, 0.95, 1]], dtype=np.float32)
+
+
+@pytest.fixture
+def prior_boxes():
+    return create_prior_boxes('VOC')
+
+
+@pytest.fixture
+def detection_data(tmp_path, boxes):
+    data = []
+    for sample_arg in range(5):
+        image = np.full((64 + sample_arg, 80, 3), 20 * sample_arg, 'uint8')
+        filepath = str(tmp_path / ('image_%d.png' % sample_arg))
+        write_image(filepath, image)
+        data.append({'image': filepath, 'boxes': boxes[:1 + sample_arg % 3]})
+    return data
+
+
+def test_match_and_encode_equal_numpy(boxes, prior_boxes):
+    matched_boxes = match(boxes.copy(), prior_boxes)
+    encoded_boxes = encode(matched_boxes, prior_boxes)
+    prior_boxes = tf.constant(prior_boxes, tf.float32)
+    tf_matched_boxes = tensorflow_boxes.match(boxes, prior_boxes)
+    tf_encoded_boxes = tensorflow_boxes.encode(tf_matched_boxes, prior_boxes)
+    assert np.allclose(tf_matched_boxes, matched_boxes)
+    assert np.allclose(tf_encoded_boxes, encoded_boxes, atol=1e-4)
+
+
+def test_flip_left_right_equals_numpy(boxes):
+    assert np.allclose(tensorflow_boxes.flip_left_right(boxes),
+                       flip_left_right(boxes, 1.0))
+
+
+def test_transform_image_fills_empty_pixels():
+    image = np.full((10, 10, 3), 100.0, dtype=np.float32)
+    matrix = np.array([[1.0, 0.0, 5.0], [0.0, 1.0, 0.0]])
+    transformed_image = transform_image(image, matrix, [0.0, 50.0, 255.0])
+    assert np.allclose(transformed_image[:, 6:], 100.0)
+    assert np.allclose(transformed_image[:, :5], [0.0, 50.0, 255.0])
+
+
+@pytest.mark.parametrize('split', [TRAIN, VAL])
+def test_detection_dataset(detection_data, prior_boxes, split):
+    pipeline = AugmentDetectionTF(prior_boxes, split, num_classes=21)
+    dataset = build_dataset(detection_data, pipeline, 2, shuffle=True)
+    batch_sizes = []
+    for inputs, labels in dataset:
+        batch_sizes.append(len(inputs['image']))
+        assert inputs['image'].shape[1:] == (300, 300, 3)
+        assert labels['boxes'].shape[1:] == (len(prior_boxes), 4 + 21)
+        one_hot_vectors = labels['boxes'][..., 4:].numpy()
+        assert np.allclose(np.sum(one_hot_vectors, axis=-1), 1.0)
+        assert np.any(np.argmax(one_hot_vectors, axis=-1) != 0)
+    assert batch_sizes == [2, 2, 1]
+
+
+def test_detection_dataset_encodes_as_numpy(detection_data, prior_boxes):
+    pipeline = AugmentDetectionTF(prior_boxes, VAL, num_classes=21)
+    inputs, labels = next(iter(build_dataset(detection_data, pipeline, 1)))
+    boxes = match(detection_data[0]['boxes'].copy(), prior_boxes)
+    boxes = encode(boxes, prior_boxes)
+    assert np.allclose(labels['boxes'][0, :, :4], boxes[:, :4], atol=1e-4)
+    assert np.allclose(np.argmax(labels['boxes'][0, :, 4:], -1), boxes[:, 4])
+
+
+def test_classification_dataset():
+    data = [{'image': np.zeros((48, 48), 'uint8'), 'label': label}
+            for label in range(4)]
+    pipeline = AugmentClassificationTF(32, 7, TRAIN, num_channels=1)
+    inputs, labels = next(iter(build_dataset(data, pipeline, 4)))
+    assert inputs['image'].shape == (4, 32, 32, 1)
+    assert np.allclose(np.argmax(labels['label'], axis=-1), range(4))
+
+
+def test_keypoints_dataset():
+    keypoints = np.array([[48.0, 48.0], [0.0, 96.0]])
+    data = [{'image': np.zeros((96, 96), 'uint8'), 'keypoints': keypoints}
+            for sample_arg in range(3)]
+    pipeline = AugmentKeypointsTF(96, TRAIN, probability=1.0)
+    inputs, labels = next(iter(build_dataset(data, pipeline, 3)))
+    assert inputs['image'].shape == (3, 96, 96, 1)
+    assert labels['keypoints'].shape == (3, 2, 2)
+    # rotations keep the image center and translations move all keypoints
+    center, corner = labels['keypoints'][:, 0], labels['keypoints'][:, 1]
+    assert np.allclose(np.linalg.norm(corner - center, axis=-1), np.sqrt(2))
@@ -1,5 +1,11 @@
 import pytest
+import numpy as np
+
 from paz import processors as pr
+from paz.abstract import Box2D
+from paz.backend.image.draw import (
+    Overlay, draw_line, draw_rectangle, draw_circle, put_text,
+    draw_keypoints_link, draw_keypoints, draw_keypoint, make_mosaic)
 
 
 def test_DrawBoxes2D_with_invalid_class_names_type():
@@ -14,3 +20,122 @@ def test_DrawBoxes2D_with_invalid_colors_type():
         class_names = ['Face']
         colors = [255, 0, 0]
         pr.DrawBoxes2D(class_names, colors)
+
+
+@pytest.fixture
+def image():
+    RNG = np.random.default_rng(777)
+    return RNG.integers(0, 256, (240, 320, 3)).astype(np.uint8)
+
+
+def test_Overlay_draws_as_opencv_functions(image):
+    RNG = np.random.default_rng(777)
+    points_A = RNG.integers(-20, 340, (30, 2))
+    points_B = RNG.integers(-20, 340, (30, 2))
+    colors = RNG.integers(0, 256, (20, 3))
+    corners = np.sort(RNG.integers(0, 240, (10, 2, 2)), axis=1)
+    centers = RNG.integers(-5, 325, (20, 2))
+
+    # runs of equal colors are drawn together without changing the order
+    line_colors = np.repeat(colors[:6], 5, axis=0)
+    line_colors[[3, 17]] = colors[7]
+    target_image = image.copy()
+    for point_A, point_B, color in zip(points_A, points_B, line_colors):
+        draw_line(target_image, point_A.tolist(), point_B.tolist(),
+                  color.tolist(), 3)
+    for corner_A, corner_B in corners:
+        draw_rectangle(target_image, corner_A.tolist(), corner_B.tolist(),
+                       (0, 255, 0), 2)
+    for center, color in zip(centers, colors):
+        draw_circle(target_image, center.tolist(), color.tolist(), 4)
+
+    overlay = Overlay()
+    overlay.reset(image.copy())
+    overlay.draw_lines(points_A, points_B, line_colors, 3)
+    overlay.draw_boxes(corners.reshape(-1, 4), (0, 255, 0), 2)
+    overlay.draw_dots(centers, colors, 4)
+    assert np.array_equal(overlay.render(), target_image)
+
+
+def test_Overlay_blends_with_alpha():
+    image = np.full((10, 10, 3), 100, dtype=np.uint8)
+    overlay = Overlay(alpha=0.5)
+    overlay.reset(image)
+    overlay.draw_points(np.array([[2, 3]]), (200, 0, 50))
+    assert np.all(image == 100)
+    image = overlay.render()
+    assert np.array_equal(image[3, 2], [150, 50, 75])
+    assert np.all(image[4:] == 100)
+
+
+def test_DrawHandSkeleton_equals_draw_keypoints(image):
+    RNG = np.random.default_rng(777)
+    keypoints = RNG.uniform(0, 240, (21, 2))
+    draw = pr.DrawHandSkeleton()
+    target_image = draw_keypoints_link(
+        image.copy(), keypoints, draw.link_args, draw.link_orders,
+        draw.link_colors, False, draw.link_width)
+    target_image = draw_keypoints(target_image, keypoints,
+                                  draw.keypoint_colors, False,
+                                  draw.keypoint_radius)
+    assert np.array_equal(draw(image.copy(), keypoints), target_image)
+
+
+def test_DrawHumanSkeleton_keeps_order_of_overlapping_people(image):
+    RNG = np.random.default_rng(777)
+    joints = RNG.uniform(0, 120, (4, 17, 3)) + [100, 60, 0]
+    joints[0, :5, 2] = 0.0
+    draw = pr.DrawHumanSkeleton('COCO', check_scores=True)
+    target_image = image.copy()
+    for one_person_joints in joints:
+        target_image = draw_keypoints_link(
+            target_image, one_person_joints, draw.link_args,
+            draw.link_orders, draw.link_colors, True, draw.link_width)
+        target_image = draw_keypoints(
+            target_image, one_person_joints, draw.keypoint_colors, True,
+            draw.keypoint_radius)
+    assert np.array_equal(draw(image.copy(), joints), target_image)
+
+
+def test_DrawKeypoints2D_keeps_order_of_overlapping_keypoints(image):
+    keypoints = np.array([[50, 50], [55, 52], [58, 49], [200, 100]])
+    draw = pr.DrawKeypoints2D(4, radius=8)
+    target_image = image.copy()
+    for keypoint, color in zip(keypoints, draw.colors):
+        draw_keypoint(target_image, keypoint.tolist(), color, 8)
+    assert np.array_equal(draw(image.copy(), keypoints), target_image)
+
+
+def test_DrawHumanSkeleton_checks_scores(image):
+    RNG = np.random.default_rng(777)
+    joints = RNG.uniform(0, 240, (3, 17, 3))
+    joints[..., 2] = 0.0
+    draw = pr.DrawHumanSkeleton('COCO', check_scores=True)
+    assert np.array_equal(draw(image.copy(), joints), image)
+    joints[..., 2] = 1.0
+    assert not np.array_equal(draw(image.copy(), joints), image)
+
+
+def test_DrawBoxes2D_equals_put_text_and_draw_rectangle(image):
+    boxes2D = [Box2D([10, 40, 100, 120], 0.9, 'cat'),
+               Box2D([150, 30, 300, 200], 0.6, 'dog'),
+               Box2D([60, 50, 180, 150], 0.7, 'cat')]
+    draw = pr.DrawBoxes2D(['cat', 'dog'])
+    target_image = image.copy()
+    for box2D in boxes2D:
+        x_min, y_min, x_max, y_max = box2D.coordinates
+        color = draw.class_to_color[box2D.class_name]
+        text = '{:0.2f}, {}'.format(box2D.score, box2D.class_name)
+        put_text(target_image, text, (x_min, y_min - 10), 0.7, color, 1)
+        draw_rectangle(target_image, (x_min, y_min), (x_max, y_max), color, 2)
+    assert np.array_equal(draw(image.copy(), boxes2D), target_image)
+
+
+def test_make_mosaic_tiles_images():
+    images = np.arange(5 * 4 * 3 * 2).reshape(5, 4, 3, 2)
+    mosaic = make_mosaic(images, (2, 3), border=1)
+    assert mosaic.shape == (2 * 4 + 1, 3 * 3 + 2, 2)
+    assert np.array_equal(mosaic[:4, :3], images[0])
+    assert np.array_equal(mosaic[5:9, 4:7], images[4])
+    assert np.all(mosaic[4] == 1.0)
+    assert np.all(mosaic[5:, 8:] == 1.0)
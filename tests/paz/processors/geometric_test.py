@@ -5,6 +5,7 @@ import numpy as np
 from tensorflow.keras.utils import get_file
 from paz import processors as pr
 from paz.backend.image import load_image
+from paz.backend.boxes import compute_iou
 
 
 @pytest.fixture
@@ -31,6 +32,48 @@ def test_random_sample_crop_pass_by_reference(boxes_with_label):
     assert np.all(initial_boxes_with_label == boxes_with_label)
 
 
+def sample_crop_sequentially(H_original, W_original, boxes, min_iou,
+                             max_iou, max_trials):
+    for trial_arg in range(max_trials):
+        W = np.random.uniform(0.3 * W_original, W_original)
+        H = np.random.uniform(0.3 * H_original, H_original)
+        aspect_ratio = H / W
+        if (aspect_ratio < 0.5) or (aspect_ratio > 2):
+            continue
+        x_min = np.random.uniform(W_original - W)
+        y_min = np.random.uniform(H_original - H)
+        crop_box = np.array([x_min, y_min, x_min + W, y_min + H]).astype(int)
+        overlap = compute_iou(crop_box, boxes)
+        if ((overlap.max() < min_iou) or (overlap.min() > max_iou)):
+            continue
+        centers = (boxes[:, :2] + boxes[:, 2:]) / 2.0
+        mask = np.logical_and(np.all(crop_box[:2] < centers, axis=1),
+                              np.all(crop_box[2:] > centers, axis=1))
+        if mask.any():
+            return crop_box
+    return None
+
+
+@pytest.mark.parametrize('min_iou, max_iou', [(0.1, np.inf), (0.7, np.inf),
+                                              (0.9, np.inf)])
+def test_random_sample_crop_matches_sequential_trials(
+        boxes_with_label, min_iou, max_iou):
+    crop = pr.RandomSampleCrop(probability=1.0, max_trials=50)
+    boxes = boxes_with_label[:, :4]
+    for seed in range(50):
+        np.random.seed(seed)
+        crop_box = sample_crop_sequentially(
+            500, 400, boxes, min_iou, max_iou, 50)
+        next_draw = np.random.rand()
+        np.random.seed(seed)
+        sample = crop._sample_crop(500, 400, boxes, min_iou, max_iou)
+        assert next_draw == np.random.rand()
+        if crop_box is None:
+            assert sample is None
+        else:
+            assert np.all(sample[0] == crop_box)
+
+
 def test_random_sample_crop():
     URL = ('https://github.com/oarriaga/altamira-data/releases/download'
            '/v0.9/object_detection_augmentation.png')
@@ -54,3 +97,53 @@ def test_random_sample_crop():
         assert len(crop_boxes.shape) == 2
         assert np.alltrue(crop_boxes[:, 0] < crop_boxes[:, 2])
         assert np.alltrue(crop_boxes[:, 1] < crop_boxes[:, 3])
+
+
+@pytest.fixture
+def batch():
+    images = np.random.randint(0, 256, (4, 60, 80, 3)).astype('uint8')
+    boxes = np.array([[0.1, 0.2, 0.5, 0.6, 3.0], [0.4, 0.3, 0.9, 0.8, 7.0]])
+    boxes = pr.PadBoxes(5)(boxes)
+    return images, np.stack([boxes] * 4)
+
+
+def test_random_flip_boxes_left_right_batch(batch):
+    images, boxes = batch
+    flipped_images, flipped_boxes = pr.RandomFlipBoxesLeftRightBatch()(
+        images, boxes)
+    for image, sample_boxes, flipped_image, flipped_sample_boxes in zip(
+            images, boxes, flipped_images, flipped_boxes):
+        if np.all(flipped_image == image):
+            assert np.allclose(flipped_sample_boxes, sample_boxes)
+        else:
+            assert np.all(flipped_image == image[:, ::-1])
+            assert np.allclose(flipped_sample_boxes[:2, [0, 2]],
+                               1.0 - sample_boxes[:2, [2, 0]])
+        assert np.all(flipped_sample_boxes[:, -1] == sample_boxes[:, -1])
+
+
+def test_expand_batch_keeps_boxes_inside(batch):
+    images, boxes = batch
+    expand = pr.ExpandBatch(max_ratio=3, mean=[0, 0, 0], probability=1.0)
+    expanded_images, expanded_boxes = expand(images, boxes)
+    assert expanded_images.shape == images.shape
+    assert np.all(expanded_boxes[:, :2, :4] >= 0.0)
+    assert np.all(expanded_boxes[:, :2, :4] <= 1.0)
+    widths = expanded_boxes[:, :2, 2] - expanded_boxes[:, :2, 0]
+    assert np.all(widths <= (boxes[:, :2, 2] - boxes[:, :2, 0]) + 1e-8)
+    assert np.all(expanded_boxes[:, :, -1] == boxes[:, :, -1])
+
+
+def test_random_sample_crop_batch(batch):
+    images, boxes = batch
+    crop = pr.RandomSampleCropBatch(probability=1.0)
+    for _ in range(20):
+        cropped_images, cropped_boxes = crop(images, boxes)
+        assert cropped_images.shape == images.shape
+        for sample_boxes in cropped_boxes:
+            sample_boxes = pr.UnpadBoxes()(sample_boxes)
+            assert len(sample_boxes) > 0
+            assert np.all(sample_boxes[:, :4] >= -1e-8)
+            assert np.all(sample_boxes[:, :4] <= 1.0 + 1e-8)
+            assert np.all(sample_boxes[:, 0] < sample_boxes[:, 2])
+    assert np.all(boxes[:, 2:] == -1)
@@ -110,3 +110,49 @@ def test_Scale(object_sizes):
     values = np.array([1.0, 0.5, 0.25])
     scaled_values = scale(values)
     assert np.allclose(scaled_values, values * object_sizes)
+
+
+def test_array_boxes_processors_equal_Boxes2D_processors():
+    RNG = np.random.default_rng(777)
+    class_names = ['background', 'person', 'car', 'dog']
+    x_min, y_min = RNG.uniform(0.0, 0.5, (2, 200))
+    x_max, y_max = RNG.uniform(0.55, 1.0, (2, 200))
+    coordinates = np.stack([x_min, y_min, x_max, y_max], axis=1)
+    scores = RNG.uniform(0.0, 1.0, (200, len(class_names)))
+    boxes = np.concatenate([coordinates, scores], axis=1)
+    image = np.zeros((240, 320, 3), dtype=np.uint8)
+
+    boxes2D = pr.ToBoxes2D(class_names)(boxes)
+    boxes2D = pr.FilterClassBoxes2D(['person', 'dog'])(boxes2D)
+    boxes2D = pr.DenormalizeBoxes2D()(image, boxes2D)
+    boxes2D = pr.SquareBoxes2D()(boxes2D)
+    boxes2D = pr.OffsetBoxes2D([0.1, 0.2])(boxes2D)
+    boxes2D = pr.ClipBoxes2D()(image, boxes2D)
+    boxes2D = pr.RoundBoxes2D()(boxes2D)
+
+    boxes = pr.FilterClassBoxes(class_names, ['person', 'dog'])(boxes)
+    boxes = pr.DenormalizeBoxes()(image, boxes)
+    boxes = pr.SquareBoxes()(boxes)
+    boxes = pr.OffsetBoxes([0.1, 0.2])(boxes)
+    boxes = pr.ClipBoxes()(image, boxes)
+    boxes = pr.TruncateBoxes()(boxes)
+    view = pr.ToBoxes2DView(class_names, integer_coordinates=True)(boxes)
+
+    assert len(view) == len(boxes2D)
+    for box2D, view_box2D in zip(boxes2D, view):
+        assert list(box2D.coordinates) == list(view_box2D.coordinates)
+        assert box2D.score == view_box2D.score
+        assert box2D.class_name == view_box2D.class_name
+
+
+def test_ToBoxes2DView_builds_Box2D_on_access():
+    boxes = np.array([[0.1, 0.2, 0.4, 0.5, 0.1, 0.9],
+                      [0.5, 0.5, 0.4, 0.9, 0.8, 0.2]])
+    view = pr.ToBoxes2DView(['cat', 'dog'])(boxes)
+    assert len(view) == 2
+    assert view[0].class_name == 'dog'
+    assert view[0].score == 0.9
+    assert len(view[:1].to_list()) == 1
+    # invalid boxes only raise once they are materialized
+    with pytest.raises(ValueError):
+        view[1]
@@ -0,0 +1,134 @@
+import time
+import asyncio
+import pytest
+import numpy as np
+
+from paz.serving import MicroBatchingService
+from paz.serving import SequentialAdapter
+from paz.serving import build_adapter
+
+
+class SumAdapter(object):
+    def __init__(self):
+        self.batch_sizes = []
+
+    def preprocess(self, image):
+        return image, image.shape
+
+    def predict(self, inputs):
+        self.batch_sizes.append(len(inputs))
+        return np.sum(np.stack(inputs), axis=(1, 2))
+
+    def postprocess(self, image, output, context):
+        return {'sum': output, 'shape': context}
+
+
+def serve(service, images):
+    async def run():
+        await service.start()
+        results = await asyncio.gather(
+            *[service.predict(image) for image in images])
+        await service.stop()
+        return results
+    return asyncio.run(run())
+
+
+def test_results_are_routed_to_their_requests():
+    images = [np.full((2, 3), value) for value in range(10)]
+    adapter = SumAdapter()
+    service = MicroBatchingService(None, 4, 0.05, adapter)
+    results = serve(service, images)
+    assert [result['sum'] for result in results] == [6 * value
+                                                     for value in range(10)]
+    assert results[0]['shape'] == (2, 3)
+
+
+def test_batches_are_bounded_by_max_batch_size():
+    images = [np.zeros((2, 2)) for _ in range(10)]
+    adapter = SumAdapter()
+    service = MicroBatchingService(None, 4, 0.05, adapter)
+    serve(service, images)
+    assert adapter.batch_sizes == [4, 4, 2]
+    metrics = service.metrics
+    assert metrics['num_requests'] == 10
+    assert metrics['num_batches'] == 3
+    assert metrics['batch_sizes'] == {2: 1, 4: 2}
+    assert metrics['queue_depth'] == 0
+
+
+def test_errors_are_propagated():
+    def pipeline(image):
+        raise ValueError('invalid image')
+
+    async def run():
+        service = MicroBatchingService(pipeline, 2, 0.01)
+        await service.start()
+        try:
+            await service.predict(np.zeros((2, 2)))
+        except ValueError:
+            return True
+        finally:
+            await service.stop()
+        return False
+    assert asyncio.run(run())
+
+
+def test_build_adapter_falls_back_to_sequential():
+    assert isinstance(build_adapter(lambda image: image), SequentialAdapter)
+
+
+class SlowAdapter(SumAdapter):
+    def predict(self, inputs):
+        time.sleep(0.2)
+        return super(SlowAdapter, self).predict(inputs)
+
+
+def test_stop_cancels_pending_requests():
+    async def run():
+        service = MicroBatchingService(None, 2, 0.01, SlowAdapter())
+        await service.start()
+        requests = [asyncio.ensure_future(service.predict(np.zeros((2, 2))))
+                    for _ in range(5)]
+        await asyncio.sleep(0.05)
+        await service.stop()
+        done, pending = await asyncio.wait(requests, timeout=2.0)
+        return len(pending), all(request.cancelled() for request in done)
+    num_pending, are_cancelled = asyncio.run(run())
+    assert num_pending == 0
+    assert are_cancelled
+
+
+def test_stop_does_not_block_event_loop():
+    async def tick(ticks):
+        while True:
+            await asyncio.sleep(0.01)
+            ticks.append(1)
+
+    async def run():
+        service = MicroBatchingService(None, 2, 0.01, SlowAdapter())
+        await service.start()
+        request = asyncio.ensure_future(service.predict(np.zeros((2, 2))))
+        await asyncio.sleep(0.05)
+        ticks = []
+        ticker = asyncio.ensure_future(tick(ticks))
+        await service.stop()
+        ticker.cancel()
+        await asyncio.wait([request], timeout=2.0)
+        return len(ticks)
+    assert asyncio.run(run()) >= 5
+
+
+def test_predict_before_start_raises():
+    service = MicroBatchingService(None, 2, 0.01, SumAdapter())
+    with pytest.raises(RuntimeError):
+        asyncio.run(service.predict(np.zeros((2, 2))))
+
+
+def test_service_can_be_restarted():
+    images = [np.full((2, 3), value) for value in range(4)]
+    adapter = SumAdapter()
+    service = MicroBatchingService(None, 4, 0.05, adapter)
+    for _ in range(2):
+        results = serve(service, images)
+        assert [result['sum'] for result in results] == [0, 6, 12, 18]
+    assert service.metrics['num_requests'] == 8